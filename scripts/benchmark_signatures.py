@@ -0,0 +1,116 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Measures the time spent computing the signatures of a large pipeline.
+
+A synthetic pipeline of layers of Integer modules is built, then copied and hashed
+repeatedly, changing a single parameter each time, the way parameter
+explorations do. The signatures are computed both with and without the
+signatures memoized on the modules, functions and parameters.
+
+Usage: python benchmark_signatures.py [nb_modules] [nb_runs]
+"""
+
+import copy
+import sys
+import timeit
+
+import vistrails.core.application
+from vistrails.core.system import get_vistrails_basic_pkg_id
+from vistrails.core.vistrail.connection import Connection
+from vistrails.core.vistrail.module import Module
+from vistrails.core.vistrail.module_function import ModuleFunction
+from vistrails.core.vistrail.module_param import ModuleParam
+from vistrails.core.vistrail.pipeline import Pipeline
+from vistrails.core.vistrail.port import Port
+
+
+def build_pipeline(nb_modules, width=50):
+    basic_pkg = get_vistrails_basic_pkg_id()
+    pipeline = Pipeline()
+    for i in xrange(nb_modules):
+        params = [ModuleParam(id=i, pos=0, type='Integer', val=str(i),
+                              identifier=basic_pkg)]
+        function = ModuleFunction(id=i, pos=0, name='value',
+                                  parameters=params)
+        pipeline.add_module(Module(id=i, name='Integer', package=basic_pkg,
+                                   functions=[function]))
+        if i >= width:
+            # Layers of 'width' modules, each connected to the previous one
+            pipeline.add_connection(Connection(id=i, ports=[
+                    Port(id=2*i, type='source', moduleId=i-width,
+                         name='value',
+                         signature='(%s:Integer)' % basic_pkg),
+                    Port(id=2*i+1, type='destination', moduleId=i,
+                         name='value',
+                         signature='(%s:Integer)' % basic_pkg)]))
+    return pipeline
+
+def forget_signatures(pipeline):
+    for module in pipeline.module_list:
+        module._signature_memo = None
+        for function in module.functions:
+            function._signature_memo = None
+            for param in function.params:
+                param._signature_memo = None
+
+def prepare(pipeline, memoized):
+    pipeline = copy.copy(pipeline)
+    if not memoized:
+        forget_signatures(pipeline)
+    param = pipeline.modules[len(pipeline.modules) // 2].functions[0].params[0]
+    param.strValue = str(int(param.strValue) + 1)
+    return pipeline
+
+def main(argv):
+    nb_modules = int(argv[1]) if len(argv) > 1 else 2000
+    nb_runs = int(argv[2]) if len(argv) > 2 else 10
+    vistrails.core.application.init({'batch': True,
+                                     'singleInstance': False})
+    pipeline = build_pipeline(nb_modules)
+    pipeline.refresh_signatures()
+    for memoized in (False, True):
+        # Copying the pipeline is not part of the measure
+        times = []
+        for i in xrange(nb_runs):
+            copied = prepare(pipeline, memoized)
+            start = timeit.default_timer()
+            copied.refresh_signatures()
+            times.append(timeit.default_timer() - start)
+        print "%-12s %d modules: %.1f ms per execution" % (
+                'memoized' if memoized else 'not memoized',
+                nb_modules, min(times) * 1000.0)
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,107 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Compares the numpy and the pure-Python code of the tabledata operations.
+
+A random table with a numeric column and a key column is built twice: as a
+ColumnarTable, which the operations process with numpy, and as a plain
+TableObject of lists, which makes them fall back to the per-row code. Each
+operation (select, aggregate, join) is then timed on both.
+
+Usage: python benchmark_tabledata.py [nb_rows] [nb_keys]
+"""
+
+import random
+import sys
+import timeit
+
+import numpy
+
+import vistrails.core.application
+
+
+def build_tables(nb_rows, nb_keys):
+    from vistrails.packages.tabledata.common import TableObject, \
+        ColumnarTable
+
+    rand = random.Random(4)
+    values = ['%.3f' % rand.uniform(-100.0, 100.0) for i in xrange(nb_rows)]
+    keys = ['key%d' % rand.randrange(nb_keys) for i in xrange(nb_rows)]
+    right_keys = ['key%d' % i for i in xrange(nb_keys)]
+    right_values = [str(i) for i in xrange(nb_keys)]
+    names = ['value', 'key']
+    fast = (ColumnarTable([numpy.array(values), numpy.array(keys)],
+                          nb_rows, names),
+            ColumnarTable([numpy.array(right_keys),
+                           numpy.array(right_values)],
+                          nb_keys, ['key', 'id']))
+    slow = (TableObject([values, keys], nb_rows, names),
+            TableObject([right_keys, right_values], nb_keys, ['key', 'id']))
+    return fast, slow
+
+def run_select(table, right):
+    from vistrails.packages.tabledata.operations import SelectFromTable
+    for idx, comparer, comparand in [(0, '>', 0.0), (1, '==', 'key1')]:
+        rows = SelectFromTable.match_rows(table, idx, comparer, comparand)
+        SelectFromTable.select_rows(table, rows).get_column(0)
+
+def run_aggregate(table, right):
+    from vistrails.packages.tabledata.operations import AggregatedTable
+    AggregatedTable(table, 'sum', 0, 1).get_column(1, True)
+
+def run_join(table, right):
+    from vistrails.packages.tabledata.operations import JoinedTables
+    JoinedTables(table, right, 1, 0).get_column(3)
+
+def main(argv):
+    nb_rows = int(argv[1]) if len(argv) > 1 else 1000000
+    nb_keys = int(argv[2]) if len(argv) > 2 else 1000
+    nb_runs = 3
+    vistrails.core.application.init({'batch': True,
+                                     'singleInstance': False})
+    fast, slow = build_tables(nb_rows, nb_keys)
+    for name, func in [('select', run_select),
+                       ('aggregate', run_aggregate),
+                       ('join', run_join)]:
+        for path, tables in [('python', slow), ('numpy', fast)]:
+            times = []
+            for i in xrange(nb_runs):
+                start = timeit.default_timer()
+                func(*tables)
+                times.append(timeit.default_timer() - start)
+            print "%-10s %-7s %d rows: %.1f ms" % (
+                    name, path, nb_rows, min(times) * 1000.0)
+
+if __name__ == '__main__':
+    main(sys.argv)
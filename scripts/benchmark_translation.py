@@ -0,0 +1,105 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Measures the time to open vistrails saved with an older schema.
+
+Each file is opened without the translation cache, then twice with it: the
+first open translates and stores the vistrail, the second reads it from the
+cache.
+
+Usage: python benchmark_translation.py [filename...]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+import vistrails.core.application
+from vistrails.core.db.io import load_vistrail
+from vistrails.core.db.locator import FileLocator
+import vistrails.core.system
+
+
+def timed_load(locator, repeat=3):
+    """Returns the best time to load the vistrail, in seconds.
+    """
+    best = None
+    for i in xrange(repeat):
+        start = timeit.default_timer()
+        load_vistrail(locator)
+        elapsed = timeit.default_timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main(argv):
+    if len(argv) > 1:
+        filenames = argv[1:]
+    else:
+        root = vistrails.core.system.vistrails_root_directory()
+        filenames = [os.path.join(root, 'tests', 'resources', f)
+                     for f in ['terminator.vt', 'triangle_count.vt']]
+        filenames.extend(os.path.join(root, '..', 'examples', f)
+                         for f in ['lung.vt', 'plot.vt', 'brain_vistrail.vt'])
+    # Keep a reference, the configuration is needed to open files
+    app = vistrails.core.application.init({'batch': True,
+                                           'singleInstance': False})
+    configuration = app.temp_configuration
+    cache_dir = tempfile.mkdtemp(prefix='vt_translations_')
+    try:
+        for filename in filenames:
+            locator = FileLocator(os.path.abspath(filename))
+            configuration.translationCache.enabled = False
+            load_vistrail(locator)
+            uncached = timed_load(locator)
+
+            configuration.translationCache.enabled = True
+            configuration.translationCache.cacheDir = cache_dir
+            start = timeit.default_timer()
+            load_vistrail(locator)
+            storing = timeit.default_timer() - start
+            cached = timed_load(locator)
+            shutil.rmtree(cache_dir)
+
+            print "%s: %.0f ms, %.0f ms storing, %.0f ms cached" % (
+                    os.path.basename(filename), uncached * 1000.0,
+                    storing * 1000.0, cached * 1000.0)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    app.finishSession()
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,112 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Measures the memory used by vistrails once loaded.
+
+The vistrail is loaded several times and all the copies are kept, so that
+the growth of the process is mostly made of the domain objects (actions,
+operations, modules, functions, parameters...).
+
+Usage: python benchmark_vistrail_memory.py [filename] [nb_copies]
+"""
+
+import gc
+import os
+import resource
+import sys
+import timeit
+
+import vistrails.core.application
+from vistrails.core.db.io import load_vistrail
+from vistrails.core.db.locator import FileLocator
+import vistrails.core.system
+
+
+def memory_usage():
+    """Returns the resident set size of the process, in kilobytes.
+    """
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except IOError:
+        pass
+    # Peak size, in bytes on Mac OS X
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss //= 1024
+    return rss
+
+def count_objects(vistrail):
+    nb_ops = 0
+    for action in vistrail.actions:
+        nb_ops += len(action.operations)
+    return len(vistrail.actions), nb_ops
+
+def main(argv):
+    if len(argv) > 1:
+        filename = argv[1]
+    else:
+        filename = os.path.join(
+                vistrails.core.system.vistrails_root_directory(),
+                '..', 'examples', 'terminator.vt')
+    nb_copies = int(argv[2]) if len(argv) > 2 else 20
+    # Keep a reference, the configuration is needed to open files
+    app = vistrails.core.application.init({'batch': True,
+                                           'singleInstance': False})
+    locator = FileLocator(os.path.abspath(filename))
+
+    # Load once first, so that modules and caches are already there
+    load_vistrail(locator)
+    gc.collect()
+    before = memory_usage()
+    start = timeit.default_timer()
+    loaded = []
+    for i in xrange(nb_copies):
+        loaded.append(load_vistrail(locator)[0])
+    elapsed = timeit.default_timer() - start
+    gc.collect()
+    used = memory_usage() - before
+
+    nb_actions, nb_ops = count_objects(loaded[0])
+    print "%s: %d actions, %d operations" % (os.path.basename(filename),
+                                              nb_actions, nb_ops)
+    print "%.1f MB per copy, %.0f bytes per operation" % (
+            used / 1024.0 / nb_copies, used * 1024.0 / nb_copies / nb_ops)
+    print "%.0f ms to load a copy" % (elapsed * 1000.0 / nb_copies)
+    app.finishSession()
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,92 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Measures the time it takes to load the VTK package, with and without the
+cache of VTK modules.
+
+Each measure runs in a new process, using a temporary .vistrails directory.
+The cold measures remove the cache file first, so the modules and ports are
+built by inspecting the VTK classes (and the cache is written); the warm
+measures reuse the cache written by the previous runs.
+
+Usage: python benchmark_vtk_startup.py [nb_runs]
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+
+def load_package(dot_vistrails):
+    """Starts VisTrails then enables the VTK package, printing the time it
+    took to enable it.
+    """
+    import vistrails.core.application
+    from vistrails.core.packagemanager import get_package_manager
+
+    vistrails.core.application.init({'batch': True,
+                                     'singleInstance': False,
+                                     'dotVistrails': dot_vistrails})
+    start = timeit.default_timer()
+    get_package_manager().late_enable_package('vtk')
+    print timeit.default_timer() - start
+
+def measure(dot_vistrails, cold):
+    if cold:
+        cache = os.path.join(dot_vistrails, 'vtk_modules.cache')
+        if os.path.exists(cache):
+            os.remove(cache)
+    output = subprocess.check_output([sys.executable, __file__,
+                                      '--load', dot_vistrails])
+    return float(output.strip().splitlines()[-1])
+
+def main(argv):
+    if len(argv) == 3 and argv[1] == '--load':
+        load_package(argv[2])
+        return
+    nb_runs = int(argv[1]) if len(argv) > 1 else 3
+    dot_vistrails = tempfile.mkdtemp(prefix='vt_bench_')
+    try:
+        for cold in (True, False):
+            times = [measure(dot_vistrails, cold) for i in xrange(nb_runs)]
+            print "%-5s start: %.2f s to load the VTK package" % (
+                    'cold' if cold else 'warm', min(times))
+    finally:
+        shutil.rmtree(dot_vistrails)
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -38,6 +38,8 @@ for version in os.listdir('vistrails/db/versions'):
     package_data['vistrails.db.versions.%s' % version] = [
         'schemas/sql/vistrails.sql',
         'schemas/sql/vistrails_drop.sql',
+        'schemas/sql/vistrails_sqlite.sql',
+        'schemas/sql/vistrails_sqlite_drop.sql',
         'schemas/xml/log.xsd',
         'schemas/xml/vistrail.xsd',
         'schemas/xml/vtlink.xsd',
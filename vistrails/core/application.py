@@ -530,7 +530,8 @@ class VistrailsCoreApplication(VistrailsApplicationInterface):
         VistrailsApplicationInterface.init(self, options_dict=options_dict, 
                                            args=args)
         self.package_manager.initialize_packages(
-                report_missing_dependencies=not self.startup.first_run)
+                report_missing_dependencies=not self.startup.first_run,
+                lazy=bool(self.temp_configuration.check('lazyPackages')))
 
     def is_running_gui(self):
         return False
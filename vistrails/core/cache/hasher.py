@@ -32,7 +32,18 @@
 ## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
 ##
 ###############################################################################
-"""Hasher class for vistrail items."""
+"""Hasher class for vistrail items.
+
+Signatures of parameters, functions and modules are memoized on the objects
+themselves, in a _signature_memo attribute, so that executing a pipeline
+again only rehashes what changed. The objects drop their memo whenever they
+are modified (see Hasher.invalidate_signature()), and a parameter or
+function being modified also drops the memo of the function or module
+holding it. Functions with parameters that have a custom hasher are not
+memoized, as these hashers can depend on more than the parameter (e.g. the
+modification time of a file).
+
+"""
 from vistrails.core.cache.utils import hash_list
 
 try:
@@ -53,6 +64,9 @@ class Hasher(object):
         if custom_hasher:
             return custom_hasher(p)
         else:
+            memo = getattr(p, '_signature_memo', None)
+            if memo is not None:
+                return memo
             hasher = sha_hash()
             u = hasher.update
             u(p.type)
@@ -61,17 +75,27 @@ class Hasher(object):
             u(p.strValue)
             u(p.name)
             u(p.evaluatedStrValue)
-            return hasher.digest()
+            p._signature_memo = hasher.digest()
+            return p._signature_memo
 
     @staticmethod
     def function_signature(function, constant_hasher_map={}):
+        memo = getattr(function, '_signature_memo', None)
+        if memo is not None:
+            return memo
+        params = function.params
         hasher = sha_hash()
         u = hasher.update
         u(function.name)
         u(function.returnType)
-        u(hash_list(function.params,
+        u(hash_list(params,
                     Hasher.parameter_signature,
                     constant_hasher_map))
+        if not any((p.identifier, p.type, p.namespace) in constant_hasher_map
+                   for p in params):
+            for p in params:
+                p._signature_parent = function
+            function._signature_memo = hasher.digest()
         return hasher.digest()
 
     @staticmethod
@@ -105,19 +129,44 @@ class Hasher(object):
 
     @staticmethod
     def module_signature(obj, constant_hasher_map={}):
+        descriptor = obj.module_descriptor
+        memo = getattr(obj, '_signature_memo', None)
+        if memo is not None and memo[0] is descriptor:
+            return memo[1]
+        functions = obj.functions
         hasher = sha_hash()
         u = hasher.update
-        u(obj.module_descriptor.name)
-        u(obj.module_descriptor.package)
-        u(obj.module_descriptor.namespace or '')
-        u(obj.module_descriptor.package_version or '')
-        u(obj.module_descriptor.version or '')
-        u(hash_list(obj.functions, Hasher.function_signature,
+        u(descriptor.name)
+        u(descriptor.package)
+        u(descriptor.namespace or '')
+        u(descriptor.package_version or '')
+        u(descriptor.version or '')
+        u(hash_list(functions, Hasher.function_signature,
                     constant_hasher_map))
         u(hash_list(obj.control_parameters, Hasher.control_param_signature,
                     constant_hasher_map))
+        if all(getattr(f, '_signature_memo', None) is not None
+               for f in functions):
+            for child in functions:
+                child._signature_parent = obj
+            for child in obj.control_parameters:
+                child._signature_parent = obj
+            obj._signature_memo = (descriptor, hasher.digest())
         return hasher.digest()
 
+    @staticmethod
+    def invalidate_signature(obj):
+        """Drops the memoized signature of a parameter, function, control
+        parameter or module, and of the objects holding it.
+
+        This is called when the object is modified through its fields or
+        the db_add_*()/db_change_*()/db_delete_*() methods; changing the
+        lists of children in place is not detected.
+        """
+        while obj is not None:
+            obj._signature_memo = None
+            obj = getattr(obj, '_signature_parent', None)
+
     @staticmethod
     def subpipeline_signature(module_sig, upstream_sigs):
         """Returns the signature for a subpipeline, given the signatures for
@@ -144,3 +193,105 @@ class Hasher(object):
         for h in sorted(sig_list):
             hasher.update(h)
         return hasher.digest()
+
+##############################################################################
+
+import unittest
+
+
+class TestHasher(unittest.TestCase):
+    def make_module(self):
+        from vistrails.core.system import get_vistrails_basic_pkg_id
+        from vistrails.core.vistrail.module import Module
+        from vistrails.core.vistrail.module_function import ModuleFunction
+        from vistrails.core.vistrail.module_param import ModuleParam
+        basic_pkg = get_vistrails_basic_pkg_id()
+        param = ModuleParam(type='Integer', val='1', identifier=basic_pkg)
+        function = ModuleFunction(name='value', parameters=[param])
+        return Module(name='Integer', package=basic_pkg, functions=[function])
+
+    def fresh_signature(self, module):
+        import copy
+        module = copy.deepcopy(module)
+        for function in module.functions:
+            function._signature_memo = None
+            for param in function.params:
+                param._signature_memo = None
+        module._signature_memo = None
+        return Hasher.module_signature(module)
+
+    def test_memoized(self):
+        module = self.make_module()
+        sig = Hasher.module_signature(module)
+        self.assertIsNotNone(module._signature_memo)
+        self.assertEqual(Hasher.module_signature(module), sig)
+        self.assertEqual(self.fresh_signature(module), sig)
+
+        # Copies keep the memo
+        module2 = module.do_copy()
+        self.assertIsNotNone(module2.functions[0].params[0]._signature_memo)
+        self.assertEqual(Hasher.module_signature(module2), sig)
+
+    def test_invalidated(self):
+        from vistrails.core.vistrail.module_param import ModuleParam
+        module = self.make_module()
+        sig = Hasher.module_signature(module)
+        param = module.functions[0].params[0]
+
+        param.strValue = '2'
+        self.assertIsNone(param._signature_memo)
+        sig2 = Hasher.module_signature(module)
+        self.assertNotEqual(sig2, sig)
+        self.assertEqual(self.fresh_signature(module), sig2)
+
+        param.evaluatedStrValue = '3'
+        sig3 = Hasher.module_signature(module)
+        self.assertNotEqual(sig3, sig2)
+
+        # Adding a parameter
+        module.functions[0].add_parameter(ModuleParam(type='Integer',
+                                                      val='4'))
+        sig4 = Hasher.module_signature(module)
+        self.assertNotEqual(sig4, sig3)
+        self.assertEqual(self.fresh_signature(module), sig4)
+
+        module.functions[0].name = 'other'
+        self.assertNotEqual(Hasher.module_signature(module), sig4)
+
+    def test_invalidated_copy(self):
+        from vistrails.core.vistrail.module_control_param import \
+            ModuleControlParam
+        module = self.make_module()
+        sig = Hasher.module_signature(module)
+        module2 = module.do_copy()
+        module2.functions[0].params[0].strValue = '2'
+        self.assertIsNone(module2._signature_memo)
+        self.assertIsNotNone(module._signature_memo)
+        self.assertNotEqual(Hasher.module_signature(module2), sig)
+        self.assertEqual(Hasher.module_signature(module), sig)
+
+        module.add_control_parameter(ModuleControlParam(
+                name=ModuleControlParam.LOOP_KEY, value='cartesian'))
+        sig2 = Hasher.module_signature(module)
+        self.assertNotEqual(sig2, sig)
+        module.control_parameters[0].value = 'pairwise'
+        self.assertIsNone(module._signature_memo)
+        self.assertNotEqual(Hasher.module_signature(module), sig2)
+
+    def test_custom_hasher(self):
+        """Functions with custom hashed parameters are not memoized.
+        """
+        module = self.make_module()
+        param = module.functions[0].params[0]
+        values = ['a']
+        chm = {(param.identifier, param.type, param.namespace):
+                   lambda p: values[0]}
+        sig = Hasher.module_signature(module, chm)
+        self.assertIsNone(module._signature_memo)
+        self.assertIsNone(module.functions[0]._signature_memo)
+        values[0] = 'b'
+        self.assertNotEqual(Hasher.module_signature(module, chm), sig)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,487 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Persistent stores for module results.
+
+The interpreter identifies the result of a module by the signature of the
+subpipeline that produces it (see Hasher.subpipeline_signature). A result
+store keeps the serialized outputs of modules under that signature, so that
+they can be reused across sessions: modules that opt in (see the
+PersistentCacheable mixin in vistrails_module) are not computed again if
+their result is found in the store.
+
+Two backends are provided: DirectoryResultStore keeps one file per result in
+a content-addressed directory, SQLiteResultStore keeps them in a single
+sqlite file. Both evict the least recently used results once their total
+size goes over a limit.
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from vistrails.core import debug
+
+##############################################################################
+
+class ResultStore(object):
+    """Base class for persistent result stores.
+
+    Results are opaque strings, keyed by the hexadecimal signature of the
+    subpipeline that produced them. max_size is the size limit in bytes, or
+    None for an unbounded store.
+
+    """
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, signature):
+        """get(signature: str) -> str or None
+
+        Returns the stored result or None, and marks it as recently used.
+
+        """
+        raise NotImplementedError
+
+    def put(self, signature, data):
+        """put(signature: str, data: str) -> None
+
+        Stores a result, evicting old ones if the store gets too big.
+
+        """
+        raise NotImplementedError
+
+    def remove(self, signature):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def size(self):
+        """size() -> int
+
+        Returns the total size of the stored results, in bytes.
+
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+##############################################################################
+
+class DirectoryResultStore(ResultStore):
+    """Stores each result as a file, named after its signature.
+
+    The modification time of the files is used to track their last use.
+
+    """
+    def __init__(self, directory, max_size=None):
+        ResultStore.__init__(self, max_size)
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._size = None
+        self._lock = threading.Lock()
+
+    def _filename(self, signature):
+        return os.path.join(self.directory, signature[:2], signature)
+
+    def _entries(self):
+        """Returns a list of (mtime, size, filename) for all stored results.
+        """
+        entries = []
+        for root, dirs, files in os.walk(self.directory):
+            for f in files:
+                if f.startswith('.'):
+                    continue
+                fname = os.path.join(root, f)
+                try:
+                    stat = os.stat(fname)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, fname))
+        return entries
+
+    def size(self):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(s for _, s, _ in self._entries())
+            return self._size
+
+    def get(self, signature):
+        fname = self._filename(signature)
+        try:
+            with open(fname, 'rb') as f:
+                data = f.read()
+        except IOError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(fname, None)
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, signature, data):
+        fname = self._filename(signature)
+        dirname = os.path.dirname(fname)
+        if not os.path.isdir(dirname):
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                # Might have been created concurrently
+                if not os.path.isdir(dirname):
+                    raise
+        size = self.size()
+        old_size = os.path.getsize(fname) if os.path.exists(fname) else 0
+        # Write to a temporary file first, so that readers never see a
+        # partial result
+        fd, tmp = tempfile.mkstemp(prefix='.', dir=dirname)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            if os.path.exists(fname):
+                os.remove(fname)
+            os.rename(tmp, fname)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        with self._lock:
+            self._size = size + len(data) - old_size
+        self.evict()
+
+    def remove(self, signature):
+        fname = self._filename(signature)
+        try:
+            size = os.path.getsize(fname)
+            os.remove(fname)
+        except OSError:
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+
+    def evict(self):
+        """evict() -> None
+
+        Removes the least recently used results until the store fits in
+        max_size.
+
+        """
+        if self.max_size is None or self.size() <= self.max_size:
+            return
+        with self._lock:
+            entries = self._entries()
+            entries.sort()
+            size = sum(s for _, s, _ in entries)
+            for _, s, fname in entries:
+                if size <= self.max_size:
+                    break
+                try:
+                    os.remove(fname)
+                except OSError, e:
+                    debug.warning("Could not remove cached result %s" %
+                                  fname, e)
+                    continue
+                size -= s
+            self._size = size
+
+    def clear(self):
+        with self._lock:
+            for _, _, fname in self._entries():
+                os.remove(fname)
+            self._size = 0
+
+##############################################################################
+
+class SQLiteResultStore(ResultStore):
+    """Stores the results in a single sqlite database.
+
+    """
+    def __init__(self, filename, max_size=None):
+        ResultStore.__init__(self, max_size)
+        self.filename = filename
+        dirname = os.path.dirname(filename)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(filename, check_same_thread=False)
+        self.conn.text_factory = str
+        with self.conn:
+            self.conn.execute('''
+                    CREATE TABLE IF NOT EXISTS results(
+                        signature TEXT PRIMARY KEY,
+                        data BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        accessed REAL NOT NULL)
+                    ''')
+            self.conn.execute('''
+                    CREATE INDEX IF NOT EXISTS results_accessed
+                    ON results(accessed)
+                    ''')
+
+    def size(self):
+        with self._lock:
+            return self._size()
+
+    def _size(self):
+        cur = self.conn.execute('SELECT SUM(size) FROM results')
+        return cur.fetchone()[0] or 0
+
+    def get(self, signature):
+        with self._lock:
+            cur = self.conn.execute(
+                    'SELECT data FROM results WHERE signature=?',
+                    (signature,))
+            row = cur.fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self.conn:
+                self.conn.execute(
+                        'UPDATE results SET accessed=? WHERE signature=?',
+                        (time.time(), signature))
+            self.hits += 1
+            return str(row[0])
+
+    def put(self, signature, data):
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                        'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                        (signature, sqlite3.Binary(data), len(data),
+                         time.time()))
+                self._evict()
+
+    def remove(self, signature):
+        with self._lock:
+            with self.conn:
+                self.conn.execute('DELETE FROM results WHERE signature=?',
+                                  (signature,))
+
+    def evict(self):
+        with self._lock:
+            with self.conn:
+                self._evict()
+
+    def _evict(self):
+        if self.max_size is None:
+            return
+        size = self._size()
+        if size <= self.max_size:
+            return
+        cur = self.conn.execute(
+                'SELECT signature, size FROM results ORDER BY accessed')
+        to_delete = []
+        for signature, s in cur:
+            if size <= self.max_size:
+                break
+            to_delete.append((signature,))
+            size -= s
+        self.conn.executemany('DELETE FROM results WHERE signature=?',
+                              to_delete)
+
+    def clear(self):
+        with self._lock:
+            with self.conn:
+                self.conn.execute('DELETE FROM results')
+
+    def close(self):
+        self.conn.close()
+
+##############################################################################
+
+RESULT_STORE_BACKENDS = {'directory': DirectoryResultStore,
+                         'sqlite': SQLiteResultStore}
+
+_result_store = None
+
+def get_result_store(configuration=None):
+    """get_result_store(configuration: ConfigurationObject)
+         -> ResultStore or None
+
+    Returns the result store selected by the 'resultCache' configuration
+    fields, or None if the persistent result cache is disabled.
+
+    """
+    global _result_store
+    from vistrails.core import system
+    if configuration is None:
+        from vistrails.core.configuration import get_vistrails_configuration
+        configuration = get_vistrails_configuration()
+    if (configuration is None or
+            not configuration.has_deep_value('resultCache.enabled') or
+            not configuration.get_deep_value('resultCache.enabled')):
+        return None
+    backend = configuration.get_deep_value('resultCache.backend')
+    if backend not in RESULT_STORE_BACKENDS:
+        debug.warning("Unknown result cache backend %r" % backend)
+        return None
+    directory = system.get_vistrails_directory('resultCache.cacheDir',
+                                               configuration)
+    if directory is None:
+        return None
+    max_size = configuration.get_deep_value('resultCache.cacheSize')
+    max_size = max_size * 1024 * 1024 if max_size else None
+    if backend == 'sqlite':
+        location = os.path.join(directory, 'results.db')
+    else:
+        location = directory
+    klass = RESULT_STORE_BACKENDS[backend]
+    if (not isinstance(_result_store, klass) or
+            getattr(_result_store, 'directory',
+                    getattr(_result_store, 'filename', None)) != location):
+        if _result_store is not None:
+            _result_store.close()
+        try:
+            _result_store = klass(location, max_size)
+        except Exception, e:
+            debug.critical("Could not open result cache %s" % location, e)
+            _result_store = None
+            return None
+    _result_store.max_size = max_size
+    return _result_store
+
+##############################################################################
+
+import shutil
+import unittest
+
+
+class TestResultStores(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='vt_results_')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def check_store(self, store):
+        self.assertIsNone(store.get('ab01'))
+        store.put('ab01', 'a' * 40)
+        store.put('ab02', 'b' * 40)
+        self.assertEqual(store.get('ab01'), 'a' * 40)
+        self.assertEqual(store.size(), 80)
+        self.assertEqual((store.hits, store.misses), (1, 1))
+        store.put('ab02', 'c' * 30)
+        self.assertEqual(store.get('ab02'), 'c' * 30)
+        self.assertEqual(store.size(), 70)
+        store.remove('ab02')
+        self.assertIsNone(store.get('ab02'))
+        self.assertEqual(store.size(), 40)
+        store.clear()
+        self.assertIsNone(store.get('ab01'))
+        self.assertEqual(store.size(), 0)
+
+    def check_lru(self, store):
+        store.put('cd01', 'a' * 40)
+        time.sleep(0.01)
+        store.put('cd02', 'b' * 40)
+        time.sleep(0.01)
+        # Use the first one, so that the second one gets evicted
+        store.get('cd01')
+        time.sleep(0.01)
+        store.put('cd03', 'c' * 40)
+        self.assertLessEqual(store.size(), 100)
+        self.assertEqual(store.get('cd01'), 'a' * 40)
+        self.assertIsNone(store.get('cd02'))
+        self.assertEqual(store.get('cd03'), 'c' * 40)
+
+    def test_directory(self):
+        self.check_store(DirectoryResultStore(self.directory))
+
+    def test_directory_lru(self):
+        store = DirectoryResultStore(self.directory, 100)
+        # mtime resolution can be coarse, set it explicitly
+        store.put('cd01', 'a' * 40)
+        os.utime(store._filename('cd01'), (1000, 1000))
+        store.put('cd02', 'b' * 40)
+        os.utime(store._filename('cd02'), (2000, 2000))
+        store.get('cd01')
+        store.put('cd03', 'c' * 40)
+        self.assertLessEqual(store.size(), 100)
+        self.assertEqual(store.get('cd01'), 'a' * 40)
+        self.assertIsNone(store.get('cd02'))
+
+    def test_directory_reopen(self):
+        store = DirectoryResultStore(self.directory)
+        store.put('ef01', 'data')
+        store = DirectoryResultStore(self.directory)
+        self.assertEqual(store.get('ef01'), 'data')
+        self.assertEqual(store.size(), 4)
+
+    def test_sqlite(self):
+        store = SQLiteResultStore(os.path.join(self.directory, 'r.db'))
+        self.check_store(store)
+        store.close()
+
+    def test_sqlite_lru(self):
+        store = SQLiteResultStore(os.path.join(self.directory, 'r.db'), 100)
+        self.check_lru(store)
+        store.close()
+
+    def test_sqlite_binary(self):
+        store = SQLiteResultStore(os.path.join(self.directory, 'r.db'))
+        data = ''.join(chr(i) for i in xrange(256))
+        store.put('ff', data)
+        self.assertEqual(store.get('ff'), data)
+        store.close()
+
+    def test_configuration(self):
+        from vistrails.core.configuration import ConfigurationObject
+        conf = ConfigurationObject(
+                resultCache=ConfigurationObject(enabled=False,
+                                                backend='sqlite',
+                                                cacheDir=self.directory,
+                                                cacheSize=1))
+        self.assertIsNone(get_result_store(conf))
+        conf.resultCache.enabled = True
+        store = get_result_store(conf)
+        self.assertIsInstance(store, SQLiteResultStore)
+        self.assertEqual(store.max_size, 1024 * 1024)
+        self.assertIs(get_result_store(conf), store)
+        store.close()
+        global _result_store
+        _result_store = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,297 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Eviction policies for the module cache of the interpreter.
+
+The cached interpreter keeps every module it executed in its persistent
+pipeline, so that later executions can reuse them. CachePolicy bounds that
+cache by number of modules and by the estimated size of their output values,
+picking modules to evict in least recently used (LRU) or least frequently
+used (LFU) order.
+"""
+
+import sys
+
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
+##############################################################################
+
+def estimate_size(value, max_items=100, _seen=None):
+    """estimate_size(value, max_items: int) -> int
+
+    Returns an estimate of the memory used by a value, in bytes. Containers
+    are walked recursively; for containers with more than max_items
+    elements, the size is extrapolated from the first max_items ones.
+
+    """
+    from vistrails.core.modules.vistrails_module import Module
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        return sys.getsizeof(value) + (value.nbytes if value.base is None
+                                       else 0)
+    try:
+        size = sys.getsizeof(value)
+    except TypeError:
+        size = 0
+    if isinstance(value, (basestring, Module)):
+        # Modules are counted separately by the interpreter
+        return size
+    elif isinstance(value, dict):
+        items = value.iteritems()
+        nb = len(value)
+        def item_size(item):
+            return (estimate_size(item[0], max_items, _seen) +
+                    estimate_size(item[1], max_items, _seen))
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = iter(value)
+        nb = len(value)
+        def item_size(item):
+            return estimate_size(item, max_items, _seen)
+    else:
+        return size
+    total = 0
+    counted = 0
+    for item in items:
+        if counted >= max_items:
+            break
+        total += item_size(item)
+        counted += 1
+    if counted:
+        total = total * nb // counted
+    return size + total
+
+def estimate_outputs_size(module):
+    """estimate_outputs_size(module: Module) -> int
+
+    Returns an estimate of the memory used by the output values of a module.
+
+    """
+    seen = set([id(module)])
+    return sum(estimate_size(value, _seen=seen)
+               for port, value in module.outputPorts.iteritems()
+               if port != 'self')
+
+##############################################################################
+
+class CacheStatistics(object):
+    """Counters for the module cache.
+
+    hits counts the modules that were reused from the cache, misses the
+    modules that had to be created, and evictions the modules that were
+    removed to keep the cache within its budget.
+
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def as_dict(self):
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions}
+
+##############################################################################
+
+class CachePolicy(object):
+    """Tracks the usage of cached modules and chooses which ones to evict.
+
+    max_modules and max_size (in bytes) are the limits of the cache, 0
+    meaning no limit. policy is either 'lru' or 'lfu'.
+
+    """
+    POLICIES = ['lru', 'lfu']
+
+    def __init__(self, max_modules=0, max_size=0, policy='lru'):
+        self.max_modules = max_modules
+        self.max_size = max_size
+        self.policy = policy
+        self._clock = 0
+        self._last_used = {}
+        self._use_count = {}
+        self._sizes = {}
+        self._total_size = 0
+
+    def configure(self, configuration):
+        """configure(configuration: ConfigurationObject) -> None
+
+        Reads the limits from the 'cacheMaxModules', 'cacheMaxSize' (in MB)
+        and 'cacheEviction' configuration fields.
+
+        """
+        if configuration is None:
+            return
+        self.max_modules = getattr(configuration, 'cacheMaxModules', 0) or 0
+        max_size = getattr(configuration, 'cacheMaxSize', 0) or 0
+        self.max_size = max_size * 1024 * 1024
+        policy = getattr(configuration, 'cacheEviction', 'lru')
+        if policy in self.POLICIES:
+            self.policy = policy
+
+    def is_bounded(self):
+        return bool(self.max_modules or self.max_size)
+
+    def use(self, key):
+        """use(key) -> None
+
+        Records that a cached module was used by an execution.
+
+        """
+        self._clock += 1
+        self._last_used[key] = self._clock
+        self._use_count[key] = self._use_count.get(key, 0) + 1
+
+    def set_size(self, key, size):
+        self._total_size += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+
+    def remove(self, key):
+        self._last_used.pop(key, None)
+        self._use_count.pop(key, None)
+        self._total_size -= self._sizes.pop(key, 0)
+
+    def clear(self):
+        self._last_used.clear()
+        self._use_count.clear()
+        self._sizes.clear()
+        self._total_size = 0
+
+    def total_size(self):
+        return self._total_size
+
+    def over_budget(self, nb_modules):
+        """over_budget(nb_modules: int) -> bool
+
+        Whether a cache holding nb_modules modules is over its limits.
+
+        """
+        return bool((self.max_modules and nb_modules > self.max_modules) or
+                    (self.max_size and self._total_size > self.max_size))
+
+    def victim(self, keys):
+        """victim(keys: iterable) -> key
+
+        Returns the module that should be evicted first among keys.
+
+        """
+        if self.policy == 'lfu':
+            def sort_key(k):
+                return (self._use_count.get(k, 0), self._last_used.get(k, 0))
+        else:
+            def sort_key(k):
+                return self._last_used.get(k, 0)
+        return min(keys, key=sort_key)
+
+##############################################################################
+
+import unittest
+
+
+class TestCachePolicy(unittest.TestCase):
+    def test_estimate_size(self):
+        self.assertGreaterEqual(estimate_size('a' * 1000), 1000)
+        small = estimate_size([1])
+        big = estimate_size(range(10000))
+        self.assertGreater(big, small * 100)
+        self.assertGreaterEqual(estimate_size({'a': 'b' * 1000}), 1000)
+        l = ['c' * 1000]
+        # Shared objects are only counted once
+        self.assertLess(estimate_size([l, l]), 2000)
+        # Cycles don't recurse forever
+        l.append(l)
+        estimate_size(l)
+
+    @unittest.skipIf(numpy is None, "numpy not available")
+    def test_estimate_numpy(self):
+        a = numpy.zeros((100, 100))
+        self.assertGreaterEqual(estimate_size(a), a.nbytes)
+        self.assertLess(estimate_size(a[10:20]), a.nbytes)
+
+    def test_lru(self):
+        policy = CachePolicy(max_modules=2)
+        for k in [1, 2, 3, 1]:
+            policy.use(k)
+        self.assertTrue(policy.over_budget(3))
+        self.assertFalse(policy.over_budget(2))
+        self.assertEqual(policy.victim([1, 2, 3]), 2)
+        policy.remove(2)
+        self.assertEqual(policy.victim([1, 3]), 3)
+
+    def test_lfu(self):
+        policy = CachePolicy(max_modules=2, policy='lfu')
+        for k in [1, 1, 2, 2, 3]:
+            policy.use(k)
+        self.assertEqual(policy.victim([1, 2, 3]), 3)
+        policy.use(3)
+        policy.use(3)
+        # Ties are broken by recency
+        self.assertEqual(policy.victim([1, 2, 3]), 1)
+
+    def test_size(self):
+        policy = CachePolicy(max_size=100)
+        policy.set_size(1, 60)
+        self.assertFalse(policy.over_budget(1))
+        policy.set_size(2, 60)
+        self.assertTrue(policy.over_budget(2))
+        policy.set_size(2, 30)
+        self.assertEqual(policy.total_size(), 90)
+        policy.remove(1)
+        self.assertEqual(policy.total_size(), 30)
+
+    def test_configure(self):
+        from vistrails.core.configuration import ConfigurationObject
+        policy = CachePolicy()
+        self.assertFalse(policy.is_bounded())
+        policy.configure(ConfigurationObject(cacheMaxModules=10,
+                                             cacheMaxSize=2,
+                                             cacheEviction='lfu'))
+        self.assertTrue(policy.is_bounded())
+        self.assertEqual(policy.max_size, 2 * 1024 * 1024)
+        self.assertEqual(policy.policy, 'lfu')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -60,6 +60,9 @@ autoConnect: Automatically connect dragged in modules
 autoSave: Automatically save backup vistrails every two minutes
 batch: Run in batch mode instead of interactive mode
 cache: Cache previous results so they may be used in future computations
+cacheEviction: Which cached modules to evict first when the cache is full
+cacheMaxModules: Maximum number of modules kept in the cache
+cacheMaxSize: Maximum size of the results kept in the cache (MB)
 dataDir: Default data directory
 db: The name for the database to load the vistrail from
 dbDefault: Save vistrails in a database by default
@@ -71,6 +74,8 @@ enablePackagesSilently: Automatically enable packages when needed
 errorLog: Write errors to a log file
 execute: Execute any specified workflows
 executionLog: Track execution provenance when running workflows
+executionScheduler: How to schedule the modules of a workflow
+executionWorkers: Number of modules to execute concurrently
 fileDir: Default vistrail directory
 fixedSpreadsheetCells: Draw spreadsheet cells at a fixed size
 handlerDontAsk: Do not ask about extension handling at startup
@@ -82,6 +87,7 @@ jobAutorun: Run jobs automatically when they finish
 jobCheckInterval: How often to check for jobs (in seconds)
 jobList: List running workflows
 jobInfo: List jobs in running workflow
+lazyPackages: Only load the packages used by the workflows (batch mode)
 logDir: Log files directory
 maxRecentVistrails: Number of recent vistrails
 maximizeWindows: VisTrails windows should be maximized
@@ -94,6 +100,10 @@ parameters: List of parameters to use when running workflow
 port: The port for the database to load the vistrail from
 repositoryHTTPURL: Remote package repository URL
 repositoryLocalPath: Local package repository directory
+resultCache.backend: Storage for the persistent result cache
+resultCache.cacheDir: Persistent result cache directory
+resultCache.cacheSize: Persistent result cache size (MB)
+resultCache.enabled: Reuse module results across sessions
 rootDirectory: Directory that contains the VisTrails source code
 rpcConfig: Config file for server connection options
 rpcInstances: Number of other instances that vistrails should start
@@ -122,6 +132,9 @@ thumbs.cacheDir: Thumbnail cache directory
 thumbs.cacheSize: Thumbnail cache size (MB)
 thumbs.mouseHover: Show thumbnails when mouse is hovering above a version
 thumbs.tagsOnly: Store thumbnails only for tagged versions
+translationCache.cacheDir: Translated vistrails cache directory
+translationCache.cacheSize: Translated vistrails cache size (MB)
+translationCache.enabled: Keep translated copies of old vistrails
 upgradeDelay: Persist upgrade only after other changes
 upgradeModuleFailPrompt: Alert when a subworkflow upgrade fails
 upgrades: Attempt to automatically upgrade old workflows
@@ -153,6 +166,23 @@ cache: Boolean
 
     Cache previous results so they may be used in future computations.
 
+cacheEviction: String
+
+    When the cache exceeds cacheMaxModules or cacheMaxSize, which modules
+    are evicted first: 'lru' evicts the least recently used ones and 'lfu'
+    the least frequently used ones. The modules that depend on an evicted
+    module are evicted with it.
+
+cacheMaxModules: Integer
+
+    The maximum number of modules kept in the cache between executions
+    (0 means no limit).
+
+cacheMaxSize: Integer
+
+    The maximum estimated size (in MB) of the results kept in the cache
+    between executions (0 means no limit).
+
 dataDir: Path
 
     The location that VisTrails uses as a default directory for data.
@@ -201,6 +231,18 @@ executionLog: Boolean
 
     Track execution provenance when running workflows.
 
+executionScheduler: String
+
+    How the modules of a workflow are scheduled: 'serial' updates them
+    one at a time from the sinks, 'thread' runs independent thread-safe
+    modules concurrently in a pool of threads, and 'process' runs their
+    computation in forked processes.
+
+executionWorkers: Integer
+
+    The number of modules the 'thread' and 'process' schedulers execute
+    concurrently (0 means the number of CPUs).
+
 fileDir: Path
 
     The location that VisTrails uses as a default directory for
@@ -247,6 +289,12 @@ jobInfo: Boolean
 
     List jobs in running workflow
 
+lazyPackages: Boolean
+
+    In batch mode, only initialize the packages used by the workflows
+    being run (and their dependencies) instead of all the enabled
+    packages.
+
 logDir: Path
 
     The path that indicates where log files should be stored.
@@ -337,6 +385,29 @@ reviewMode: Boolean
 
     *Deprecated* Used to interactively export a pipeline.
 
+resultCache: ConfigurationObject
+
+    Settings for the persistent result cache.
+
+resultCache.backend: String
+
+    How results are stored: 'directory' keeps one file per result,
+    'sqlite' keeps them in a single database file.
+
+resultCache.cacheDir: Path
+
+    The directory where module results are stored.
+
+resultCache.cacheSize: Integer
+
+    The size (in MB) of the persistent result cache. The least recently
+    used results are removed when it gets bigger.
+
+resultCache.enabled: Boolean
+
+    Store the results of modules that support it on disk, so that they
+    can be reused in later sessions.
+
 rootDirectory: Path
 
     Directory that contains the VisTrails source code.
@@ -470,6 +541,25 @@ thumbs.tagsOnly: Boolean
     If True, only stores thumbnails for tagged versions. Otherwise,
     stores thumbnails for all versions.
 
+translationCache: ConfigurationObject
+
+    Settings for the cache of vistrails translated from older schemas.
+
+translationCache.cacheDir: Path
+
+    The directory where translated vistrails are stored.
+
+translationCache.cacheSize: Integer
+
+    The size (in MB) of the translation cache. The least recently used
+    vistrails are removed when it gets bigger.
+
+translationCache.enabled: Boolean
+
+    Store the vistrails that were saved with an older schema once they
+    are translated, so that opening the same file again doesn't have to
+    translate it.
+
 upgradeDelay: Boolean
 
     Persist upgrade only after other changes.
@@ -637,8 +727,21 @@ base_config = {
     [ConfigField('autoSave', True, bool, ConfigType.ON_OFF),
      ConfigField('dbDefault', False, bool, ConfigType.ON_OFF),
      ConfigField('cache', True, bool, ConfigType.ON_OFF),
+     ConfigField('cacheMaxModules', 0, int),
+     ConfigField('cacheMaxSize', 0, int),
+     ConfigField('cacheEviction', 'lru', str, widget_type="combo",
+                 widget_options={"allowed_values": ["lru", "lfu"],
+                                 "remap": {"lru": "Least Recently Used",
+                                           "lfu": "Least Frequently Used"}}),
      ConfigField('stopOnError', True, bool, ConfigType.ON_OFF),
      ConfigField('executionLog', True, bool, ConfigType.ON_OFF),
+     ConfigField('executionScheduler', 'serial', str, widget_type="combo",
+                 widget_options={"allowed_values": ["serial", "thread",
+                                                    "process"],
+                                 "remap": {"serial": "Serial",
+                                           "thread": "Threads",
+                                           "process": "Processes"}}),
+     ConfigField('executionWorkers', 0, int),
      ConfigField('errorLog', True, bool, ConfigType.ON_OFF),
      ConfigField('defaultFileType', system.vistrails_default_file_type(), str,
                  widget_type="combo",
@@ -701,6 +804,7 @@ base_config = {
      ConfigField('installBundles', True, bool, ConfigType.ON_OFF),
      ConfigField('installBundlesWithPip', False, bool, ConfigType.ON_OFF,
                  depends_on="installBundles"),
+     ConfigField('lazyPackages', False, bool, ConfigType.ON_OFF),
      ConfigField('repositoryLocalPath', None, ConfigPath),
      ConfigField('repositoryHTTPURL', "http://www.vistrails.org/packages",
                  ConfigURL)],
@@ -716,7 +820,18 @@ base_config = {
      ConfigField('temporaryDir', None,  ConfigPath)],
     "Advanced":
     [ConfigField('singleInstance', True, bool, ConfigType.ON_OFF),
-     ConfigField('staticRegistry', None, ConfigPath)],
+     ConfigField('staticRegistry', None, ConfigPath),
+     ConfigFieldParent('resultCache',
+        [ConfigField('enabled', False, bool, ConfigType.ON_OFF),
+         ConfigField('backend', "directory", str, widget_type="combo",
+                     widget_options={"allowed_values": ["directory",
+                                                        "sqlite"]}),
+         ConfigField('cacheDir', "results", ConfigPath),
+         ConfigField('cacheSize', 1024, int)]),
+     ConfigFieldParent('translationCache',
+        [ConfigField('enabled', True, bool, ConfigType.ON_OFF),
+         ConfigField('cacheDir', "translations", ConfigPath),
+         ConfigField('cacheSize', 200, int)])],
     "Web Sharing":
     [ConfigField('webRepositoryURL', "http://www.crowdlabs.org", ConfigURL),
      ConfigField('webRepositoryUser', None, str)],
@@ -1283,7 +1398,7 @@ class ConfigurationObject(DBConfiguration):
                 raise AttributeError(name)
 
     def __setattr__(self, name, value):
-        if name == '_subscribers' or name == '_unset_keys' or name == '_in_init' or name == 'is_dirty' or name == 'vistrails' or self._in_init:
+        if name == '_subscribers' or name == '_unset_keys' or name == '_in_init' or name == 'is_dirty' or name == 'vistrails' or name.startswith('_db_') or self._in_init:
             object.__setattr__(self, name, value)
         else:
             if name in self.db_config_keys_name_index:
@@ -54,7 +54,22 @@ import vistrails.db
 
 
 ################################################################################
-    
+
+def enable_workflow_packages(vistrail, version):
+    """Initializes the packages a workflow uses, in lazy mode.
+
+    When packages are loaded lazily (see the lazyPackages setting), only
+    the required ones are initialized at startup; this enables the ones
+    used by the modules of the workflow, with their dependencies. Packages
+    only needed by subworkflows get enabled when the pipeline is validated.
+    """
+    pm = vistrails.core.packagemanager.get_package_manager()
+    if not pm.deferred_package_list():
+        return
+    pipeline = vistrail.getPipeline(version)
+    pm.enable_packages(set(module.package
+                           for module in pipeline.module_list))
+
 def run_and_get_results(w_list, parameters='', output_dir=None, 
                         update_vistrail=True, extra_info=None, 
                         reason='Console Mode Execution'):
@@ -82,6 +97,7 @@ def run_and_get_results(w_list, parameters='', output_dir=None,
         else:
             msg = "Invalid version tag or number: %s" % workflow
             raise VistrailsInternalError(msg)
+        enable_workflow_packages(v, version)
         controller.change_selected_version(version)
         
         for e in elements:
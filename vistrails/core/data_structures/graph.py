@@ -294,8 +294,13 @@ class Graph(object):
         for (v_from, e_id) in self.inverse_adjacency_list[old_vertex][:]:
             self.change_edge(v_from, old_vertex, new_vertex, e_id, e_id)
 
+        for (v_to, e_id) in self.adjacency_list[old_vertex]:
+            edges_to = self.inverse_adjacency_list[v_to]
+            edges_to[edges_to.index((old_vertex, e_id))] = (new_vertex, e_id)
+
         self.adjacency_list[new_vertex] = self.adjacency_list[old_vertex]
         del self.adjacency_list[old_vertex]
+        del self.inverse_adjacency_list[old_vertex]
         del self.vertices[old_vertex]
        
     def change_edge(self, old_froom, old_to, new_to, old_id=None, new_id=None):
@@ -1014,6 +1019,8 @@ class TestGraph(unittest.TestCase):
         g.rename_vertex(1, 11)
         assert g.get_edge(0, 1) is None
         assert g.get_edge(0, 11) is not None
+        assert g.parent(2) == 11
+        assert 1 not in g.inverse_adjacency_list
         g.rename_vertex(11, 1)
         assert g.get_edge(0, 1) is not None
         assert g.get_edge(0, 11) is None
@@ -185,6 +185,9 @@ class XMLFileLocator(_XMLFileLocator, CoreLocator):
                                                          locator)
 
 #    def update_from_gui(self, parent_widget, klass=None):
+        if self._db_type == 'sqlite':
+            # no credentials to ask for
+            return True
 #        from core.vistrail.vistrail import Vistrail
 #        if klass is None:
 #            klass = Vistrail
@@ -291,6 +294,9 @@ class DBLocator(_DBLocator, CoreLocator):
         return False
     
     def update_from_console(self):
+        if self._db_type == 'sqlite':
+            # no credentials to ask for
+            return True
         config = self.find_connection_info(self._host, self._port, self._db)
         
         if config is None:
@@ -433,7 +439,8 @@ class DBLocator(_DBLocator, CoreLocator):
     def __eq__(self, other):
         if type(other) != type(self):
             return False
-        return (self._host == other._host and
+        return (self._db_type == other._db_type and
+                self._host == other._host and
                 self._port == other._port and
                 self._db == other._db and
                 self._user == other._user and
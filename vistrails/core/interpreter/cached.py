@@ -38,19 +38,25 @@ import copy
 import gc
 import cPickle as pickle
 
+from vistrails.core.cache.persistent import get_result_store
+from vistrails.core.cache.policy import CachePolicy, CacheStatistics, \
+    estimate_outputs_size
 from vistrails.core.common import InstanceObject, VistrailsInternalError
 from vistrails.core.data_structures.bijectivedict import Bidict
 from vistrails.core import debug
 import vistrails.core.interpreter.base
 from vistrails.core.interpreter.base import AbortExecution
+from vistrails.core.interpreter.scheduler import SynchronizedLogging, \
+    get_scheduler
 import vistrails.core.interpreter.utils
+from vistrails.core.configuration import get_vistrails_configuration
 from vistrails.core.log.controller import DummyLogController
 from vistrails.core.modules.basic_modules import identifier as basic_pkg, \
                                                  Generator
 from vistrails.core.modules.module_registry import get_module_registry
 from vistrails.core.modules.vistrails_module import ModuleBreakpoint, \
     ModuleConnector, ModuleError, ModuleErrors, ModuleHadError, \
-    ModuleSuspended, ModuleWasSuspended
+    ModuleSuspended, ModuleWasSuspended, PersistentCacheable
 from vistrails.core.utils import DummyView
 import vistrails.core.system
 import vistrails.core.vistrail.pipeline
@@ -210,6 +216,29 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         self._objects = {}
         self.filePool = self._file_pool
         self._streams = []
+        self._scheduler = None
+        self._cache_policy = CachePolicy()
+        self._cache_statistics = CacheStatistics()
+
+    def set_scheduler(self, scheduler):
+        """set_scheduler(scheduler: ParallelScheduler) -> None
+
+        Sets the scheduler used to execute pipelines. If None (the default),
+        the scheduler is built from the configuration.
+
+        """
+        self._scheduler = scheduler
+
+    def get_scheduler(self):
+        """get_scheduler() -> ParallelScheduler or None
+
+        Returns the scheduler used to execute pipelines, or None if modules
+        are to be updated depth-first from the sinks.
+
+        """
+        if self._scheduler is not None:
+            return self._scheduler
+        return get_scheduler(get_vistrails_configuration())
 
     def clear(self):
         self._file_pool.cleanup()
@@ -217,6 +246,7 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         for obj in self._objects.itervalues():
             obj.clear()
         self._objects = {}
+        self._cache_policy.clear()
 
     def __del__(self):
         self.clear()
@@ -235,6 +265,34 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
         for v in dependencies:
             self._persistent_pipeline.delete_module(v)
             del self._objects[v]
+            self._cache_policy.remove(v)
+
+    def get_cache_statistics(self):
+        """get_cache_statistics() -> dict
+
+        Returns the hit, miss and eviction counters of the module cache, along
+        with its current number of modules and estimated size in bytes.
+
+        """
+        stats = self._cache_statistics.as_dict()
+        stats['modules'] = len(self._objects)
+        stats['size'] = self._cache_policy.total_size()
+        return stats
+
+    def enforce_cache_budget(self):
+        """enforce_cache_budget() -> None
+
+        Evicts modules until the cache is within the limits set in the
+        configuration. Evicting a module also evicts all the modules that
+        depend on it, since their cached results are no longer valid.
+
+        """
+        policy = self._cache_policy
+        policy.configure(get_vistrails_configuration())
+        while self._objects and policy.over_budget(len(self._objects)):
+            nb_modules = len(self._objects)
+            self.clean_modules([policy.victim(self._objects.iterkeys())])
+            self._cache_statistics.evictions += nb_modules - len(self._objects)
 
     def clean_non_cacheable_modules(self):
         """clean_non_cacheable_modules() -> None
@@ -258,6 +316,72 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
                    if mod.module_descriptor.identifier == identifier]
         self.clean_modules(modules)
 
+    def get_result_store(self):
+        """get_result_store() -> ResultStore or None
+
+        Returns the persistent result store, if enabled in the configuration.
+
+        """
+        return get_result_store()
+
+    def _upstream_cacheable(self, persistent_id, memo):
+        """Checks that a module and all its upstream modules are cacheable.
+        """
+        if persistent_id not in memo:
+            memo[persistent_id] = False # guards against cycles
+            g = self._persistent_pipeline.graph
+            memo[persistent_id] = (
+                    self._objects[persistent_id].is_cacheable() and
+                    all(self._upstream_cacheable(u, memo)
+                        for u, _ in g.edges_to(persistent_id)))
+        return memo[persistent_id]
+
+    def restore_result(self, store, obj, memo):
+        """restore_result(store: ResultStore, obj: Module, memo: dict) -> bool
+
+        Sets the outputs of a module from the persistent result store, if
+        it has been stored there before. Returns whether it was found.
+
+        """
+        if (not isinstance(obj, PersistentCacheable) or
+                not self._upstream_cacheable(obj.id, memo)):
+            return False
+        data = store.get(obj.signature)
+        if data is None:
+            return False
+        try:
+            obj.deserialize_outputs(data)
+        except Exception, e:
+            debug.warning("Could not restore the cached result of module %s" %
+                          obj.__class__.__name__, e)
+            store.remove(obj.signature)
+            return False
+        obj.upToDate = True
+        obj.restored_from_cache = True
+        return True
+
+    def store_result(self, store, obj, memo):
+        """store_result(store: ResultStore, obj: Module, memo: dict) -> None
+
+        Adds the outputs of a module that just executed to the persistent
+        result store.
+
+        """
+        if (not isinstance(obj, PersistentCacheable) or
+                obj.restored_from_cache or
+                not self._upstream_cacheable(obj.id, memo)):
+            return
+        try:
+            data = obj.serialize_outputs()
+        except Exception, e:
+            debug.warning("Could not store the result of module %s" %
+                          obj.__class__.__name__, e)
+            return
+        try:
+            store.put(obj.signature, data)
+        except Exception, e:
+            debug.warning("Could not write to the result cache", e)
+
     def make_connection(self, conn, src, dst):
         """make_connection(self, conn, src, dst)
         Builds a execution-time connection between modules.
@@ -351,6 +475,13 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
          module_added_set,
          conn_added_set) = self.add_to_persistent_pipeline(pipeline)
 
+        for i, persistent_id in tmp_to_persistent_module_map.iteritems():
+            self._cache_policy.use(persistent_id)
+            if i in module_added_set:
+                self._cache_statistics.misses += 1
+            else:
+                self._cache_statistics.hits += 1
+
         # Create the new objects
         for i in module_added_set:
             persistent_id = tmp_to_persistent_module_map[i]
@@ -421,6 +552,16 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
             dst = self._objects[conn.destinationId]
             self.make_connection(conn, src, dst)
 
+        # Restore results from the persistent result store
+        store = self.get_result_store()
+        if store is not None:
+            memo = {}
+            for i in module_added_set:
+                persistent_id = tmp_to_persistent_module_map[i]
+                if persistent_id not in to_delete:
+                    self.restore_result(store, self._objects[persistent_id],
+                                        memo)
+
         if self.done_summon_hook:
             self.done_summon_hook(self._persistent_pipeline, self._objects)
         for callable_ in done_summon_hooks:
@@ -507,25 +648,24 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
             persistent_sinks = [tmp_id_to_module_map[sink]
                                 for sink in pipeline.graph.sinks()]
 
-        self._streams.append(Generator.generators)
-        Generator.generators = []
+        def update_module(obj):
+            """Updates a module and reports errors.
 
-        # Update new sinks
-        for obj in persistent_sinks:
+            Returns a pair (success, stop) indicating whether the module
+            could be updated and whether execution should stop.
+            """
             abort = False
             try:
                 obj.update()
-                continue
+                return True, False
             except ModuleWasSuspended:
-                continue
+                return False, False
             except ModuleHadError:
                 pass
-            except AbortExecution:
-                break
             except ModuleSuspended, ms:
                 ms.module.logging.end_update(ms.module, ms,
                                              was_suspended=True)
-                continue
+                return False, False
             except ModuleErrors, mes:
                 for me in mes.module_errors:
                     me.module.logging.end_update(me.module, me)
@@ -539,8 +679,42 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
                 mb.module.logging.end_update(mb.module)
                 logging_obj.signalError(mb.module, mb)
                 abort = True
-            if stop_on_error or abort:
-                break
+            return False, stop_on_error or abort
+
+        # Nested pipelines (e.g. Groups) are always executed depth-first
+        scheduler = None
+        if not self._streams:
+            scheduler = self.get_scheduler()
+
+        self._streams.append(Generator.generators)
+        Generator.generators = []
+
+        if scheduler is not None:
+            # Update the modules concurrently, as their dependencies are done
+            locked_logging = SynchronizedLogging(logging_obj)
+            for obj in tmp_id_to_module_map.itervalues():
+                obj.logging = locked_logging
+            if sinks is not None:
+                sink_ids = [sink for sink in sinks
+                            if sink in tmp_id_to_module_map]
+            else:
+                sink_ids = pipeline.graph.sinks()
+            try:
+                scheduler.run(pipeline.graph, tmp_id_to_module_map,
+                              sink_ids, update_module)
+            except AbortExecution:
+                pass
+            for obj in tmp_id_to_module_map.itervalues():
+                obj.logging = logging_obj
+        else:
+            # Update new sinks
+            for obj in persistent_sinks:
+                try:
+                    success, stop = update_module(obj)
+                except AbortExecution:
+                    break
+                if stop:
+                    break
 
         # execute all generators until inputs are exhausted
         # this makes sure branching and multiple sinks are executed correctly
@@ -577,6 +751,15 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
 
         Generator.generators = self._streams.pop()
 
+        # Add new results to the persistent result store
+        store = self.get_result_store()
+        if store is not None:
+            memo = {}
+            for obj in set(tmp_id_to_module_map.itervalues()):
+                if (obj.id in logging_obj.executed and
+                        obj.id not in logging_obj.errors):
+                    self.store_result(store, obj, memo)
+
         if self.done_update_hook:
             self.done_update_hook(self._persistent_pipeline, self._objects)
                 
@@ -627,6 +810,13 @@ class CachedInterpreter(vistrails.core.interpreter.base.BaseInterpreter):
 
         self.clean_modules(to_delete)
 
+        # Account for the size of the new results and evict old modules
+        for tmp_id, obj in objs.iteritems():
+            if execs.get(tmp_id) and obj.id in self._objects:
+                self._cache_policy.set_size(obj.id,
+                                            estimate_outputs_size(obj))
+        self.enforce_cache_budget()
+
         def dict2set(s):
             return set(k for k, v in s.iteritems() if v)
         if view is not None:
@@ -928,6 +1118,127 @@ class TestCachedInterpreter(unittest.TestCase):
         finally:
             StandardOutput.compute = old_compute
 
+    def run_parallel(self, mode):
+        """Runs independent branches with a parallel scheduler."""
+        from vistrails.core.interpreter.noncached import Interpreter
+        from vistrails.core.interpreter.scheduler import ParallelScheduler
+        from vistrails.core.modules.basic_modules import PythonSource
+        from vistrails.tests.utils import execute, intercept_result
+        import time
+        import urllib
+
+        source = urllib.quote('# pragma: thread-safe\n'
+                              'import time\n'
+                              'time.sleep(0.5)\n'
+                              'r = 42\n')
+        interpreter = Interpreter.get()
+        interpreter.set_scheduler(ParallelScheduler(mode, 4))
+        try:
+            start = time.time()
+            with intercept_result(PythonSource, 'r') as results:
+                self.assertFalse(execute(
+                        [('PythonSource', 'org.vistrails.vistrails.basic', [
+                            ('source', [('String', source)]),
+                            ('value', [('Integer', str(i))])])
+                         for i in xrange(4)],
+                        [],
+                        add_port_specs=[
+                            (i, 'input', 'value',
+                             'org.vistrails.vistrails.basic:Integer')
+                            for i in xrange(4)] + [
+                            (i, 'output', 'r',
+                             'org.vistrails.vistrails.basic:Integer')
+                            for i in xrange(4)]))
+            self.assertLess(time.time() - start, 1.5)
+            self.assertEqual(results, [42] * 4)
+        finally:
+            interpreter.set_scheduler(None)
+
+    def test_result_store(self):
+        from vistrails.core.cache.persistent import DirectoryResultStore
+        from vistrails.core.interpreter.noncached import Interpreter
+        from vistrails.core.modules.vistrails_module import Module
+        from vistrails.tests.utils import execute
+        import shutil
+        import tempfile
+
+        computed = []
+        class CachedSquare(PersistentCacheable, Module):
+            def compute(self):
+                computed.append(self.get_input('value'))
+                self.set_output('value', self.get_input('value') ** 2)
+
+        results = []
+        class Collect(Module):
+            def compute(self):
+                results.append(self.get_input('value'))
+
+        reg = get_module_registry()
+        version = reg.get_package_by_name(basic_pkg).version
+        reg.add_module(CachedSquare, package=basic_pkg,
+                       package_version=version)
+        reg.add_input_port(CachedSquare, 'value', 'basic:Integer')
+        reg.add_output_port(CachedSquare, 'value', 'basic:Integer')
+        reg.add_module(Collect, package=basic_pkg, package_version=version)
+        reg.add_input_port(Collect, 'value', 'basic:Integer')
+        directory = tempfile.mkdtemp(prefix='vt_results_')
+        store = DirectoryResultStore(directory)
+        interpreter = Interpreter.get()
+        old_get_result_store = interpreter.get_result_store
+        interpreter.get_result_store = lambda: store
+        try:
+            for i in xrange(2):
+                # The non-cached interpreter forgets everything between
+                # executions, so the second run has to use the store
+                self.assertFalse(execute([
+                        ('CachedSquare', basic_pkg, [
+                            ('value', [('Integer', '7')])]),
+                        ('Collect', basic_pkg, []),
+                    ],
+                    [(0, 'value', 1, 'value')]))
+            self.assertEqual(computed, [7])
+            self.assertEqual(results, [49, 49])
+            self.assertEqual(store.hits, 1)
+        finally:
+            interpreter.get_result_store = old_get_result_store
+            reg.delete_module(basic_pkg, 'Collect')
+            reg.delete_module(basic_pkg, 'CachedSquare')
+            shutil.rmtree(directory)
+
+    def test_cache_budget(self):
+        from vistrails.core.configuration import get_vistrails_configuration
+        from vistrails.core.interpreter.noncached import Interpreter
+        from vistrails.tests.utils import execute
+
+        conf = get_vistrails_configuration()
+        old_max_modules = conf.cacheMaxModules
+        conf.cacheMaxModules = 2
+        interpreter = Interpreter.get()
+        stats = interpreter.get_cache_statistics()
+        try:
+            self.assertFalse(execute([
+                    ('Integer', basic_pkg, [('value', [('Integer', '2')])]),
+                    ('List', basic_pkg, []),
+                    ('List', basic_pkg, []),
+                ],
+                [(0, 'value', 1, 'head'),
+                 (1, 'value', 2, 'head')]))
+            # Evicting a module evicts the modules downstream of it
+            self.assertLessEqual(len(interpreter._objects), 2)
+            new_stats = interpreter.get_cache_statistics()
+            self.assertEqual(new_stats['misses'] - stats['misses'], 3)
+            self.assertGreaterEqual(
+                    new_stats['evictions'] - stats['evictions'], 1)
+            self.assertEqual(new_stats['modules'], len(interpreter._objects))
+        finally:
+            conf.cacheMaxModules = old_max_modules
+
+    def test_parallel_threads(self):
+        self.run_parallel('thread')
+
+    def test_parallel_processes(self):
+        self.run_parallel('process')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,480 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+
+"""Parallel scheduling of the modules of a pipeline.
+
+The default execution model of the interpreter is demand-driven: each sink
+is updated in turn, and Module.update_upstream() recurses depth-first. This
+means that independent branches of a pipeline never run at the same time.
+
+The ParallelScheduler in this module works from the pipeline graph instead:
+it dispatches every module whose upstream modules are done, so that
+independent branches can run concurrently. Only modules that declare
+themselves thread-safe (see Module.is_thread_safe() and the ThreadSafe mixin)
+are dispatched to the workers; every other module runs on the calling
+thread, in dependency order.
+
+Two kinds of workers are available:
+
+  'thread': modules are updated in a pool of threads. This is useful for
+  modules that release the GIL, e.g. modules running external processes or
+  numerical libraries.
+
+  'process': modules are updated in a pool of threads, but their compute()
+  method runs in a forked child process. Output values are sent back to the
+  interpreter and must therefore be picklable; if they are not, the module
+  is computed again on the calling thread. This requires os.fork(), so it
+  falls back to 'thread' on platforms where it is not available.
+"""
+
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import os
+import Queue
+import threading
+import types
+
+from vistrails.core import debug
+from vistrails.core.interpreter.base import AbortExecution
+from vistrails.core.modules.vistrails_module import ModuleError, \
+    ModuleSuspended, Streaming
+from vistrails.core.vistrail.module_control_param import ModuleControlParam
+
+
+SCHEDULER_MODES = ['serial', 'thread', 'process']
+
+###############################################################################
+
+class SynchronizedLogging(object):
+    """Wraps a logging controller so that it can be called from several
+    threads.
+
+    """
+    def __init__(self, logging_obj, lock=None):
+        self._logging_obj = logging_obj
+        if lock is None:
+            lock = threading.RLock()
+        self._lock = lock
+
+    def __getattr__(self, name):
+        attr = getattr(self._logging_obj, name)
+        if not isinstance(attr, types.MethodType):
+            return attr
+        lock = self._lock
+        def synchronized(*args, **kwargs):
+            with lock:
+                result = attr(*args, **kwargs)
+            # Loop objects returned by begin_loop_execution() need locking too
+            if name == 'begin_loop_execution':
+                result = SynchronizedLogging(result, lock)
+            return result
+        return synchronized
+
+###############################################################################
+
+class ForkedCompute(object):
+    """Replaces the compute() method of a module instance so that it runs in
+    a forked child process.
+
+    """
+    def __init__(self, module):
+        self.module = module
+
+    @staticmethod
+    def _run_in_child(module, conn):
+        try:
+            type(module).compute(module)
+        except ModuleSuspended, e:
+            result = ('suspended', e.msg)
+        except ModuleError, e:
+            result = ('error', e.msg)
+        except Exception, e:
+            result = ('error', debug.format_exception(e))
+        else:
+            result = ('ok', dict((k, v)
+                                 for k, v in module.outputPorts.iteritems()
+                                 if k != 'self'))
+        try:
+            conn.send(result)
+        except Exception, e:
+            # Most likely the outputs are not picklable
+            conn.send(('unpicklable', debug.format_exception(e)))
+        conn.close()
+
+    def __call__(self):
+        module = self.module
+        parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=self._run_in_child,
+                                          args=(module, child_conn))
+        process.start()
+        child_conn.close()
+        try:
+            result = parent_conn.recv()
+        except EOFError:
+            result = ('error', "Child process exited with code %s" %
+                      process.exitcode)
+        finally:
+            parent_conn.close()
+            process.join()
+
+        if result[0] == 'ok':
+            for port_name, value in result[1].iteritems():
+                module.set_output(port_name, value)
+        elif result[0] == 'suspended':
+            raise ModuleSuspended(module, result[1])
+        elif result[0] == 'error':
+            raise ModuleError(module, result[1])
+        else:
+            debug.warning("Outputs of module %s can't be sent back from the "
+                          "child process, computing it again locally" %
+                          module.__class__.__name__,
+                          result[1])
+            type(module).compute(module)
+
+###############################################################################
+
+class ParallelScheduler(object):
+    """Executes the modules of a pipeline as their dependencies get done.
+
+    """
+    def __init__(self, mode='thread', workers=None):
+        if mode not in ('thread', 'process'):
+            raise ValueError("Unknown scheduler mode %r" % mode)
+        if mode == 'process' and not hasattr(os, 'fork'):
+            debug.warning("Process scheduler requires os.fork(), using "
+                          "threads instead")
+            mode = 'thread'
+        if not workers:
+            try:
+                workers = multiprocessing.cpu_count()
+            except NotImplementedError:
+                workers = 1
+        self.mode = mode
+        self.workers = workers
+
+    def can_dispatch(self, obj):
+        """can_dispatch(obj: Module) -> bool
+
+        Whether a module may be updated by a worker. Modules that are
+        already computed, that take part in streaming or that are not
+        thread-safe are updated on the calling thread.
+
+        """
+        if obj.computed or obj.upToDate:
+            return False
+        if isinstance(obj, Streaming):
+            return False
+        try:
+            if not obj.is_thread_safe():
+                return False
+        except Exception:
+            return False
+        obj.set_streamed_ports()
+        return not obj.streamed_ports
+
+    def can_fork(self, obj):
+        """can_fork(obj: Module) -> bool
+
+        Whether compute() can run in a child process. Modules that iterate
+        need to copy themselves and are computed in a thread instead.
+
+        """
+        return (self.mode == 'process' and
+                obj.list_depth == 0 and
+                ModuleControlParam.WHILE_COND_KEY not in obj.control_params and
+                ModuleControlParam.WHILE_MAX_KEY not in obj.control_params)
+
+    def _dependencies(self, graph, module_map, sinks):
+        """Finds the modules needed to update the sinks.
+
+        Returns a dict mapping each object to the set of objects it depends
+        on. Several pipeline modules might map to the same object.
+        """
+        deps = {}
+        to_visit = list(sinks)
+        visited = set()
+        while to_visit:
+            v = to_visit.pop()
+            if v in visited:
+                continue
+            visited.add(v)
+            obj = module_map[v]
+            upstream = deps.setdefault(obj, set())
+            if obj.restored_from_cache:
+                # Upstream modules are not needed
+                continue
+            for (u, _) in graph.edges_to(v):
+                if module_map[u] is not obj:
+                    upstream.add(module_map[u])
+                to_visit.append(u)
+        return deps
+
+    def _update(self, obj, update_module):
+        """Runs update_module(obj) on a worker, forking compute() if needed.
+        """
+        forked = self.can_fork(obj)
+        if forked:
+            obj.compute = ForkedCompute(obj)
+        try:
+            return update_module(obj)
+        except AbortExecution:
+            return False, True
+        except Exception, e:
+            debug.unexpected_exception(e)
+            return False, True
+        finally:
+            if forked:
+                del obj.compute
+
+    def run(self, graph, module_map, sinks, update_module):
+        """run(graph: Graph, module_map: dict, sinks: list,
+               update_module: callable) -> None
+
+        Updates the modules needed by the given sinks. graph is the pipeline
+        graph, module_map maps its vertices to the module instances, and
+        update_module(obj) updates a single module, returning a pair of
+        booleans (success, stop): modules downstream of an unsuccessful
+        module are not updated, and no module is dispatched after stop is
+        set. AbortExecution is propagated.
+
+        """
+        deps = self._dependencies(graph, module_map, sinks)
+        dependents = dict((obj, set()) for obj in deps)
+        for obj, upstream in deps.iteritems():
+            for u in upstream:
+                dependents[u].add(obj)
+        waiting = dict((obj, len(upstream))
+                       for obj, upstream in deps.iteritems())
+        ready = sorted((obj for obj, n in waiting.iteritems() if n == 0),
+                       key=lambda o: o.id)
+
+        done = Queue.Queue()
+        running = [0]
+        stopping = [False]
+        aborted = [False]
+
+        def skip(obj):
+            # Downstream modules of a failed module are never updated
+            to_skip = [obj]
+            while to_skip:
+                o = to_skip.pop()
+                for d in dependents[o]:
+                    if waiting.pop(d, None) is not None:
+                        to_skip.append(d)
+
+        def finished(obj, result):
+            success, stop = result
+            if stop:
+                stopping[0] = True
+            if not success:
+                skip(obj)
+                return
+            for d in sorted(dependents[obj], key=lambda o: o.id):
+                if d in waiting:
+                    waiting[d] -= 1
+                    if waiting[d] == 0:
+                        ready.append(d)
+
+        def make_callback(obj):
+            return lambda result: done.put((obj, result))
+
+        pool = ThreadPool(self.workers)
+        try:
+            while True:
+                local = []
+                while ready and not stopping[0]:
+                    obj = ready.pop(0)
+                    waiting.pop(obj, None)
+                    if self.can_dispatch(obj):
+                        running[0] += 1
+                        pool.apply_async(self._update,
+                                         (obj, update_module),
+                                         callback=make_callback(obj))
+                    else:
+                        local.append(obj)
+                if local:
+                    # Run a single local module, then dispatch again
+                    obj = local.pop(0)
+                    ready[0:0] = local
+                    try:
+                        result = update_module(obj)
+                    except AbortExecution:
+                        aborted[0] = True
+                        result = (False, True)
+                    finished(obj, result)
+                    continue
+                if running[0] == 0:
+                    break
+                obj, result = done.get()
+                running[0] -= 1
+                finished(obj, result)
+        finally:
+            pool.close()
+            pool.join()
+        if aborted[0]:
+            raise AbortExecution("Execution aborted")
+
+###############################################################################
+
+def get_scheduler(configuration):
+    """get_scheduler(configuration: ConfigurationObject)
+         -> ParallelScheduler or None
+
+    Builds the scheduler selected by the 'executionScheduler' and
+    'executionWorkers' configuration fields, or returns None for the default
+    depth-first execution.
+
+    """
+    if configuration is None:
+        return None
+    mode = getattr(configuration, 'executionScheduler', 'serial')
+    if not mode or mode == 'serial':
+        return None
+    if mode not in SCHEDULER_MODES:
+        debug.warning("Unknown executionScheduler %r, using serial "
+                      "execution" % mode)
+        return None
+    workers = getattr(configuration, 'executionWorkers', 0)
+    return ParallelScheduler(mode, workers)
+
+###############################################################################
+
+import unittest
+import time
+
+
+class TestParallelScheduler(unittest.TestCase):
+    class FakeGraph(object):
+        def __init__(self, edges):
+            self.edges = edges
+        def edges_to(self, v):
+            return [(u, None) for (u, w) in self.edges if w == v]
+
+    class FakeModule(object):
+        def __init__(self, id, thread_safe=True, delay=0.0, fail=False):
+            self.id = id
+            self.thread_safe = thread_safe
+            self.delay = delay
+            self.fail = fail
+            self.computed = False
+            self.upToDate = False
+            self.restored_from_cache = False
+            self.list_depth = 0
+            self.control_params = {}
+            self.streamed_ports = {}
+        def is_thread_safe(self):
+            return self.thread_safe
+        def set_streamed_ports(self):
+            pass
+
+    def run_scheduler(self, modules, edges, sinks, **kwargs):
+        log = []
+        lock = threading.Lock()
+        def update_module(obj):
+            with lock:
+                log.append(('begin', obj.id))
+            time.sleep(obj.delay)
+            with lock:
+                log.append(('end', obj.id))
+            obj.computed = True
+            return not obj.fail, False
+        scheduler = ParallelScheduler('thread', kwargs.pop('workers', 4))
+        scheduler.run(self.FakeGraph(edges), modules, sinks, update_module,
+                      **kwargs)
+        return log
+
+    def test_dependencies_respected(self):
+        modules = dict((i, self.FakeModule(i)) for i in xrange(4))
+        edges = [(0, 1), (0, 2), (1, 3), (2, 3)]
+        log = self.run_scheduler(modules, edges, [3])
+        self.assertEqual(len(log), 8)
+        index = dict((e, i) for i, e in enumerate(log))
+        for u, v in edges:
+            self.assertLess(index[('end', u)], index[('begin', v)])
+
+    def test_concurrent_branches(self):
+        modules = dict((i, self.FakeModule(i, delay=0.2)) for i in xrange(4))
+        start = time.time()
+        self.run_scheduler(modules, [], range(4))
+        self.assertLess(time.time() - start, 0.6)
+
+    def test_not_thread_safe(self):
+        modules = dict((i, self.FakeModule(i, thread_safe=False, delay=0.05))
+                       for i in xrange(3))
+        log = self.run_scheduler(modules, [], range(3))
+        # Serial execution: each module ends before the next one begins
+        self.assertEqual([e for e, _ in log], ['begin', 'end'] * 3)
+
+    def test_error_skips_downstream(self):
+        modules = dict((i, self.FakeModule(i)) for i in xrange(4))
+        modules[1].fail = True
+        edges = [(0, 1), (1, 2), (0, 3)]
+        log = self.run_scheduler(modules, edges, [2, 3])
+        ran = set(i for e, i in log if e == 'begin')
+        self.assertEqual(ran, set([0, 1, 3]))
+
+    def test_shared_objects(self):
+        # Two pipeline modules mapped to the same persistent module
+        shared = self.FakeModule(0)
+        modules = {0: shared, 1: shared, 2: self.FakeModule(2)}
+        log = self.run_scheduler(modules, [(0, 2), (1, 2)], [2])
+        self.assertEqual(log.count(('begin', 0)), 1)
+
+    def test_synchronized_logging(self):
+        class Logger(object):
+            def begin_loop_execution(self):
+                return self
+            def end_iteration(self, i):
+                return i
+        logging = SynchronizedLogging(Logger())
+        loop = logging.begin_loop_execution()
+        self.assertIsInstance(loop, SynchronizedLogging)
+        self.assertEqual(loop.end_iteration(3), 3)
+
+    def test_get_scheduler(self):
+        from vistrails.core.configuration import ConfigurationObject
+        conf = ConfigurationObject(executionScheduler='serial',
+                                   executionWorkers=0)
+        self.assertIsNone(get_scheduler(conf))
+        conf.executionScheduler = 'thread'
+        conf.executionWorkers = 3
+        scheduler = get_scheduler(conf)
+        self.assertEqual(scheduler.mode, 'thread')
+        self.assertEqual(scheduler.workers, 3)
+        self.assertIsNone(get_scheduler(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
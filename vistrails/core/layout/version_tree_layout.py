@@ -37,6 +37,8 @@ Interface Vistrails - TreeLayoutLW to align version trees.
 Originally written by Lauro D. Lins.
 
 """
+import copy
+
 from tree_layout import TreeLW, NodeLW, TreeLayoutLW
 from vistrails.core.data_structures.point import Point
 
@@ -85,6 +87,36 @@ class VistrailsTreeLayoutLW(object):
         self.height = 0.0
         self.scale = 0.0
         self.width = 0.0
+        # widths of the labels, shared with the copies of this layout
+        self._text_widths = {}
+
+    def __copy__(self):
+        cp = VistrailsTreeLayoutLW(self.text_width_f, self.text_height,
+                                   self.text_horizontal_margin,
+                                   self.text_vertical_margin)
+        cp.nodes = self.nodes
+        cp.height = self.height
+        cp.scale = self.scale
+        cp.width = self.width
+        cp._text_widths = self._text_widths
+        return cp
+
+    def __deepcopy__(self, memo):
+        cp = copy.copy(self)
+        cp.nodes = copy.deepcopy(self.nodes, memo)
+        return cp
+
+    def text_width(self, text):
+        """ text_width(text: str) -> float
+        Returns the width of a node with this label, computing it only once
+
+        """
+        try:
+            return self._text_widths[text]
+        except KeyError:
+            width = self.text_horizontal_margin + self.text_width_f(text)
+            self._text_widths[text] = width
+            return width
 
     def generateTreeLW(self, vistrail, graph):
         """ output_vistrail_graph(f: str) -> None
@@ -124,7 +156,7 @@ class VistrailsTreeLayoutLW(object):
                     X.add(first)
 
         # get widths and heights for the nodes
-        empty_width = self.text_horizontal_margin + self.text_width_f(" " * 5)
+        empty_width = self.text_width(" " * 5)
         
         # default height for all nodes
         height = self.text_height + self.text_vertical_margin
@@ -137,8 +169,7 @@ class VistrailsTreeLayoutLW(object):
 
         # add the remaining nodes
         for id, tag in nodes:
-            width = self.text_horizontal_margin + self.text_width_f(tag)
-            width = max(width, empty_width)
+            width = max(self.text_width(tag), empty_width)
             # print "add node to the tree %d %s" % (id, tag)
             mapTreeNodes[id] = tree.addNode(None,width,height,(id,tag))
 
@@ -1032,6 +1032,10 @@ class PythonSource(CodeRunnerMixin, NotCacheable, Module):
 
     If you want a PythonSource execution to be cached, call
     cache_this().
+
+    If the code can safely run concurrently with other modules, add the
+    line "# pragma: thread-safe" so that the parallel scheduler may run it
+    in a worker.
     """
     _settings = ModuleSettings(
         configure_widget=("vistrails.gui.modules.python_source_configure:"
@@ -1039,6 +1043,11 @@ class PythonSource(CodeRunnerMixin, NotCacheable, Module):
     _input_ports = [IPort('source', 'String', optional=True, default="")]
     _output_pors = [OPort('self', 'Module')]
 
+    def is_thread_safe(self):
+        # Magic tag: "# pragma: thread-safe"
+        return ('%23%20pragma%3A%20thread-safe' in
+                self.force_get_input('source', ''))
+
     def compute(self):
         s = urllib.unquote(str(self.get_input('source')))
         self.run_code(s, use_input=True, use_output=True)
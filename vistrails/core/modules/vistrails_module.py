@@ -34,8 +34,15 @@
 ###############################################################################
 from base64 import b16encode, b16decode
 import copy
+import cPickle as pickle
 import json
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import os
+import sys
+import threading
 import time
+import traceback
 from itertools import izip, product
 import warnings
 
@@ -184,6 +191,36 @@ class DummyModuleLogging(object):
 
 _dummy_logging = DummyModuleLogging()
 
+# Iteration modules of the loop running in a process pool; the workers get
+# them when the pool forks
+_process_loop_modules = None
+
+def _compute_loop_iteration(i):
+    """Computes an iteration of Module.compute_all_parallel() in a worker
+    process, returning the outputs or the error.
+
+    """
+    module = _process_loop_modules[i]
+    # the execution is logged by the parent process
+    module.logging = _dummy_logging
+    try:
+        module.update()
+    except ModuleSuspended, e:
+        handle = e.handle
+        try:
+            pickle.dumps(handle)
+        except Exception:
+            handle = None
+        return ('suspended', e.msg, handle)
+    except ModuleError, e:
+        return ('error', e.msg)
+    except Exception, e:
+        return ('error', "Uncaught exception: %s\n%s" % (
+                debug.format_exception(e), traceback.format_exc()))
+    return ('done', dict((port, value)
+                         for port, value in module.outputPorts.iteritems()
+                         if port != 'self'))
+
 ################################################################################
 # Serializable
 
@@ -332,6 +369,10 @@ class Module(Serializable):
         # execution log
         self.annotate_output = False
 
+        # stores whether the outputs were restored from the persistent
+        # result cache, in which case upstream modules are not updated
+        self.restored_from_cache = False
+
     def transfer_attrs(self, module):
         if module.cache != 1:
             self.is_cacheable = lambda *args: False
@@ -391,6 +432,16 @@ class Module(Serializable):
         """
         return True
 
+    def is_thread_safe(self):
+        """is_thread_safe() -> bool.
+        A Module should return whether it can be updated concurrently with
+        other modules, from a thread other than the main one. This is used
+        by the parallel scheduler; modules that are not thread-safe are
+        always updated from the interpreter's thread.
+
+        """
+        return False
+
     def update_upstream_port(self, port_name):
         """Updates upstream of a single port instead of all ports."""
 
@@ -563,7 +614,7 @@ class Module(Serializable):
         elif self.computed:
             return
         self.logging.begin_update(self)
-        if not self.setJobCache():
+        if not self.restored_from_cache and not self.setJobCache():
             self.update_upstream()
         if self.upToDate:
             if not self.computed:
@@ -652,6 +703,50 @@ class Module(Serializable):
             return self.control_params[ModuleControlParam.LOOP_KEY]
         return default
 
+    def get_loop_parallelism(self):
+        """get_loop_parallelism() -> (kind, size) or None
+
+        Reads the LOOP_PARALLEL_KEY control parameter, e.g. 'threads' or
+        'processes:4'. The size defaults to the number of CPUs.
+
+        """
+        value = self.control_params.get(ModuleControlParam.LOOP_PARALLEL_KEY)
+        if not value:
+            return None
+        kind, _, size = value.partition(':')
+        kind = kind.strip()
+        if kind not in ('threads', 'processes'):
+            raise ModuleError(self, 'Unknown parallel loop type "%s"' % kind)
+        if size.strip():
+            try:
+                size = int(size)
+            except ValueError:
+                raise ModuleError(self, 'Invalid parallel loop size "%s"' %
+                                        size)
+        else:
+            size = multiprocessing.cpu_count()
+        return kind, max(size, 1)
+
+    def make_iteration_module(self, i, port_names, elements):
+        """Makes the copy of this module computed for iteration i of
+        compute_all().
+
+        """
+        module = copy.copy(self)
+        module.list_depth = self.list_depth - 1
+        module.had_error = False
+        module.was_suspended = False
+
+        if not self.upToDate: # pragma: no partial
+            ## Type checking if first iteration and last iteration level
+            if i == 0 and self.list_depth == 1:
+                self.typeChecking(module, port_names, elements)
+
+            module.upToDate = False
+            module.computed = False
+            self.setInputValues(module, port_names, elements[i], i)
+        return module
+
     def compute_all(self):
         """This method executes the module once for each input.
            Similarly to controlflow's fold.
@@ -683,24 +778,16 @@ class Module(Serializable):
 
         elements, port_names = self.do_combine(combine_type, inputs, port_names)
         num_inputs = len(elements)
+        parallel = self.get_loop_parallelism()
         loop = self.logging.begin_loop_execution(self, num_inputs)
+        if parallel is not None and num_inputs > 1:
+            return self.compute_all_parallel(loop, port_names, elements,
+                                             *parallel)
         ## Update everything for each value inside the list
         outputs = {}
         for i in xrange(num_inputs):
             self.logging.update_progress(self, float(i)/num_inputs)
-            module = copy.copy(self)
-            module.list_depth = self.list_depth - 1
-            module.had_error = False
-            module.was_suspended = False
-
-            if not self.upToDate: # pragma: no partial
-                ## Type checking if first iteration and last iteration level
-                if i == 0 and self.list_depth == 1:
-                    self.typeChecking(module, port_names, elements)
-
-                module.upToDate = False
-                module.computed = False
-                self.setInputValues(module, port_names, elements[i], i)
+            module = self.make_iteration_module(i, port_names, elements)
 
             loop.begin_iteration(module, i)
 
@@ -735,6 +822,130 @@ class Module(Serializable):
             self.set_output(nameOutput, outputs[nameOutput])
         loop.end_loop_execution()
 
+    def compute_all_parallel(self, loop, port_names, elements, kind, size):
+        """Runs the iterations of compute_all() in a pool of threads or
+        processes.
+
+        Outputs are collected in iteration order, so the result is the same
+        as with the serial loop. With threads, each iteration is updated as
+        usual, but calls to the log are serialized. With processes, the
+        workers are forked once the iteration modules are ready and only
+        compute them; the log is then updated here as each result comes
+        back, so the iteration is only begun at that point.
+
+        """
+        # scheduler imports this module
+        from vistrails.core.interpreter.scheduler import SynchronizedLogging
+        global _process_loop_modules
+
+        if kind == 'processes' and (not hasattr(os, 'fork') or
+                                    multiprocessing.current_process().daemon):
+            # no fork (the modules can't be sent to the workers), or already
+            # in a worker, which can't have children
+            kind = 'threads'
+        num_inputs = len(elements)
+        modules = [self.make_iteration_module(i, port_names, elements)
+                   for i in xrange(num_inputs)]
+
+        lock = threading.RLock()
+        loop = SynchronizedLogging(loop, lock)
+        if kind == 'threads':
+            for module in modules:
+                module.logging = SynchronizedLogging(module.logging, lock)
+
+            def run(i):
+                module = modules[i]
+                loop.begin_iteration(module, i)
+                try:
+                    module.update()
+                except ModuleSuspended, e:
+                    e.loop_iteration = i
+                    module.logging.end_update(module, e, was_suspended=True)
+                    return e
+                except Exception:
+                    return sys.exc_info()
+                return None
+            pool = ThreadPool(min(size, num_inputs))
+            results = pool.imap(run, xrange(num_inputs))
+        else:
+            _process_loop_modules = modules
+            try:
+                pool = multiprocessing.Pool(min(size, num_inputs))
+            finally:
+                _process_loop_modules = None
+            results = pool.imap(_compute_loop_iteration, xrange(num_inputs))
+
+        outputs = {}
+        suspended = []
+        try:
+            for i, result in enumerate(results):
+                module = modules[i]
+                if kind == 'processes':
+                    loop.begin_iteration(module, i)
+                    result = self.finish_process_iteration(module, i, result)
+                if isinstance(result, tuple):
+                    raise result[0], result[1], result[2]
+
+                with lock:
+                    loop.end_iteration(module)
+                    if result is not None:
+                        suspended.append(result)
+                        continue
+
+                    ## Getting the result from the output port
+                    for nameOutput in module.outputPorts:
+                        if nameOutput not in outputs:
+                            outputs[nameOutput] = []
+                        output = module.get_output(nameOutput)
+                        outputs[nameOutput].append(output)
+
+                    self.logging.update_progress(self,
+                                                 (i + 1) * 1.0 / num_inputs)
+        except:
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
+
+        if suspended:
+            raise ModuleSuspended(
+                    self,
+                    "function module suspended in %d/%d iterations" % (
+                            len(suspended), num_inputs),
+                    children=suspended)
+        # set final outputs
+        for nameOutput in outputs:
+            self.set_output(nameOutput, outputs[nameOutput])
+        loop.end_loop_execution()
+
+    def finish_process_iteration(self, module, i, result):
+        """Logs an iteration computed in a worker process and sets its
+        outputs; returns the error or suspension like the threads do.
+
+        """
+        module.logging.begin_update(module)
+        module.logging.begin_compute(module)
+        if result[0] == 'error':
+            try:
+                raise ModuleError(module, result[1])
+            except ModuleError:
+                return sys.exc_info()
+        elif result[0] == 'suspended':
+            e = ModuleSuspended(module, result[1], handle=result[2])
+            e.loop_iteration = i
+            module.was_suspended = True
+            module.logging.end_update(module, e, was_suspended=True)
+            return e
+        for port, value in result[1].iteritems():
+            module.set_output(port, value)
+        module.computed = True
+        module.upToDate = True
+        module.logging.end_update(module)
+        module.logging.signalSuccess(module)
+        return None
+
     def build_stream(self):
         """Determines and builds correct generator type.
 
@@ -1645,6 +1856,74 @@ class NotCacheable(object):
 
 ################################################################################
 
+class ThreadSafe(object):
+    """ A mixin indicating that the module can be updated concurrently with
+    other modules by the parallel scheduler. (NB: like NotCacheable, it must
+    appear *BEFORE* Module in the class hierarchy declarations)
+
+    """
+    def is_thread_safe(self):
+        return True
+
+################################################################################
+
+class PersistentCacheable(object):
+    """ A mixin indicating that the results of the module can be stored in
+    the persistent result cache, and reused in later sessions instead of
+    computing the module (and its upstream modules) again.
+
+    Results are keyed by the subpipeline signature, so this should only be
+    used for modules whose outputs depend on nothing but their inputs.
+
+    By default the output values are pickled; values that are themselves
+    modules are stored through their Serializable.serialize/deserialize
+    hooks. Override serialize_outputs() and deserialize_outputs() to use a
+    different format.
+
+    """
+    def serialize_outputs(self):
+        """serialize_outputs() -> str
+
+        Returns a string representing the output values of the module.
+
+        """
+        outputs = {}
+        for port_name, value in self.outputPorts.iteritems():
+            if port_name == 'self':
+                continue
+            if isinstance(value, Module):
+                from vistrails.core.modules.module_registry import \
+                    get_module_registry
+                reg = get_module_registry()
+                sigstring = reg.get_descriptor(type(value)).sigstring
+                outputs[port_name] = ('serialized', sigstring,
+                                      value.serialize())
+            else:
+                outputs[port_name] = ('value', value)
+        return pickle.dumps(outputs, pickle.HIGHEST_PROTOCOL)
+
+    def deserialize_outputs(self, data):
+        """deserialize_outputs(data: str) -> None
+
+        Sets the output values of the module from the result of
+        serialize_outputs().
+
+        """
+        from vistrails.core.modules.module_registry import get_module_registry
+        from vistrails.core.modules.utils import parse_descriptor_string
+        outputs = pickle.loads(data)
+        for port_name, output in outputs.iteritems():
+            if output[0] == 'serialized':
+                reg = get_module_registry()
+                descriptor = reg.get_descriptor_by_name(
+                        *parse_descriptor_string(output[1]))
+                value = descriptor.module().deserialize(output[2])
+            else:
+                value = output[1]
+            self.set_output(port_name, value)
+
+################################################################################
+
 class Streaming(object):
     """ A mixin indicating support for streamable inputs
 
@@ -1876,3 +2155,86 @@ class TestImplicitLooping(unittest.TestCase):
 
     def test_list_custom(self):
         self.run_vt("test-list-custom.vt")
+
+
+class TestParallelLooping(unittest.TestCase):
+    def run_loop(self, parallel, op='*', value2='2.0'):
+        from vistrails.tests.utils import execute, intercept_result
+        from vistrails.packages.pythonCalc.init import PythonCalc
+        if parallel is not None:
+            control_params = [(ModuleControlParam.LOOP_PARALLEL_KEY,
+                               parallel)]
+        else:
+            control_params = []
+        with intercept_result(PythonCalc, 'value') as results:
+            errors = execute([
+                    ('List', 'org.vistrails.vistrails.basic', [
+                        ('value', [('List', '[1.0, 2.0, 3.0, 4.0, 5.0]')]),
+                    ]),
+                    ('PythonCalc', 'org.vistrails.vistrails.pythoncalc', [
+                        ('value2', [('Float', value2)]),
+                        ('op', [('String', op)]),
+                    ], control_params),
+                ],
+                [
+                    (0, 'value', 1, 'value1'),
+                ])
+        return errors, results
+
+    def test_serial(self):
+        errors, results = self.run_loop(None)
+        self.assertFalse(errors)
+        self.assertEqual(results[-1], [2.0, 4.0, 6.0, 8.0, 10.0])
+
+    def test_threads(self):
+        errors, results = self.run_loop('threads:3')
+        self.assertFalse(errors)
+        self.assertEqual(results[-1], [2.0, 4.0, 6.0, 8.0, 10.0])
+
+    def test_processes(self):
+        errors, results = self.run_loop('processes:2')
+        self.assertFalse(errors)
+        self.assertEqual(results[-1], [2.0, 4.0, 6.0, 8.0, 10.0])
+
+    def test_iteration_log(self):
+        """Iterations are begun in the log as they are computed.
+        """
+        from vistrails.core.interpreter.cached import \
+            ViewUpdatingLogController
+        from vistrails.packages.pythonCalc.init import PythonCalc
+        events = []
+        Loop = ViewUpdatingLogController.Loop
+        orig_begin, orig_compute = Loop.begin_iteration, PythonCalc.compute
+        def begin_iteration(self, looped_obj, iteration):
+            events.append(('begin', iteration))
+            orig_begin(self, looped_obj, iteration)
+        def compute(self):
+            events.append('compute')
+            orig_compute(self)
+        Loop.begin_iteration = begin_iteration
+        PythonCalc.compute = compute
+        try:
+            errors, results = self.run_loop('threads:1')
+        finally:
+            Loop.begin_iteration = orig_begin
+            PythonCalc.compute = orig_compute
+        self.assertFalse(errors)
+        self.assertEqual(events,
+                         [e for i in xrange(5) for e in (('begin', i),
+                                                         'compute')])
+
+    def test_default_size(self):
+        errors, results = self.run_loop('threads')
+        self.assertFalse(errors)
+        self.assertEqual(results[-1], [2.0, 4.0, 6.0, 8.0, 10.0])
+
+    def test_errors(self):
+        for parallel in ('threads:2', 'processes:2'):
+            errors, results = self.run_loop(parallel, op='/', value2='0.0')
+            self.assertEqual(len(errors), 1)
+            self.assertIn('ZeroDivisionError', str(errors.values()[0]))
+
+    def test_invalid(self):
+        errors, results = self.run_loop('fibers')
+        self.assertEqual(len(errors), 1)
+        self.assertIn('Unknown parallel loop type', str(errors.values()[0]))
@@ -37,6 +37,7 @@
 with handling packages, from setting paths to adding new packages
 to checking dependencies to initializing them."""
 import copy
+import cPickle
 import inspect
 import itertools
 import os
@@ -74,6 +75,9 @@ class PackageManager(object):
     # # the packages, but has not yet enabled them
     # reloading_package_signal = QtCore.SIGNAL("reloading_package_signal")
 
+    # Packages initialized even in lazy mode
+    _required_packages = ('basic_modules', 'abstraction')
+
     class DependencyCycle(Exception):
         def __init__(self, p1, p2):
             self._package_1 = p1
@@ -159,6 +163,13 @@ class PackageManager(object):
         self._available_packages = {} # codepath: str -> Package
         # These other lists contain enabled packages
         self._package_list = {} # codepath: str -> Package
+        # Enabled packages whose initialization was deferred (lazy mode)
+        self._deferred_packages = {} # codepath: str -> Package
+        # Files of the available packages, and what we know of them from
+        # previous runs (see get_package_index())
+        self._package_files = {} # codepath: str -> filename
+        self._package_index = None
+        self._package_index_changed = False
         self._package_versions = {} # identifier: str -> version -> Package
         self._old_identifier_map = {} # old_id: str -> new_id: str
         self._dependency_graph = vistrails.core.data_structures.graph.Graph()
@@ -550,13 +561,24 @@ class PackageManager(object):
             self.late_enable_package(dep_pkg.codepath, prefix_dictionary)
 
     def initialize_packages(self, prefix_dictionary={},
-                            report_missing_dependencies=True):
-        """initialize_packages(prefix_dictionary={}): None
+                            report_missing_dependencies=True, lazy=False):
+        """initialize_packages(prefix_dictionary={}, lazy=False): None
 
         Initializes all installed packages. If prefix_dictionary is
         not {}, then it should be a dictionary from package names to
         the prefix such that prefix + package_name is a valid python
-        import."""
+        import.
+
+        If lazy is True, only the packages that are always needed are
+        initialized; the other enabled packages are deferred until
+        enable_packages() is called with their identifiers, for example
+        with the packages used by the workflows about to be run."""
+
+        if lazy:
+            for codepath in self._package_list.keys():
+                if codepath not in self._required_packages:
+                    self._deferred_packages[codepath] = \
+                            self._package_list.pop(codepath)
 
         failed = []
         # import the modules
@@ -682,6 +704,67 @@ class PackageManager(object):
 
         self._startup.save_persisted_startup()
 
+        # Index the packages we loaded, for identifier_is_available()
+        for package in self._package_list.itervalues():
+            self.index_package(package)
+        self.save_package_index()
+
+    def enable_packages(self, identifiers):
+        """enable_packages(identifiers: list) -> None
+
+        Enables the packages with the given identifiers, along with their
+        dependencies, if they are not already enabled. This is used in lazy
+        mode to initialize the packages a workflow uses before it is
+        loaded.
+
+        Identifiers that a package handles dynamically (with
+        can_handle_identifier()) are then loaded from that package, like
+        VistrailController.do_enable_package() does.
+
+        Identifiers for which no package can be found are skipped; the
+        workflow will then fail to validate and report them.
+        """
+        missing = [identifier for identifier in identifiers
+                   if not self.has_package(identifier)]
+        if not missing:
+            return
+        dep_graph = self.build_dependency_graph(missing)
+        for identifier in self.get_ordered_dependencies(dep_graph):
+            if self.has_package(identifier):
+                continue
+            pkg = self.identifier_is_available(identifier)
+            if pkg is None or self.has_package(pkg.identifier):
+                continue
+            try:
+                self.late_enable_package(pkg.codepath,
+                                         self._default_prefix_dict)
+            except Exception, e:
+                debug.critical("Couldn't enable package %s" % pkg.codepath,
+                               e)
+            else:
+                self._deferred_packages.pop(pkg.codepath, None)
+
+        for identifier in missing:
+            if self.has_package(identifier):
+                continue
+            for pkg in self.enabled_package_list():
+                if (hasattr(pkg.module, 'can_handle_identifier') and
+                        pkg.module.can_handle_identifier(identifier) and
+                        hasattr(pkg.init_module, 'load_from_identifier')):
+                    try:
+                        pkg.init_module.load_from_identifier(identifier)
+                    except Exception, e:
+                        debug.critical("Couldn't load %s from package %s" % (
+                                           identifier, pkg.codepath),
+                                       e)
+                    break
+
+    def deferred_package_list(self):
+        """Returns the enabled packages that haven't been initialized yet
+        (lazy mode).
+        """
+        return self._deferred_packages.values()
+
     def add_menu_items(self, pkg):
         """add_menu_items(pkg: Package) -> None
         If the package implemented the function menu_items(),
@@ -734,24 +817,123 @@ class PackageManager(object):
         returns true if there exists a package with the given
         identifier in the list of available (ie, disabled) packages.
 
-        If true, returns succesfully loaded, uninitialized package."""
-        for codepath in self.available_package_names_list():
+        If true, returns succesfully loaded, uninitialized package.
+
+        The package index is used to only load the package that has this
+        identifier; the other packages are loaded to find it if it's not in
+        the index (or might be handled by a package with
+        can_handle_identifier()).
+        """
+        index = self.get_package_index()
+        codepaths = self.available_package_names_list()
+        indexed = {}
+        for codepath in codepaths:
+            entry = index.get(codepath)
+            if (entry is not None and
+                    entry['stamp'] == self.get_package_stamp(codepath)):
+                indexed[codepath] = entry
+        for codepath, entry in indexed.iteritems():
+            if (entry['identifier'] == identifier or
+                    identifier in entry['old_identifiers']):
+                pkg = self.get_available_package(codepath)
+                try:
+                    pkg.load()
+                except Exception:
+                    pass
+                else:
+                    return pkg
+
+        found = None
+        for codepath in codepaths:
+            entry = indexed.get(codepath)
+            if entry is not None and not entry['handles_identifiers']:
+                continue
             pkg = self.get_available_package(codepath)
             try:
                 pkg.load()
+                self.index_package(pkg)
                 if pkg.identifier == identifier:
-                    return pkg
+                    found = pkg
                 elif identifier in pkg.old_identifiers:
-                    return pkg
-                if (hasattr(pkg._module, "can_handle_identifier") and
+                    found = pkg
+                elif (hasattr(pkg._module, "can_handle_identifier") and
                         pkg._module.can_handle_identifier(identifier)):
-                    return pkg
+                    found = pkg
             except (pkg.LoadFailed, pkg.InitializationFailed,
                     MissingRequirement):
                 pass
             except Exception, e:
                 pass
-        return None
+            if found is not None:
+                break
+        self.save_package_index()
+        return found
+
+    def get_package_stamp(self, codepath):
+        """Returns what tells whether the file of a package has changed.
+
+        This is None for packages whose file is not known (plugin packages),
+        which are then never found through the index.
+        """
+        try:
+            filename = self._package_files[codepath]
+            stat = os.stat(filename)
+        except (KeyError, OSError):
+            return None
+        return (filename, stat.st_mtime, stat.st_size)
+
+    def get_package_index_filename(self):
+        return os.path.join(system.current_dot_vistrails(), 'package_index')
+
+    def get_package_index(self):
+        """Returns the package index, reading it if necessary.
+
+        The index is a snapshot of the identifier, old identifiers and
+        version of the available packages, written by previous runs. It
+        maps a code-path to a dict, with the stamp of the package's file at
+        the time it was read.
+        """
+        if self._package_index is None:
+            self._package_index = {}
+            try:
+                with open(self.get_package_index_filename(), 'rb') as fp:
+                    self._package_index = cPickle.load(fp)
+            except IOError:
+                pass
+            except Exception, e:
+                debug.warning("Couldn't read the package index", e)
+        return self._package_index
+
+    def index_package(self, pkg):
+        """Records a loaded package in the package index.
+        """
+        stamp = self.get_package_stamp(pkg.codepath)
+        if stamp is None:
+            return
+        entry = {'stamp': stamp,
+                 'identifier': pkg.identifier,
+                 'old_identifiers': list(pkg.old_identifiers),
+                 'version': pkg.version,
+                 'handles_identifiers': hasattr(pkg._module,
+                                                'can_handle_identifier')}
+        index = self.get_package_index()
+        if index.get(pkg.codepath) != entry:
+            index[pkg.codepath] = entry
+            self._package_index_changed = True
+
+    def save_package_index(self):
+        """Writes the package index, if new packages were recorded.
+        """
+        if not self._package_index_changed:
+            return
+        try:
+            with open(self.get_package_index_filename(), 'wb') as fp:
+                cPickle.dump(self._package_index, fp,
+                             cPickle.HIGHEST_PROTOCOL)
+        except (IOError, OSError), e:
+            debug.warning("Couldn't write the package index", e)
+        else:
+            self._package_index_changed = False
 
     def available_package_names_list(self):
         """available_package_names_list() -> returns list with code-paths of all
@@ -773,9 +955,13 @@ class PackageManager(object):
 
         def search(dirname, prefix):
             for name in os.listdir(dirname):
-                if is_vistrails_package(os.path.join(dirname, name)):
+                path = os.path.join(dirname, name)
+                if is_vistrails_package(path):
                     if name.endswith('.py'):
                         name = name[:-3]
+                    else:
+                        path = os.path.join(path, '__init__.py')
+                    self._package_files.setdefault(name, path)
                     self.get_available_package(name, prefix=prefix)
 
         # Finds standard packages
@@ -951,3 +1137,115 @@ class TestImports(unittest.TestCase):
                     'vistrails.tests.resources.import_targets.test5',
                     'vistrails.tests.resources.import_targets.test6']:
             self.assertIn(dep, deps)
+
+
+class TestPackageIndex(unittest.TestCase):
+    def test_index(self):
+        pm = get_package_manager()
+        pkg = pm.identifier_is_available('org.vistrails.vistrails.tabledata')
+        self.assertIsNotNone(pkg)
+        self.assertEqual(pkg.codepath, 'tabledata')
+        entry = pm.get_package_index()['tabledata']
+        self.assertEqual(entry['identifier'],
+                         'org.vistrails.vistrails.tabledata')
+        self.assertEqual(entry['stamp'], pm.get_package_stamp('tabledata'))
+
+        try:
+            # Lookups go through the index
+            pm.get_package_index()['tabledata'] = dict(
+                    entry, identifier='org.vistrails.tests.indexed')
+            pkg = pm.identifier_is_available('org.vistrails.tests.indexed')
+            self.assertIsNotNone(pkg)
+            self.assertEqual(pkg.codepath, 'tabledata')
+
+            # Entries for a file that changed are not used
+            pm.get_package_index()['tabledata'] = dict(
+                    entry, identifier='org.vistrails.tests.indexed',
+                    stamp=('changed', 0, 0))
+            self.assertIsNone(
+                    pm.identifier_is_available('org.vistrails.tests.indexed'))
+        finally:
+            pm.get_package_index()['tabledata'] = entry
+
+    def test_enable_unknown(self):
+        pm = get_package_manager()
+        pm.enable_packages(['org.vistrails.tests.nonexistent'])
+        self.assertFalse(pm.has_package('org.vistrails.tests.nonexistent'))
+
+    def test_enable_dynamic(self):
+        """Identifiers handled by an enabled package are loaded from it.
+        """
+        pm = get_package_manager()
+        pkg = pm.get_package('org.vistrails.vistrails.basic')
+        loaded = []
+        pkg.module.can_handle_identifier = \
+            lambda identifier: identifier == 'org.vistrails.tests.dynamic'
+        pkg.init_module.load_from_identifier = loaded.append
+        try:
+            pm.enable_packages(['org.vistrails.tests.dynamic'])
+        finally:
+            del pkg.module.can_handle_identifier
+            del pkg.init_module.load_from_identifier
+        self.assertEqual(loaded, ['org.vistrails.tests.dynamic'])
+
+
+_lazy_test_script = """
+import sys
+import vistrails.core.application
+app = vistrails.core.application.init({'batch': True,
+                                       'singleInstance': False,
+                                       'dotVistrails': sys.argv[1],
+                                       'lazyPackages': True,
+                                       'enablePackagesSilently': True})
+from vistrails.core.console_mode import enable_workflow_packages
+from vistrails.core.db.action import create_action
+from vistrails.core.packagemanager import get_package_manager
+from vistrails.core.vistrail.module import Module
+from vistrails.core.vistrail.vistrail import Vistrail
+
+pm = get_package_manager()
+deferred = set(pkg.codepath for pkg in pm.deferred_package_list())
+assert 'tabledata' in deferred and 'pythonCalc' in deferred
+assert not pm.has_package('org.vistrails.vistrails.tabledata')
+
+pm.enable_packages(['org.vistrails.vistrails.tabledata'])
+assert pm.has_package('org.vistrails.vistrails.tabledata')
+assert not pm.has_package('org.vistrails.vistrails.pythoncalc')
+
+vistrail = Vistrail()
+module = Module(id=vistrail.idScope.getNewId(Module.vtType),
+                name='PythonCalc',
+                package='org.vistrails.vistrails.pythoncalc')
+action = create_action([('add', module)])
+vistrail.add_action(action, 0)
+enable_workflow_packages(vistrail, action.id)
+assert pm.has_package('org.vistrails.vistrails.pythoncalc')
+deferred = set(pkg.codepath for pkg in pm.deferred_package_list())
+assert 'tabledata' not in deferred and 'pythonCalc' not in deferred
+assert 'controlflow' in deferred
+"""
+
+
+class TestLazyPackages(unittest.TestCase):
+    def test_lazy(self):
+        """Initializes the packages lazily, then enables some of them.
+
+        This is done in a new process, as packages can't be uninitialized.
+        """
+        import shutil
+        import subprocess
+        import tempfile
+        dot_vistrails = tempfile.mkdtemp(prefix='vt_lazy_')
+        try:
+            env = dict(os.environ)
+            env['PYTHONPATH'] = os.path.dirname(
+                    system.vistrails_root_directory())
+            proc = subprocess.Popen([sys.executable, '-c', _lazy_test_script,
+                                     dot_vistrails],
+                                    env=env,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT)
+            output = proc.communicate()[0]
+            self.assertEqual(proc.returncode, 0, output)
+        finally:
+            shutil.rmtree(dot_vistrails)
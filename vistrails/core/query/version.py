@@ -439,13 +439,41 @@ class NameSearchStmt(RegexEnabledSearchStmt):
             m = self._content_matches(vistrail.get_description(action.timestep))
         return bool(m)
 
-class ModuleSearchStmt(RegexEnabledSearchStmt):
+class IndexedSearchStmt(RegexEnabledSearchStmt):
+    """Matches versions using the SearchIndex of the vistrail.
+
+    The matching versions are all found at once, when the search is run or
+    first matched, and again if the vistrail gets new versions.
+    """
+    kind = None
+
+    def __init__(self, content, use_regex):
+        RegexEnabledSearchStmt.__init__(self, content, use_regex)
+        self._versions = None
+
+    def matching_versions(self, vistrail):
+        index = vistrail.search_index
+        if (self._versions is None or self._versions[0] is not index or
+                self._versions[1] != index.generation):
+            versions = index.find(self.kind,
+                                  lambda v: bool(self._content_matches(v)))
+            self._versions = (index, index.generation, versions)
+        return self._versions[2]
+
+    def run(self, vistrail, name):
+        self.matching_versions(vistrail)
+
     def match(self, vistrail, action):
-        pipeline = vistrail.getPipeline(action.timestep)
-        for module in pipeline.modules.itervalues():
-            if self._content_matches(module.name):
-                return True
-        return False
+        return action.timestep in self.matching_versions(vistrail)
+
+class ModuleSearchStmt(IndexedSearchStmt):
+    kind = 'module'
+
+class PackageSearchStmt(IndexedSearchStmt):
+    kind = 'package'
+
+class ParameterSearchStmt(IndexedSearchStmt):
+    kind = 'parameter'
 
 class AndSearchStmt(SearchStmt):
     def __init__(self, lst):
@@ -455,6 +483,9 @@ class AndSearchStmt(SearchStmt):
             if not s.match(vistrail, action):
                 return False
         return True
+    def run(self, v, n):
+        for s in self.matchList:
+            s.run(v, n)
 
 class OrSearchStmt(SearchStmt):
     def __init__(self, lst):
@@ -464,12 +495,17 @@ class OrSearchStmt(SearchStmt):
             if s.match(vistrail, action):
                 return True
         return False
+    def run(self, v, n):
+        for s in self.matchList:
+            s.run(v, n)
 
 class NotSearchStmt(SearchStmt):
     def __init__(self, stmt):
         self.stmt = stmt
     def match(self, vistrail, action):
         return not self.stmt.match(action)
+    def run(self, v, n):
+        self.stmt.run(v, n)
 
 class TrueSearch(SearchStmt):
     def __init__(self):
@@ -544,6 +580,28 @@ class SearchCompiler(object):
             lst.append(ModuleSearchStmt(tok, use_regex))
             tokStream = tokStream[1:]
         return (AndSearchStmt(lst), [])
+    def parsePackage(self, tokStream, use_regex):
+        if len(tokStream) == 0:
+            raise SearchParseError('Expected token, got end of search')
+        lst = []
+        while len(tokStream):
+            tok = tokStream[0]
+            if ':' in tok:
+                return (AndSearchStmt(lst), tokStream)
+            lst.append(PackageSearchStmt(tok, use_regex))
+            tokStream = tokStream[1:]
+        return (AndSearchStmt(lst), [])
+    def parseParameter(self, tokStream, use_regex):
+        if len(tokStream) == 0:
+            raise SearchParseError('Expected token, got end of search')
+        lst = []
+        while len(tokStream):
+            tok = tokStream[0]
+            if ':' in tok:
+                return (AndSearchStmt(lst), tokStream)
+            lst.append(ParameterSearchStmt(tok, use_regex))
+            tokStream = tokStream[1:]
+        return (AndSearchStmt(lst), [])
     def parseBefore(self, tokStream, use_regex):
         old_tokstream = tokStream
         try:
@@ -601,6 +659,8 @@ class SearchCompiler(object):
                 'after': parseAfter,
                 'name': parseName,
                 'module': parseModule,
+                'package': parsePackage,
+                'parameter': parseParameter,
                 'any': parseAny}
                 
             
@@ -699,6 +759,18 @@ class TestSearch(unittest.TestCase):
         # Test compiling these searches
         SearchCompiler('before')
         SearchCompiler('after')
+    def test_module_search(self):
+        from vistrails.core.db.locator import FileLocator
+        import vistrails.core.system
+        v = FileLocator(vistrails.core.system.vistrails_root_directory() +
+                        '/tests/resources/terminator.vt').load().vistrail
+        search = SearchCompiler('module:vtkContourFilter').searchStmt
+        search.run(v, '')
+        for version, action in v.actionMap.iteritems():
+            names = [m.name
+                     for m in v.getPipeline(version).modules.itervalues()]
+            self.assertEqual(search.match(v, action),
+                             'vtkContourFilter' in names)
 
 if __name__ == '__main__':
     unittest.main()
@@ -32,14 +32,14 @@
 ## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
 ##
 ###############################################################################
-import itertools
-
 """ Utilities for dealing with the thumbnails """
 import os
 import os.path
+import Queue
 import shutil
+import sqlite3
 import tempfile
-import time
+import threading
 import uuid
 import mimetypes
 # mimetypes are broken by default on windows so use the builtins
@@ -49,6 +49,8 @@ from vistrails.core import debug, system
 from vistrails.core.configuration import get_vistrails_configuration, \
       get_vistrails_persistent_configuration
 from vistrails.core.utils import VistrailsInternalError
+from vistrails.db.services.io import extract_bundle_file, \
+    get_bundle_file_info
 
 ############################################################################
 class CacheEntry(object):
@@ -57,8 +59,137 @@ class CacheEntry(object):
         self.name = name
         self.time = time
         self.size = size
-        
+
+
+class ThumbnailIndex(object):
+    """Persistent index of the images in the thumbnail cache directory.
+
+    Entries are kept in a sqlite database in the directory, indexed by time
+    so that the oldest ones can be removed without sorting everything, and
+    the total size is kept up to date instead of being recomputed. The
+    directory is only scanned if the database doesn't exist yet.
+
+    """
+    FILENAME = '.thumbs_index.db'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.filename = os.path.join(directory, self.FILENAME)
+        self._lock = threading.Lock()
+        exists = os.path.exists(self.filename)
+        try:
+            self.conn = self._connect(self.filename)
+        except sqlite3.Error, e:
+            debug.warning("Could not open thumbnail index %s" % self.filename,
+                          e)
+            self.conn = self._connect(':memory:')
+            exists = False
+        if not exists:
+            self._scan()
+        cur = self.conn.execute('SELECT total(size) FROM thumbnails')
+        self.total_size = int(cur.fetchone()[0])
+
+    @staticmethod
+    def _connect(filename):
+        conn = sqlite3.connect(filename, check_same_thread=False)
+        conn.text_factory = str
+        with conn:
+            conn.execute('''
+                    CREATE TABLE IF NOT EXISTS thumbnails(
+                        name TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        time REAL NOT NULL)
+                    ''')
+            conn.execute('''
+                    CREATE INDEX IF NOT EXISTS thumbnails_time
+                    ON thumbnails(time)
+                    ''')
+        return conn
+
+    def _scan(self):
+        """Adds the images already in the directory.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.startswith(self.FILENAME):
+                continue
+            fname = os.path.join(self.directory, name)
+            if os.path.isfile(fname):
+                statinfo = os.stat(fname)
+                entries.append((name, statinfo.st_size, statinfo.st_mtime))
+        with self.conn:
+            self.conn.executemany(
+                    'INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?)',
+                    entries)
+
+    def abs_name(self, name):
+        return os.path.join(self.directory, name)
+
+    def __contains__(self, name):
+        with self._lock:
+            cur = self.conn.execute(
+                    'SELECT 1 FROM thumbnails WHERE name=?', (name,))
+            return cur.fetchone() is not None
+
+    def names(self):
+        with self._lock:
+            return [name for name, in self.conn.execute(
+                    'SELECT name FROM thumbnails')]
+
+    def add(self, name, size, time):
+        with self._lock:
+            with self.conn:
+                cur = self.conn.execute(
+                        'SELECT size FROM thumbnails WHERE name=?', (name,))
+                row = cur.fetchone()
+                if row is not None:
+                    self.total_size -= row[0]
+                self.conn.execute(
+                        'INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?)',
+                        (name, size, time))
+                self.total_size += size
+
+    def remove(self, names):
+        with self._lock:
+            with self.conn:
+                for name in names:
+                    cur = self.conn.execute(
+                            'SELECT size FROM thumbnails WHERE name=?',
+                            (name,))
+                    row = cur.fetchone()
+                    if row is not None:
+                        self.total_size -= row[0]
+                        self.conn.execute(
+                                'DELETE FROM thumbnails WHERE name=?',
+                                (name,))
+
+    def oldest(self, n):
+        """Returns the names of the n oldest entries.
+        """
+        with self._lock:
+            return [name for name, in self.conn.execute(
+                    'SELECT name FROM thumbnails ORDER BY time LIMIT ?',
+                    (n,))]
+
+    def clear(self):
+        with self._lock:
+            with self.conn:
+                self.conn.execute('DELETE FROM thumbnails')
+            self.total_size = 0
+
+    def close(self):
+        self.conn.close()
+
+
 class ThumbnailCache(object):
+    """Cache of the thumbnails of workflow results.
+
+    Thumbnails are composed from the images dumped by an execution and
+    written by a background thread, so that executions don't wait on image
+    encoding; methods looking up a thumbnail wait for it if it is still
+    being written.
+
+    """
     _instance = None
     IMAGE_MAX_WIDTH = 200 
     SUPPORTED_TYPES = ['image/png','image/jpeg','image/bmp','image/gif']
@@ -73,18 +204,30 @@ class ThumbnailCache(object):
     def clearInstance():
         if ThumbnailCache._instance is not None:
             ThumbnailCache._instance.destroy()
+            ThumbnailCache._instance = None
 
     def __init__(self):
         self._temp_directory = None
-        self.elements = {}
+        self._index = None
         self.vtelements = {}
         self.conf = None
         conf = get_vistrails_configuration()
         if conf.has('thumbs'):
             self.conf = conf.thumbs
+        self._jobs = Queue.Queue()
+        self._worker = None
+        self._pending = {} # name -> threading.Event
+        self._pending_lock = threading.Lock()
         self.init_cache()
 
     def destroy(self):
+        self.flush()
+        if self._worker is not None:
+            self._jobs.put(None)
+            self._worker.join()
+            self._worker = None
+        if self._index is not None:
+            self._index.close()
         if self._temp_directory is not None:
             print "removing thumbnail directory"
             shutil.rmtree(self._temp_directory)
@@ -103,34 +246,46 @@ class ThumbnailCache(object):
         return self._temp_directory
     
     def init_cache(self):
-        for root,dirs, files in os.walk(self.get_directory()):
-            for f in files:
-                fname = os.path.join(root,f)
-                statinfo = os.stat(fname)
-                size = int(statinfo[6])
-                time = float(statinfo[8])
-                entry = CacheEntry(fname, f, time, size)
-                self.elements[f] = entry
+        self._index = ThumbnailIndex(self.get_directory())
+
+    def flush(self):
+        """Waits for all the thumbnails being written.
+        """
+        if self._worker is not None:
+            self._jobs.join()
+
+    def wait_for(self, name):
+        """Waits until the thumbnail name is written, if it is pending.
+        """
+        with self._pending_lock:
+            event = self._pending.get(name)
+        if event is not None:
+            event.wait()
                 
     def get_abs_name_entry(self,name):
         """get_abs_name_entry(name) -> str 
-        It will look for absolute file path of name in self.elements and 
+        It will look for absolute file path of name in the cache and 
         self.vtelements. It returns None if item was not found.
         
         """
+        if name:
+            self.wait_for(name)
+            abs_name = self._index.abs_name(name)
+            if name in self._index:
+                return abs_name
+            # Thumbnails extracted from a bundle are put in the directory
+            # without being added
+            if os.path.isfile(abs_name):
+                statinfo = os.stat(abs_name)
+                self._index.add(name, statinfo.st_size, statinfo.st_mtime)
+                return abs_name
         try:
-            return self.elements[name].abs_name
+            return extract_bundle_file(self.vtelements[name].abs_name)
         except KeyError, e:
-            try:
-                return self.vtelements[name].abs_name
-            except KeyError, e:
-                return None
+            return None
         
     def size(self):
-        size = 0
-        for entry in self.elements.itervalues():
-            size += entry.size
-        return size
+        return self._index.total_size
 
     def move_cache_directory(self, sourcedir, destdir):
         """change_cache_directory(sourcedir: str, dest_dir: str) -> None"
@@ -138,75 +293,149 @@ class ThumbnailCache(object):
         
         """
         if os.path.exists(destdir):
-            for entry in self.elements.itervalues():
+            self.flush()
+            moved = []
+            for name in self._index.names():
                 try:
-                    srcname = entry.abs_name
-                    dstname = os.path.join(destdir,entry.name)
+                    srcname = self._index.abs_name(name)
+                    dstname = os.path.join(destdir, name)
                     shutil.move(srcname,dstname)
-                    entry.abs_name = dstname
-                        
-                except shutil.Error, e:
+                    statinfo = os.stat(dstname)
+                    moved.append((name, statinfo.st_size, statinfo.st_mtime))
+                except (shutil.Error, EnvironmentError), e:
                     debug.warning("Could not move thumbnail from %s to %s" % (
                                   sourcedir, destdir),
                                   e)
+            self._index.close()
+            try:
+                os.remove(self._index.filename)
+            except OSError:
+                pass
+            self._index = ThumbnailIndex(destdir)
+            for entry in moved:
+                self._index.add(*entry)
                     
     def remove_lru(self,n=1):
-        elements = self.elements.values()
-        elements.sort(key=lambda obj: obj.time)
-        num = min(n,len(elements))
-        debug.debug("Will remove %s elements from cache..."%num)
-        debug.debug("Cache has %s elements and %s bytes"%(len(elements),
-                                                             self.size()))
-        for elem in itertools.islice(elements, num):
+        names = self._index.oldest(n)
+        debug.debug("Will remove %s elements from cache..." % len(names))
+        debug.debug("Cache has %s bytes" % self.size())
+        removed = []
+        for name in names:
+            abs_name = self._index.abs_name(name)
             try:
-                del self.elements[elem.name]
-                os.unlink(elem.abs_name)
+                if os.path.exists(abs_name):
+                    os.unlink(abs_name)
+                removed.append(name)
             except os.error, e:
-                debug.warning("Could not remove file %s" % elem.abs_name, e)
+                debug.warning("Could not remove file %s" % abs_name, e)
+        self._index.remove(removed)
 
     def remove(self,key):
-        if key in self.elements.keys():
-            entry = self.elements[key]
-            del self.elements[key]
-            os.unlink(entry.abs_name)
-        elif key in self.vtelements.keys():
+        self.wait_for(key)
+        self._remove(key)
+
+    def _remove(self, key):
+        if key in self._index:
+            self._index.remove([key])
+            abs_name = self._index.abs_name(key)
+            if os.path.exists(abs_name):
+                os.unlink(abs_name)
+        elif key in self.vtelements:
             entry = self.vtelements[key]
             del self.vtelements[key]
-            os.unlink(entry.abs_name)
+            if os.path.exists(entry.abs_name):
+                os.unlink(entry.abs_name)
             
     def clear(self):
-        self.elements = {}
-        self._delete_files(self.get_directory())
+        self.flush()
+        self._index.clear()
+        self._delete_files(self.get_directory(),
+                           keep=ThumbnailIndex.FILENAME)
         
-    def add_entry_from_cell_dump(self, folder, key=None):
-        """create_entry_from_cell_dump(folder: str) -> str
+    def add_entry_from_cell_dump(self, folder, key=None, remove_folder=False,
+                                 wait=False):
+        """add_entry_from_cell_dump(folder: str, key: str,
+                                    remove_folder: bool, wait: bool) -> str
         Creates a cache entry from images in folder by merge them in a single 
         image and returns the name of the image in cache.
-        If a valid key is provided, it will use it as the name of the 
-        image file.
+        If a valid key is provided, the old image with that name is removed.
+
+        The image is created by a background thread unless wait is True,
+        and might fail to be created (name lookups then return None). If
+        remove_folder is True, folder is removed afterwards; else the images
+        are copied first, since the folder might be overwritten by the next
+        execution.
         
         """
-        
-        image = None
         thumbnail_fnames = self._get_thumbnail_fnames(folder)
-        if len(thumbnail_fnames) > 0:
+        if len(thumbnail_fnames) == 0:
+            if remove_folder:
+                shutil.rmtree(folder, ignore_errors=True)
+            return None
+        if not remove_folder:
+            snapshot = tempfile.mkdtemp(prefix='vt_thumb_')
+            fnames = []
+            for i, fname in enumerate(sorted(thumbnail_fnames)):
+                copy = os.path.join(snapshot, '%04d_%s' % (
+                                    i, os.path.basename(fname)))
+                shutil.copyfile(fname, copy)
+                fnames.append(copy)
+            folder, thumbnail_fnames = snapshot, fnames
+        fname = "%s.png" % str(uuid.uuid1())
+        event = threading.Event()
+        with self._pending_lock:
+            self._pending[fname] = event
+        job = (fname, key, thumbnail_fnames, folder, event)
+        if wait:
+            if not self._create_entry(*job):
+                return None
+        else:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_jobs,
+                                                name='thumbnails')
+                self._worker.daemon = True
+                self._worker.start()
+            self._jobs.put(job)
+        return fname
+
+    def _run_jobs(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    break
+                self._create_entry(*job)
+            finally:
+                self._jobs.task_done()
+
+    def _create_entry(self, fname, key, thumbnail_fnames, folder, event):
+        """Merges and writes a thumbnail, and adds it to the cache.
+
+        Returns True if the image could be created.
+        """
+        try:
             image = self._merge_thumbnails(thumbnail_fnames)
-        fname = None
-        if image != None and image.width() > 0 and image.height() > 0:
-            fname = "%s.png" % str(uuid.uuid1())
-            abs_fname = self._save_thumbnail(image, fname) 
+            if image is None or image.width() <= 0 or image.height() <= 0:
+                return False
+            abs_fname = self._save_thumbnail(image, fname)
             statinfo = os.stat(abs_fname)
-            size = int(statinfo[6])
-            time = float(statinfo[8])
-            entry = CacheEntry(abs_fname, fname, time, size)
+            size = int(statinfo.st_size)
+            time = float(statinfo.st_mtime)
             #remove old element
             if key:
-                self.remove(key)
+                self._remove(key)
             if self.size() + size > self.conf.cacheSize*1024*1024:
                 self.remove_lru(10)
-                
-            self.elements[fname] = entry
-        return fname
+            self._index.add(fname, size, time)
+            return True
+        except Exception, e:
+            debug.warning("Could not create thumbnail %s" % fname, e)
+            return False
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+            with self._pending_lock:
+                del self._pending[fname]
+            event.set()
         
     def add_entries_from_files(self, absfnames):
         """add_entries_from_files(absfnames: list of str) -> None
@@ -216,16 +445,18 @@ class ThumbnailCache(object):
         """
         for abs_fname in absfnames:
             fname = os.path.basename(abs_fname)
-            statinfo = os.stat(abs_fname)
-            size = int(statinfo[6])
-            time = float(statinfo[8])
+            # thumbnails of .vt files might not have been extracted yet
+            size, time = get_bundle_file_info(abs_fname)
+            size = int(size)
+            time = float(time)
             entry = CacheEntry(abs_fname, fname, time, size)
             self.vtelements[fname] = entry
 
     @staticmethod
-    def _delete_files(dirname):
-        """delete_files(dirname: str) -> None
-        Deletes all files inside dirname
+    def _delete_files(dirname, keep=None):
+        """delete_files(dirname: str, keep: str) -> None
+        Deletes all files inside dirname, except those whose name starts
+        with keep
     
         """
         if dirname is None:
@@ -233,6 +464,8 @@ class ThumbnailCache(object):
         try:
             for root, dirs, files in os.walk(dirname):
                 for fname in files:
+                    if keep is not None and fname.startswith(keep):
+                        continue
                     os.unlink(os.path.join(root,fname))
                     
         except OSError, e:
@@ -256,29 +489,31 @@ class ThumbnailCache(object):
     def _merge_thumbnails(fnames):
         """_merge_thumbnails(fnames: list(str)) -> QImage 
         Generates a single image formed by all the images in the fnames list.
+
+        This only uses QImage, so it can run outside of the GUI thread.
         
         """
         from PyQt4 import QtCore, QtGui
         height = 0
         width = 0
-        pixmaps = []
+        images = []
         # OS may return wrong order so  we need to sort
         fnames.sort()
         for fname in fnames:
-            pix = QtGui.QPixmap(fname)
-            if pix.height() > 0 and pix.width() > 0:
-                pixmaps.append(pix)
-                #width += pix.width()
-                #height = max(height, pix.height())
-                height += pix.height()
-                width = max(width,pix.width())            
-        if len(pixmaps) > 0 and height > 0 and width > 0:        
+            img = QtGui.QImage(fname)
+            if img.height() > 0 and img.width() > 0:
+                images.append(img)
+                #width += img.width()
+                #height = max(height, img.height())
+                height += img.height()
+                width = max(width,img.width())            
+        if len(images) > 0 and height > 0 and width > 0:        
             finalImage = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32)
             painter = QtGui.QPainter(finalImage)
             x = 0
-            for pix in pixmaps:
-                painter.drawPixmap(0, x, pix)
-                x += pix.height()
+            for img in images:
+                painter.drawImage(0, x, img)
+                x += img.height()
             painter.end()
             if width > ThumbnailCache.IMAGE_MAX_WIDTH:
                 finalImage = finalImage.scaledToWidth(ThumbnailCache.IMAGE_MAX_WIDTH,
@@ -303,5 +538,116 @@ class ThumbnailCache(object):
         local_dir = self.get_directory()
         for thumb in thumbnails:
             local_thumb = os.path.join(local_dir, os.path.basename(thumb))
+            thumb = extract_bundle_file(thumb)
             if os.path.exists(thumb) and not os.path.exists(local_thumb):
                 shutil.copyfile(thumb, local_thumb)
+
+
+############################################################################
+
+import unittest
+
+
+class TestThumbnailIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='vt_thumbs_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_index(self):
+        index = ThumbnailIndex(self.directory)
+        index.add('a.png', 10, 3.0)
+        index.add('b.png', 20, 1.0)
+        index.add('c.png', 30, 2.0)
+        index.add('a.png', 15, 3.0)
+        self.assertEqual(index.total_size, 65)
+        self.assertEqual(index.oldest(2), ['b.png', 'c.png'])
+        index.remove(['b.png', 'd.png'])
+        self.assertEqual(index.total_size, 45)
+        self.assertNotIn('b.png', index)
+        index.close()
+
+        index = ThumbnailIndex(self.directory)
+        self.assertEqual(index.total_size, 45)
+        self.assertEqual(sorted(index.names()), ['a.png', 'c.png'])
+        index.clear()
+        self.assertEqual(index.total_size, 0)
+        self.assertEqual(index.names(), [])
+        index.close()
+
+    def test_scan(self):
+        with open(os.path.join(self.directory, 'old.png'), 'wb') as fp:
+            fp.write('x' * 12)
+        index = ThumbnailIndex(self.directory)
+        self.assertIn('old.png', index)
+        self.assertEqual(index.total_size, 12)
+        index.close()
+
+
+class TestThumbnailCache(unittest.TestCase):
+    class FakeImage(object):
+        def __init__(self, data):
+            self.data = data
+        def width(self):
+            return len(self.data)
+        def height(self):
+            return 1
+        def save(self, fname):
+            with open(fname, 'wb') as fp:
+                fp.write(self.data)
+
+    def setUp(self):
+        directory = self.directory = tempfile.mkdtemp(prefix='vt_thumbs_test_')
+        FakeImage = self.FakeImage
+        class Cache(ThumbnailCache):
+            def get_directory(self):
+                return directory
+            @staticmethod
+            def _merge_thumbnails(fnames):
+                data = []
+                for fname in sorted(fnames):
+                    with open(fname, 'rb') as fp:
+                        data.append(fp.read())
+                return FakeImage(''.join(data))
+        self.cache = Cache()
+
+    def tearDown(self):
+        self.cache.destroy()
+        shutil.rmtree(self.directory)
+
+    def make_dump(self, images):
+        folder = tempfile.mkdtemp(prefix='vt_thumb_test_')
+        for name, data in images:
+            with open(os.path.join(folder, name), 'wb') as fp:
+                fp.write(data)
+        return folder
+
+    def test_async(self):
+        folder = self.make_dump([('b.png', 'second'), ('a.png', 'first')])
+        try:
+            name = self.cache.add_entry_from_cell_dump(folder)
+            # the caller's folder can be reused right away
+            with open(os.path.join(folder, 'a.png'), 'wb') as fp:
+                fp.write('overwritten')
+            abs_name = self.cache.get_abs_name_entry(name)
+            with open(abs_name, 'rb') as fp:
+                self.assertEqual(fp.read(), 'firstsecond')
+            self.assertEqual(self.cache.size(), 11)
+        finally:
+            shutil.rmtree(folder)
+
+        folder = self.make_dump([('c.png', 'third')])
+        name2 = self.cache.add_entry_from_cell_dump(folder, key=name,
+                                                    remove_folder=True)
+        self.cache.flush()
+        self.assertFalse(os.path.exists(folder))
+        self.assertIsNone(self.cache.get_abs_name_entry(name))
+        self.assertIsNotNone(self.cache.get_abs_name_entry(name2))
+        self.assertEqual(self.cache.size(), 5)
+
+    def test_empty(self):
+        folder = self.make_dump([('notes.txt', 'text')])
+        self.assertIsNone(self.cache.add_entry_from_cell_dump(
+                folder, remove_folder=True, wait=True))
+        self.assertFalse(os.path.exists(folder))
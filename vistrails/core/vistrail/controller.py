@@ -126,6 +126,10 @@ class CompareThumbnailsError(Exception):
         return "Comparing thumbnails failed.\n%s\n%s\n%s" % \
             (self._msg, self._first, self._second)
 
+class _TerseGraphMismatch(Exception):
+    """The terse graph can't be updated in place and has to be recomputed.
+    """
+
 def dot_escape(s):
     return '"%s"' % s.replace('\\', '\\\\').replace('"', '\\"')
 
@@ -157,6 +161,10 @@ class VistrailController(object):
         self.flush_pipeline_cache()
         self._current_full_graph = None
         self._current_terse_graph = None
+        # state the terse graph was computed for, used to update it
+        self._terse_graph_current = None
+        self._terse_graph_last_n = set()
+        self._terse_graph_full_tree = None
         self.num_versions_always_shown = 1
 
         # if self.search is True, vistrail is currently being searched
@@ -526,9 +534,11 @@ class VistrailController(object):
         desc_key = Action.ANNOTATION_DESCRIPTION
         added_upgrade = False
         should_migrate_tags = get_vistrails_configuration().check("migrateTags")
+        added = []
         for action in self._delayed_actions:
             self.vistrail.add_action(action, start_version, 
                                      self.current_session)
+            added.append(action.id)
             # HACK to populate upgrade information
             if (action.has_annotation_with_key(desc_key) and
                 action.get_annotation_by_key(desc_key).value == 'Upgrade'):
@@ -556,9 +566,12 @@ class VistrailController(object):
         self._delayed_actions = []
         self._delayed_paramexps = []
         self._delayed_mashups = []
-        if added_upgrade or added_moves:
+        if added_moves:
             self.recompute_terse_graph()
             self.invalidate_version_tree(False)
+        elif added_upgrade:
+            self.update_terse_graph(added=added)
+            self.invalidate_version_tree(False)
 
     def perform_action(self, action, do_validate=True, raise_exception=False):
         """ performAction(action: Action) -> timestep
@@ -596,7 +609,7 @@ class VistrailController(object):
                 self.vistrail.change_description(description, action.id)
             self.current_version = action.db_id
             self.set_changed(True)
-            self.recompute_terse_graph()
+            self.update_terse_graph(added=[action.db_id])
             
     def create_module_from_descriptor(self, *args, **kwargs):
         return self.create_module_from_descriptor_static(self.id_scope,
@@ -2627,9 +2640,14 @@ class VistrailController(object):
                 old_thumb_name = self.vistrail.get_thumbnail(version)
                 if 'compare_thumbnails' in extra_info:
                     old_thumb_name = None
+                # the thumbnail is written in the background, and the cache
+                # removes the temporary folder once it's done
                 fname = thumb_cache.add_entry_from_cell_dump(
                                         extra_info['pathDumpCells'],
-                                        old_thumb_name)
+                                        old_thumb_name,
+                                        remove_folder=temp_folder_used,
+                                        wait='compare_thumbnails' in extra_info)
+                temp_folder_used = False
                 if 'compare_thumbnails' in extra_info:
                     # check thumbnail difference
                     prev = None
@@ -2786,6 +2804,181 @@ class VistrailController(object):
 
         self._current_terse_graph = tersedVersionTree
         self._current_full_graph = self.vistrail.tree.getVersionTree()
+        self._terse_graph_current = self.current_version
+        self._terse_graph_last_n = set(last_n)
+        self._terse_graph_full_tree = self.full_tree
+
+    def update_terse_graph(self, added=(), changed=(), pruned=()):
+        """update_terse_graph(added: list, changed: list, pruned: list)
+        Updates the terse graph after versions were added, tagged or
+        pruned, or after the current version changed.
+
+        Only the versions around the changes are looked at, instead of the
+        whole tree; if the graph can't be updated that way,
+        recompute_terse_graph() is called instead.
+
+        """
+        if not self._update_terse_graph(added, changed, pruned):
+            self.recompute_terse_graph()
+
+    def _update_terse_graph(self, added=(), changed=(), pruned=()):
+        """Updates the terse graph in place, returns False if it couldn't.
+        """
+        graph = self._current_terse_graph
+        if (graph is None or self.full_tree != self._terse_graph_full_tree or
+                (self.refine and self.search)):
+            return False
+
+        vistrail = self.vistrail
+        tree = vistrail.tree.getVersionTree()
+        am = vistrail.actionMap
+        current_version = self.current_version
+        last_n = set(vistrail.getLastActions(self.num_versions_always_shown))
+
+        def is_pruned(version):
+            return version in am and vistrail.is_pruned(version)
+
+        def is_reachable(version):
+            # Whether recompute_terse_graph() would get to this version; the
+            # versions on the graph are, so we can stop at the first one
+            if version == 0:
+                return True
+            if version not in am or (is_pruned(version) and
+                                     version != current_version):
+                return False
+            version = tree.parent(version)
+            while version not in graph.vertices:
+                if is_pruned(version):
+                    return False
+                version = tree.parent(version)
+            return True
+
+        def children_of(version):
+            return [to for (to, _) in tree.adjacency_list[version]
+                    if (to in am) and (not vistrail.is_pruned(to) or
+                                       to == current_version)]
+
+        def is_visible(version, children):
+            return (self.full_tree or
+                    version == 0 or
+                    vistrail.has_tag(version) or
+                    len(children) != 1 or
+                    version == current_version or
+                    am[version].expand or
+                    version in last_n)
+
+        def visible_below(version):
+            # Follows the chain of hidden versions down to a visible one
+            while version not in graph.vertices:
+                children = children_of(version)
+                if not children:
+                    # version was just added, it has no vertex yet
+                    return None
+                elif len(children) != 1:
+                    raise _TerseGraphMismatch
+                version = children[0]
+            return version
+
+        def visible_above(version):
+            version = tree.parent(version)
+            while version not in graph.vertices:
+                version = tree.parent(version)
+            return version
+
+        def show(version):
+            # The visible versions below this one are children of the
+            # visible version above it, replace them with it
+            below = set(visible_below(child)
+                        for child in children_of(version))
+            below.discard(None)
+            if not below:
+                raise _TerseGraphMismatch
+            above = visible_above(version)
+            edges = graph.adjacency_list[above]
+            idx = [i for i, (to, _) in enumerate(edges) if to in below]
+            if len(idx) != len(below) or idx[-1] - idx[0] != len(idx) - 1:
+                raise _TerseGraphMismatch
+            below = [to for (to, _) in edges[idx[0]:idx[-1] + 1]]
+            graph.add_vertex(version)
+            edges[idx[0]:idx[-1] + 1] = [(version, 0)]
+            graph.inverse_adjacency_list[version].append((above, 0))
+            for to in below:
+                graph.inverse_adjacency_list[to].remove((above, 0))
+                graph.add_edge(version, to, 0)
+
+        def hide(version):
+            # Moves the children of this version up to its parent
+            above = graph.parent(version)
+            below = [to for (to, _) in graph.adjacency_list[version]]
+            edges = graph.adjacency_list[above]
+            i = edges.index((version, 0))
+            edges[i:i + 1] = [(to, 0) for to in below]
+            for to in below:
+                graph.inverse_adjacency_list[to] = [(above, 0)]
+            graph.adjacency_list[version] = []
+            graph.inverse_adjacency_list[version] = []
+            graph.delete_vertex(version)
+
+        old_current = self._terse_graph_current
+        if (is_pruned(old_current) or is_pruned(current_version) or
+                not is_reachable(current_version)):
+            return False
+        affected = set(changed)
+        affected.update(last_n.symmetric_difference(self._terse_graph_last_n))
+        affected.add(old_current)
+        affected.add(current_version)
+
+        try:
+            for version in pruned:
+                # Removes everything that was visible below this version
+                top = version
+                while top not in graph.vertices:
+                    children = [to for (to, _) in tree.adjacency_list[top]
+                                if (to in am) and not vistrail.is_pruned(to)]
+                    if len(children) != 1:
+                        raise _TerseGraphMismatch
+                    top = children[0]
+                if top == 0:
+                    raise _TerseGraphMismatch
+                to_delete = [top]
+                for v in to_delete:
+                    to_delete.extend(to for (to, _) in graph.adjacency_list[v])
+                for v in reversed(to_delete):
+                    graph.delete_vertex(v)
+                affected.add(tree.parent(version))
+
+            for version in added:
+                if version in graph.vertices or not is_reachable(version):
+                    continue
+                parent = tree.parent(version)
+                # New versions are shown after the existing siblings, which
+                # is only right if they come last in the tree
+                if tree.adjacency_list[parent][-1][0] != version:
+                    raise _TerseGraphMismatch
+                if parent not in graph.vertices:
+                    show(parent)
+                graph.add_edge(parent, version, 0)
+                affected.add(parent)
+
+            for version in sorted(affected):
+                if version is None or version < 0:
+                    continue
+                if not is_reachable(version):
+                    if version in graph.vertices:
+                        raise _TerseGraphMismatch
+                    continue
+                visible = is_visible(version, children_of(version))
+                if version in graph.vertices:
+                    if not visible:
+                        hide(version)
+                elif visible:
+                    show(version)
+        except (_TerseGraphMismatch, Graph.VertexHasNoParentError):
+            return False
+
+        self._terse_graph_current = current_version
+        self._terse_graph_last_n = last_n
+        return True
 
     def save_version_graph(self, filename, tersed=True):
         if tersed:
@@ -4005,3 +4198,76 @@ class VistrailController(object):
         return self.move_modules_ops(moves)
         
             
+
+################################################################################
+
+import unittest
+
+class TestTerseGraph(unittest.TestCase):
+    def setUp(self):
+        from vistrails.core.db.io import load_vistrail
+        from vistrails.core.db.locator import XMLFileLocator
+        import vistrails.core.system
+        locator = XMLFileLocator(
+                vistrails.core.system.vistrails_root_directory() +
+                '/tests/resources/dummy.xml')
+        (v, abstractions, thumbnails, mashups) = load_vistrail(locator)
+        self.controller = VistrailController(v, locator, abstractions,
+                                             thumbnails, mashups,
+                                             auto_save=False)
+        self.controller.num_versions_always_shown = 3
+        self.controller.change_selected_version(
+                v.get_version_number('int chain'))
+        self.controller.recompute_terse_graph()
+
+    def tearDown(self):
+        self.controller.close_vistrail(None)
+
+    def assert_terse_graph(self):
+        """Checks the updated terse graph against a recomputed one.
+        """
+        controller = self.controller
+        updated = controller._current_terse_graph
+        controller.recompute_terse_graph()
+        expected = controller._current_terse_graph
+        self.assertEqual(set(updated.vertices), set(expected.vertices))
+        for v in expected.vertices:
+            self.assertEqual(updated.adjacency_list[v],
+                             expected.adjacency_list[v])
+            self.assertEqual(updated.inverse_adjacency_list[v],
+                             expected.inverse_adjacency_list[v])
+
+    def add_version(self):
+        controller = self.controller
+        controller.add_module(basic_pkg, 'String', '', 0.0, 0.0)
+        self.assert_terse_graph()
+        return controller.current_version
+
+    def test_add(self):
+        controller = self.controller
+        start = controller.current_version
+        for i in xrange(4):
+            self.add_version()
+        controller.change_selected_version(start)
+        self.add_version()
+        controller.change_selected_version(0)
+        self.add_version()
+
+    def test_tag_and_prune(self):
+        controller = self.controller
+        vistrail = controller.vistrail
+        start = controller.current_version
+        versions = [self.add_version() for i in xrange(4)]
+        vistrail.set_tag(versions[1], 'tagged')
+        controller.update_terse_graph(changed=[versions[1]])
+        self.assert_terse_graph()
+        controller.change_selected_version(start)
+        branch = self.add_version()
+        vistrail.set_tag(versions[1], '')
+        controller.update_terse_graph(changed=[versions[1]])
+        self.assert_terse_graph()
+        vistrail.pruneVersion(versions[0])
+        controller.update_terse_graph(pruned=[versions[0]])
+        self.assert_terse_graph()
+        self.assertNotIn(versions[-1], controller._current_terse_graph.vertices)
+        self.assertIn(branch, controller._current_terse_graph.vertices)
@@ -40,6 +40,7 @@ from itertools import izip
 import weakref
 
 from vistrails.db.domain import DBModule
+from vistrails.core.cache.hasher import Hasher
 from vistrails.core.vistrail.annotation import Annotation
 from vistrails.core.vistrail.location import Location
 from vistrails.core.vistrail.module_control_param import ModuleControlParam
@@ -108,6 +109,15 @@ class Module(DBModule):
             self._module_descriptor = other._module_descriptor
         if not self.namespace:
             self.namespace = None
+        # after the setters above, which drop the memo
+        if other is None or other._signature_memo is None:
+            self._signature_memo = None
+        else:
+            self._signature_memo = other._signature_memo
+            for child in self.db_functions:
+                child._signature_parent = self
+            for child in self.db_controlParameters:
+                child._signature_parent = self
         self.function_idx = self.db_functions_id_index
         self.setup_indices()
 
@@ -169,6 +179,15 @@ class Module(DBModule):
     port_spec_list = DBModule.db_portSpecs
     internal_version = ''
 
+    # See ModuleParam.is_dirty
+    def _get_is_dirty(self):
+        return self.__dict__.get('is_dirty', True)
+    def _set_is_dirty(self, dirty):
+        self.__dict__['is_dirty'] = dirty
+        if dirty:
+            Hasher.invalidate_signature(self)
+    is_dirty = property(_get_is_dirty, _set_is_dirty)
+
     # type check this (list, hash)
     def _get_functions(self):
         self.db_functions.sort(key=lambda x: x.db_pos)
@@ -467,6 +486,9 @@ class TestModule(unittest.TestCase):
         m3 = m1.do_copy(True, id_scope, {})
         self.assertEquals(m1, m3)
         self.assertNotEquals(m1.id, m3.id)
+        m1.namespace = 'ns'
+        m4 = copy.copy(copy.copy(m1))
+        self.assertEquals(m1, m4)
 
     def test_serialization(self):
         """ Check that serialize and unserialize are working properly """
@@ -33,6 +33,7 @@
 ##
 ###############################################################################
 from vistrails.db.domain import DBControlParameter
+from vistrails.core.cache.hasher import Hasher
 
 import unittest
 import copy
@@ -41,6 +42,7 @@ class ModuleControlParam(DBControlParameter):
 
     # Valid control parameters should be put here
     LOOP_KEY = 'loop_type' # How input lists are combined
+    LOOP_PARALLEL_KEY = 'loop_parallel' # 'threads[:N]' or 'processes[:N]'
     WHILE_COND_KEY = 'while_cond' # Run module in a while loop
     WHILE_INPUT_KEY = 'while_input' # input port for forwarded value
     WHILE_OUTPUT_KEY = 'while_output' # output port for forwarded value
@@ -76,6 +78,16 @@ class ModuleControlParam(DBControlParameter):
     name = DBControlParameter.db_name
     value = DBControlParameter.db_value
 
+    # See ModuleParam.is_dirty; control parameters are not memoized but the
+    # module holding them is
+    def _get_is_dirty(self):
+        return DBControlParameter.is_dirty.__get__(self)
+    def _set_is_dirty(self, dirty):
+        DBControlParameter.is_dirty.__set__(self, dirty)
+        if dirty:
+            Hasher.invalidate_signature(self)
+    is_dirty = property(_get_is_dirty, _set_is_dirty)
+
     ##########################################################################
     # Operators
     
@@ -37,6 +37,7 @@
     * ModuleFunction
 """
 from vistrails.db.domain import DBFunction
+from vistrails.core.cache.hasher import Hasher
 from vistrails.core.modules.utils import create_port_spec_string
 from vistrails.core.utils import enum, VistrailsInternalError, all, eprint
 from vistrails.core.vistrail.module_param import ModuleParam
@@ -73,9 +74,14 @@ class ModuleFunction(DBFunction):
         if other is None:
             self.returnType = "void"
             self.is_valid = False
+            self._signature_memo = None
         else:
             self.returnType = other.returnType
             self.is_valid = other.is_valid
+            self._signature_memo = other._signature_memo
+            if self._signature_memo is not None:
+                for param in self.db_parameters:
+                    param._signature_parent = self
         self.parameter_idx = self.db_parameters_id_index
 
     def __copy__(self):
@@ -105,6 +111,15 @@ class ModuleFunction(DBFunction):
     real_id = DBFunction.db_id
     name = DBFunction.db_name   
 
+    # See ModuleParam.is_dirty
+    def _get_is_dirty(self):
+        return DBFunction.is_dirty.__get__(self)
+    def _set_is_dirty(self, dirty):
+        DBFunction.is_dirty.__set__(self, dirty)
+        if dirty:
+            Hasher.invalidate_signature(self)
+    is_dirty = property(_get_is_dirty, _set_is_dirty)
+
     def _get_sigstring(self):
         return create_port_spec_string([p.spec_tuple for p in self.params])
     sigstring = property(_get_sigstring)
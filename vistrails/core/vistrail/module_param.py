@@ -37,6 +37,7 @@
 
  """
 from vistrails.db.domain import DBParameter
+from vistrails.core.cache.hasher import Hasher
 from vistrails.core.modules.utils import parse_port_spec_item_string, \
     create_port_spec_item_string
 from vistrails.core.utils import enum
@@ -108,6 +109,7 @@ class ModuleParam(DBParameter):
         cp.evaluatedStrValue = self.evaluatedStrValue
         cp.queryMethod = self.queryMethod
         cp._port_spec_item = self._port_spec_item
+        cp._signature_memo = self.__dict__.get('_signature_memo')
 
         # cp.identifier = self.identifier
         # cp.namespace = self.namespace
@@ -143,6 +145,25 @@ class ModuleParam(DBParameter):
     strValue = DBParameter.db_val
     alias = DBParameter.db_alias
 
+    # The DB setters flag the object as dirty whenever a field changes; this
+    # is also when the memoized signature (see Hasher.parameter_signature)
+    # becomes invalid
+    def _get_is_dirty(self):
+        return DBParameter.is_dirty.__get__(self)
+    def _set_is_dirty(self, dirty):
+        DBParameter.is_dirty.__set__(self, dirty)
+        if dirty:
+            Hasher.invalidate_signature(self)
+    is_dirty = property(_get_is_dirty, _set_is_dirty)
+
+    def _get_evaluatedStrValue(self):
+        return self.__dict__.get('evaluatedStrValue', "")
+    def _set_evaluatedStrValue(self, value):
+        self.__dict__['evaluatedStrValue'] = value
+        Hasher.invalidate_signature(self)
+    evaluatedStrValue = property(_get_evaluatedStrValue,
+                                 _set_evaluatedStrValue)
+
     def parse_db_type(self):
         if self.db_type:
             (self._identifier, self._type, self._namespace) = \
@@ -339,6 +360,29 @@ class TestModuleParam(unittest.TestCase):
         self.assertEquals(p1, p3)
         self.assertNotEquals(p1.real_id, p3.real_id)
 
+    def test_convert(self):
+        """A converted DB object keeps its fields and the new attributes.
+        """
+        import cPickle
+        p1 = DBParameter(id=1, pos=0, name='value', val='3',
+                         type='org.vistrails.vistrails.basic:Integer')
+        p1.is_dirty = False
+        ModuleParam.convert(p1)
+        p1.queryMethod = 2
+        self.assertEqual(p1.strValue, '3')
+        self.assertEqual(p1.type, 'Integer')
+        self.assertFalse(p1.is_dirty)
+        copies = [p1.do_copy()] + [
+                cPickle.loads(cPickle.dumps(p1, protocol))
+                for protocol in (0, 2)]
+        for p2 in copies:
+            self.assertIsInstance(p2, ModuleParam)
+            self.assertEqual(p2.strValue, '3')
+            self.assertEqual(p2.type, 'Integer')
+            self.assertEqual(p2.queryMethod, 2)
+            self.assertEqual(p2.evaluatedStrValue, '')
+            self.assertFalse(p2.is_dirty)
+
     def test_serialization(self):
         import vistrails.core.db.io
         p1 = self.create_param()
@@ -0,0 +1,254 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Index of the modules and parameters of the versions of a vistrail.
+
+The SearchIndex is built from the operations of the actions and updated
+when an action is added, so that searching the version tree for a module or
+parameter doesn't need to materialize the pipeline of each version.
+
+For each module name, package and parameter value, the index records the
+objects that have it and the versions where these objects are added and
+removed; an object exists in the subtree of the version that adds it,
+except below the versions that remove it. The versions matching a query are
+found with a single traversal of the version tree.
+
+"""
+from vistrails.core.system import get_vistrails_basic_pkg_id
+
+__all__ = ['SearchIndex']
+
+
+# Types sharing the ids of modules
+_MODULE_TYPES = set(['module', 'abstraction', 'group'])
+
+
+def _obj_type(vt_type):
+    if vt_type in _MODULE_TYPES:
+        return 'module'
+    return vt_type
+
+
+class SearchIndex(object):
+    """Index of module names, packages and parameter values per version.
+
+    """
+    KINDS = ('module', 'package', 'parameter')
+
+    def __init__(self):
+        # kind -> value -> [object key]
+        self.values = dict((kind, {}) for kind in self.KINDS)
+        # object key -> parent object key (for functions and parameters)
+        self.parents = {}
+        # version -> [(object key, delta)]
+        self.events = {}
+        # version -> [child version]
+        self.children = {}
+        # incremented when the index changes, so results can be cached
+        self.generation = 0
+
+    @classmethod
+    def from_vistrail(cls, vistrail):
+        index = cls()
+        for action in sorted(vistrail.actions, key=lambda a: a.id):
+            index.add_action(action)
+        return index
+
+    def add_action(self, action):
+        """Updates the index with the operations of a new action.
+        """
+        version = action.db_id
+        self.children.setdefault(action.db_prevId, []).append(version)
+        events = []
+        for op in action.db_operations:
+            if op.vtType == 'add':
+                self._add_object(op.db_what, op.db_objectId,
+                                 op.db_parentObjType, op.db_parentObjId,
+                                 op.db_data, events)
+            elif op.vtType == 'change':
+                events.append(((_obj_type(op.db_what), op.db_oldObjId), -1))
+                self._add_object(op.db_what, op.db_newObjId,
+                                 op.db_parentObjType, op.db_parentObjId,
+                                 op.db_data, events)
+            elif op.vtType == 'delete':
+                events.append(((_obj_type(op.db_what), op.db_objectId), -1))
+        # only the objects that can be found are recorded
+        events = [(key, delta) for key, delta in events
+                  if key in self.parents]
+        if events:
+            self.events[version] = events
+        self.generation += 1
+
+    def _add_object(self, what, obj_id, parent_type, parent_id, data,
+                    events):
+        obj_type = _obj_type(what)
+        if data is None:
+            return
+        elif what == 'group':
+            # the name and package of groups are fixed, see Group
+            values = [('module', 'Group'),
+                      ('package', get_vistrails_basic_pkg_id())]
+        elif obj_type == 'module':
+            values = [('module', data.db_name), ('package', data.db_package)]
+        elif obj_type == 'function':
+            values = []
+        elif obj_type == 'parameter':
+            values = [('parameter', data.db_val)]
+        else:
+            return
+        key = (obj_type, obj_id)
+        if parent_type is not None and obj_type != 'module':
+            self.parents[key] = (_obj_type(parent_type), parent_id)
+        else:
+            self.parents[key] = None
+        for kind, value in values:
+            if value is not None:
+                self.values[kind].setdefault(value, []).append(key)
+        events.append((key, 1))
+
+    def find(self, kind, predicate):
+        """Returns the set of versions where a value matches.
+
+        kind is one of 'module' (module names), 'package' or 'parameter',
+        and predicate is called on the values in the index.
+
+        """
+        matching = []
+        for value, keys in self.values[kind].iteritems():
+            if predicate(value):
+                matching.extend(keys)
+        if not matching:
+            return set()
+
+        # the objects whose existence matters, and the matching objects
+        # that depend on each of them
+        dependents = {}
+        for key in matching:
+            obj = key
+            while obj is not None:
+                dependents.setdefault(obj, []).append(key)
+                obj = self.parents.get(obj)
+
+        counts = dict.fromkeys(dependents, 0)
+        found = dict.fromkeys(matching, False)
+        state = [0] # number of matching objects that exist
+
+        def apply(events, sign):
+            for obj, delta in events:
+                if obj not in counts:
+                    continue
+                counts[obj] += sign * delta
+                for key in dependents[obj]:
+                    exists = True
+                    o = key
+                    while o is not None:
+                        if counts[o] <= 0:
+                            exists = False
+                            break
+                        o = self.parents.get(o)
+                    if exists != found[key]:
+                        found[key] = exists
+                        state[0] += 1 if exists else -1
+
+        # depth-first traversal of the version tree, without recursion
+        result = set()
+        stack = [(0, True)]
+        while stack:
+            version, entering = stack.pop()
+            events = self.events.get(version, ())
+            if entering:
+                apply(events, 1)
+                if state[0] > 0:
+                    result.add(version)
+                stack.append((version, False))
+                stack.extend((child, True)
+                             for child in self.children.get(version, ()))
+            else:
+                apply(events, -1)
+        return result
+
+
+import unittest
+
+
+class TestSearchIndex(unittest.TestCase):
+    def check_index(self, vistrail, index):
+        """Compares the index with the pipelines of all the versions.
+        """
+        expected = {'module': {}, 'package': {}, 'parameter': {}}
+        for version in [0] + vistrail.actionMap.keys():
+            pipeline = vistrail.getPipeline(version)
+            for module in pipeline.modules.itervalues():
+                expected['module'].setdefault(module.name,
+                                              set()).add(version)
+                expected['package'].setdefault(module.package,
+                                               set()).add(version)
+                for function in module.functions:
+                    for param in function.params:
+                        expected['parameter'].setdefault(
+                                param.strValue, set()).add(version)
+        for kind, values in expected.iteritems():
+            for value, versions in values.iteritems():
+                self.assertEqual(index.find(kind, lambda v: v == value),
+                                 versions)
+        self.assertEqual(index.find('module', lambda v: False), set())
+
+    def load(self, name):
+        from vistrails.core.db.locator import FileLocator
+        from vistrails.core.system import vistrails_root_directory
+        import os
+        filename = os.path.join(vistrails_root_directory(),
+                                'tests', 'resources', name)
+        return FileLocator(filename).load().vistrail
+
+    def test_versions(self):
+        vistrail = self.load('terminator.vt')
+        self.check_index(vistrail, vistrail.search_index)
+
+    def test_add_action(self):
+        from vistrails.core.db.action import create_action
+        from vistrails.core.vistrail.module import Module
+        vistrail = self.load('dummy_new.vt')
+        index = vistrail.search_index
+        generation = index.generation
+        parent = max(vistrail.actionMap)
+        module = Module(id=vistrail.idScope.getNewId(Module.vtType),
+                        name='NewModule',
+                        package=get_vistrails_basic_pkg_id())
+        action = create_action([('add', module)])
+        vistrail.add_action(action, parent)
+        self.assertNotEqual(index.generation, generation)
+        self.assertEqual(index.find('module', lambda v: v == 'NewModule'),
+                         set([action.id]))
+        self.check_index(vistrail, index)
@@ -37,6 +37,7 @@ from vistrails.core.paramexplore.paramexplore import ParameterExploration
 import copy
 import datetime
 import getpass
+import heapq
 
 from vistrails.db.domain import DBVistrail
 from vistrails.db.services.io import open_vt_log_from_db, open_log_from_xml
@@ -57,6 +58,7 @@ from vistrails.core.vistrail.module_function import ModuleFunction
 from vistrails.core.vistrail.module_param import ModuleParam
 from vistrails.core.vistrail.operation import AddOp, ChangeOp, DeleteOp
 from vistrails.core.vistrail.plugin_data import PluginData
+from vistrails.core.vistrail.search_index import SearchIndex
 
 import unittest
 import copy
@@ -123,6 +125,13 @@ class Vistrail(DBVistrail):
         for action in sorted(self.actions, key=lambda a: a.id):
             self.tree.addVersion(action.id, action.prevId)
 
+        # index of modules and parameters, built when first used
+        self._search_index = None
+
+        # descriptions computed from the operations of the actions; these
+        # never change once an action is added
+        self._descriptions = {}
+
     @staticmethod
     def convert(_vistrail):
         _vistrail.__class__ = Vistrail
@@ -169,6 +178,14 @@ class Vistrail(DBVistrail):
     def _get_actionMap(self):
         return self.db_actions_id_index
     actionMap = property(_get_actionMap)
+
+    def _get_search_index(self):
+        """Gets the SearchIndex of the versions, building it if needed.
+        """
+        if self._search_index is None:
+            self._search_index = SearchIndex.from_vistrail(self)
+        return self._search_index
+    search_index = property(_get_search_index)
     
     def get_annotation(self, key):
         if self.db_has_annotation_with_key(key):
@@ -519,8 +536,9 @@ class Vistrail(DBVistrail):
         if num_actions < n:
             n = num_actions
         if n > 0:
-            sorted_keys = sorted(self.actionMap.keys())
-            last_n = sorted_keys[num_actions-n:num_actions-1]
+            # same as sorted(keys)[num_actions-n:num_actions-1], without
+            # sorting all the versions
+            last_n = heapq.nlargest(n, self.actionMap)[:0:-1]
         return last_n
 
     def hasVersion(self, version):
@@ -543,6 +561,8 @@ class Vistrail(DBVistrail):
 
         # signal to update explicit tree
         self.tree.addVersion(action.id, action.prevId)
+        if self._search_index is not None:
+            self._search_index.add_action(action)
 
     def hasTag(self, tag):
         """ hasTag(tag) -> boolean 
@@ -796,6 +816,10 @@ class Vistrail(DBVistrail):
             # if a description has been manually set, return that value
             if action.description is not None:
                 return action.description
+            try:
+                return self._descriptions[version_number]
+            except KeyError:
+                pass
             ops = action.operations
             added_modules = 0
             added_functions = 0
@@ -922,6 +946,7 @@ class Vistrail(DBVistrail):
                 description = "Deleted port"
                 if deleted_ports > 1:
                     description += "s"
+            self._descriptions[version_number] = description
         return description
 
     # FIXME: remove this function (left here only for transition)
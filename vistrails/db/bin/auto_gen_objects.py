@@ -194,6 +194,16 @@ class Field(object):
                             indices.append(index_field.getRegularName())
         return indices
 
+    def getIndexNames(self):
+        names = []
+        for index in self.getAllIndices():
+            if isinstance(index, list):
+                index = index[0]
+            if index[0] == '!':
+                index = index[1:]
+            names.append('db_%s_%s_index' % (self.getRegularName(), index))
+        return names
+
     def isInverse(self):
         try:
             return self.params['inverse'] == 'true'
@@ -411,6 +421,28 @@ class Object(object):
     def getConstructorNames(self):
         return [f.getRegularName() for f in self.getPythonFields()]
 
+    def hasSlots(self):
+        return self.params.get('slots', 'true') == 'true'
+
+    def getSlotNames(self):
+        """getSlotNames() -> list of str
+        Returns the attributes of the class generated in slots mode.
+
+        The indices and lists of deleted children are created on first use,
+        behind properties, so they have private slots. __dict__ is kept so
+        that the core classes can be converted to and add attributes.
+
+        """
+        names = []
+        for field in self.getPythonFields():
+            names.append(field.getPrivateName())
+            if field.isReference() and not field.isInverse():
+                names.append('_db_deleted_%s' % field.getRegularName())
+            if field.isPlural():
+                names.extend('_' + n for n in field.getIndexNames())
+        names.extend(['is_dirty', 'is_new', '__dict__', '__weakref__'])
+        return names
+
     def getCopyNames(self):
         return [(f.getRegularName(), f.getPrivateName()) 
                 for f in self.getPythonFields() 
@@ -148,7 +148,7 @@ def indent_python(fname):
                      stdout=subprocess.PIPE).communicate()
 
 def run_template(template_fname, objects, version, version_string, output_file,
-                 indent=False):
+                 indent=False, **kwargs):
     [prefix, suffix] = os.path.basename(template_fname).split('.', 1)
     (fd, p_fname) = tempfile.mkstemp(prefix=prefix, suffix=suffix)
     os.close(fd)
@@ -159,7 +159,8 @@ def run_template(template_fname, objects, version, version_string, output_file,
         f = open(output_file, 'w')
         f.write(template.render(objs=objects,
                                 version=version,
-                                version_string=version_string))
+                                version_string=version_string,
+                                **kwargs))
         f.close()
         if indent:
             indent_python(output_file)
@@ -227,6 +228,8 @@ def main(argv=None):
                     'b:': ('base directory', False, 'dir'),
                     'd:': ('versions directory', False, 'dir'),
                     'p': ('generate python domain classes', False),
+                    'l': ('generate python domain classes with __slots__',
+                          False),
                     's': ('generate sql schema and persistence classes', False),
                     'x': ('generate xml schema and persistence classes', False),
                     'v:': ('vistrail version tag', True, 'version'),
@@ -305,7 +308,7 @@ def main(argv=None):
             objects = parser.parse(versionDirs['specs'])
         run_template('templates/domain.py.mako', objects, version, versionName,
                      os.path.join(versionDirs['domain'], 'auto_gen.py'),
-                     True)
+                     True, slots=bool(options['l']))
 
         if not options['n']:
             domainFile = os.path.join(baseDirs['domain'], '__init__.py')
@@ -366,6 +369,18 @@ def main(argv=None):
                      os.path.join(versionDirs['sqlSchema'], 
                                   'vistrails_drop.sql'),
                      False)
+
+        run_template('templates/sql_sqlite_schema.sql.mako', sql_objects,
+                     version, versionName,
+                     os.path.join(versionDirs['sqlSchema'],
+                                  'vistrails_sqlite.sql'),
+                     False)
+
+        run_template('templates/sql_sqlite_delete.sql.mako', sql_objects,
+                     version, versionName,
+                     os.path.join(versionDirs['sqlSchema'],
+                                  'vistrails_sqlite_drop.sql'),
+                     False)
         
         run_template('templates/sql.py.mako', sql_objects,
                      version, versionName,
@@ -21,6 +21,26 @@ def getIndexKey(field_str, index):
             index = index[1:]
         return field_str + '.db_' + index
 
+def wrapNames(prefix, names, suffix, width=79, indent=4):
+    # formats a tuple of strings over as many lines as needed
+    lines = []
+    line = prefix
+    for i, name in enumerate(names):
+        item = "'%s'" % name
+        if i < len(names) - 1 or len(names) == 1:
+            item += ','
+        if i == len(names) - 1:
+            item += suffix
+        if i > 0 and indent + len(line) + 1 + len(item) > width:
+            lines.append(line)
+            line = ' ' * (indent + len(prefix)) + item
+        elif i > 0:
+            line += ' ' + item
+        else:
+            line += item
+    lines.append(line)
+    return '\n'.join(lines)
+
 def shouldIgnoreIndexDelete(index):
     if type(index) == type([]):
         return index[0][0] == '!'
@@ -65,20 +85,52 @@ def shouldIgnoreIndexDelete(index):
 
 import copy
 
+% if slots:
+def _getstate(self):
+    """Returns the state of an object that uses __slots__, as the values in
+    its __dict__ and its slots.
+
+    pickle and copy know how to restore that; without it, these objects could
+    only be pickled with protocol 2.
+    """
+    slots = {}
+    for cls in type(self).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            if name not in ('__dict__', '__weakref__'):
+                try:
+                    slots[name] = cls.__dict__[name].__get__(self)
+                except AttributeError:
+                    pass
+    return getattr(self, '__dict__', None) or None, slots
+
+% endif
 % for obj in objs:
 class ${obj.getClassName()}(object):
 
+    % if slots and obj.hasSlots():
+    ${wrapNames('__slots__ = (', obj.getSlotNames(), ')')}
+    __getstate__ = _getstate
+
+    % endif
     vtType = '${obj.getRegularName()}'
 
     def __init__(self, ${', '.join(['%s=None' % n \
                                     for n in obj.getConstructorNames()])}):
         % for field in obj.getPythonFields():
         % if field.isReference() and not field.isInverse():
+        % if slots:
+        self._db_deleted_${field.getRegularName()} = None
+        % else:
         self.db_deleted_${field.getRegularName()} = []
         % endif
+        % endif
         % if field.isPlural():
         % for index in field.getAllIndices():
+        % if slots:
+        self._db_${field.getRegularName()}_${getIndexName(index)}_index = None
+        % else:
         self.db_${field.getRegularName()}_${getIndexName(index)}_index = {}
+        % endif
         % endfor
         if ${field.getRegularName()} is None:
             % if field.getPythonType() == 'hash':
@@ -186,12 +238,21 @@ class ${obj.getClassName()}(object):
         # recreate indices and set flags
         % for field in obj.getPythonFields():
         % if len(field.getAllIndices()) > 0:
+        % if slots:
+        if cp.${field.getPrivateName()}:
+            % for index in field.getAllIndices():
+            cp.db_${field.getRegularName()}_${getIndexName(index)}_index = \
+                dict((${getIndexKey('v', index)}, v) \
+                         for v in cp.${field.getPrivateIterator()})
+            % endfor
+        % else:
         % for index in field.getAllIndices():
         cp.db_${field.getRegularName()}_${getIndexName(index)}_index = \
             dict((${getIndexKey('v', index)}, v) \
                      for v in cp.${field.getPrivateIterator()})
         % endfor
         % endif
+        % endif
         % endfor
         if not new_ids:
             cp.is_dirty = self.is_dirty
@@ -340,11 +401,20 @@ class ${obj.getClassName()}(object):
         children = []
         % if len(obj.getNonInverseReferences()) > 0:
         % for ref in obj.getNonInverseReferences():
+        % if slots:
+        if self._db_deleted_${ref.getRegularName()} is not None:
+            children.extend(self._db_deleted_${ref.getRegularName()})
+        % else:
         children.extend(self.db_deleted_${ref.getRegularName()})
+        % endif
         % endfor
         if remove:
             % for ref in obj.getNonInverseReferences():
+            % if slots:
+            self._db_deleted_${ref.getRegularName()} = None
+            % else:
             self.db_deleted_${ref.getRegularName()} = []
+            % endif
             % endfor
         % endif
         return children
@@ -373,6 +443,40 @@ class ${obj.getClassName()}(object):
         self.is_dirty = True
     ${field.getFieldName()} = property(${field.getDefineAccessor()}, \
                                             ${field.getDefineMutator()})
+    % if slots:
+    ## empty lists and indices are only created when used
+    % if field.isReference() and not field.isInverse():
+    def __get_db_deleted_${field.getRegularName()}(self):
+        if self._db_deleted_${field.getRegularName()} is None:
+            self._db_deleted_${field.getRegularName()} = []
+        return self._db_deleted_${field.getRegularName()}
+    def __set_db_deleted_${field.getRegularName()}(self, deleted):
+        self._db_deleted_${field.getRegularName()} = deleted
+    db_deleted_${field.getRegularName()} = \
+        property(__get_db_deleted_${field.getRegularName()}, \
+                     __set_db_deleted_${field.getRegularName()})
+    % endif
+    % if field.isPlural():
+    % for index in field.getAllIndices():
+    def __get_db_${field.getRegularName()}_${getIndexName(index)}_index(self):
+        if self._db_${field.getRegularName()}_${getIndexName(index)}_ \!
+                index is None:
+            self._db_${field.getRegularName()}_${getIndexName(index)}_ \!
+                index = {}
+        return self._db_${field.getRegularName()}_${getIndexName(index)}_ \!
+            index
+    def __set_db_${field.getRegularName()}_${getIndexName(index)}_index(self, \
+                                                                 index):
+        self._db_${field.getRegularName()}_${getIndexName(index)}_index = \
+            index
+    db_${field.getRegularName()}_${getIndexName(index)}_index = \
+        property(__get_db_${field.getRegularName()}_${getIndexName(index)}_ \!
+                     index, \
+                 __set_db_${field.getRegularName()}_${getIndexName(index)}_ \!
+                     index)
+    % endfor
+    % endif
+    % endif
     % if not field.isPlural():
     def ${field.getAppender()}(self, ${field.getName()}):
         self.${field.getPrivateName()} = ${field.getName()}
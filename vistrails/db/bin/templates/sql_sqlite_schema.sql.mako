@@ -0,0 +1,88 @@
+--#############################################################################
+--
+-- Copyright (C) 2011-2014, NYU-Poly.
+-- Copyright (C) 2006-2011, University of Utah. 
+-- All rights reserved.
+-- Contact: contact@vistrails.org
+--
+-- This file is part of VisTrails.
+--
+-- "Redistribution and use in source and binary forms, with or without 
+-- modification, are permitted provided that the following conditions are met:
+--
+--  - Redistributions of source code must retain the above copyright notice, 
+--    this list of conditions and the following disclaimer.
+--  - Redistributions in binary form must reproduce the above copyright 
+--    notice, this list of conditions and the following disclaimer in the 
+--    documentation and/or other materials provided with the distribution.
+--  - Neither the name of the University of Utah nor the names of its 
+--    contributors may be used to endorse or promote products derived from 
+--    this software without specific prior written permission.
+--
+-- THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+-- AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+-- THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+-- PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+-- CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+-- EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+-- PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+-- OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+-- WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+-- OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+-- ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+--
+--#############################################################################
+<%!
+def has_entity(obj):
+    columns = set(p.getColumn() for p in obj.getSQLProperties())
+    return 'entity_id' in columns and 'entity_type' in columns
+%>
+-- SQLite version of vistrails.sql: no storage engine, integer primary keys
+-- for auto-incremented ids and an index on the entity of each object
+
+CREATE TABLE `vistrails_version`(`version` char(16));
+INSERT INTO `vistrails_version`(`version`) VALUES ('${version}');
+
+CREATE TABLE thumbnail(
+    id integer primary key autoincrement,
+    file_name varchar(255),
+    image_bytes mediumblob,
+    last_modified datetime
+);
+CREATE INDEX thumbnail_file_name_idx ON thumbnail(file_name);
+
+-- generated automatically by generate.py
+
+% for obj in objs:
+CREATE TABLE ${obj.getName()}(
+% for i, prop in enumerate(obj.getSQLProperties() + obj.getSQLChoices()):
+    % if prop.isChoice():
+    % if prop.isInverse():
+    % if i != len(obj.getSQLProperties() + obj.getSQLChoices()) - 1:
+    ${prop.getSpec().getColumn()} ${prop.getSpec().getType()},
+    % else:
+    ${prop.getSpec().getColumn()} ${prop.getSpec().getType()}
+    % endif
+    % endif
+    % else:
+    % if prop.isAutoInc():
+    % if i != len(obj.getSQLProperties() + obj.getSQLChoices()) - 1:
+    ${prop.getColumn()} integer primary key autoincrement,
+    % else:
+    ${prop.getColumn()} integer primary key autoincrement
+    % endif
+    % else:
+    % if i != len(obj.getSQLProperties() + obj.getSQLChoices()) - 1:
+    ${prop.getColumn()} ${prop.getType()},
+    % else:
+    ${prop.getColumn()} ${prop.getType()}
+    % endif
+    % endif
+    % endif
+% endfor
+);
+% if has_entity(obj):
+CREATE INDEX ${obj.getName()}_entity_idx ON ${obj.getName()}(entity_id, entity_type);
+% endif
+
+% endfor
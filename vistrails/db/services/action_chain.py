@@ -33,6 +33,10 @@
 ##
 ###############################################################################
 
+from collections import deque
+import copy
+import weakref
+
 def getActionChain(obj, version, start=0):
     result = []
     currentId = version
@@ -89,31 +93,30 @@ def getCurrentOperationDict(actions, currentOperations=None):
     for action in actions:
         for operation in action.db_operations:
             operationvtType = operation.vtType
-            d = operation.__dict__
             if operationvtType == 'add':
-                currentOperations[(d['_db_what'], 
-                                   d['_db_objectId'])] = \
+                currentOperations[(operation._db_what, 
+                                   operation._db_objectId)] = \
                                    operation
             elif operationvtType == 'delete':
-                what = d['_db_what']
-                objectId = d['_db_objectId']
+                what = operation._db_what
+                objectId = operation._db_objectId
                 t = (what, objectId)
                 try:
                     del currentOperations[t]
                 except KeyError:
-                    msg = "Illegal delete operation: %d" % d['_db_id']
+                    msg = "Illegal delete operation: %d" % operation._db_id
                     raise RuntimeError(msg)
             elif operationvtType == 'change':
-                what = d['_db_what']
-                objectId = d['_db_oldObjId']
+                what = operation._db_what
+                objectId = operation._db_oldObjId
                 t = (what, objectId)
                 try:
                     del currentOperations[t]
                 except KeyError:
-                    msg = "Illegal change operation: %d" % d['_db_id']
+                    msg = "Illegal change operation: %d" % operation._db_id
                     raise RuntimeError(msg)
                 currentOperations[(what,
-                                   d['_db_newObjId'])] = operation
+                                   operation._db_newObjId)] = operation
             else:
                 msg = "Unrecognized operation '%s'" % operation.vtType
                 raise TypeError(msg)
@@ -126,3 +129,124 @@ def getCurrentOperations(actions):
     sortedOperations.sort(key=lambda x: x.db_id)
     return sortedOperations
 
+
+################################################################################
+# Checkpoints
+
+class OperationDictCheckpoints(object):
+    """Snapshots of the current operation dict of some versions of a vistrail.
+
+    A snapshot is kept for every version whose depth in the version tree is
+    a multiple of interval, so that the operation dict of any version can be
+    computed by replaying at most interval actions on top of a snapshot. At
+    most max_size snapshots are kept, the least recently used ones being
+    dropped first.
+
+    A snapshot is not used if the action of its version was replaced, but
+    changes made in place to the actions of a vistrail are not detected:
+    clearCheckpoints() has to be called after those.
+
+    """
+    def __init__(self, interval=50, max_size=64):
+        self.interval = interval
+        self.max_size = max_size
+        # version -> (action, depth, operation dict)
+        self._snapshots = {}
+        # versions, least recently used first
+        self._order = deque()
+
+    def clear(self):
+        self._snapshots.clear()
+        self._order.clear()
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def get_operation_dict(self, obj, version):
+        """get_operation_dict(obj: DBVistrail, version: int) -> dict
+
+        Returns a new current operation dict for version (see
+        getCurrentOperationDict), starting from the nearest snapshot.
+
+        """
+        actions = []
+        depth = 0
+        operations = {}
+        currentId = version
+        while currentId > 0:
+            action = obj.db_get_action_by_id(currentId)
+            snapshot = self._snapshots.get(currentId)
+            # Actions might have been replaced since the snapshot was taken
+            if snapshot is not None and snapshot[0] is action:
+                self._order.remove(currentId)
+                self._order.append(currentId)
+                depth = snapshot[1]
+                operations = copy.copy(snapshot[2])
+                break
+            actions.append(action)
+            currentId = action.db_prevId
+        actions.reverse()
+        for action in actions:
+            getCurrentOperationDict([action], operations)
+            depth += 1
+            if self.interval > 0 and depth % self.interval == 0:
+                self._add(action, depth, operations)
+        return operations
+
+    def _add(self, action, depth, operations):
+        if self.max_size <= 0:
+            return
+        if action.db_id in self._snapshots:
+            self._order.remove(action.db_id)
+        self._snapshots[action.db_id] = (action, depth, copy.copy(operations))
+        self._order.append(action.db_id)
+        while len(self._order) > self.max_size:
+            del self._snapshots[self._order.popleft()]
+
+CHECKPOINT_INTERVAL = 50
+CHECKPOINT_MAX_SIZE = 64
+
+_checkpoints = weakref.WeakKeyDictionary()
+
+def getCheckpoints(obj):
+    """getCheckpoints(obj: DBVistrail) -> OperationDictCheckpoints
+
+    Returns the checkpoints of a vistrail, creating them if needed.
+
+    """
+    try:
+        return _checkpoints[obj]
+    except KeyError:
+        checkpoints = OperationDictCheckpoints(CHECKPOINT_INTERVAL,
+                                               CHECKPOINT_MAX_SIZE)
+        _checkpoints[obj] = checkpoints
+        return checkpoints
+
+def clearCheckpoints(obj):
+    """clearCheckpoints(obj: DBVistrail) -> None
+
+    Drops the checkpoints of a vistrail; needed if actions already in the
+    vistrail are modified in place.
+
+    """
+    _checkpoints.pop(obj, None)
+
+def getVersionOperationDict(obj, version):
+    """getVersionOperationDict(obj: DBVistrail, version: int) -> dict
+
+    Same as getCurrentOperationDict(getActionChain(obj, version)), but starts
+    from the nearest checkpoint instead of the root.
+
+    """
+    return getCheckpoints(obj).get_operation_dict(obj, version)
+
+def getVersionOperations(obj, version):
+    """getVersionOperations(obj: DBVistrail, version: int) -> list
+
+    Same as getCurrentOperations(getActionChain(obj, version)), using the
+    checkpoints.
+
+    """
+    sortedOperations = getVersionOperationDict(obj, version).values()
+    sortedOperations.sort(key=lambda x: x.db_id)
+    return sortedOperations
@@ -37,8 +37,9 @@ from __future__ import with_statement
 from datetime import datetime
 from vistrails.core import debug
 from vistrails.core.bundles import py_import
-from vistrails.core.system import get_elementtree_library, strftime
-from vistrails.core.utils import Chdir
+from vistrails.core.system import get_elementtree_library, strftime, \
+    time_strptime
+from vistrails.core.utils import Chdir, versions_increasing
 from vistrails.core.mashup.mashup_trail import Mashuptrail
 from vistrails.core.modules.sub_module import get_cur_abs_namespace,\
     parse_abstraction_name, read_vistrail_from_db
@@ -46,9 +47,13 @@ from vistrails.core.modules.sub_module import get_cur_abs_namespace,\
 import vistrails.core.requirements
 
 import os.path
+import sqlite3
+import sys
 import shutil
 import tempfile
 import copy
+import struct
+import time
 import zipfile
 
 from vistrails.db import VistrailsDBException
@@ -56,14 +61,21 @@ from vistrails.db.domain import DBVistrail, DBWorkflow, DBLog, DBAbstraction, DB
     DBRegistry, DBWorkflowExec, DBOpmGraph, DBProvDocument, DBAnnotation, \
     DBMashuptrail, DBStartup
 import vistrails.db.services.abstraction
+from vistrails.db.services.sqlite import SQLiteConnection, \
+    is_sqlite_connection
 import vistrails.db.services.log
+import vistrails.db.services.log_store
 import vistrails.db.services.opm
 import vistrails.db.services.prov
 import vistrails.db.services.registry
 import vistrails.db.services.workflow
 import vistrails.db.services.vistrail
+import vistrails.db.services.xml_stream
+from vistrails.db.services.translation_cache import get_translation_cache, \
+    hash_file
 from vistrails.db.versions import getVersionDAO, currentVersion, getVersionSchemaDir, \
-    translate_vistrail, translate_workflow, translate_log, translate_registry, translate_startup
+    translate_vistrail, translate_workflow, translate_log, translate_registry, translate_startup, \
+    translate_mashuptrail
 
 import unittest
 import vistrails.core.system
@@ -73,7 +85,9 @@ ElementTree = get_elementtree_library()
 CONNECT_TIMEOUT = 15
 
 _db_lib = None
-def get_db_lib():
+def get_db_lib(db_connection=None):
+    if is_sqlite_connection(db_connection):
+        return sqlite3
     global _db_lib
     if _db_lib is None:
         MySQLdb = py_import('MySQLdb', {
@@ -88,6 +102,15 @@ def set_db_lib(lib):
     global _db_lib
     _db_lib = lib
 
+def format_db_error(e):
+    """format_db_error(e: Exception) -> str
+    Formats an error raised by the database library for a message.
+
+    """
+    if len(e.args) == 2:
+        return "%d : %s" % (e.args[0], e.args[1])
+    return str(e)
+
 
 class SaveBundle(object):
     """Transient bundle of objects to be saved or loaded.
@@ -165,17 +188,21 @@ class SaveBundle(object):
         
         return cp
 
-def format_prepared_statement(statement):
-    """format_prepared_statement(statement: str) -> str
-    Formats a prepared statement for compatibility with the currently
-    loaded database library's paramstyle.
+def format_prepared_statement(statement, db_connection=None):
+    """format_prepared_statement(statement: str, db_connection) -> str
+    Formats a prepared statement for compatibility with the paramstyle of
+    the database library of db_connection (or of the currently loaded one).
 
     Currently only supports 'qmark' and 'format' paramstyles.
     May be expanded later to allow for more compatibility options
     on input and output.  See PEP 249 for more info.
 
     """
-    style = get_db_lib().paramstyle
+    if is_sqlite_connection(db_connection):
+        # SQLiteConnection takes the same statements as MySQLdb
+        style = 'format'
+    else:
+        style = get_db_lib().paramstyle
     if style == 'format':
         return statement.replace("?", "%s")
     elif style == 'qmark':
@@ -183,10 +210,25 @@ def format_prepared_statement(statement):
     return statement
 
 def open_db_connection(config):
+    """open_db_connection(config: dict) -> connection
+    Opens a connection to the database described by config.
 
+    The keys of config are passed to MySQLdb.connect(), unless 'type' is
+    'sqlite': then 'db' is the path of the SQLite file and 'journal_mode'
+    its journal mode ('wal' by default).
+
+    """
     if config is None:
         msg = "You need to provide valid config dictionary"
         raise VistrailsDBException(msg)
+    if config.get('type') == 'sqlite':
+        try:
+            return SQLiteConnection(config['db'],
+                                    config.get('journal_mode', 'wal'),
+                                    config.get('connect_timeout'))
+        except sqlite3.Error, e:
+            msg = "cannot open connection (%s)" % format_db_error(e)
+            raise VistrailsDBException(msg)
     if 'connect_timeout' not in config:
         config['connect_timeout'] = CONNECT_TIMEOUT
     try:
@@ -196,7 +238,7 @@ def open_db_connection(config):
         return db_connection
     except get_db_lib().Error, e:
         # should have a DB exception type
-        msg = "cannot open connection (%d: %s)" % (e.args[0], e.args[1])
+        msg = "cannot open connection (%s)" % format_db_error(e)
         raise VistrailsDBException(msg)
 
 def close_db_connection(db_connection):
@@ -209,13 +251,16 @@ def test_db_connection(config):
     
     """
     #print "Testing config", config
+    if config.get('type') == 'sqlite':
+        close_db_connection(open_db_connection(config))
+        return
     if 'connect_timeout' not in config:
         config['connect_timeout'] = CONNECT_TIMEOUT
     try:
         db_connection = get_db_lib().connect(**config)
         close_db_connection(db_connection)
     except get_db_lib().Error, e:
-        msg = "connection test failed (%d: %s)" % (e.args[0], e.args[1])
+        msg = "connection test failed (%s)" % format_db_error(e)
         raise VistrailsDBException(msg)
     except TypeError, e:
         msg = "connection test failed (%s)" %str(e)
@@ -229,7 +274,7 @@ def ping_db_connection(db_connection):
     """
     try:
         db_connection.ping()
-    except get_db_lib().OperationalError:
+    except get_db_lib(db_connection).OperationalError:
         return False
     return True
     
@@ -287,9 +332,9 @@ def get_db_object_list(config, obj_type):
         c.close()
         close_db_connection(db)
         
-    except get_db_lib().Error, e:
-        msg = "Couldn't get list of vistrails objects from db (%d : %s)" % \
-            (e.args[0], e.args[1])
+    except get_db_lib(db).Error, e:
+        msg = "Couldn't get list of vistrails objects from db (%s)" % \
+            format_db_error(e)
         raise VistrailsDBException(msg)
     return result
 
@@ -307,9 +352,12 @@ def get_db_object_modification_time(db_connection, obj_id, obj_type):
         db_connection.commit()
         time = c.fetchall()[0][0]
         c.close()
-    except get_db_lib().Error, e:
-        msg = "Couldn't get object modification time from db (%d : %s)" % \
-            (e.args[0], e.args[1])
+        if isinstance(time, basestring):
+            # sqlite3 returns dates as strings
+            time = datetime(*time_strptime(time, '%Y-%m-%d %H:%M:%S')[0:6])
+    except get_db_lib(db_connection).Error, e:
+        msg = "Couldn't get object modification time from db (%s)" % \
+            format_db_error(e)
         raise VistrailsDBException(msg)
     return time
 
@@ -326,9 +374,9 @@ def get_db_object_version(db_connection, obj_id, obj_type):
         c.execute(command % (translate_to_tbl_name(obj_type), obj_id))
         version = c.fetchall()[0][0]
         c.close()
-    except get_db_lib().Error, e:
-        msg = "Couldn't get object version from db (%d : %s)" % \
-            (e.args[0], e.args[1])
+    except get_db_lib(db_connection).Error, e:
+        msg = "Couldn't get object version from db (%s)" % \
+            format_db_error(e)
         raise VistrailsDBException(msg)
     return version
 
@@ -343,7 +391,7 @@ def get_db_version(db_connection):
         c.execute(command)
         version = c.fetchall()[0][0]
         c.close()
-    except get_db_lib().Error, e:
+    except get_db_lib(db_connection).Error, e:
         # just return None if we hit an error
         return None
     return version
@@ -373,7 +421,7 @@ def get_db_id_from_name(db_connection, obj_type, name):
         else:
             c.close()
             return int(rows[0][0])
-    except get_db_lib().Error, e:
+    except get_db_lib(db_connection).Error, e:
         c.close()
         msg = "Connection error when trying to get db id from name"
         raise VistrailsDBException(msg)
@@ -404,9 +452,9 @@ def get_db_abstraction_modification_time(db_connection, abstraction):
                              id_value))
         modtime = c.fetchall()[0][0]
         c.close()
-    except get_db_lib().Error, e:
-        msg = "Couldn't get modification time from db (%d : %s)" % \
-            (e.args[0], e.args[1])
+    except get_db_lib(db_connection).Error, e:
+        msg = "Couldn't get modification time from db (%s)" % \
+            format_db_error(e)
         raise VistrailsDBException(msg)
     return modtime
 
@@ -441,9 +489,9 @@ def get_db_ids_from_vistrail(db_connection, vt_id, id_key):
         c.execute(command%(translate_to_tbl_name(DBAnnotation.vtType), id_key, vt_id))
         abs_ids = c.fetchall()
         c.close()
-    except get_db_lib().Error, e:
-        msg = "Couldn't get object ids from db (%d : %s)" % \
-            (e.args[0], e.args[1])
+    except get_db_lib(db_connection).Error, e:
+        msg = "Couldn't get object ids from db (%s)" % \
+            format_db_error(e)
         raise VistrailsDBException(msg)
     return [i[0] for i in abs_ids]
 
@@ -478,9 +526,9 @@ def get_matching_abstraction_id(db_connection, abstraction):
         if len(result) > 0:
             #print 'got result:', result
             id = result[0][0]
-    except get_db_lib().Error, e:
-        msg = "Couldn't get object modification time from db (%d : %s)" % \
-            (e.args[0], e.args[1])
+    except get_db_lib(db_connection).Error, e:
+        msg = "Couldn't get object modification time from db (%s)" % \
+            format_db_error(e)
         raise VistrailsDBException(msg)
     return id
 
@@ -517,10 +565,15 @@ def setup_db_tables(db_connection, version=None, old_version=None):
                     c.execute(cmd)
                     cmd = ""
 
+        if is_sqlite_connection(db_connection):
+            schema_name = 'vistrails_sqlite'
+        else:
+            schema_name = 'vistrails'
+
         # delete tables
         c = db_connection.cursor()
         schemaDir = getVersionSchemaDir(old_version)
-        f = open(os.path.join(schemaDir, 'vistrails_drop.sql'))
+        f = open(os.path.join(schemaDir, schema_name + '_drop.sql'))
         execute_file(c, f)
 #         db_script = f.read()
 #         c.execute(db_script)
@@ -530,13 +583,15 @@ def setup_db_tables(db_connection, version=None, old_version=None):
         # create tables        
         c = db_connection.cursor()
         schemaDir = getVersionSchemaDir(version)
-        f = open(os.path.join(schemaDir, 'vistrails.sql'))
+        f = open(os.path.join(schemaDir, schema_name + '.sql'))
         execute_file(c, f)
 #         db_script = f.read()
 #         c.execute(db_script)
         f.close()
         c.close()
-    except get_db_lib().Error, e:
+        # MySQL commits DDL statements implicitly, sqlite doesn't
+        db_connection.commit()
+    except get_db_lib(db_connection).Error, e:
         raise VistrailsDBException("unable to create tables: " + str(e))
 
 ##############################################################################
@@ -653,6 +708,7 @@ def close_zip_xml(temp_dir):
     """
     if temp_dir is None:
         return
+    _zip_bundles.pop(temp_dir, None)
     if not os.path.isdir(temp_dir):
         if os.path.isfile(temp_dir):
             os.remove(temp_dir)
@@ -669,6 +725,146 @@ def close_zip_xml(temp_dir):
     except OSError, e:
         raise VistrailsDBException("Can't remove %s: %s" % (temp_dir, str(e)))
 
+class ZipBundle(object):
+    """Tracks the members of a .vt file that are extracted lazily.
+
+    Opening a vistrail bundle parses the vistrail straight from the zip file
+    and only extracts the members that are needed right away. The log and the
+    thumbnails stay in the zip file until extract_bundle_file() is called on
+    their path in the bundle directory. When the bundle is saved, members that
+    were not modified are copied from the original zip file without being
+    recompressed.
+
+    """
+    def __init__(self, filename, directory):
+        self.filename = filename
+        self.directory = directory
+        # members that were not extracted
+        self.pending = set()
+        # member -> (size, mtime) of the extracted file
+        self.extracted = {}
+
+    def path(self, name):
+        return os.path.join(self.directory, *name.split('/'))
+
+    def member_name(self, path):
+        path = os.path.abspath(path)
+        directory = os.path.abspath(self.directory)
+        if not path.startswith(directory + os.sep):
+            return None
+        return path[len(directory) + 1:].replace(os.sep, '/')
+
+    def extract(self, name):
+        if name in self.pending:
+            z = zipfile.ZipFile(self.filename)
+            try:
+                z.extract(name, self.directory)
+            finally:
+                z.close()
+            self.pending.discard(name)
+            self.mark_extracted(name)
+        return self.path(name)
+
+    def mark_extracted(self, name):
+        st = os.stat(self.path(name))
+        self.extracted[name] = (st.st_size, st.st_mtime)
+
+    def is_unchanged(self, name):
+        """is_unchanged(name: str) -> bool
+
+        Whether an extracted member was left untouched, so that it can be
+        copied as-is from the original zip file.
+
+        """
+        if name not in self.extracted:
+            return False
+        try:
+            st = os.stat(self.path(name))
+        except OSError:
+            return False
+        return self.extracted[name] == (st.st_size, st.st_mtime)
+
+# bundle directory -> ZipBundle
+_zip_bundles = {}
+
+def _find_pending_member(filename):
+    for bundle in _zip_bundles.itervalues():
+        name = bundle.member_name(filename)
+        if name is not None and name in bundle.pending:
+            return bundle, name
+    return None, None
+
+def extract_bundle_file(filename):
+    """extract_bundle_file(filename: str) -> str
+    Makes sure a file from an opened .vt bundle exists on disk, extracting it
+    from the zip file if it was deferred. Returns filename.
+
+    """
+    if filename is not None and not os.path.exists(filename):
+        bundle, name = _find_pending_member(filename)
+        if bundle is not None:
+            return bundle.extract(name)
+    return filename
+
+def get_bundle_file_info(filename):
+    """get_bundle_file_info(filename: str) -> (size, mtime)
+    Returns the size and modification time of a file from an opened .vt
+    bundle, without extracting it.
+
+    """
+    if not os.path.exists(filename):
+        bundle, name = _find_pending_member(filename)
+        if bundle is not None:
+            z = zipfile.ZipFile(bundle.filename)
+            try:
+                info = z.getinfo(name)
+            finally:
+                z.close()
+            return (info.file_size,
+                    time.mktime(info.date_time + (0, 0, -1)))
+    st = os.stat(filename)
+    return (st.st_size, st.st_mtime)
+
+# _copy_zip_member() writes the compressed data of members directly, using
+# internals of the zipfile module as it is in Python 2.7
+_RAW_ZIP_COPY = (sys.version_info[:2] == (2, 7) and
+                 hasattr(zipfile, '_FH_FILENAME_LENGTH') and
+                 hasattr(zipfile, '_FH_EXTRA_FIELD_LENGTH'))
+
+def _copy_zip_member(zin, zout, name):
+    """Copies a member between zip files without recompressing it.
+
+    If the zipfile module is not the one this was written for, the member
+    is decompressed and compressed again instead.
+
+    """
+    info = zin.getinfo(name)
+    if not _RAW_ZIP_COPY:
+        zout.writestr(copy.copy(info), zin.read(name))
+        return
+    zin.fp.seek(info.header_offset)
+    header = struct.unpack(zipfile.structFileHeader,
+                           zin.fp.read(zipfile.sizeFileHeader))
+    zin.fp.seek(header[zipfile._FH_FILENAME_LENGTH] +
+                header[zipfile._FH_EXTRA_FIELD_LENGTH], 1)
+    new_info = copy.copy(info)
+    new_info.header_offset = zout.fp.tell()
+    # sizes and CRC are known, no data descriptor is needed
+    new_info.flag_bits &= ~0x08
+    new_info.extra = ''
+    zout.fp.write(new_info.FileHeader())
+    remaining = info.compress_size
+    while remaining > 0:
+        data = zin.fp.read(min(remaining, 1 << 20))
+        if not data:
+            raise VistrailsDBException("Truncated member %s in %s" %
+                                       (name, zin.filename))
+        zout.fp.write(data)
+        remaining -= len(data)
+    zout.filelist.append(new_info)
+    zout.NameToInfo[new_info.filename] = new_info
+    zout._didModify = True
+
 def serialize(object):
     daoList = getVersionDAO(currentVersion)
     return daoList.serialize(object)
@@ -680,16 +876,39 @@ def unserialize(str, obj_type):
 ##############################################################################
 # Vistrail I/O
 
-def open_vistrail_from_xml(filename):
-    """open_vistrail_from_xml(filename) -> Vistrail"""
-    tree = ElementTree.parse(filename)
-    version = get_version_for_xml(tree.getroot())
+def open_vistrail_from_xml(filename, tree=None, digest=None):
+    """open_vistrail_from_xml(filename) -> Vistrail
+
+    A vistrail saved with an older schema is read from the translation
+    cache if it is there, and added to it otherwise. digest is the hash of
+    the file, if the caller already knows it.
+
+    """
+    stream = None
+    if tree is None:
+        # abstractions of a .vt file are only extracted when they are read
+        filename = extract_bundle_file(filename)
+        # actions are converted while the file is read
+        tree = stream = vistrails.db.services.xml_stream.parse(filename)
     try:
-        daoList = getVersionDAO(version)
-        vistrail = daoList.open_from_xml(filename, DBVistrail.vtType, tree)
+        version = get_version_for_xml(tree.getroot())
+        vistrail = None
+        cache = None
+        if versions_increasing(version, currentVersion):
+            cache = get_translation_cache()
+        if cache is not None:
+            if digest is None:
+                digest = hash_file(filename)
+            vistrail = cache.load(digest)
         if vistrail is None:
-            raise VistrailsDBException("Couldn't read vistrail from XML")
-        vistrail = translate_vistrail(vistrail, version)
+            daoList = getVersionDAO(version)
+            vistrail = daoList.open_from_xml(filename, DBVistrail.vtType,
+                                             tree)
+            if vistrail is None:
+                raise VistrailsDBException("Couldn't read vistrail from XML")
+            vistrail = translate_vistrail(vistrail, version)
+            if cache is not None:
+                cache.store(digest, vistrail)
         vistrails.db.services.vistrail.update_id_scope(vistrail)
     except VistrailsDBException, e:
         if str(e).startswith('VistrailsDBException: Cannot find DAO for'):
@@ -697,6 +916,9 @@ def open_vistrail_from_xml(filename):
                 "This vistrail was created by a newer version of VisTrails "
                 "and cannot be opened.")
         raise e
+    finally:
+        if stream is not None:
+            stream.close()
 
     return vistrail
 
@@ -710,12 +932,7 @@ def open_vistrail_bundle_from_zip_xml(filename):
 
     """
     vt_save_dir = tempfile.mkdtemp(prefix='vt_save')
-
-    z = zipfile.ZipFile(filename)
-    try:
-        z.extractall(vt_save_dir)
-    finally:
-        z.close()
+    bundle = ZipBundle(os.path.abspath(filename), vt_save_dir)
 
     vistrail = None
     log = None
@@ -725,46 +942,82 @@ def open_vistrail_bundle_from_zip_xml(filename):
     thumbnail_files = []
     mashups = []
     try:
-        for root, dirs, files in os.walk(vt_save_dir):
-            for fname in files:
-                if fname == 'vistrail' and root == vt_save_dir:
-                    vistrail = open_vistrail_from_xml(os.path.join(root, fname))
-                elif fname == 'log' and root == vt_save_dir:
-                    # FIXME read log to get execution info
-                    # right now, just ignore the file
-                    log = None 
-                    log_fname = os.path.join(root, fname)
-                    # log = open_log_from_xml(os.path.join(root, fname))
-                    # objs.append(DBLog.vtType, log)
-                elif fname.startswith('abstraction_'):
-                    abstraction_file = os.path.join(root, fname)
-                    abstraction_files.append(abstraction_file)
-                elif (fname.endswith('.png') and
-                      root == os.path.join(vt_save_dir,'thumbs')):
-                    thumbnail_file = os.path.join(root, fname)
-                    thumbnail_files.append(thumbnail_file)
-                elif root == os.path.join(vt_save_dir,'mashups'):
-                    mashup_file = os.path.join(root, fname)
-                    mashup = open_mashuptrail_from_xml(mashup_file)
-                    mashups.append(mashup)
+        z = zipfile.ZipFile(filename)
+    except (IOError, zipfile.BadZipfile), e:
+        raise VistrailsDBException("Error when reading vt file: %s" % e)
+    try:
+        # only the vistrail is read now, the log, thumbnails and
+        # abstractions are extracted on demand
+        for name in z.namelist():
+            if name.endswith('/'):
+                continue
+            bundle.pending.add(name)
+            fname = name.rsplit('/', 1)[-1]
+            root = name[:-len(fname)].rstrip('/')
+            if name == 'vistrail':
+                f = z.open(name)
+                try:
+                    tree = vistrails.db.services.xml_stream.parse(f)
+                    version = get_version_for_xml(tree.getroot())
+                    if versions_increasing(version, '0.8.0'):
+                        # old schemas are read with minidom from the file
+                        tree.close()
+                        vistrail = open_vistrail_from_xml(bundle.extract(name))
+                    else:
+                        digest = None
+                        if versions_increasing(version, currentVersion):
+                            # the member might not be extracted
+                            g = z.open(name)
+                            try:
+                                digest = hash_file(g)
+                            finally:
+                                g.close()
+                        vistrail = open_vistrail_from_xml(bundle.path(name),
+                                                          tree, digest)
+                finally:
+                    f.close()
+            elif name == 'log':
+                # FIXME read log to get execution info
+                # right now, just ignore the file
+                log = None
+                log_fname = bundle.path(name)
+                # log = open_log_from_xml(os.path.join(root, fname))
+                # objs.append(DBLog.vtType, log)
+            elif fname.startswith('abstraction_'):
+                # read by open_vistrail_from_xml() when it is used
+                abstraction_files.append(bundle.path(name))
+            elif fname.endswith('.png') and root == 'thumbs':
+                thumbnail_files.append(bundle.path(name))
+            elif root == 'mashups':
+                f = z.open(name)
+                try:
+                    mashups.append(open_mashuptrail_from_xml(f))
+                finally:
+                    f.close()
+            else:
+                handled = False
+                from vistrails.core.packagemanager import get_package_manager
+                pm = get_package_manager()
+                for package in pm.enabled_package_list():
+                    if package.can_handle_vt_file(fname):
+                        handled = True
+                        continue
+                if handled:
+                    # package hooks expect their files in the directory
+                    bundle.extract(name)
                 else:
-                    handled = False
-                    from vistrails.core.packagemanager import get_package_manager
-                    pm = get_package_manager()
-                    for package in pm.enabled_package_list():
-                        if package.can_handle_vt_file(fname):
-                            handled = True
-                            continue
-                    if not handled:
-                        unknown_files.append(os.path.join(root, fname))
-    except OSError, e:
+                    unknown_files.append(bundle.path(name))
+    except (OSError, IOError, zipfile.BadZipfile), e:
         raise VistrailsDBException("Error when reading vt file")
+    finally:
+        z.close()
     if len(unknown_files) > 0:
         raise VistrailsDBException("Unknown files in vt file: %s" % \
                                        unknown_files)
     if vistrail is None:
         raise VistrailsDBException("vt file does not contain vistrail")
     vistrail.db_log_filename = log_fname
+    _zip_bundles[vt_save_dir] = bundle
 
     # call package hooks
     from vistrails.core.packagemanager import get_package_manager
@@ -876,6 +1129,9 @@ def save_vistrail_bundle_to_zip_xml(save_bundle, filename, vt_save_dir=None, ver
                                    'bundle does not contain a vistrail')
     if not vt_save_dir:
         vt_save_dir = tempfile.mkdtemp(prefix='vt_save')
+    bundle = _zip_bundles.get(vt_save_dir)
+    # members copied from the original file without being extracted
+    kept_members = set()
     # abstractions are saved in the root of the zip file
     # abstraction_dir = os.path.join(vt_save_dir, 'abstractions')
     #thumbnails and mashups have their own folder
@@ -890,13 +1146,31 @@ def save_vistrail_bundle_to_zip_xml(save_bundle, filename, vt_save_dir=None, ver
     if save_bundle.vistrail.db_log_filename is not None:
         xml_fname = os.path.join(vt_save_dir, 'log')
         if save_bundle.vistrail.db_log_filename != xml_fname:
-            shutil.copyfile(save_bundle.vistrail.db_log_filename, xml_fname)
+            shutil.copyfile(
+                    extract_bundle_file(save_bundle.vistrail.db_log_filename),
+                    xml_fname)
             save_bundle.vistrail.db_log_filename = xml_fname
+        elif bundle is not None and 'log' in bundle.pending:
+            kept_members.add('log')
 
     if save_bundle.log is not None:
         xml_fname = os.path.join(vt_save_dir, 'log')
+        # the new executions are appended to the log
+        extract_bundle_file(xml_fname)
+        kept_members.discard('log')
+        if os.path.exists(xml_fname):
+            offset = os.path.getsize(xml_fname)
+        else:
+            offset = 0
         save_log_to_xml(save_bundle.log, xml_fname, version, True)
         save_bundle.vistrail.db_log_filename = xml_fname
+        try:
+            vistrails.db.services.log_store.update_log_store(
+                xml_fname, save_bundle.log.db_workflow_execs, offset)
+        except Exception, e:
+            # the store is rebuilt from the log when it is next opened
+            debug.warning("Could not update the execution log store",
+                          e)
 
     # Save Abstractions
     saved_abstractions = []
@@ -915,10 +1189,16 @@ def save_vistrail_bundle_to_zip_xml(save_bundle, filename, vt_save_dir=None, ver
             #     os.mkdir(abstraction_dir)
             # print "obj:", obj
             # print "xml_fname:", xml_fname
+            if obj == xml_fname and bundle is not None:
+                name = bundle.member_name(xml_fname)
+                if name in bundle.pending:
+                    # never read, copied from the original file
+                    kept_members.add(name)
+                    continue
             if obj != xml_fname:
                 # print 'copying %s -> %s' % (obj, xml_fname)
                 try:
-                    shutil.copyfile(obj, xml_fname)
+                    shutil.copyfile(extract_bundle_file(obj), xml_fname)
                 except Exception, e:
                     saved_abstractions.pop()
                     debug.critical('copying %s -> %s failed: %s' % \
@@ -935,9 +1215,16 @@ def save_vistrail_bundle_to_zip_xml(save_bundle, filename, vt_save_dir=None, ver
             saved_thumbnails.append(png_fname)
             if not os.path.exists(thumbnail_dir):
                 os.mkdir(thumbnail_dir)
-            
+
+            if obj == png_fname and bundle is not None:
+                name = bundle.member_name(png_fname)
+                if name in bundle.pending:
+                    # still in the original file, same as an unchanged file
+                    kept_members.add(name)
+                    saved_thumbnails.pop()
+                    continue
             try:
-                shutil.copyfile(obj, png_fname)
+                shutil.copyfile(extract_bundle_file(obj), png_fname)
             except shutil.Error, e:
                 #files are the same no need to show warning
                 saved_thumbnails.pop()
@@ -975,18 +1262,45 @@ def save_vistrail_bundle_to_zip_xml(save_bundle, filename, vt_save_dir=None, ver
     tmp_zip_dir = tempfile.mkdtemp(prefix='vt_zip')
     tmp_zip_file = os.path.join(tmp_zip_dir, "vt.zip")
 
+    written_members = []
     z = zipfile.ZipFile(tmp_zip_file, 'w')
     try:
-        with Chdir(vt_save_dir):
-            # zip current directory
-            for root, dirs, files in os.walk('.'):
-                for f in files:
-                    z.write(os.path.join(root, f))
+        zin = None
+        if bundle is not None and os.path.exists(bundle.filename):
+            zin = zipfile.ZipFile(bundle.filename)
+        try:
+            with Chdir(vt_save_dir):
+                # zip current directory, copying the members that didn't
+                # change from the original file
+                for root, dirs, files in os.walk('.'):
+                    for f in files:
+                        name = os.path.normpath(os.path.join(root, f))
+                        name = name.replace(os.sep, '/')
+                        if (zin is not None and bundle.is_unchanged(name) and
+                                name in zin.NameToInfo):
+                            _copy_zip_member(zin, z, name)
+                        else:
+                            z.write(name)
+                        written_members.append(name)
+            for name in sorted(kept_members):
+                _copy_zip_member(zin, z, name)
+        finally:
+            if zin is not None:
+                zin.close()
         z.close()
         shutil.copyfile(tmp_zip_file, filename)
     finally:
         os.unlink(tmp_zip_file)
         os.rmdir(tmp_zip_dir)
+
+    # the saved file is now the reference for the next save
+    if bundle is None:
+        bundle = ZipBundle(filename, vt_save_dir)
+        _zip_bundles[vt_save_dir] = bundle
+    bundle.filename = os.path.abspath(filename)
+    bundle.pending = kept_members
+    for name in written_members:
+        bundle.mark_extracted(name)
     save_bundle = SaveBundle(save_bundle.bundle_type, save_bundle.vistrail,
                              save_bundle.log, thumbnails=saved_thumbnails,
                              abstractions=saved_abstractions,
@@ -1185,37 +1499,57 @@ def get_saved_workflows(vistrail, db_connection):
 ##############################################################################
 # Logging I/O
 
+def read_workflow_exec_from_xml(node):
+    """read_workflow_exec_from_xml(node) -> DBWorkflowExec
+    Reads a single workflow execution, as stored in an appended log,
+    and translates it to the current version.
+
+    """
+    version = get_version_for_xml(node)
+    daoList = getVersionDAO(version)
+    workflow_exec = daoList.read_xml_object(DBWorkflowExec.vtType, node)
+    if version != currentVersion:
+        # if version is wrong, dump this into a dummy log object, 
+        # then translate, then get workflow_exec back
+        log = DBLog()
+        translate_log(log, currentVersion, version)
+        log.db_add_workflow_exec(workflow_exec)
+        log = translate_log(log, version)
+        workflow_exec = log.db_workflow_execs[0]
+    return workflow_exec
+
+def iter_workflow_execs_from_xml(filename, start=0, end=None):
+    """iter_workflow_execs_from_xml(filename, start: int, end: int)
+         -> iterator of DBWorkflowExec
+    Reads the workflow executions of an appended log one at a time,
+    optionally only those written between the start and end offsets.
+
+    """
+    tree = vistrails.db.services.xml_stream.parse_fragments(filename, 'log',
+                                                            start, end)
+    try:
+        for node in tree.getroot().getchildren():
+            yield read_workflow_exec_from_xml(node)
+    finally:
+        tree.close()
+
 def open_log_from_xml(filename, was_appended=False):
     """open_log_from_xml(filename) -> DBLog"""
+    # the log of a .vt file is only extracted when it is read
+    filename = extract_bundle_file(filename)
     if was_appended:
-        parser = ElementTree.XMLTreeBuilder()
-        parser.feed("<log>\n")
-        f = open(filename, "rb")
-        parser.feed(f.read())
-        parser.feed("</log>\n")
-        root = parser.close()
-        workflow_execs = []
-        for node in root:
-            version = get_version_for_xml(node)
-            daoList = getVersionDAO(version)
-            workflow_exec = \
-                daoList.read_xml_object(DBWorkflowExec.vtType, node)
-            if version != currentVersion:
-                # if version is wrong, dump this into a dummy log object, 
-                # then translate, then get workflow_exec back
-                log = DBLog()
-                translate_log(log, currentVersion, version)
-                log.db_add_workflow_exec(workflow_exec)
-                log = translate_log(log, version)
-                workflow_exec = log.db_workflow_execs[0]
-            workflow_execs.append(workflow_exec)
+        workflow_execs = list(iter_workflow_execs_from_xml(filename))
         log = DBLog(workflow_execs=workflow_execs)
         vistrails.db.services.log.update_ids(log)
     else:
-        tree = ElementTree.parse(filename)
-        version = get_version_for_xml(tree.getroot())
-        daoList = getVersionDAO(version)
-        log = daoList.open_from_xml(filename, DBLog.vtType, tree)
+        # workflow executions are converted while the file is read
+        tree = vistrails.db.services.xml_stream.parse(filename)
+        try:
+            version = get_version_for_xml(tree.getroot())
+            daoList = getVersionDAO(version)
+            log = daoList.open_from_xml(filename, DBLog.vtType, tree)
+        finally:
+            tree.close()
         log = translate_log(log, version)
         vistrails.db.services.log.update_id_scope(log)
     return log
@@ -1248,8 +1582,8 @@ def open_vt_log_from_db(db_connection, vt_id, version=None):
             res = c.execute("SELECT id FROM log_tbl WHERE vistrail_id=%s;", (vt_id,))
             ids = [i[0] for i in c.fetchall()]
             c.close()
-        except get_db_lib().Error, e:
-            debug.critical("Error getting log id:s %d: %s" % (e.args[0], e.args[1]))
+        except get_db_lib(db_connection).Error, e:
+            debug.critical("Error getting log id:s %s" % format_db_error(e))
     log = DBLog()
     if hasattr(dao_list, 'open_many_from_db'): # does not exist pre 1.0.2
         logs = dao_list.open_many_from_db(db_connection, DBLog.vtType, ids)
@@ -1579,15 +1913,15 @@ def open_thumbnails_from_db(db_connection, obj_type, obj_id, tmp_dir=None):
     SELECT a.value
     FROM action_annotation a
     WHERE a.akey = '__thumb__' AND a.entity_id = ? AND a.entity_type = ?
-    """)
+    """, db_connection)
     try:
         c = db_connection.cursor()
         c.execute(prepared_statement, (obj_id, obj_type))
         file_names = [file_name for (file_name,) in c.fetchall()]
         c.close()
-    except get_db_lib().Error, e:
-        msg = "Couldn't get thumbnails list from db (%d : %s)" % \
-            (e.args[0], e.args[1])
+    except get_db_lib(db_connection).Error, e:
+        msg = "Couldn't get thumbnails list from db (%s)" % \
+            format_db_error(e)
         raise VistrailsDBException(msg)
     # Next get all thumbnails from the db that aren't already in tmp_dir
     get_db_file_names = [fname for fname in file_names if fname not in os.listdir(tmp_dir)]
@@ -1597,15 +1931,15 @@ def open_thumbnails_from_db(db_connection, obj_type, obj_id, tmp_dir=None):
         SELECT t.image_bytes
         FROM thumbnail t
         WHERE t.file_name = ?
-        """)
+        """, db_connection)
         try:
             c = db_connection.cursor()
             c.execute(prepared_statement, (file_name,))
             row = c.fetchone()
             c.close()
-        except get_db_lib().Error, e:
-            msg = "Couldn't get thumbnail from db (%d : %s)" % \
-                (e.args[0], e.args[1])
+        except get_db_lib(db_connection).Error, e:
+            msg = "Couldn't get thumbnail from db (%s)" % \
+                format_db_error(e)
             raise VistrailsDBException(msg)
         if row is not None:
             image_bytes = row[0]
@@ -1649,9 +1983,9 @@ def save_thumbnails_to_db(absfnames, db_connection):
         c.execute(statement % sql_in_token)
         db_file_names = [file_name for (file_name,) in c.fetchall()]
         c.close()
-    except get_db_lib().Error, e:
-        msg = "Couldn't check which thumbnails already exist in db (%d : %s)" % \
-            (e.args[0], e.args[1])
+    except get_db_lib(db_connection).Error, e:
+        msg = "Couldn't check which thumbnails already exist in db (%s)" % \
+            format_db_error(e)
         raise VistrailsDBException(msg)
     insert_absfnames = [absfname for absfname in absfnames if os.path.basename(absfname) not in db_file_names]
 
@@ -1660,22 +1994,24 @@ def save_thumbnails_to_db(absfnames, db_connection):
     """
     INSERT INTO thumbnail(file_name, image_bytes, last_modified)
     VALUES (?, ?, ?)
-    """)
+    """, db_connection)
     try:
         c = db_connection.cursor()
         for absfname in insert_absfnames:
-            image_file = open(absfname, 'rb')
+            image_file = open(extract_bundle_file(absfname), 'rb')
             image_bytes = image_file.read()
             image_file.close()
+            if is_sqlite_connection(db_connection):
+                image_bytes = sqlite3.Binary(image_bytes)
             c.execute(prepared_statement, (os.path.basename(absfname), image_bytes, strftime(get_current_time(db_connection), '%Y-%m-%d %H:%M:%S')))
             db_connection.commit()
         c.close()
     except IOError, e:
         msg = "Couldn't read thumbnail file for writing to db: %s" % absfname
         raise VistrailsDBException(msg)
-    except get_db_lib().Error, e:
-        msg = "Couldn't insert thumbnail into db (%d : %s)" % \
-            (e.args[0], e.args[1])
+    except get_db_lib(db_connection).Error, e:
+        msg = "Couldn't insert thumbnail into db (%s)" % \
+            format_db_error(e)
         raise VistrailsDBException(msg)
     return None
 ##############################################################################
@@ -1696,6 +2032,7 @@ def open_mashuptrail_from_xml(filename):
         mashuptrail = daoList.open_from_xml(filename, DBMashuptrail.vtType, tree)
         if old_version == "0.1.0":
             mashuptrail.db_version = version
+        mashuptrail = translate_mashuptrail(mashuptrail, version)
         Mashuptrail.convert(mashuptrail)
         mashuptrail.currentVersion = mashuptrail.getLatestVersion()
         mashuptrail.updateIdScope()
@@ -1728,6 +2065,7 @@ def open_mashuptrail_from_db(db_connection, mashup_id, lock=False):
     try:
         daoList = getVersionDAO(version)
         mashuptrail = daoList.open_from_db(db_connection, DBMashuptrail.vtType, mashup_id, lock)
+        mashuptrail = translate_mashuptrail(mashuptrail, version)
         Mashuptrail.convert(mashuptrail)
         mashuptrail.currentVersion = mashuptrail.getLatestVersion()
         mashuptrail.updateIdScope()
@@ -1838,17 +2176,19 @@ def get_current_time(db_connection=None):
     if db_connection is not None:
         try:
             c = db_connection.cursor()
-            # FIXME MySQL versus sqlite3
-            c.execute("SELECT NOW();")
-            # c.execute("SELECT DATETIME('NOW');")
+            if is_sqlite_connection(db_connection):
+                c.execute("SELECT DATETIME('NOW', 'LOCALTIME');")
+            else:
+                c.execute("SELECT NOW();")
             row = c.fetchone()
             if row:
-                # FIXME MySQL versus sqlite3
                 timestamp = row[0]
-                # timestamp = strptime(row[0], '%Y-%m-%d %H:%M:%S')
+                if isinstance(timestamp, basestring):
+                    timestamp = datetime(*time_strptime(
+                            timestamp, '%Y-%m-%d %H:%M:%S')[0:6])
             c.close()
-        except get_db_lib().Error, e:
-            debug.critical("Logger Error %d: %s" % (e.args[0], e.args[1]))
+        except get_db_lib(db_connection).Error, e:
+            debug.critical("Logger Error %s" % format_db_error(e))
 
     return timestamp
 
@@ -1925,3 +2265,141 @@ class TestDBIO(unittest.TestCase):
                 self.fail(str(e))
         finally:
             os.rmdir(testdir)
+
+    def test_lazy_bundle(self):
+        """test that log and thumbnails are only extracted when needed"""
+        testdir = tempfile.mkdtemp(prefix='vt_')
+        src = os.path.join(testdir, 'src.vt')
+        dst = os.path.join(testdir, 'dst.vt')
+        z = zipfile.ZipFile(os.path.join(
+                vistrails.core.system.vistrails_root_directory(),
+                'tests/resources/dummy_new.vt'))
+        vistrail_xml = z.read('vistrail')
+        z.close()
+        z = zipfile.ZipFile(src, 'w', zipfile.ZIP_DEFLATED)
+        z.writestr('vistrail', vistrail_xml)
+        z.writestr('log', 'log contents ' * 100)
+        z.writestr('thumbs/a.png', 'not really a png')
+        z.writestr('thumbs/b.png', 'not a png either')
+        z.writestr('abstraction_sub.xml', vistrail_xml)
+        z.close()
+        vt_save_dir = None
+        try:
+            (save_bundle, vt_save_dir) = open_vistrail_bundle_from_zip_xml(
+                src)
+            log_fname = save_bundle.vistrail.db_log_filename
+            self.assertEqual(log_fname, os.path.join(vt_save_dir, 'log'))
+            self.assertEqual(len(save_bundle.thumbnails), 2)
+            self.assertFalse(os.path.exists(log_fname))
+            self.assertFalse(os.path.exists(save_bundle.thumbnails[0]))
+            abs_fname = os.path.join(vt_save_dir, 'abstraction_sub.xml')
+            self.assertEqual(save_bundle.abstractions, [abs_fname])
+            self.assertFalse(os.path.exists(abs_fname))
+            self.assertEqual(get_bundle_file_info(log_fname)[0], 1300)
+
+            # only keep the first thumbnail, extracted
+            thumb = sorted(save_bundle.thumbnails)[0]
+            extract_bundle_file(thumb)
+            self.assertTrue(os.path.isfile(thumb))
+            save_bundle.thumbnails = [thumb]
+            save_bundle_to_zip_xml(save_bundle, dst, vt_save_dir)
+            self.assertFalse(os.path.exists(log_fname))
+
+            z = zipfile.ZipFile(dst)
+            try:
+                self.assertEqual(sorted(z.namelist()),
+                                 ['abstraction_sub.xml', 'log',
+                                  'thumbs/a.png', 'vistrail'])
+                self.assertEqual(z.read('abstraction_sub.xml'), vistrail_xml)
+                self.assertEqual(z.read('log'), 'log contents ' * 100)
+                self.assertEqual(z.getinfo('log').compress_type,
+                                 zipfile.ZIP_DEFLATED)
+                self.assertEqual(z.read('thumbs/a.png'), 'not really a png')
+                self.assertIsNone(z.testzip())
+            finally:
+                z.close()
+
+            # the log is now read from the saved file
+            self.assertEqual(open(extract_bundle_file(log_fname)).read(),
+                             'log contents ' * 100)
+            # so is the abstraction, when it is used
+            abstraction = open_vistrail_from_xml(abs_fname)
+            self.assertTrue(os.path.isfile(abs_fname))
+            self.assertEqual(len(abstraction.db_actions),
+                             len(save_bundle.vistrail.db_actions))
+        finally:
+            close_zip_xml(vt_save_dir)
+            shutil.rmtree(testdir)
+
+    def test_copy_zip_member(self):
+        """test copying zip members with and without zipfile internals"""
+        global _RAW_ZIP_COPY
+        testdir = tempfile.mkdtemp(prefix='vt_')
+        try:
+            src = os.path.join(testdir, 'src.zip')
+            z = zipfile.ZipFile(src, 'w')
+            z.writestr('stored', 'stored data ' * 10)
+            z.writestr(zipfile.ZipInfo('deflated'), 'deflated data ' * 10,
+                       zipfile.ZIP_DEFLATED)
+            z.close()
+            raw_copy = _RAW_ZIP_COPY
+            for raw in (True, False):
+                _RAW_ZIP_COPY = raw and raw_copy
+                dst = os.path.join(testdir, 'dst%d.zip' % raw)
+                zin = zipfile.ZipFile(src)
+                zout = zipfile.ZipFile(dst, 'w')
+                try:
+                    _copy_zip_member(zin, zout, 'deflated')
+                    _copy_zip_member(zin, zout, 'stored')
+                finally:
+                    zin.close()
+                    zout.close()
+                    _RAW_ZIP_COPY = raw_copy
+                z = zipfile.ZipFile(dst)
+                try:
+                    self.assertIsNone(z.testzip())
+                    self.assertEqual(z.namelist(), ['deflated', 'stored'])
+                    self.assertEqual(z.getinfo('deflated').compress_type,
+                                     zipfile.ZIP_DEFLATED)
+                    self.assertEqual(z.read('deflated'),
+                                     'deflated data ' * 10)
+                    self.assertEqual(z.read('stored'), 'stored data ' * 10)
+                finally:
+                    z.close()
+        finally:
+            shutil.rmtree(testdir)
+
+    def test_lazy_thumbnails_to_db(self):
+        """test saving the thumbnails of a lazily opened bundle to a db"""
+        testdir = tempfile.mkdtemp(prefix='vt_')
+        src = os.path.join(testdir, 'src.vt')
+        z = zipfile.ZipFile(os.path.join(
+                vistrails.core.system.vistrails_root_directory(),
+                'tests/resources/dummy_new.vt'))
+        vistrail_xml = z.read('vistrail')
+        z.close()
+        z = zipfile.ZipFile(src, 'w', zipfile.ZIP_DEFLATED)
+        z.writestr('vistrail', vistrail_xml)
+        z.writestr('thumbs/a.png', 'not really a png')
+        z.close()
+        vt_save_dir = None
+        try:
+            (save_bundle, vt_save_dir) = open_vistrail_bundle_from_zip_xml(
+                src)
+            self.assertFalse(os.path.exists(save_bundle.thumbnails[0]))
+            db = open_db_connection({'type': 'sqlite',
+                                     'db': os.path.join(testdir, 'db')})
+            try:
+                setup_db_tables(db)
+                save_thumbnails_to_db(save_bundle.thumbnails, db)
+                c = db.cursor()
+                c.execute("SELECT file_name, image_bytes FROM thumbnail;")
+                rows = c.fetchall()
+                c.close()
+            finally:
+                close_db_connection(db)
+            self.assertEqual([(name, str(data)) for name, data in rows],
+                             [('a.png', 'not really a png')])
+        finally:
+            close_zip_xml(vt_save_dir)
+            shutil.rmtree(testdir)
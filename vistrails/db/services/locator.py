@@ -184,7 +184,7 @@ class BaseLocator(object):
             url = BaseLocator.convert_filename_to_url(url)
         if scheme == 'untitled':
             return UntitledLocator.from_url(url)
-        elif scheme == 'db':
+        elif scheme in ('db', 'sqlite3'):
             return DBLocator.from_url(url)
         elif scheme == 'file':
             old_uses_query = urlparse.uses_query
@@ -732,8 +732,15 @@ class DBLocator(BaseLocator):
         
     def __init__(self, host, port, database, user, passwd, name=None,
                  **kwargs):
+        """DBLocator(host, port, database, user, passwd, name, **kwargs)
+
+        With db_type='sqlite', database is the path of a SQLite file and
+        host, port, user and passwd are ignored.
+
+        """
+        self._db_type = kwargs.pop('db_type', 'mysql')
         self._host = host
-        self._port = int(port)
+        self._port = int(port or 0)
         self._db = database
         self._user = user
         self._passwd = passwd
@@ -763,6 +770,10 @@ class DBLocator(BaseLocator):
     def _get_db(self):
         return self._db
     db = property(_get_db)
+
+    def _get_db_type(self):
+        return self._db_type
+    db_type = property(_get_db_type)
     
     def _get_obj_id(self):
         return self._obj_id
@@ -826,11 +837,15 @@ class DBLocator(BaseLocator):
                     self._conn_id = 1
                 else:
                     self._conn_id = max(DBLocator.connections.keys()) + 1
-        config = {'host': self._host,
-                  'port': self._port,
-                  'db': self._db,
-                  'user': self._user,
-                  'passwd': self._passwd}
+        if self._db_type == 'sqlite':
+            config = {'type': 'sqlite',
+                      'db': self._db}
+        else:
+            config = {'host': self._host,
+                      'port': self._port,
+                      'db': self._db,
+                      'user': self._user,
+                      'passwd': self._passwd}
         #print "config:", config
         connection = io.open_db_connection(config)
             
@@ -909,6 +924,8 @@ class DBLocator(BaseLocator):
         """
         locator = dom.createElement('locator')
         locator.setAttribute('type', 'db')
+        if self._db_type != 'mysql':
+            locator.setAttribute('db_type', self._db_type)
         locator.setAttribute('host', str(self._host))
         locator.setAttribute('port', str(self._port))
         locator.setAttribute('db', str(self._db))
@@ -931,6 +948,7 @@ class DBLocator(BaseLocator):
             port = int(element.getAttribute('port'))
             database = str(element.getAttribute('db'))
             vt_id = str(element.getAttribute('vt_id'))
+            db_type = str(element.getAttribute('db_type') or 'mysql')
             user = ""
             passwd = ""
             for n in element.childNodes:
@@ -938,13 +956,20 @@ class DBLocator(BaseLocator):
                     name = str(n.firstChild.nodeValue).strip(" \n\t")
                     #print host, port, database, name, vt_id
                     return DBLocator(host, port, database,
-                                     user, passwd, name, obj_id=vt_id)
+                                     user, passwd, name, obj_id=vt_id,
+                                     db_type=db_type)
             return None
         else:
             return None
     
     @staticmethod
     def from_url(url):
+        if url.startswith('sqlite3://'):
+            path, _, args_str = url[len('sqlite3://'):].partition('?')
+            kwargs = BaseLocator.parse_args(args_str)
+            kwargs['db_type'] = 'sqlite'
+            return DBLocator('', None, urllib.unquote(str(path)), '', '',
+                             **kwargs)
         format = re.compile(
                 r"^"
                 "([a-zA-Z0-9_-]+)://"   # scheme
@@ -971,9 +996,14 @@ class DBLocator(BaseLocator):
     
     def to_url(self):
         # FIXME may also want to allow database type to be encoded in 
-        # scheme (ie mysql://host/db, sqlite3://path/to)
-        net_loc = '%s:%s' % (self._host, self._port)
+        # scheme (ie mysql://host/db)
         args_str = BaseLocator.generate_args(self.kwargs)
+        if self._db_type == 'sqlite':
+            url = 'sqlite3://' + urllib.quote(self._db)
+            if args_str:
+                url += '?' + args_str
+            return url
+        net_loc = '%s:%s' % (self._host, self._port)
         # query_str = '%s=%s' % (self._obj_type, self._obj_id)
         url_tuple = ('db', net_loc, urllib.quote(self._db, ''), args_str, '')
         return urlparse.urlunsplit(url_tuple)
@@ -987,6 +1017,8 @@ class DBLocator(BaseLocator):
             node = ElementTree.Element('locator')
 
         node.set('type', 'db')
+        if self._db_type != 'mysql':
+            node.set('db_type', self._db_type)
         node.set('host', str(self._host))
         node.set('port', str(self._port))
         node.set('db', str(self._db))
@@ -1047,6 +1079,8 @@ class DBLocator(BaseLocator):
             vt_id = convert_from_str(data, 'str')
             data = node.get('user')
             user = convert_from_str(data, 'str')
+            data = node.get('db_type', 'mysql')
+            db_type = convert_from_str(data, 'str')
             passwd = ""
             name = None
             if include_name:
@@ -1054,7 +1088,8 @@ class DBLocator(BaseLocator):
                     if child.tag == 'name':
                         name = str(child.text).strip(" \n\t")
             return DBLocator(host, port, database,
-                             user, passwd, name, obj_id=vt_id, obj_type='vistrail')
+                             user, passwd, name, obj_id=vt_id, obj_type='vistrail',
+                             db_type=db_type)
         else:
             return None
 
@@ -1069,7 +1104,8 @@ vistrail_name="%s"/>' % ( self._host, self._port, self._db,
     def __eq__(self, other):
         if type(other) != type(self):
             return False
-        return (self._host == other._host and
+        return (self._db_type == other._db_type and
+                self._host == other._host and
                 self._port == other._port and
                 self._db == other._db and
                 self._user == other._user and
@@ -1226,6 +1262,18 @@ class TestLocators(unittest.TestCase):
         self.assertEqual(loc._db, "vistrails")
         self.assertEqual(loc.to_url(), loc_str)
 
+    def test_parse_sqlite(self):
+        loc_str = "sqlite3:///vistrails/tmp/my%20db.sqlite?workflow=42"
+        loc = BaseLocator.from_url(loc_str)
+        self.assertIsInstance(loc, DBLocator)
+        self.assertEqual(loc.db_type, 'sqlite')
+        self.assertEqual(loc.kwargs['version_node'], 42)
+        self.assertEqual(loc._db, "/vistrails/tmp/my db.sqlite")
+        self.assertEqual(loc.to_url(), loc_str)
+        loc2 = DBLocator.from_xml(loc.to_xml())
+        self.assertEqual(loc2.db_type, 'sqlite')
+        self.assertEqual(loc2._db, loc._db)
+
     def test_parse_bad_url(self):
         loc_str = "http://blah.com/"
         loc = BaseLocator.from_url(loc_str)
@@ -0,0 +1,606 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Indexed store for execution logs.
+
+Appended XML logs have to be read and translated completely before a
+single workflow execution can be looked at.  LogStore keeps every
+workflow execution as its own XML fragment in a sqlite table, indexed
+by id, parent version and start time, so that appending an execution
+and looking executions up do not depend on the size of the log.
+
+convert_xml_log() builds a store from an existing (appended) XML log.
+open_log_store() keeps one store per log, and only reads the executions
+appended to the log since it was last used; update_log_store() adds the
+executions as they are appended, so that provenance queries on a
+vistrail don't read its XML log each time.
+"""
+
+from datetime import datetime
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+
+from vistrails.core.system import get_elementtree_library, strftime
+from vistrails.db import VistrailsDBException
+from vistrails.db.domain import DBLog
+from vistrails.db.versions import getVersionDAO, currentVersion
+import vistrails.db.services.io
+import vistrails.db.services.log
+
+import unittest
+
+ElementTree = get_elementtree_library()
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def _time_to_str(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return strftime(value, TIME_FORMAT)
+    return value
+
+class LogStore(object):
+    """LogStore(filename) -> LogStore
+
+    sqlite-backed execution log.  Ids are assigned by the store in
+    append order, which is also how update_ids() numbers the executions
+    of an appended XML log.
+
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS workflow_exec (
+            id INTEGER PRIMARY KEY,
+            parent_version INTEGER,
+            ts_start TEXT,
+            ts_end TEXT,
+            completed INTEGER,
+            xml TEXT NOT NULL);
+        CREATE INDEX IF NOT EXISTS workflow_exec_parent_version
+            ON workflow_exec (parent_version);
+        CREATE INDEX IF NOT EXISTS workflow_exec_ts_start
+            ON workflow_exec (ts_start);
+        CREATE TABLE IF NOT EXISTS log_state (
+            key TEXT PRIMARY KEY,
+            value TEXT);
+        """
+
+    def __init__(self, filename):
+        self.filename = filename
+        try:
+            self.conn = sqlite3.connect(filename)
+            self.conn.executescript(self.SCHEMA)
+        except sqlite3.Error, e:
+            raise VistrailsDBException("Cannot open log store '%s': %s" %
+                                       (filename, e))
+        self.dao_list = getVersionDAO(currentVersion)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def _to_row(self, workflow_exec):
+        # ids are given by the store
+        wf_exec_id = workflow_exec.db_id
+        workflow_exec.db_id = -1L
+        try:
+            node = self.dao_list.write_xml_object(workflow_exec)
+        finally:
+            workflow_exec.db_id = wf_exec_id
+        node.set('version', currentVersion)
+        return (workflow_exec.db_parent_version,
+                _time_to_str(workflow_exec.db_ts_start),
+                _time_to_str(workflow_exec.db_ts_end),
+                workflow_exec.db_completed,
+                ElementTree.tostring(node))
+
+    def _from_row(self, row):
+        wf_exec_id, xml = row
+        node = ElementTree.fromstring(xml)
+        workflow_exec = \
+            vistrails.db.services.io.read_workflow_exec_from_xml(node)
+        workflow_exec.db_id = wf_exec_id
+        return workflow_exec
+
+    def append(self, workflow_exec):
+        """append(workflow_exec: DBWorkflowExec) -> long
+        Adds a workflow execution and returns its id in the store.
+
+        """
+        c = self.conn.execute(
+            "INSERT INTO workflow_exec (parent_version, ts_start, ts_end, "
+            "completed, xml) VALUES (?, ?, ?, ?, ?)",
+            self._to_row(workflow_exec))
+        self.conn.commit()
+        return c.lastrowid
+
+    def extend(self, workflow_execs):
+        """extend(workflow_execs: iterable) -> None
+        Adds many workflow executions in a single transaction.
+
+        """
+        self.conn.executemany(
+            "INSERT INTO workflow_exec (parent_version, ts_start, ts_end, "
+            "completed, xml) VALUES (?, ?, ?, ?, ?)",
+            (self._to_row(wf_exec) for wf_exec in workflow_execs))
+        self.conn.commit()
+
+    def append_log(self, log):
+        """append_log(log: DBLog) -> None"""
+        self.extend(log.db_workflow_execs)
+
+    def __len__(self):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM workflow_exec").fetchone()[0]
+
+    def get(self, wf_exec_id):
+        """get(wf_exec_id: long) -> DBWorkflowExec"""
+        row = self.conn.execute(
+            "SELECT id, xml FROM workflow_exec WHERE id = ?",
+            (wf_exec_id,)).fetchone()
+        if row is None:
+            raise KeyError(wf_exec_id)
+        return self._from_row(row)
+
+    def find(self, parent_version=None, start=None, end=None):
+        """find(parent_version: long, start: datetime, end: datetime)
+              -> list of DBWorkflowExec
+        Returns the workflow executions of a version and/or started
+        within [start, end], in append order.
+
+        """
+        where = []
+        args = []
+        if parent_version is not None:
+            where.append("parent_version = ?")
+            args.append(parent_version)
+        if start is not None:
+            where.append("ts_start >= ?")
+            args.append(_time_to_str(start))
+        if end is not None:
+            where.append("ts_start <= ?")
+            args.append(_time_to_str(end))
+        cmd = "SELECT id, xml FROM workflow_exec"
+        if where:
+            cmd += " WHERE " + " AND ".join(where)
+        cmd += " ORDER BY id"
+        return [self._from_row(row) for row in self.conn.execute(cmd, args)]
+
+    def to_log(self):
+        """to_log() -> DBLog
+        Reads the whole store, like open_log_from_xml(was_appended=True).
+
+        """
+        log = DBLog(workflow_execs=self.find())
+        log.db_version = currentVersion
+        vistrails.db.services.log.update_id_scope(log)
+        return log
+
+def convert_xml_log(xml_filename, store_filename, was_appended=True):
+    """convert_xml_log(xml_filename: str, store_filename: str,
+                       was_appended: bool) -> LogStore
+    Copies the workflow executions of an XML log into a new store.
+
+    """
+    store = LogStore(store_filename)
+    if len(store) > 0:
+        store.close()
+        raise VistrailsDBException("Log store '%s' is not empty" %
+                                   store_filename)
+    if was_appended:
+        workflow_execs = \
+            vistrails.db.services.io.iter_workflow_execs_from_xml(
+                xml_filename)
+    else:
+        log = vistrails.db.services.io.open_log_from_xml(xml_filename)
+        workflow_execs = sorted(log.db_workflow_execs,
+                                key=lambda wf_exec: wf_exec.db_id)
+    try:
+        store.extend(workflow_execs)
+    except Exception:
+        store.close()
+        raise
+    return store
+
+# bytes compared at both ends of the converted part of a log, to check
+# that the log was only appended to since
+MARK_SIZE = 4096
+
+# stores whose log is gone are deleted after this many seconds, unless
+# they get reused for the same log in the meantime
+ORPHAN_AGE = 7 * 24 * 3600
+
+def _log_mark(xml_filename, offset):
+    """_log_mark(xml_filename: str, offset: int) -> str
+    Digest of the first and last bytes before offset in the log.
+
+    """
+    f = open(xml_filename, 'rb')
+    try:
+        head = f.read(min(offset, MARK_SIZE))
+        f.seek(max(offset - MARK_SIZE, 0))
+        tail = f.read(offset - max(offset - MARK_SIZE, 0))
+    finally:
+        f.close()
+    if len(tail) != min(offset, MARK_SIZE):
+        return None
+    return '%s:%s' % (hashlib.sha1(head).hexdigest(),
+                      hashlib.sha1(tail).hexdigest())
+
+def _get_state(store):
+    return dict(store.conn.execute("SELECT key, value FROM log_state"))
+
+def _set_state(store, log_path, offset):
+    store.conn.executemany(
+        "INSERT OR REPLACE INTO log_state (key, value) VALUES (?, ?)",
+        [('log_path', log_path),
+         ('offset', str(offset)),
+         ('mark', _log_mark(log_path, offset))])
+    store.conn.commit()
+
+def _is_prefix(state, xml_filename):
+    """Checks that the part of the log read into a store is unchanged."""
+    if 'offset' not in state:
+        return False
+    offset = int(state['offset'])
+    try:
+        if os.path.getsize(xml_filename) < offset:
+            return False
+        return _log_mark(xml_filename, offset) == state['mark']
+    except (IOError, OSError):
+        return False
+
+def sync_log_store(store, xml_filename):
+    """sync_log_store(store: LogStore, xml_filename: str) -> None
+    Reads the executions appended to the log since the store was last
+    updated. If the log was rewritten instead, the store is rebuilt.
+
+    """
+    state = _get_state(store)
+    size = os.path.getsize(xml_filename)
+    if _is_prefix(state, xml_filename):
+        offset = int(state['offset'])
+        if offset == size and state['log_path'] == xml_filename:
+            return
+    else:
+        store.conn.execute("DELETE FROM workflow_exec")
+        offset = 0
+    store.extend(vistrails.db.services.io.iter_workflow_execs_from_xml(
+            xml_filename, offset, size))
+    _set_state(store, xml_filename, size)
+
+def _store_filename(directory, xml_filename):
+    return os.path.join(directory,
+                        '%s.db' % hashlib.sha1(xml_filename).hexdigest())
+
+def _find_store(xml_filename, directory):
+    """Returns the filename of the store for a log, or None.
+
+    A store whose log is gone (the log of a .vt bundle is extracted to a
+    new directory each time the bundle is opened) is moved to the new
+    log if the new log starts with the old one, and deleted once it is
+    old enough otherwise.
+
+    """
+    store_filename = _store_filename(directory, xml_filename)
+    if os.path.isfile(store_filename):
+        return store_filename
+    if not os.path.isdir(directory):
+        return None
+    found = None
+    now = time.time()
+    for name in os.listdir(directory):
+        filename = os.path.join(directory, name)
+        if not name.endswith('.db') or name.startswith('.tmp'):
+            continue
+        try:
+            store = LogStore(filename)
+            try:
+                state = _get_state(store)
+            finally:
+                store.close()
+            log_path = state.get('log_path')
+            if log_path is not None and os.path.exists(log_path):
+                continue
+            if found is None and _is_prefix(state, xml_filename):
+                os.rename(filename, store_filename)
+                found = store_filename
+            elif now - os.path.getmtime(filename) > ORPHAN_AGE:
+                os.remove(filename)
+        except (VistrailsDBException, sqlite3.Error, OSError):
+            continue
+    return found
+
+def _resolve(xml_filename, directory):
+    xml_filename = os.path.abspath(
+        vistrails.db.services.io.extract_bundle_file(xml_filename))
+    if directory is None:
+        directory = _get_store_directory()
+        if directory is None:
+            directory = os.path.dirname(xml_filename)
+    return xml_filename, directory
+
+def open_log_store(xml_filename, directory=None):
+    """open_log_store(xml_filename: str, directory: str) -> LogStore
+    Returns the store of an appended XML log, up to date with the log.
+
+    There is one store per log, kept in directory; only the executions
+    appended to the log since the store was last used are read. If
+    directory is None, the 'executions' subdirectory of the 'logDir'
+    configuration field is used, or the directory of the log if
+    VisTrails is not configured.
+
+    """
+    xml_filename, directory = _resolve(xml_filename, directory)
+    store_filename = _find_store(xml_filename, directory)
+    if store_filename is None:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        store_filename = _store_filename(directory, xml_filename)
+    store = LogStore(store_filename)
+    try:
+        sync_log_store(store, xml_filename)
+    except Exception:
+        store.close()
+        raise
+    return store
+
+def update_log_store(xml_filename, workflow_execs, offset, directory=None):
+    """update_log_store(xml_filename: str, workflow_execs: list,
+                        offset: int, directory: str) -> None
+    Adds workflow executions that were just appended to a log at offset
+    to the store of the log.
+
+    Nothing is done if the log has no store yet, unless it was empty: the
+    store is then built by the next open_log_store().
+
+    """
+    xml_filename, directory = _resolve(xml_filename, directory)
+    store_filename = _find_store(xml_filename, directory)
+    if store_filename is None:
+        if offset > 0:
+            return
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        store_filename = _store_filename(directory, xml_filename)
+    store = LogStore(store_filename)
+    try:
+        state = _get_state(store)
+        if (offset == 0 and len(store) == 0) or \
+                (state.get('offset') == str(offset) and
+                 _is_prefix(state, xml_filename)):
+            store.extend(workflow_execs)
+            _set_state(store, xml_filename,
+                       os.path.getsize(xml_filename))
+        else:
+            sync_log_store(store, xml_filename)
+    finally:
+        store.close()
+
+def _get_store_directory():
+    from vistrails.core.configuration import get_vistrails_configuration
+    from vistrails.core.system import get_vistrails_directory
+    configuration = get_vistrails_configuration()
+    if configuration is None:
+        return None
+    log_dir = get_vistrails_directory('logDir', configuration)
+    if log_dir is None:
+        return None
+    return os.path.join(log_dir, 'executions')
+
+##############################################################################
+
+class TestLogStore(unittest.TestCase):
+    def make_exec(self, parent_version, day):
+        from vistrails.db.domain import DBWorkflowExec, DBModuleExec
+        module_exec = DBModuleExec(id=1, module_id=3, completed=1,
+                                   ts_start=datetime(2014, 1, day, 10),
+                                   ts_end=datetime(2014, 1, day, 11))
+        return DBWorkflowExec(id=-1, user='u', ip='127.0.0.1',
+                              session=5, vt_version='2.1',
+                              ts_start=datetime(2014, 1, day, 10),
+                              ts_end=datetime(2014, 1, day, 11),
+                              parent_type='vistrail',
+                              parent_version=parent_version,
+                              completed=1, name='wf',
+                              item_execs=[module_exec])
+
+    def test_append_find(self):
+        store = LogStore(':memory:')
+        try:
+            self.assertEqual(store.append(self.make_exec(4, 1)), 1)
+            store.extend([self.make_exec(7, 2), self.make_exec(4, 3)])
+            self.assertEqual(len(store), 3)
+            wf_exec = store.get(2)
+            self.assertEqual(wf_exec.db_id, 2)
+            self.assertEqual(wf_exec.db_parent_version, 7)
+            self.assertEqual(len(wf_exec.db_item_execs), 1)
+            self.assertEqual(wf_exec.db_ts_start, datetime(2014, 1, 2, 10))
+            self.assertRaises(KeyError, store.get, 10)
+            self.assertEqual([e.db_id for e in store.find(parent_version=4)],
+                             [1, 3])
+            self.assertEqual([e.db_id for e in store.find(
+                        start=datetime(2014, 1, 2),
+                        end=datetime(2014, 1, 3, 10))], [2, 3])
+            self.assertEqual([e.db_id for e in store.find(
+                        parent_version=4, start=datetime(2014, 1, 2))], [3])
+            self.assertEqual(len(store.to_log().db_workflow_execs), 3)
+        finally:
+            store.close()
+
+    def test_convert(self):
+        import shutil
+        tmpdir = tempfile.mkdtemp(prefix='vt_log')
+        try:
+            xml_fname = os.path.join(tmpdir, 'log')
+            log = DBLog(workflow_execs=[self.make_exec(4, 1),
+                                        self.make_exec(5, 2)])
+            vistrails.db.services.io.save_log_to_xml(log, xml_fname,
+                                                     do_append=True)
+            log = DBLog(workflow_execs=[self.make_exec(6, 3)])
+            vistrails.db.services.io.save_log_to_xml(log, xml_fname,
+                                                     do_append=True)
+            expected = vistrails.db.services.io.open_log_from_xml(xml_fname,
+                                                                  True)
+            store = convert_xml_log(xml_fname,
+                                    os.path.join(tmpdir, 'log.db'))
+            try:
+                self.assertEqual(
+                    [(e.db_id, e.db_parent_version) for e in store.find()],
+                    [(e.db_id, e.db_parent_version)
+                     for e in expected.db_workflow_execs])
+            finally:
+                store.close()
+            self.assertRaises(VistrailsDBException, convert_xml_log,
+                              xml_fname, os.path.join(tmpdir, 'log.db'))
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def append_execs(self, xml_fname, *execs):
+        log = DBLog(workflow_execs=list(execs))
+        vistrails.db.services.io.save_log_to_xml(log, xml_fname,
+                                                 do_append=True)
+
+    def find_ids(self, xml_fname, store_dir, parent_version=None):
+        store = open_log_store(xml_fname, store_dir)
+        try:
+            return [e.db_id for e in store.find(parent_version)]
+        finally:
+            store.close()
+
+    def test_open_log_store(self):
+        import shutil
+        tmpdir = tempfile.mkdtemp(prefix='vt_log')
+        try:
+            xml_fname = os.path.join(tmpdir, 'log')
+            store_dir = os.path.join(tmpdir, 'stores')
+            self.append_execs(xml_fname, self.make_exec(4, 1),
+                              self.make_exec(5, 2))
+            self.assertEqual(self.find_ids(xml_fname, store_dir, 5), [2])
+            store_files = os.listdir(store_dir)
+            self.assertEqual(len(store_files), 1)
+            # new executions are read from the end of the log only
+            self.append_execs(xml_fname, self.make_exec(5, 3))
+            orig_iter = vistrails.db.services.io.iter_workflow_execs_from_xml
+            offsets = []
+            def iter_execs(filename, start=0, end=None):
+                offsets.append(start)
+                return orig_iter(filename, start, end)
+            vistrails.db.services.io.iter_workflow_execs_from_xml = \
+                iter_execs
+            try:
+                self.assertEqual(self.find_ids(xml_fname, store_dir, 5),
+                                 [2, 3])
+                self.assertEqual(self.find_ids(xml_fname, store_dir),
+                                 [1, 2, 3])
+            finally:
+                vistrails.db.services.io.iter_workflow_execs_from_xml = \
+                    orig_iter
+            self.assertEqual(len(offsets), 1)
+            self.assertGreater(offsets[0], 0)
+            self.assertEqual(os.listdir(store_dir), store_files)
+            # a rewritten log rebuilds the store
+            os.remove(xml_fname)
+            self.append_execs(xml_fname, self.make_exec(7, 4))
+            self.assertEqual(self.find_ids(xml_fname, store_dir, 7), [1])
+            self.assertEqual(self.find_ids(xml_fname, store_dir), [1])
+            self.assertEqual(os.listdir(store_dir), store_files)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_update_log_store(self):
+        import shutil
+        tmpdir = tempfile.mkdtemp(prefix='vt_log')
+        try:
+            xml_fname = os.path.join(tmpdir, 'log')
+            store_dir = os.path.join(tmpdir, 'stores')
+            # a log with no store gets one when it is created
+            wf_exec = self.make_exec(4, 1)
+            self.append_execs(xml_fname, wf_exec)
+            update_log_store(xml_fname, [wf_exec], 0, store_dir)
+            self.assertEqual(len(os.listdir(store_dir)), 1)
+            offset = os.path.getsize(xml_fname)
+            wf_exec = self.make_exec(5, 2)
+            self.append_execs(xml_fname, wf_exec)
+            update_log_store(xml_fname, [wf_exec], offset, store_dir)
+            store = LogStore(_store_filename(store_dir, xml_fname))
+            try:
+                self.assertEqual([e.db_parent_version for e in store.find()],
+                                 [4, 5])
+                state = _get_state(store)
+                self.assertEqual(int(state['offset']),
+                                 os.path.getsize(xml_fname))
+            finally:
+                store.close()
+            # a missed update is caught up from the log
+            self.append_execs(xml_fname, self.make_exec(6, 3))
+            self.assertEqual(self.find_ids(xml_fname, store_dir, 6), [3])
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_moved_log(self):
+        """The store of a log whose bundle was reopened is reused."""
+        import shutil
+        tmpdir = tempfile.mkdtemp(prefix='vt_log')
+        try:
+            store_dir = os.path.join(tmpdir, 'stores')
+            old_fname = os.path.join(tmpdir, 'log1')
+            self.append_execs(old_fname, self.make_exec(4, 1))
+            self.assertEqual(self.find_ids(old_fname, store_dir), [1])
+            other_fname = os.path.join(tmpdir, 'log2')
+            self.append_execs(other_fname, self.make_exec(8, 1))
+            self.assertEqual(self.find_ids(other_fname, store_dir), [1])
+            new_fname = os.path.join(tmpdir, 'log3')
+            shutil.copyfile(old_fname, new_fname)
+            os.remove(old_fname)
+            os.remove(other_fname)
+            self.append_execs(new_fname, self.make_exec(5, 2))
+            self.assertEqual(self.find_ids(new_fname, store_dir, 5), [2])
+            # the old store was moved, the other one is kept for now
+            self.assertEqual(sorted(os.listdir(store_dir)),
+                             sorted([os.path.basename(
+                                 _store_filename(store_dir, fname))
+                                 for fname in (new_fname, other_fname)]))
+            # orphaned stores are eventually deleted
+            other_store = _store_filename(store_dir, other_fname)
+            old_time = time.time() - ORPHAN_AGE - 60
+            os.utime(other_store, (old_time, old_time))
+            self.assertIsNone(_find_store(old_fname, store_dir))
+            self.assertFalse(os.path.exists(other_store))
+        finally:
+            shutil.rmtree(tmpdir)
@@ -0,0 +1,332 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""SQLite backend for the database persistence layer.
+
+The SQL DAOs and the functions in io were written against MySQLdb.
+SQLiteConnection wraps a sqlite3 connection so that it can be used in place
+of a MySQLdb one: statements use the 'format' paramstyle, a transaction is
+started by the first write (or by begin()) and nothing is stored until
+commit() is called.
+
+Groups of statements are run with executemany(), one call per distinct
+statement, instead of being sent as a single multi-statement string.
+"""
+
+import os
+import re
+import sqlite3
+
+from vistrails.db import VistrailsDBException
+
+JOURNAL_MODES = set(['delete', 'truncate', 'persist', 'memory', 'wal', 'off'])
+
+_placeholder = re.compile(r'%([%s])')
+_for_update = re.compile(r'\s+FOR\s+UPDATE(\s*;?\s*)$', re.IGNORECASE)
+_insert = re.compile(r'^\s*INSERT\s+INTO\s+\S+\s*\(([^)]*)\)', re.IGNORECASE)
+
+def translate_statement(statement, has_params=True):
+    """translate_statement(statement: str, has_params: bool) -> str
+    Rewrites a statement written for MySQLdb so that sqlite3 accepts it.
+
+    """
+    # sqlite locks the whole database on write, there is no row locking
+    statement = _for_update.sub(r'\1', statement)
+    if has_params:
+        statement = _placeholder.sub(
+            lambda m: '?' if m.group(1) == 's' else '%', statement)
+    return statement
+
+def inserts_without_id(statement):
+    """inserts_without_id(statement: str) -> bool
+    Tells whether statement is an INSERT that leaves the id to the database.
+
+    """
+    match = _insert.match(statement)
+    if match is None:
+        return False
+    columns = [c.strip().strip('`') for c in match.group(1).split(',')]
+    return 'id' not in columns
+
+def is_sqlite_connection(db_connection):
+    return isinstance(db_connection, SQLiteConnection)
+
+
+class SQLiteCursor(object):
+    """Cursor of a SQLiteConnection, accepting MySQLdb-style statements.
+
+    Rows are fetched as soon as a statement runs, as with MySQLdb: sqlite3
+    cursors cannot be read from once the transaction has been committed.
+
+    """
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._rows = []
+        self._pos = 0
+
+    def _fetch_rows(self):
+        if self._cursor.description is not None:
+            self._rows = self._cursor.fetchall()
+        else:
+            self._rows = []
+        self._pos = 0
+
+    def execute(self, statement, params=None):
+        if params is None:
+            self._cursor.execute(translate_statement(statement, False))
+        else:
+            self._cursor.execute(translate_statement(statement), params)
+        self._fetch_rows()
+        return self._cursor.rowcount
+
+    def executemany(self, statement, seq_of_params):
+        self._cursor.executemany(translate_statement(statement),
+                                 seq_of_params)
+        self._fetch_rows()
+        return self._cursor.rowcount
+
+    def fetchone(self):
+        if self._pos >= len(self._rows):
+            return None
+        self._pos += 1
+        return self._rows[self._pos - 1]
+
+    def fetchall(self):
+        rows = self._rows[self._pos:]
+        self._pos = len(self._rows)
+        return rows
+
+    def _get_lastrowid(self):
+        return self._cursor.lastrowid
+    lastrowid = property(_get_lastrowid)
+
+    def _get_rowcount(self):
+        return self._cursor.rowcount
+    rowcount = property(_get_rowcount)
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection(object):
+    """Connection to a SQLite database file, used like a MySQLdb one.
+
+    journal_mode is applied when the file is opened; the default, 'wal',
+    lets readers go on while a vistrail is being saved.
+
+    """
+    def __init__(self, filename, journal_mode='wal', timeout=None):
+        if journal_mode is not None and \
+                journal_mode.lower() not in JOURNAL_MODES:
+            raise VistrailsDBException("Unknown SQLite journal mode '%s'" %
+                                       journal_mode)
+        self.filename = filename
+        kwargs = {}
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+        self._conn = sqlite3.connect(filename, **kwargs)
+        # MySQLdb returns str, and so do the DAOs expect
+        self._conn.text_factory = str
+        if journal_mode is not None:
+            self.journal_mode = self._conn.execute(
+                'PRAGMA journal_mode = %s;' % journal_mode).fetchone()[0]
+        else:
+            self.journal_mode = self._conn.execute(
+                'PRAGMA journal_mode;').fetchone()[0]
+
+    def cursor(self):
+        return SQLiteCursor(self._conn.cursor())
+
+    def begin(self):
+        """begin() -> None
+        Starts a new transaction, committing the current one like MySQL's
+        BEGIN does.
+
+        """
+        self._conn.commit()
+        self._conn.execute('BEGIN;')
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def ping(self):
+        try:
+            self._conn.execute('SELECT 1;')
+        except sqlite3.Error, e:
+            raise sqlite3.OperationalError(str(e))
+
+    def close(self):
+        self._conn.close()
+
+    def execute_group(self, commands, fetch):
+        """execute_group(commands: list, fetch: bool) -> list
+        Runs a list of (statement, values) pairs and returns one result
+        per command: the rows for SELECT statements when fetch is True,
+        the id of the new row for INSERTs that let the database pick it,
+        None otherwise.
+
+        Writes that use the same statement are sent in a single
+        executemany() call. They run in the current transaction, in the
+        order their statements first appear in the list.
+
+        """
+        cursor = self._conn.cursor()
+        results = [None] * len(commands)
+        try:
+            if fetch:
+                for i, (statement, values) in enumerate(commands):
+                    cursor.execute(translate_statement(statement), values)
+                    results[i] = cursor.fetchall()
+                return results
+
+            groups = {}
+            order = []
+            for i, (statement, values) in enumerate(commands):
+                if statement not in groups:
+                    groups[statement] = []
+                    order.append(statement)
+                groups[statement].append(i)
+            for statement in order:
+                indices = groups[statement]
+                sqlite_statement = translate_statement(statement)
+                if inserts_without_id(statement):
+                    # need lastrowid for each row
+                    for i in indices:
+                        cursor.execute(sqlite_statement, commands[i][1])
+                        results[i] = cursor.lastrowid
+                else:
+                    cursor.executemany(sqlite_statement,
+                                       [commands[i][1] for i in indices])
+        except sqlite3.Error, e:
+            raise VistrailsDBException('Command failed: %s -- """ %s """' %
+                                       (e, statement))
+        finally:
+            cursor.close()
+        return results
+
+import unittest
+
+class TestSQLite(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.dir = tempfile.mkdtemp(prefix='vt_sqlite_')
+        self.filename = os.path.join(self.dir, 'vistrails.db')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.dir)
+
+    def test_translate(self):
+        self.assertEqual(
+                translate_statement("SELECT a FROM t WHERE b = %s AND "
+                                    "c LIKE '10%%' FOR UPDATE;"),
+                "SELECT a FROM t WHERE b = ? AND c LIKE '10%';")
+        self.assertEqual(translate_statement("SELECT '%s';", False),
+                         "SELECT '%s';")
+        self.assertTrue(inserts_without_id("INSERT INTO t(a, b) VALUES "
+                                           "(%s,%s);"))
+        self.assertFalse(inserts_without_id("INSERT INTO t(a, id) VALUES "
+                                            "(%s,%s);"))
+        self.assertFalse(inserts_without_id("UPDATE t SET a = %s;"))
+
+    def test_group(self):
+        conn = SQLiteConnection(self.filename)
+        try:
+            self.assertEqual(conn.journal_mode, 'wal')
+            c = conn.cursor()
+            c.execute("CREATE TABLE t(id integer primary key autoincrement, "
+                      "v varchar(255));")
+            c.close()
+            results = conn.execute_group(
+                    [("INSERT INTO t(v) VALUES (%s);", ('a',)),
+                     ("INSERT INTO t(id, v) VALUES (%s,%s);", ('7', 'b')),
+                     ("INSERT INTO t(v) VALUES (%s);", ('c',)),
+                     ("INSERT INTO t(id, v) VALUES (%s,%s);", ('9', 'd'))],
+                    False)
+            self.assertEqual(results, [1, None, 2, None])
+            conn.commit()
+            results = conn.execute_group(
+                    [("SELECT v FROM t WHERE id = %s;", ('7',)),
+                     ("SELECT v FROM t WHERE id = %s;", ('2',))], True)
+            self.assertEqual(results, [[('b',)], [('c',)]])
+        finally:
+            conn.close()
+
+    def test_rollback(self):
+        conn = SQLiteConnection(self.filename, 'delete')
+        try:
+            self.assertEqual(conn.journal_mode, 'delete')
+            c = conn.cursor()
+            c.execute("CREATE TABLE t(v int);")
+            c.execute("INSERT INTO t(v) VALUES (%s);", (1,))
+            conn.rollback()
+            c.execute("SELECT COUNT(*) FROM t;")
+            self.assertEqual(c.fetchone(), (0,))
+            c.close()
+        finally:
+            conn.close()
+
+    def test_vistrail(self):
+        """test saving a vistrail to a SQLite file and loading it back"""
+        import vistrails.core.system
+        from vistrails.db.services import io
+        vistrail = io.open_vistrail_from_xml(
+            os.path.join(vistrails.core.system.vistrails_root_directory(),
+                         'tests/resources/dummy.xml'))
+        db = io.open_db_connection({'type': 'sqlite', 'db': self.filename})
+        try:
+            io.setup_db_tables(db)
+            self.assertEqual(io.get_db_version(db), '1.0.4')
+            io.save_vistrail_to_db(vistrail, db, do_copy=True)
+            self.assertIsNotNone(vistrail.db_id)
+            loaded = io.open_vistrail_from_db(db, vistrail.db_id)
+        finally:
+            io.close_db_connection(db)
+
+        self.assertEqual(loaded.db_name, vistrail.db_name)
+        self.assertEqual(
+                sorted((a.db_id, a.db_prevId, len(a.db_operations))
+                       for a in loaded.db_actions),
+                sorted((a.db_id, a.db_prevId, len(a.db_operations))
+                       for a in vistrail.db_actions))
+        self.assertEqual(
+                sorted((a.db_action_id, a.db_key, a.db_value)
+                       for a in loaded.db_actionAnnotations),
+                sorted((a.db_action_id, a.db_key, a.db_value)
+                       for a in vistrail.db_actionAnnotations))
+        self.assertEqual(loaded.db_last_modified,
+                         vistrail.db_last_modified)
@@ -0,0 +1,381 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Cache of vistrails translated from older schemas.
+
+Opening a vistrail saved with an older schema translates it one version at
+a time, which is slow for big or very old files. The translated vistrail is
+pickled in the cache directory, under the hash of the source file, so that
+opening the same file again only has to load that. Pickling keeps the
+objects exactly as the translation made them, which writing them in the XML
+format doesn't (empty fields would come back as empty strings).
+
+Entries are written to a temporary file and renamed, so concurrent sessions
+never read a partial entry. The least recently used entries are removed
+when the cache grows over its size.
+"""
+
+import cPickle
+import hashlib
+import os
+import tempfile
+
+from vistrails.core import debug
+from vistrails.db.domain import DBVistrail
+from vistrails.db.versions import currentVersion, getVersionDAO
+import vistrails.db.services.xml_stream
+
+import unittest
+
+
+def hash_file(f):
+    """hash_file(f: str or file) -> str
+
+    Returns the SHA-1 of the content of a file, given its name or a file
+    object.
+
+    """
+    h = hashlib.sha1()
+    if isinstance(f, basestring):
+        fp = open(f, 'rb')
+    else:
+        fp = f
+    try:
+        chunk = fp.read(65536)
+        while chunk:
+            h.update(chunk)
+            chunk = fp.read(65536)
+    finally:
+        if fp is not f:
+            fp.close()
+    return h.hexdigest()
+
+
+def _source_files(directory):
+    """Lists the Python files in a directory, or the compiled files if only
+    those are installed.
+    """
+    names = set()
+    for fname in os.listdir(directory):
+        base, ext = os.path.splitext(fname)
+        if ext in ('.py', '.pyc'):
+            names.add(base)
+    files = []
+    for base in sorted(names):
+        filename = os.path.join(directory, base + '.py')
+        if not os.path.exists(filename):
+            filename += 'c'
+        files.append(filename)
+    return files
+
+_code_fingerprint = None
+
+def code_fingerprint():
+    """code_fingerprint() -> str
+
+    Hash of the code the cached objects depend on: the translation steps of
+    every schema version and the domain classes of the current one.
+
+    """
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        import vistrails.db.versions
+        versions_dir = os.path.dirname(
+                os.path.abspath(vistrails.db.versions.__file__))
+        current_dir = 'v' + currentVersion.replace('.', '_')
+        files = _source_files(versions_dir)
+        for version_dir in sorted(os.listdir(versions_dir)):
+            for subdir in ('translate', 'domain'):
+                if subdir == 'domain' and version_dir != current_dir:
+                    continue
+                directory = os.path.join(versions_dir, version_dir, subdir)
+                if os.path.isdir(directory):
+                    files.extend(_source_files(directory))
+        h = hashlib.sha1()
+        for filename in files:
+            with open(filename, 'rb') as fp:
+                h.update(fp.read())
+        _code_fingerprint = h.hexdigest()
+    return _code_fingerprint
+
+
+class TranslationCache(object):
+    """A directory of translated vistrails, keyed by the hash of the source.
+
+    The current schema version and a fingerprint of the translation and
+    domain code are part of the name of the entries, so they are not used
+    anymore once VisTrails is upgraded; they are then evicted like unused
+    entries.
+    """
+    def __init__(self, directory, max_size=None):
+        self.directory = directory
+        self.max_size = max_size
+
+    def _entry(self, key):
+        return os.path.join(self.directory, '%s-%s-%s.pickle' % (
+                key, currentVersion, code_fingerprint()[:16]))
+
+    def load(self, key):
+        """load(key: str) -> DBVistrail or None
+
+        Reads a translated vistrail, or returns None if it is not in the
+        cache.
+
+        """
+        entry = self._entry(key)
+        if not os.path.isfile(entry):
+            return None
+        try:
+            with open(entry, 'rb') as fp:
+                vistrail = cPickle.load(fp)
+        except Exception, e:
+            debug.warning("Ignoring invalid translation cache entry %s" %
+                          entry, e)
+            vistrail = None
+        if not isinstance(vistrail, DBVistrail):
+            self._remove(entry)
+            return None
+        # Used entries are kept the longest
+        try:
+            os.utime(entry, None)
+        except OSError:
+            pass
+        return vistrail
+
+    def store(self, key, vistrail):
+        """store(key: str, vistrail: DBVistrail) -> None
+
+        Adds a vistrail in the current schema to the cache.
+
+        """
+        entry = self._entry(key)
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            fd, tmp = tempfile.mkstemp(prefix='.tmp', suffix='.pickle',
+                                       dir=self.directory)
+        except OSError, e:
+            debug.warning("Couldn't create translation cache entry", e)
+            return
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                cPickle.dump(vistrail, fp, cPickle.HIGHEST_PROTOCOL)
+            if os.name == 'nt' and os.path.exists(entry):
+                os.remove(entry)
+            os.rename(tmp, entry)
+        except Exception, e:
+            # This shouldn't prevent opening the vistrail
+            self._remove(tmp)
+            debug.warning("Couldn't store translated vistrail in cache", e)
+            return
+        if self.max_size is not None:
+            self.evict(self.max_size)
+
+    def evict(self, max_size):
+        """evict(max_size: int) -> None
+
+        Removes the least recently used entries until the cache holds at
+        most max_size bytes.
+
+        """
+        entries = []
+        total = 0
+        for fname in os.listdir(self.directory):
+            if fname.startswith('.') or not fname.endswith('.pickle'):
+                continue
+            path = os.path.join(self.directory, fname)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        entries.sort()
+        for mtime, size, path in entries:
+            if total <= max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_translation_cache = None
+
+def get_translation_cache(configuration=None):
+    """get_translation_cache(configuration: ConfigurationObject)
+         -> TranslationCache or None
+
+    Returns the cache selected by the 'translationCache' configuration
+    fields, or None if it is disabled.
+
+    """
+    global _translation_cache
+    from vistrails.core import system
+    if configuration is None:
+        from vistrails.core.configuration import get_vistrails_configuration
+        configuration = get_vistrails_configuration()
+    if (configuration is None or
+            not configuration.has_deep_value('translationCache.enabled') or
+            not configuration.get_deep_value('translationCache.enabled')):
+        return None
+    directory = system.get_vistrails_directory('translationCache.cacheDir',
+                                               configuration)
+    if directory is None:
+        return None
+    max_size = configuration.get_deep_value('translationCache.cacheSize')
+    max_size = max_size * 1024 * 1024 if max_size else None
+    if (_translation_cache is None or
+            _translation_cache.directory != directory):
+        _translation_cache = TranslationCache(directory, max_size)
+    else:
+        _translation_cache.max_size = max_size
+    return _translation_cache
+
+
+###############################################################################
+
+class TestTranslationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='vt_translations_')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def open_old(self, fname):
+        from vistrails.core.system import vistrails_root_directory
+        from vistrails.db.services.io import get_version_for_xml
+        filename = os.path.join(vistrails_root_directory(),
+                                'tests', 'resources', fname)
+        tree = vistrails.db.services.xml_stream.parse(filename)
+        try:
+            version = get_version_for_xml(tree.getroot())
+            vistrail = getVersionDAO(version).open_from_xml(
+                    filename, DBVistrail.vtType, tree)
+        finally:
+            tree.close()
+        return filename, version, vistrail
+
+    def to_xml(self, vistrail, name):
+        fname = os.path.join(self.tmp, name)
+        tags = {'xmlns:xsi': 'http://www.w3.org/2001/XMLSchema-instance',
+                'xsi:schemaLocation': 'http://www.vistrails.org/vistrail.xsd'}
+        getVersionDAO(currentVersion).save_to_xml(vistrail, fname, tags,
+                                                  currentVersion)
+        with open(fname, 'rb') as fp:
+            return fp.read()
+
+    def get_modules(self, vistrail):
+        return [(op.db_data.db_id, op.db_data.db_package,
+                 op.db_data.db_version)
+                for action in vistrail.db_actions
+                for op in action.db_operations
+                if op.vtType == 'add' and op.db_what == 'module']
+
+    def test_store(self):
+        from vistrails.db.versions import translate_vistrail
+        filename, version, old = self.open_old('pythonsource.xml')
+        vistrail = translate_vistrail(old, version)
+        cache = TranslationCache(os.path.join(self.tmp, 'cache'))
+        key = hash_file(filename)
+        self.assertIsNone(cache.load(key))
+        cache.store(key, vistrail)
+        cached = cache.load(key)
+        self.assertIsNotNone(cached)
+        self.assertEqual(self.to_xml(vistrail, 'translated.xml'),
+                         self.to_xml(cached, 'cached.xml'))
+        # Fields that were not set are still None
+        modules = self.get_modules(cached)
+        self.assertTrue(modules)
+        self.assertEqual(modules, self.get_modules(vistrail))
+        self.assertIsNone(modules[0][2])
+        self.assertEqual(os.listdir(cache.directory),
+                         [os.path.basename(cache._entry(key))])
+
+    def test_invalid(self):
+        cache = TranslationCache(self.tmp)
+        for content in ['not a pickle', cPickle.dumps(['a list'])]:
+            with open(cache._entry('abc'), 'wb') as fp:
+                fp.write(content)
+            self.assertIsNone(cache.load('abc'))
+            self.assertFalse(os.path.exists(cache._entry('abc')))
+
+    def test_evict(self):
+        cache = TranslationCache(self.tmp)
+        for i, key in enumerate(['a', 'b', 'c']):
+            with open(cache._entry(key), 'wb') as fp:
+                fp.write('x' * 100)
+            os.utime(cache._entry(key), (1000 + i, 1000 + i))
+        os.utime(cache._entry('a'), None)
+        cache.evict(250)
+        self.assertEqual(sorted(os.listdir(self.tmp)),
+                         sorted(os.path.basename(cache._entry(k))
+                                for k in ['a', 'c']))
+
+    def test_code_change(self):
+        """Entries made by other code are not used"""
+        global _code_fingerprint
+        cache = TranslationCache(self.tmp)
+        vistrail = DBVistrail()
+        cache.store('abc', vistrail)
+        self.assertIsNotNone(cache.load('abc'))
+        fingerprint = code_fingerprint()
+        _code_fingerprint = 'f' * 40
+        try:
+            self.assertIsNone(cache.load('abc'))
+        finally:
+            _code_fingerprint = fingerprint
+        self.assertIsNotNone(cache.load('abc'))
+
+    def test_identity_steps(self):
+        """Skipping identity steps gives the same vistrail"""
+        import vistrails.db.versions
+        from vistrails.db.versions import translate_vistrail
+        filename, version, old = self.open_old('dummy_new.xml')
+        self.assertEqual(version, '0.5.0')
+        skipped = translate_vistrail(old, version)
+        identity = vistrails.db.versions.identity_translations
+        vistrails.db.versions.identity_translations = {}
+        try:
+            stepwise = translate_vistrail(old, version)
+        finally:
+            vistrails.db.versions.identity_translations = identity
+        self.assertEqual(self.to_xml(skipped, 'skipped.xml'),
+                         self.to_xml(stepwise, 'stepwise.xml'))
@@ -35,7 +35,8 @@
 from vistrails.db.domain import DBWorkflow, DBAdd, DBDelete, DBAction, DBAbstraction, \
     DBModule, DBConnection, DBPort, DBFunction, DBParameter, DBGroup
 from vistrails.db.services.action_chain import getActionChain, getCurrentOperationDict, \
-    getCurrentOperations, simplify_ops
+    getCurrentOperations, getVersionOperationDict, getVersionOperations, \
+    clearCheckpoints, simplify_ops
 from vistrails.db import VistrailsDBException
 
 import copy
@@ -73,8 +74,8 @@ def materializeWorkflow(vistrail, version):
         workflow = DBWorkflow()
         #for action in getActionChain(vistrail, version):
         #    oldPerformAction(action, workflow)
-        performActions(getActionChain(vistrail, version), 
-                            workflow)
+        # replay the actions from the nearest checkpointed ancestor
+        performAdds(getVersionOperations(vistrail, version), workflow)
         workflow.db_id = version
         workflow.db_vistrailId = vistrail.db_id
         return workflow
@@ -639,8 +640,7 @@ def normalOperations(adds, deletes, do_copy=False):
 
 def getPathAsAction(vistrail, v1, v2, do_copy=False):
     sharedRoot = getSharedRoot(vistrail, [v1, v2])
-    sharedActionChain = getActionChain(vistrail, sharedRoot)
-    sharedOperationDict = getCurrentOperationDict(sharedActionChain)
+    sharedOperationDict = getVersionOperationDict(vistrail, sharedRoot)
     v1Actions = getActionChain(vistrail, v1, sharedRoot)
     v2Actions = getActionChain(vistrail, v2, sharedRoot)
     (v1AddDict, v1DeleteDict) = getOperationDiff(v1Actions, 
@@ -703,9 +703,14 @@ def addAndFixActions(startDict, actions):
     return curDict
 
 def fixActions(vistrail, v, actions):
-    startingChain = getActionChain(vistrail, v)
-    startingDict = getCurrentOperationDict(startingChain)
+    startingDict = getVersionOperationDict(vistrail, v)
     addAndFixActions(startingDict, actions)
+    # the operations of actions already in the vistrail were replaced
+    for action in actions:
+        if vistrail.db_has_action_with_id(action.db_id) and \
+                vistrail.db_get_action_by_id(action.db_id) is action:
+            clearCheckpoints(vistrail)
+            break
     
 ################################################################################
 # Diff methods
@@ -794,8 +799,7 @@ def getObjects(actions):
 
 def getVersionDifferences(vistrail, versions):
     sharedRoot = getSharedRoot(vistrail, versions)
-    sharedActionChain = getActionChain(vistrail, sharedRoot)
-    sharedOperationDict = getCurrentOperationDict(sharedActionChain)
+    sharedOperationDict = getVersionOperationDict(vistrail, sharedRoot)
 
     vOnlySorted = []
     for v in versions:
@@ -1627,5 +1631,62 @@ class TestDBVistrailService(unittest.TestCase):
         # test parameter change inequality
         assert heuristicModuleMatch(module1, module5) == 0
 
+    def test_checkpoints(self):
+        from vistrails.db.services.action_chain import \
+            OperationDictCheckpoints
+        from vistrails.db.services.io import open_bundle_from_zip_xml
+        import os
+        import shutil
+
+        (save_bundle, save_dir) = open_bundle_from_zip_xml(
+            'vistrail',
+            os.path.join(vistrails.core.system.vistrails_root_directory(),
+                         'tests/resources/terminator.vt'))
+        shutil.rmtree(save_dir)
+        vistrail = save_bundle.vistrail
+        versions = sorted(a.db_id for a in vistrail.db_actions)
+        checkpoints = OperationDictCheckpoints(interval=3, max_size=5)
+        for version in reversed(versions):
+            expected = getCurrentOperationDict(getActionChain(vistrail,
+                                                              version))
+            self.assertEqual(checkpoints.get_operation_dict(vistrail,
+                                                            version),
+                             expected)
+            self.assertLessEqual(len(checkpoints), 5)
+        self.assertGreater(len(checkpoints), 0)
+        # Snapshots are not modified by the callers
+        for version in versions:
+            checkpoints.get_operation_dict(vistrail, version).clear()
+            expected = getCurrentOperationDict(getActionChain(vistrail,
+                                                              version))
+            self.assertEqual(checkpoints.get_operation_dict(vistrail,
+                                                            version),
+                             expected)
+
+    def test_fix_actions_clears_checkpoints(self):
+        from vistrails.db.services.action_chain import getCheckpoints
+        from vistrails.db.services.io import open_bundle_from_zip_xml
+        import os
+        import shutil
+
+        (save_bundle, save_dir) = open_bundle_from_zip_xml(
+            'vistrail',
+            os.path.join(vistrails.core.system.vistrails_root_directory(),
+                         'tests/resources/terminator.vt'))
+        shutil.rmtree(save_dir)
+        vistrail = save_bundle.vistrail
+        version = max(a.db_id for a in vistrail.db_actions)
+        getVersionOperationDict(vistrail, version)
+        self.assertGreater(len(getCheckpoints(vistrail)), 0)
+        # an action that is not in the vistrail keeps the snapshots
+        action = vistrail.db_get_action_by_id(version)
+        fixActions(vistrail, action.db_prevId, [action.do_copy()])
+        self.assertGreater(len(getCheckpoints(vistrail)), 0)
+        fixActions(vistrail, action.db_prevId, [action])
+        self.assertEqual(len(getCheckpoints(vistrail)), 0)
+        self.assertEqual(getVersionOperationDict(vistrail, version),
+                         getCurrentOperationDict(getActionChain(vistrail,
+                                                                version)))
+
 if __name__ == '__main__':
     unittest.main()
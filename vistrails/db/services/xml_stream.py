@@ -0,0 +1,309 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Single-pass parsing of vistrails XML files.
+
+The auto-generated XML DAOs only need the tag, the attributes and the
+children of the element they read.  parse() returns a tree whose root
+hands out its children while the file is being read, so the root object
+(a vistrail or a log) is built without keeping the whole document in
+memory: each top-level child (an action, a workflow execution, ...) is
+discarded as soon as its DAO has converted it.
+
+lxml is used when it is available, cElementTree otherwise.
+"""
+
+from vistrails.core.system import get_elementtree_library
+
+import unittest
+
+try:
+    from lxml import etree as _etree
+    _iterparse_kwargs = {'remove_comments': True, 'remove_pis': True,
+                         'huge_tree': True}
+except ImportError:
+    _etree = get_elementtree_library()
+    _iterparse_kwargs = {}
+
+
+class StreamingElement(object):
+    """Root element whose children are parsed on demand.
+
+    getchildren() can only be iterated once; every child yielded is
+    cleared and removed from the underlying tree before the next one is
+    parsed.
+
+    """
+    def __init__(self, stream, node):
+        self._stream = stream
+        self._node = node
+        self.tag = node.tag
+        self.attrib = dict(node.attrib)
+
+    def get(self, key, default=None):
+        return self.attrib.get(key, default)
+
+    def keys(self):
+        return self.attrib.keys()
+
+    def items(self):
+        return self.attrib.items()
+
+    def getchildren(self):
+        return self._stream.iter_children()
+
+    __iter__ = getchildren
+
+
+class XMLStream(object):
+    """ElementTree-like object reading a file in a single pass.
+
+    source is either a filename or a file object.  The file is closed
+    once the root element has been read completely, or by close().
+
+    """
+    def __init__(self, source):
+        if isinstance(source, basestring):
+            self._file = open(source, 'rb')
+            self._close_file = True
+        else:
+            self._file = source
+            self._close_file = False
+        self._events = _etree.iterparse(self._file,
+                                        events=('start', 'end'),
+                                        **_iterparse_kwargs)
+        self._consumed = False
+        try:
+            event, node = next(self._events)
+        except Exception:
+            self.close()
+            raise
+        self._node = node
+        self._root = StreamingElement(self, node)
+
+    def getroot(self):
+        return self._root
+
+    def iter_children(self):
+        if self._consumed:
+            raise RuntimeError("XML stream children can only be read once")
+        self._consumed = True
+        root = self._node
+        depth = 0
+        try:
+            for event, node in self._events:
+                if event == 'start':
+                    depth += 1
+                    continue
+                if depth == 0:
+                    # end of root element
+                    break
+                depth -= 1
+                if depth == 0:
+                    yield node
+                    node.clear()
+                    del root[:]
+        finally:
+            self.close()
+
+    def close(self):
+        self._events = iter(())
+        if self._close_file and self._file is not None:
+            self._file.close()
+        self._file = None
+
+class FragmentFile(object):
+    """Read-only file object wrapping a sequence of XML fragments, such
+    as an appended log, in a single root element.
+
+    Only the bytes in [start, end) of the file are read, so that the
+    fragments appended after a known offset can be parsed on their own.
+
+    """
+    def __init__(self, filename, tag, start=0, end=None):
+        self._parts = ['<%s>\n' % tag, None, '</%s>\n' % tag]
+        self._file = open(filename, 'rb')
+        if start:
+            self._file.seek(start)
+        if end is None:
+            self._remaining = -1
+        else:
+            self._remaining = max(end - start, 0)
+
+    def _read_file(self, size):
+        if self._remaining >= 0 and (size < 0 or size > self._remaining):
+            size = self._remaining
+        chunk = self._file.read(size)
+        if self._remaining >= 0:
+            self._remaining -= len(chunk)
+        return chunk
+
+    def read(self, size=-1):
+        data = ''
+        while self._parts and (size < 0 or len(data) < size):
+            if self._parts[0] is None:
+                chunk = self._read_file(size - len(data) if size >= 0
+                                        else -1)
+                if not chunk:
+                    self._parts.pop(0)
+                data += chunk
+            else:
+                part = self._parts.pop(0)
+                if size >= 0 and len(data) + len(part) > size:
+                    split = size - len(data)
+                    self._parts.insert(0, part[split:])
+                    part = part[:split]
+                data += part
+        return data
+
+    def close(self):
+        self._file.close()
+
+def parse(source):
+    """parse(source: str or file) -> XMLStream
+
+    Drop-in replacement for ElementTree.parse for files that are read
+    once by the XML DAOs.
+
+    """
+    return XMLStream(source)
+
+def parse_fragments(filename, tag, start=0, end=None):
+    """parse_fragments(filename: str, tag: str, start: int, end: int)
+         -> XMLStream
+
+    Parses a file of concatenated XML fragments as if they were the
+    children of a single tag element.
+
+    """
+    f = FragmentFile(filename, tag, start, end)
+    try:
+        stream = XMLStream(f)
+    except Exception:
+        f.close()
+        raise
+    stream._close_file = True
+    return stream
+
+##############################################################################
+
+class TestXMLStream(unittest.TestCase):
+    def test_children(self):
+        import StringIO
+        xml = ('<vistrail version="1.0.4" id="3">'
+               '<action id="1"><add what="module"/></action>'
+               '<!-- comment -->'
+               '<tag id="1" name="a"/>'
+               '</vistrail>')
+        tree = parse(StringIO.StringIO(xml))
+        root = tree.getroot()
+        self.assertEqual(root.tag, 'vistrail')
+        self.assertEqual(root.get('version'), '1.0.4')
+        self.assertEqual(root.get('missing', 'x'), 'x')
+        seen = []
+        for child in root.getchildren():
+            seen.append((child.tag, child.get('id'),
+                         [c.tag for c in child.getchildren()]))
+        self.assertEqual(seen, [('action', '1', ['add']),
+                                ('tag', '1', [])])
+        self.assertRaises(RuntimeError, lambda: list(root.getchildren()))
+
+    def test_fragments(self):
+        import os
+        import tempfile
+        (fd, fname) = tempfile.mkstemp(prefix='vt_log')
+        os.write(fd, '<exec id="1"/>\n<exec id="2"/>\n')
+        os.close(fd)
+        try:
+            f = FragmentFile(fname, 'log')
+            chunks = []
+            while True:
+                chunk = f.read(5)
+                if not chunk:
+                    break
+                self.assertLessEqual(len(chunk), 5)
+                chunks.append(chunk)
+            f.close()
+            self.assertEqual(''.join(chunks),
+                             '<log>\n<exec id="1"/>\n<exec id="2"/>\n'
+                             '</log>\n')
+            tree = parse_fragments(fname, 'log')
+            self.assertEqual([c.get('id')
+                              for c in tree.getroot().getchildren()],
+                             ['1', '2'])
+            # only the second fragment
+            tree = parse_fragments(fname, 'log', 15, 30)
+            self.assertEqual([c.get('id')
+                              for c in tree.getroot().getchildren()],
+                             ['2'])
+        finally:
+            os.unlink(fname)
+
+    def test_same_objects(self):
+        """Streaming and DOM parsing build the same vistrail."""
+        import os
+        import shutil
+        import tempfile
+        import zipfile
+        from vistrails.core.system import vistrails_root_directory
+
+        vt_fname = os.path.join(vistrails_root_directory(), 'tests',
+                                'resources', 'terminator.vt')
+        tmpdir = tempfile.mkdtemp(prefix='vt_stream')
+        try:
+            fname = zipfile.ZipFile(vt_fname).extract('vistrail', tmpdir)
+            self.compare(fname)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def compare(self, fname):
+        from vistrails.db.domain import DBVistrail
+        from vistrails.db.versions import getVersionDAO
+        ElementTree = get_elementtree_library()
+
+        dom = ElementTree.parse(fname)
+        dao_list = getVersionDAO(dom.getroot().get('version'))
+        expected = dao_list.open_from_xml(fname, DBVistrail.vtType, dom)
+        stream = parse(fname)
+        actual = dao_list.open_from_xml(fname, DBVistrail.vtType, stream)
+        self.assertIsNone(stream._file)
+        self.assertEqual(len(actual.db_actions), len(expected.db_actions))
+        self.assertEqual(sorted(a.db_id for a in actual.db_actions),
+                         sorted(a.db_id for a in expected.db_actions))
+        self.assertEqual(sorted((t.db_id, t.db_name)
+                                for t in actual.db_tags),
+                         sorted((t.db_id, t.db_name)
+                                for t in expected.db_tags))
+        self.assertEqual(actual.db_version, expected.db_version)
+        self.assertGreater(len(actual.db_actions), 0)
@@ -41,6 +41,18 @@ from vistrails.db import VistrailsDBException
 
 currentVersion = '1.0.4'
 
+# Forward steps that only copy an object to the classes of the next version:
+# none of the classes it contains changed and the translation has nothing to
+# update. When other steps follow, these are skipped and the next
+# translation reads the older objects directly, since update_version() only
+# looks the fields up by name.
+identity_translations = {
+    'translateVistrail': set(['0.9.5']),
+    'translateWorkflow': set(['0.9.5']),
+    'translateLog': set(['1.0.0', '1.0.2']),
+    'translateRegistry': set(['0.9.5', '1.0.1']),
+    }
+
 def getVersionDAO(version=None):
     if version is None:
         version = currentVersion
@@ -113,12 +125,20 @@ def translate_object(obj, method_name, version=None, target_version=None):
             map = rev_version_map
             break
 
+    skipped = set()
+    if map is version_map:
+        skipped = identity_translations.get(method_name, skipped)
+
     # don't get stuck in an infinite loop
     count = 0
     while version != target_version:
         if count > len(map):
             break
         next_version = map[version]
+        if version in skipped and next_version != target_version:
+            version = next_version
+            count += 1
+            continue
         try:
             translate_module = get_translate_module(map, version, next_version)
         except Exception, e:
@@ -160,6 +180,10 @@ def translate_startup(startup, version=None, target_version=None):
     return translate_object(startup, 'translateStartup', version,
                             target_version)
 
+def translate_mashuptrail(mashuptrail, version=None, target_version=None):
+    return translate_object(mashuptrail, 'translateMashuptrail', version,
+                            target_version)
+
 def get_version_name(version_no):
     return 'v' + version_no.replace('.', '_')
 
@@ -37,23 +37,47 @@
 
 import copy
 
+def _getstate(self):
+    """Returns the state of an object that uses __slots__, as the values in
+    its __dict__ and its slots.
+
+    pickle and copy know how to restore that; without it, these objects could
+    only be pickled with protocol 2.
+    """
+    slots = {}
+    for cls in type(self).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            if name not in ('__dict__', '__weakref__'):
+                try:
+                    slots[name] = cls.__dict__[name].__get__(self)
+                except AttributeError:
+                    pass
+    return getattr(self, '__dict__', None) or None, slots
+
 class DBOpmWasGeneratedBy(object):
 
+    __slots__ = ('_db_effect', '_db_deleted_effect', '_db_role',
+                 '_db_deleted_role', '_db_cause', '_db_deleted_cause',
+                 '_db_accounts', '_db_deleted_accounts', '_db_opm_times',
+                 '_db_deleted_opm_times', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_was_generated_by'
 
     def __init__(self, effect=None, role=None, cause=None, accounts=None, opm_times=None):
-        self.db_deleted_effect = []
+        self._db_deleted_effect = None
         self._db_effect = effect
-        self.db_deleted_role = []
+        self._db_deleted_role = None
         self._db_role = role
-        self.db_deleted_cause = []
+        self._db_deleted_cause = None
         self._db_cause = cause
-        self.db_deleted_accounts = []
+        self._db_deleted_accounts = None
         if accounts is None:
             self._db_accounts = []
         else:
             self._db_accounts = accounts
-        self.db_deleted_opm_times = []
+        self._db_deleted_opm_times = None
         if opm_times is None:
             self._db_opm_times = []
         else:
@@ -191,17 +215,22 @@ class DBOpmWasGeneratedBy(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_effect)
-        children.extend(self.db_deleted_role)
-        children.extend(self.db_deleted_cause)
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_opm_times)
+        if self._db_deleted_effect is not None:
+            children.extend(self._db_deleted_effect)
+        if self._db_deleted_role is not None:
+            children.extend(self._db_deleted_role)
+        if self._db_deleted_cause is not None:
+            children.extend(self._db_deleted_cause)
+        if self._db_deleted_accounts is not None:
+            children.extend(self._db_deleted_accounts)
+        if self._db_deleted_opm_times is not None:
+            children.extend(self._db_deleted_opm_times)
         if remove:
-            self.db_deleted_effect = []
-            self.db_deleted_role = []
-            self.db_deleted_cause = []
-            self.db_deleted_accounts = []
-            self.db_deleted_opm_times = []
+            self._db_deleted_effect = None
+            self._db_deleted_role = None
+            self._db_deleted_cause = None
+            self._db_deleted_accounts = None
+            self._db_deleted_opm_times = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -225,6 +254,13 @@ class DBOpmWasGeneratedBy(object):
         self._db_effect = effect
         self.is_dirty = True
     db_effect = property(__get_db_effect, __set_db_effect)
+    def __get_db_deleted_effect(self):
+        if self._db_deleted_effect is None:
+            self._db_deleted_effect = []
+        return self._db_deleted_effect
+    def __set_db_deleted_effect(self, deleted):
+        self._db_deleted_effect = deleted
+    db_deleted_effect = property(__get_db_deleted_effect, __set_db_deleted_effect)
     def db_add_effect(self, effect):
         self._db_effect = effect
     def db_change_effect(self, effect):
@@ -240,6 +276,13 @@ class DBOpmWasGeneratedBy(object):
         self._db_role = role
         self.is_dirty = True
     db_role = property(__get_db_role, __set_db_role)
+    def __get_db_deleted_role(self):
+        if self._db_deleted_role is None:
+            self._db_deleted_role = []
+        return self._db_deleted_role
+    def __set_db_deleted_role(self, deleted):
+        self._db_deleted_role = deleted
+    db_deleted_role = property(__get_db_deleted_role, __set_db_deleted_role)
     def db_add_role(self, role):
         self._db_role = role
     def db_change_role(self, role):
@@ -255,6 +298,13 @@ class DBOpmWasGeneratedBy(object):
         self._db_cause = cause
         self.is_dirty = True
     db_cause = property(__get_db_cause, __set_db_cause)
+    def __get_db_deleted_cause(self):
+        if self._db_deleted_cause is None:
+            self._db_deleted_cause = []
+        return self._db_deleted_cause
+    def __set_db_deleted_cause(self, deleted):
+        self._db_deleted_cause = deleted
+    db_deleted_cause = property(__get_db_deleted_cause, __set_db_deleted_cause)
     def db_add_cause(self, cause):
         self._db_cause = cause
     def db_change_cause(self, cause):
@@ -270,6 +320,13 @@ class DBOpmWasGeneratedBy(object):
         self._db_accounts = accounts
         self.is_dirty = True
     db_accounts = property(__get_db_accounts, __set_db_accounts)
+    def __get_db_deleted_accounts(self):
+        if self._db_deleted_accounts is None:
+            self._db_deleted_accounts = []
+        return self._db_deleted_accounts
+    def __set_db_deleted_accounts(self, deleted):
+        self._db_deleted_accounts = deleted
+    db_deleted_accounts = property(__get_db_deleted_accounts, __set_db_deleted_accounts)
     def db_get_accounts(self):
         return self._db_accounts
     def db_add_account(self, account):
@@ -290,6 +347,13 @@ class DBOpmWasGeneratedBy(object):
         self._db_opm_times = opm_times
         self.is_dirty = True
     db_opm_times = property(__get_db_opm_times, __set_db_opm_times)
+    def __get_db_deleted_opm_times(self):
+        if self._db_deleted_opm_times is None:
+            self._db_deleted_opm_times = []
+        return self._db_deleted_opm_times
+    def __set_db_deleted_opm_times(self, deleted):
+        self._db_deleted_opm_times = deleted
+    db_deleted_opm_times = property(__get_db_deleted_opm_times, __set_db_deleted_opm_times)
     def db_get_opm_times(self):
         return self._db_opm_times
     def db_add_opm_time(self, opm_time):
@@ -308,10 +372,14 @@ class DBOpmWasGeneratedBy(object):
 
 class DBConfigKey(object):
 
+    __slots__ = ('_db_value', '_db_deleted_value', '_db_name', 'is_dirty',
+                 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'config_key'
 
     def __init__(self, value=None, name=None):
-        self.db_deleted_value = []
+        self._db_deleted_value = None
         self._db_value = value
         self._db_name = name
         self.is_dirty = True
@@ -398,9 +466,10 @@ class DBConfigKey(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_value)
+        if self._db_deleted_value is not None:
+            children.extend(self._db_deleted_value)
         if remove:
-            self.db_deleted_value = []
+            self._db_deleted_value = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -414,6 +483,13 @@ class DBConfigKey(object):
         self._db_value = value
         self.is_dirty = True
     db_value = property(__get_db_value, __set_db_value)
+    def __get_db_deleted_value(self):
+        if self._db_deleted_value is None:
+            self._db_deleted_value = []
+        return self._db_deleted_value
+    def __set_db_deleted_value(self, deleted):
+        self._db_deleted_value = deleted
+    db_deleted_value = property(__get_db_deleted_value, __set_db_deleted_value)
     def db_add_value(self, value):
         self._db_value = value
     def db_change_value(self, value):
@@ -441,12 +517,17 @@ class DBConfigKey(object):
 
 class DBMashupAlias(object):
 
+    __slots__ = ('_db_id', '_db_name', '_db_component',
+                 '_db_deleted_component', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'mashup_alias'
 
     def __init__(self, id=None, name=None, component=None):
         self._db_id = id
         self._db_name = name
-        self.db_deleted_component = []
+        self._db_deleted_component = None
         self._db_component = component
         self.is_dirty = True
         self.is_new = True
@@ -516,9 +597,10 @@ class DBMashupAlias(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_component)
+        if self._db_deleted_component is not None:
+            children.extend(self._db_deleted_component)
         if remove:
-            self.db_deleted_component = []
+            self._db_deleted_component = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -558,6 +640,13 @@ class DBMashupAlias(object):
         self._db_component = component
         self.is_dirty = True
     db_component = property(__get_db_component, __set_db_component)
+    def __get_db_deleted_component(self):
+        if self._db_deleted_component is None:
+            self._db_deleted_component = []
+        return self._db_deleted_component
+    def __set_db_deleted_component(self, deleted):
+        self._db_deleted_component = deleted
+    db_deleted_component = property(__get_db_deleted_component, __set_db_deleted_component)
     def db_add_component(self, component):
         self._db_component = component
     def db_change_component(self, component):
@@ -576,26 +665,26 @@ class DBGroup(object):
 
     def __init__(self, id=None, workflow=None, cache=None, name=None, namespace=None, package=None, version=None, location=None, functions=None, annotations=None, controlParameters=None):
         self._db_id = id
-        self.db_deleted_workflow = []
+        self._db_deleted_workflow = None
         self._db_workflow = workflow
         self._db_cache = cache
         self._db_name = name
         self._db_namespace = namespace
         self._db_package = package
         self._db_version = version
-        self.db_deleted_location = []
+        self._db_deleted_location = None
         self._db_location = location
-        self.db_deleted_functions = []
-        self.db_functions_id_index = {}
+        self._db_deleted_functions = None
+        self._db_functions_id_index = None
         if functions is None:
             self._db_functions = []
         else:
             self._db_functions = functions
             for v in self._db_functions:
                 self.db_functions_id_index[v.db_id] = v
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
-        self.db_annotations_key_index = {}
+        self._db_deleted_annotations = None
+        self._db_annotations_id_index = None
+        self._db_annotations_key_index = None
         if annotations is None:
             self._db_annotations = []
         else:
@@ -603,9 +692,9 @@ class DBGroup(object):
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
                 self.db_annotations_key_index[v.db_key] = v
-        self.db_deleted_controlParameters = []
-        self.db_controlParameters_id_index = {}
-        self.db_controlParameters_name_index = {}
+        self._db_deleted_controlParameters = None
+        self._db_controlParameters_id_index = None
+        self._db_controlParameters_name_index = None
         if controlParameters is None:
             self._db_controlParameters = []
         else:
@@ -653,11 +742,14 @@ class DBGroup(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_functions_id_index = dict((v.db_id, v) for v in cp._db_functions)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
-        cp.db_controlParameters_id_index = dict((v.db_id, v) for v in cp._db_controlParameters)
-        cp.db_controlParameters_name_index = dict((v.db_name, v) for v in cp._db_controlParameters)
+        if cp._db_functions:
+            cp.db_functions_id_index = dict((v.db_id, v) for v in cp._db_functions)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+            cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
+        if cp._db_controlParameters:
+            cp.db_controlParameters_id_index = dict((v.db_id, v) for v in cp._db_controlParameters)
+            cp.db_controlParameters_name_index = dict((v.db_name, v) for v in cp._db_controlParameters)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -788,17 +880,22 @@ class DBGroup(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_workflow)
-        children.extend(self.db_deleted_location)
-        children.extend(self.db_deleted_functions)
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_controlParameters)
+        if self._db_deleted_workflow is not None:
+            children.extend(self._db_deleted_workflow)
+        if self._db_deleted_location is not None:
+            children.extend(self._db_deleted_location)
+        if self._db_deleted_functions is not None:
+            children.extend(self._db_deleted_functions)
+        if self._db_deleted_annotations is not None:
+            children.extend(self._db_deleted_annotations)
+        if self._db_deleted_controlParameters is not None:
+            children.extend(self._db_deleted_controlParameters)
         if remove:
-            self.db_deleted_workflow = []
-            self.db_deleted_location = []
-            self.db_deleted_functions = []
-            self.db_deleted_annotations = []
-            self.db_deleted_controlParameters = []
+            self._db_deleted_workflow = None
+            self._db_deleted_location = None
+            self._db_deleted_functions = None
+            self._db_deleted_annotations = None
+            self._db_deleted_controlParameters = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -836,6 +933,13 @@ class DBGroup(object):
         self._db_workflow = workflow
         self.is_dirty = True
     db_workflow = property(__get_db_workflow, __set_db_workflow)
+    def __get_db_deleted_workflow(self):
+        if self._db_deleted_workflow is None:
+            self._db_deleted_workflow = []
+        return self._db_deleted_workflow
+    def __set_db_deleted_workflow(self, deleted):
+        self._db_deleted_workflow = deleted
+    db_deleted_workflow = property(__get_db_deleted_workflow, __set_db_deleted_workflow)
     def db_add_workflow(self, workflow):
         self._db_workflow = workflow
     def db_change_workflow(self, workflow):
@@ -916,6 +1020,13 @@ class DBGroup(object):
         self._db_location = location
         self.is_dirty = True
     db_location = property(__get_db_location, __set_db_location)
+    def __get_db_deleted_location(self):
+        if self._db_deleted_location is None:
+            self._db_deleted_location = []
+        return self._db_deleted_location
+    def __set_db_deleted_location(self, deleted):
+        self._db_deleted_location = deleted
+    db_deleted_location = property(__get_db_deleted_location, __set_db_deleted_location)
     def db_add_location(self, location):
         self._db_location = location
     def db_change_location(self, location):
@@ -931,6 +1042,20 @@ class DBGroup(object):
         self._db_functions = functions
         self.is_dirty = True
     db_functions = property(__get_db_functions, __set_db_functions)
+    def __get_db_deleted_functions(self):
+        if self._db_deleted_functions is None:
+            self._db_deleted_functions = []
+        return self._db_deleted_functions
+    def __set_db_deleted_functions(self, deleted):
+        self._db_deleted_functions = deleted
+    db_deleted_functions = property(__get_db_deleted_functions, __set_db_deleted_functions)
+    def __get_db_functions_id_index(self):
+        if self._db_functions_id_index is None:
+            self._db_functions_id_index = {}
+        return self._db_functions_id_index
+    def __set_db_functions_id_index(self, index):
+        self._db_functions_id_index = index
+    db_functions_id_index = property(__get_db_functions_id_index, __set_db_functions_id_index)
     def db_get_functions(self):
         return self._db_functions
     def db_add_function(self, function):
@@ -973,6 +1098,27 @@ class DBGroup(object):
         self._db_annotations = annotations
         self.is_dirty = True
     db_annotations = property(__get_db_annotations, __set_db_annotations)
+    def __get_db_deleted_annotations(self):
+        if self._db_deleted_annotations is None:
+            self._db_deleted_annotations = []
+        return self._db_deleted_annotations
+    def __set_db_deleted_annotations(self, deleted):
+        self._db_deleted_annotations = deleted
+    db_deleted_annotations = property(__get_db_deleted_annotations, __set_db_deleted_annotations)
+    def __get_db_annotations_id_index(self):
+        if self._db_annotations_id_index is None:
+            self._db_annotations_id_index = {}
+        return self._db_annotations_id_index
+    def __set_db_annotations_id_index(self, index):
+        self._db_annotations_id_index = index
+    db_annotations_id_index = property(__get_db_annotations_id_index, __set_db_annotations_id_index)
+    def __get_db_annotations_key_index(self):
+        if self._db_annotations_key_index is None:
+            self._db_annotations_key_index = {}
+        return self._db_annotations_key_index
+    def __set_db_annotations_key_index(self, index):
+        self._db_annotations_key_index = index
+    db_annotations_key_index = property(__get_db_annotations_key_index, __set_db_annotations_key_index)
     def db_get_annotations(self):
         return self._db_annotations
     def db_add_annotation(self, annotation):
@@ -1022,6 +1168,27 @@ class DBGroup(object):
         self._db_controlParameters = controlParameters
         self.is_dirty = True
     db_controlParameters = property(__get_db_controlParameters, __set_db_controlParameters)
+    def __get_db_deleted_controlParameters(self):
+        if self._db_deleted_controlParameters is None:
+            self._db_deleted_controlParameters = []
+        return self._db_deleted_controlParameters
+    def __set_db_deleted_controlParameters(self, deleted):
+        self._db_deleted_controlParameters = deleted
+    db_deleted_controlParameters = property(__get_db_deleted_controlParameters, __set_db_deleted_controlParameters)
+    def __get_db_controlParameters_id_index(self):
+        if self._db_controlParameters_id_index is None:
+            self._db_controlParameters_id_index = {}
+        return self._db_controlParameters_id_index
+    def __set_db_controlParameters_id_index(self, index):
+        self._db_controlParameters_id_index = index
+    db_controlParameters_id_index = property(__get_db_controlParameters_id_index, __set_db_controlParameters_id_index)
+    def __get_db_controlParameters_name_index(self):
+        if self._db_controlParameters_name_index is None:
+            self._db_controlParameters_name_index = {}
+        return self._db_controlParameters_name_index
+    def __set_db_controlParameters_name_index(self, index):
+        self._db_controlParameters_name_index = index
+    db_controlParameters_name_index = property(__get_db_controlParameters_name_index, __set_db_controlParameters_name_index)
     def db_get_controlParameters(self):
         return self._db_controlParameters
     def db_add_controlParameter(self, controlParameter):
@@ -1070,26 +1237,33 @@ class DBGroup(object):
 
 class DBOpmWasControlledBy(object):
 
+    __slots__ = ('_db_effect', '_db_deleted_effect', '_db_role',
+                 '_db_deleted_role', '_db_cause', '_db_deleted_cause',
+                 '_db_accounts', '_db_deleted_accounts', '_db_starts',
+                 '_db_deleted_starts', '_db_ends', '_db_deleted_ends',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_was_controlled_by'
 
     def __init__(self, effect=None, role=None, cause=None, accounts=None, starts=None, ends=None):
-        self.db_deleted_effect = []
+        self._db_deleted_effect = None
         self._db_effect = effect
-        self.db_deleted_role = []
+        self._db_deleted_role = None
         self._db_role = role
-        self.db_deleted_cause = []
+        self._db_deleted_cause = None
         self._db_cause = cause
-        self.db_deleted_accounts = []
+        self._db_deleted_accounts = None
         if accounts is None:
             self._db_accounts = []
         else:
             self._db_accounts = accounts
-        self.db_deleted_starts = []
+        self._db_deleted_starts = None
         if starts is None:
             self._db_starts = []
         else:
             self._db_starts = starts
-        self.db_deleted_ends = []
+        self._db_deleted_ends = None
         if ends is None:
             self._db_ends = []
         else:
@@ -1249,19 +1423,25 @@ class DBOpmWasControlledBy(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_effect)
-        children.extend(self.db_deleted_role)
-        children.extend(self.db_deleted_cause)
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_starts)
-        children.extend(self.db_deleted_ends)
+        if self._db_deleted_effect is not None:
+            children.extend(self._db_deleted_effect)
+        if self._db_deleted_role is not None:
+            children.extend(self._db_deleted_role)
+        if self._db_deleted_cause is not None:
+            children.extend(self._db_deleted_cause)
+        if self._db_deleted_accounts is not None:
+            children.extend(self._db_deleted_accounts)
+        if self._db_deleted_starts is not None:
+            children.extend(self._db_deleted_starts)
+        if self._db_deleted_ends is not None:
+            children.extend(self._db_deleted_ends)
         if remove:
-            self.db_deleted_effect = []
-            self.db_deleted_role = []
-            self.db_deleted_cause = []
-            self.db_deleted_accounts = []
-            self.db_deleted_starts = []
-            self.db_deleted_ends = []
+            self._db_deleted_effect = None
+            self._db_deleted_role = None
+            self._db_deleted_cause = None
+            self._db_deleted_accounts = None
+            self._db_deleted_starts = None
+            self._db_deleted_ends = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -1288,6 +1468,13 @@ class DBOpmWasControlledBy(object):
         self._db_effect = effect
         self.is_dirty = True
     db_effect = property(__get_db_effect, __set_db_effect)
+    def __get_db_deleted_effect(self):
+        if self._db_deleted_effect is None:
+            self._db_deleted_effect = []
+        return self._db_deleted_effect
+    def __set_db_deleted_effect(self, deleted):
+        self._db_deleted_effect = deleted
+    db_deleted_effect = property(__get_db_deleted_effect, __set_db_deleted_effect)
     def db_add_effect(self, effect):
         self._db_effect = effect
     def db_change_effect(self, effect):
@@ -1303,6 +1490,13 @@ class DBOpmWasControlledBy(object):
         self._db_role = role
         self.is_dirty = True
     db_role = property(__get_db_role, __set_db_role)
+    def __get_db_deleted_role(self):
+        if self._db_deleted_role is None:
+            self._db_deleted_role = []
+        return self._db_deleted_role
+    def __set_db_deleted_role(self, deleted):
+        self._db_deleted_role = deleted
+    db_deleted_role = property(__get_db_deleted_role, __set_db_deleted_role)
     def db_add_role(self, role):
         self._db_role = role
     def db_change_role(self, role):
@@ -1318,6 +1512,13 @@ class DBOpmWasControlledBy(object):
         self._db_cause = cause
         self.is_dirty = True
     db_cause = property(__get_db_cause, __set_db_cause)
+    def __get_db_deleted_cause(self):
+        if self._db_deleted_cause is None:
+            self._db_deleted_cause = []
+        return self._db_deleted_cause
+    def __set_db_deleted_cause(self, deleted):
+        self._db_deleted_cause = deleted
+    db_deleted_cause = property(__get_db_deleted_cause, __set_db_deleted_cause)
     def db_add_cause(self, cause):
         self._db_cause = cause
     def db_change_cause(self, cause):
@@ -1333,6 +1534,13 @@ class DBOpmWasControlledBy(object):
         self._db_accounts = accounts
         self.is_dirty = True
     db_accounts = property(__get_db_accounts, __set_db_accounts)
+    def __get_db_deleted_accounts(self):
+        if self._db_deleted_accounts is None:
+            self._db_deleted_accounts = []
+        return self._db_deleted_accounts
+    def __set_db_deleted_accounts(self, deleted):
+        self._db_deleted_accounts = deleted
+    db_deleted_accounts = property(__get_db_deleted_accounts, __set_db_deleted_accounts)
     def db_get_accounts(self):
         return self._db_accounts
     def db_add_account(self, account):
@@ -1353,6 +1561,13 @@ class DBOpmWasControlledBy(object):
         self._db_starts = starts
         self.is_dirty = True
     db_starts = property(__get_db_starts, __set_db_starts)
+    def __get_db_deleted_starts(self):
+        if self._db_deleted_starts is None:
+            self._db_deleted_starts = []
+        return self._db_deleted_starts
+    def __set_db_deleted_starts(self, deleted):
+        self._db_deleted_starts = deleted
+    db_deleted_starts = property(__get_db_deleted_starts, __set_db_deleted_starts)
     def db_get_starts(self):
         return self._db_starts
     def db_add_start(self, start):
@@ -1373,6 +1588,13 @@ class DBOpmWasControlledBy(object):
         self._db_ends = ends
         self.is_dirty = True
     db_ends = property(__get_db_ends, __set_db_ends)
+    def __get_db_deleted_ends(self):
+        if self._db_deleted_ends is None:
+            self._db_deleted_ends = []
+        return self._db_deleted_ends
+    def __set_db_deleted_ends(self, deleted):
+        self._db_deleted_ends = deleted
+    db_deleted_ends = property(__get_db_deleted_ends, __set_db_deleted_ends)
     def db_get_ends(self):
         return self._db_ends
     def db_add_end(self, end):
@@ -1391,10 +1613,15 @@ class DBOpmWasControlledBy(object):
 
 class DBAdd(object):
 
+    __slots__ = ('_db_data', '_db_deleted_data', '_db_id', '_db_what',
+                 '_db_objectId', '_db_parentObjId', '_db_parentObjType',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'add'
 
     def __init__(self, data=None, id=None, what=None, objectId=None, parentObjId=None, parentObjType=None):
-        self.db_deleted_data = []
+        self._db_deleted_data = None
         self._db_data = data
         self._db_id = id
         self._db_what = what
@@ -1553,9 +1780,10 @@ class DBAdd(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_data)
+        if self._db_deleted_data is not None:
+            children.extend(self._db_deleted_data)
         if remove:
-            self.db_deleted_data = []
+            self._db_deleted_data = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -1569,6 +1797,13 @@ class DBAdd(object):
         self._db_data = data
         self.is_dirty = True
     db_data = property(__get_db_data, __set_db_data)
+    def __get_db_deleted_data(self):
+        if self._db_deleted_data is None:
+            self._db_deleted_data = []
+        return self._db_deleted_data
+    def __set_db_deleted_data(self, deleted):
+        self._db_deleted_data = deleted
+    db_deleted_data = property(__get_db_deleted_data, __set_db_deleted_data)
     def db_add_data(self, data):
         self._db_data = data
     def db_change_data(self, data):
@@ -1648,12 +1883,18 @@ class DBAdd(object):
 
 class DBProvGeneration(object):
 
+    __slots__ = ('_db_prov_entity', '_db_deleted_prov_entity',
+                 '_db_prov_activity', '_db_deleted_prov_activity',
+                 '_db_prov_role', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'prov_generation'
 
     def __init__(self, prov_entity=None, prov_activity=None, prov_role=None):
-        self.db_deleted_prov_entity = []
+        self._db_deleted_prov_entity = None
         self._db_prov_entity = prov_entity
-        self.db_deleted_prov_activity = []
+        self._db_deleted_prov_activity = None
         self._db_prov_activity = prov_activity
         self._db_prov_role = prov_role
         self.is_dirty = True
@@ -1734,11 +1975,13 @@ class DBProvGeneration(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_prov_entity)
-        children.extend(self.db_deleted_prov_activity)
+        if self._db_deleted_prov_entity is not None:
+            children.extend(self._db_deleted_prov_entity)
+        if self._db_deleted_prov_activity is not None:
+            children.extend(self._db_deleted_prov_activity)
         if remove:
-            self.db_deleted_prov_entity = []
-            self.db_deleted_prov_activity = []
+            self._db_deleted_prov_entity = None
+            self._db_deleted_prov_activity = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -1754,6 +1997,13 @@ class DBProvGeneration(object):
         self._db_prov_entity = prov_entity
         self.is_dirty = True
     db_prov_entity = property(__get_db_prov_entity, __set_db_prov_entity)
+    def __get_db_deleted_prov_entity(self):
+        if self._db_deleted_prov_entity is None:
+            self._db_deleted_prov_entity = []
+        return self._db_deleted_prov_entity
+    def __set_db_deleted_prov_entity(self, deleted):
+        self._db_deleted_prov_entity = deleted
+    db_deleted_prov_entity = property(__get_db_deleted_prov_entity, __set_db_deleted_prov_entity)
     def db_add_prov_entity(self, prov_entity):
         self._db_prov_entity = prov_entity
     def db_change_prov_entity(self, prov_entity):
@@ -1769,6 +2019,13 @@ class DBProvGeneration(object):
         self._db_prov_activity = prov_activity
         self.is_dirty = True
     db_prov_activity = property(__get_db_prov_activity, __set_db_prov_activity)
+    def __get_db_deleted_prov_activity(self):
+        if self._db_deleted_prov_activity is None:
+            self._db_deleted_prov_activity = []
+        return self._db_deleted_prov_activity
+    def __set_db_deleted_prov_activity(self, deleted):
+        self._db_deleted_prov_activity = deleted
+    db_deleted_prov_activity = property(__get_db_deleted_prov_activity, __set_db_deleted_prov_activity)
     def db_add_prov_activity(self, prov_activity):
         self._db_prov_activity = prov_activity
     def db_change_prov_activity(self, prov_activity):
@@ -1795,21 +2052,28 @@ class DBProvGeneration(object):
 
 class DBOpmUsed(object):
 
+    __slots__ = ('_db_effect', '_db_deleted_effect', '_db_role',
+                 '_db_deleted_role', '_db_cause', '_db_deleted_cause',
+                 '_db_accounts', '_db_deleted_accounts', '_db_opm_times',
+                 '_db_deleted_opm_times', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_used'
 
     def __init__(self, effect=None, role=None, cause=None, accounts=None, opm_times=None):
-        self.db_deleted_effect = []
+        self._db_deleted_effect = None
         self._db_effect = effect
-        self.db_deleted_role = []
+        self._db_deleted_role = None
         self._db_role = role
-        self.db_deleted_cause = []
+        self._db_deleted_cause = None
         self._db_cause = cause
-        self.db_deleted_accounts = []
+        self._db_deleted_accounts = None
         if accounts is None:
             self._db_accounts = []
         else:
             self._db_accounts = accounts
-        self.db_deleted_opm_times = []
+        self._db_deleted_opm_times = None
         if opm_times is None:
             self._db_opm_times = []
         else:
@@ -1947,17 +2211,22 @@ class DBOpmUsed(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_effect)
-        children.extend(self.db_deleted_role)
-        children.extend(self.db_deleted_cause)
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_opm_times)
+        if self._db_deleted_effect is not None:
+            children.extend(self._db_deleted_effect)
+        if self._db_deleted_role is not None:
+            children.extend(self._db_deleted_role)
+        if self._db_deleted_cause is not None:
+            children.extend(self._db_deleted_cause)
+        if self._db_deleted_accounts is not None:
+            children.extend(self._db_deleted_accounts)
+        if self._db_deleted_opm_times is not None:
+            children.extend(self._db_deleted_opm_times)
         if remove:
-            self.db_deleted_effect = []
-            self.db_deleted_role = []
-            self.db_deleted_cause = []
-            self.db_deleted_accounts = []
-            self.db_deleted_opm_times = []
+            self._db_deleted_effect = None
+            self._db_deleted_role = None
+            self._db_deleted_cause = None
+            self._db_deleted_accounts = None
+            self._db_deleted_opm_times = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -1981,6 +2250,13 @@ class DBOpmUsed(object):
         self._db_effect = effect
         self.is_dirty = True
     db_effect = property(__get_db_effect, __set_db_effect)
+    def __get_db_deleted_effect(self):
+        if self._db_deleted_effect is None:
+            self._db_deleted_effect = []
+        return self._db_deleted_effect
+    def __set_db_deleted_effect(self, deleted):
+        self._db_deleted_effect = deleted
+    db_deleted_effect = property(__get_db_deleted_effect, __set_db_deleted_effect)
     def db_add_effect(self, effect):
         self._db_effect = effect
     def db_change_effect(self, effect):
@@ -1996,6 +2272,13 @@ class DBOpmUsed(object):
         self._db_role = role
         self.is_dirty = True
     db_role = property(__get_db_role, __set_db_role)
+    def __get_db_deleted_role(self):
+        if self._db_deleted_role is None:
+            self._db_deleted_role = []
+        return self._db_deleted_role
+    def __set_db_deleted_role(self, deleted):
+        self._db_deleted_role = deleted
+    db_deleted_role = property(__get_db_deleted_role, __set_db_deleted_role)
     def db_add_role(self, role):
         self._db_role = role
     def db_change_role(self, role):
@@ -2011,6 +2294,13 @@ class DBOpmUsed(object):
         self._db_cause = cause
         self.is_dirty = True
     db_cause = property(__get_db_cause, __set_db_cause)
+    def __get_db_deleted_cause(self):
+        if self._db_deleted_cause is None:
+            self._db_deleted_cause = []
+        return self._db_deleted_cause
+    def __set_db_deleted_cause(self, deleted):
+        self._db_deleted_cause = deleted
+    db_deleted_cause = property(__get_db_deleted_cause, __set_db_deleted_cause)
     def db_add_cause(self, cause):
         self._db_cause = cause
     def db_change_cause(self, cause):
@@ -2026,6 +2316,13 @@ class DBOpmUsed(object):
         self._db_accounts = accounts
         self.is_dirty = True
     db_accounts = property(__get_db_accounts, __set_db_accounts)
+    def __get_db_deleted_accounts(self):
+        if self._db_deleted_accounts is None:
+            self._db_deleted_accounts = []
+        return self._db_deleted_accounts
+    def __set_db_deleted_accounts(self, deleted):
+        self._db_deleted_accounts = deleted
+    db_deleted_accounts = property(__get_db_deleted_accounts, __set_db_deleted_accounts)
     def db_get_accounts(self):
         return self._db_accounts
     def db_add_account(self, account):
@@ -2046,6 +2343,13 @@ class DBOpmUsed(object):
         self._db_opm_times = opm_times
         self.is_dirty = True
     db_opm_times = property(__get_db_opm_times, __set_db_opm_times)
+    def __get_db_deleted_opm_times(self):
+        if self._db_deleted_opm_times is None:
+            self._db_deleted_opm_times = []
+        return self._db_deleted_opm_times
+    def __set_db_deleted_opm_times(self, deleted):
+        self._db_deleted_opm_times = deleted
+    db_deleted_opm_times = property(__get_db_deleted_opm_times, __set_db_deleted_opm_times)
     def db_get_opm_times(self):
         return self._db_opm_times
     def db_add_opm_time(self, opm_time):
@@ -2064,6 +2368,9 @@ class DBOpmUsed(object):
 
 class DBOpmArtifactIdCause(object):
 
+    __slots__ = ('_db_id', 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_artifact_id_cause'
 
     def __init__(self, id=None):
@@ -2136,6 +2443,10 @@ class DBOpmArtifactIdCause(object):
 
 class DBRefProvEntity(object):
 
+    __slots__ = ('_db_prov_ref', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'ref_prov_entity'
 
     def __init__(self, prov_ref=None):
@@ -2208,6 +2519,12 @@ class DBRefProvEntity(object):
 
 class DBVtConnection(object):
 
+    __slots__ = ('_db_id', '_db_vt_source', '_db_vt_dest',
+                 '_db_vt_source_port', '_db_vt_dest_port',
+                 '_db_vt_source_signature', '_db_vt_dest_signature',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'vt_connection'
 
     def __init__(self, id=None, vt_source=None, vt_dest=None, vt_source_port=None, vt_dest_port=None, vt_source_signature=None, vt_dest_signature=None):
@@ -2399,6 +2716,10 @@ class DBVtConnection(object):
 
 class DBOpmAccount(object):
 
+    __slots__ = ('_db_id', '_db_value', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_account'
 
     def __init__(self, id=None, value=None):
@@ -2490,11 +2811,20 @@ class DBOpmAccount(object):
 
 class DBGroupExec(object):
 
+    __slots__ = ('_db_item_execs', '_db_deleted_item_execs',
+                 '_db_item_execs_id_index', '_db_id', '_db_ts_start',
+                 '_db_ts_end', '_db_cached', '_db_module_id',
+                 '_db_group_name', '_db_group_type', '_db_completed',
+                 '_db_error', '_db_machine_id', '_db_annotations',
+                 '_db_deleted_annotations', '_db_annotations_id_index',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'group_exec'
 
     def __init__(self, item_execs=None, id=None, ts_start=None, ts_end=None, cached=None, module_id=None, group_name=None, group_type=None, completed=None, error=None, machine_id=None, annotations=None):
-        self.db_deleted_item_execs = []
-        self.db_item_execs_id_index = {}
+        self._db_deleted_item_execs = None
+        self._db_item_execs_id_index = None
         if item_execs is None:
             self._db_item_execs = []
         else:
@@ -2511,8 +2841,8 @@ class DBGroupExec(object):
         self._db_completed = completed
         self._db_error = error
         self._db_machine_id = machine_id
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
+        self._db_deleted_annotations = None
+        self._db_annotations_id_index = None
         if annotations is None:
             self._db_annotations = []
         else:
@@ -2559,8 +2889,10 @@ class DBGroupExec(object):
                 cp._db_machine_id = id_remap[('machine', self._db_machine_id)]
         
         # recreate indices and set flags
-        cp.db_item_execs_id_index = dict((v.db_id, v) for v in cp._db_item_execs)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+        if cp._db_item_execs:
+            cp.db_item_execs_id_index = dict((v.db_id, v) for v in cp._db_item_execs)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -2681,11 +3013,13 @@ class DBGroupExec(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_item_execs)
+        if self._db_deleted_annotations is not None:
+            children.extend(self._db_deleted_annotations)
+        if self._db_deleted_item_execs is not None:
+            children.extend(self._db_deleted_item_execs)
         if remove:
-            self.db_deleted_annotations = []
-            self.db_deleted_item_execs = []
+            self._db_deleted_annotations = None
+            self._db_deleted_item_execs = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -2703,6 +3037,20 @@ class DBGroupExec(object):
         self._db_item_execs = item_execs
         self.is_dirty = True
     db_item_execs = property(__get_db_item_execs, __set_db_item_execs)
+    def __get_db_deleted_item_execs(self):
+        if self._db_deleted_item_execs is None:
+            self._db_deleted_item_execs = []
+        return self._db_deleted_item_execs
+    def __set_db_deleted_item_execs(self, deleted):
+        self._db_deleted_item_execs = deleted
+    db_deleted_item_execs = property(__get_db_deleted_item_execs, __set_db_deleted_item_execs)
+    def __get_db_item_execs_id_index(self):
+        if self._db_item_execs_id_index is None:
+            self._db_item_execs_id_index = {}
+        return self._db_item_execs_id_index
+    def __set_db_item_execs_id_index(self, index):
+        self._db_item_execs_id_index = index
+    db_item_execs_id_index = property(__get_db_item_execs_id_index, __set_db_item_execs_id_index)
     def db_get_item_execs(self):
         return self._db_item_execs
     def db_add_item_exec(self, item_exec):
@@ -2875,6 +3223,20 @@ class DBGroupExec(object):
         self._db_annotations = annotations
         self.is_dirty = True
     db_annotations = property(__get_db_annotations, __set_db_annotations)
+    def __get_db_deleted_annotations(self):
+        if self._db_deleted_annotations is None:
+            self._db_deleted_annotations = []
+        return self._db_deleted_annotations
+    def __set_db_deleted_annotations(self, deleted):
+        self._db_deleted_annotations = deleted
+    db_deleted_annotations = property(__get_db_deleted_annotations, __set_db_deleted_annotations)
+    def __get_db_annotations_id_index(self):
+        if self._db_annotations_id_index is None:
+            self._db_annotations_id_index = {}
+        return self._db_annotations_id_index
+    def __set_db_annotations_id_index(self, index):
+        self._db_annotations_id_index = index
+    db_annotations_id_index = property(__get_db_annotations_id_index, __set_db_annotations_id_index)
     def db_get_annotations(self):
         return self._db_annotations
     def db_add_annotation(self, annotation):
@@ -2916,6 +3278,9 @@ class DBGroupExec(object):
 
 class DBOpmAgentId(object):
 
+    __slots__ = ('_db_id', 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_agent_id'
 
     def __init__(self, id=None):
@@ -2988,6 +3353,11 @@ class DBOpmAgentId(object):
 
 class DBParameter(object):
 
+    __slots__ = ('_db_id', '_db_pos', '_db_name', '_db_type', '_db_val',
+                 '_db_alias', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'parameter'
 
     def __init__(self, id=None, pos=None, name=None, type=None, val=None, alias=None):
@@ -3159,6 +3529,28 @@ class DBParameter(object):
 
 class DBVistrail(object):
 
+    __slots__ = ('_db_id', '_db_entity_type', '_db_version', '_db_name',
+                 '_db_last_modified', '_db_actions', '_db_deleted_actions',
+                 '_db_actions_id_index', '_db_tags', '_db_deleted_tags',
+                 '_db_tags_id_index', '_db_tags_name_index',
+                 '_db_annotations', '_db_deleted_annotations',
+                 '_db_annotations_id_index', '_db_annotations_key_index',
+                 '_db_controlParameters', '_db_deleted_controlParameters',
+                 '_db_controlParameters_id_index',
+                 '_db_controlParameters_name_index',
+                 '_db_vistrailVariables', '_db_deleted_vistrailVariables',
+                 '_db_vistrailVariables_name_index',
+                 '_db_vistrailVariables_uuid_index',
+                 '_db_parameter_explorations',
+                 '_db_deleted_parameter_explorations',
+                 '_db_parameter_explorations_id_index',
+                 '_db_actionAnnotations', '_db_deleted_actionAnnotations',
+                 '_db_actionAnnotations_id_index',
+                 '_db_actionAnnotations_action_id_index',
+                 '_db_actionAnnotations_key_index', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'vistrail'
 
     def __init__(self, id=None, entity_type=None, version=None, name=None, last_modified=None, actions=None, tags=None, annotations=None, controlParameters=None, vistrailVariables=None, parameter_explorations=None, actionAnnotations=None):
@@ -3167,17 +3559,17 @@ class DBVistrail(object):
         self._db_version = version
         self._db_name = name
         self._db_last_modified = last_modified
-        self.db_deleted_actions = []
-        self.db_actions_id_index = {}
+        self._db_deleted_actions = None
+        self._db_actions_id_index = None
         if actions is None:
             self._db_actions = []
         else:
             self._db_actions = actions
             for v in self._db_actions:
                 self.db_actions_id_index[v.db_id] = v
-        self.db_deleted_tags = []
-        self.db_tags_id_index = {}
-        self.db_tags_name_index = {}
+        self._db_deleted_tags = None
+        self._db_tags_id_index = None
+        self._db_tags_name_index = None
         if tags is None:
             self._db_tags = []
         else:
@@ -3185,9 +3577,9 @@ class DBVistrail(object):
             for v in self._db_tags:
                 self.db_tags_id_index[v.db_id] = v
                 self.db_tags_name_index[v.db_name] = v
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
-        self.db_annotations_key_index = {}
+        self._db_deleted_annotations = None
+        self._db_annotations_id_index = None
+        self._db_annotations_key_index = None
         if annotations is None:
             self._db_annotations = []
         else:
@@ -3195,9 +3587,9 @@ class DBVistrail(object):
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
                 self.db_annotations_key_index[v.db_key] = v
-        self.db_deleted_controlParameters = []
-        self.db_controlParameters_id_index = {}
-        self.db_controlParameters_name_index = {}
+        self._db_deleted_controlParameters = None
+        self._db_controlParameters_id_index = None
+        self._db_controlParameters_name_index = None
         if controlParameters is None:
             self._db_controlParameters = []
         else:
@@ -3205,9 +3597,9 @@ class DBVistrail(object):
             for v in self._db_controlParameters:
                 self.db_controlParameters_id_index[v.db_id] = v
                 self.db_controlParameters_name_index[v.db_name] = v
-        self.db_deleted_vistrailVariables = []
-        self.db_vistrailVariables_name_index = {}
-        self.db_vistrailVariables_uuid_index = {}
+        self._db_deleted_vistrailVariables = None
+        self._db_vistrailVariables_name_index = None
+        self._db_vistrailVariables_uuid_index = None
         if vistrailVariables is None:
             self._db_vistrailVariables = []
         else:
@@ -3215,18 +3607,18 @@ class DBVistrail(object):
             for v in self._db_vistrailVariables:
                 self.db_vistrailVariables_name_index[v.db_name] = v
                 self.db_vistrailVariables_uuid_index[v.db_uuid] = v
-        self.db_deleted_parameter_explorations = []
-        self.db_parameter_explorations_id_index = {}
+        self._db_deleted_parameter_explorations = None
+        self._db_parameter_explorations_id_index = None
         if parameter_explorations is None:
             self._db_parameter_explorations = []
         else:
             self._db_parameter_explorations = parameter_explorations
             for v in self._db_parameter_explorations:
                 self.db_parameter_explorations_id_index[v.db_id] = v
-        self.db_deleted_actionAnnotations = []
-        self.db_actionAnnotations_id_index = {}
-        self.db_actionAnnotations_action_id_index = {}
-        self.db_actionAnnotations_key_index = {}
+        self._db_deleted_actionAnnotations = None
+        self._db_actionAnnotations_id_index = None
+        self._db_actionAnnotations_action_id_index = None
+        self._db_actionAnnotations_key_index = None
         if actionAnnotations is None:
             self._db_actionAnnotations = []
         else:
@@ -3286,19 +3678,26 @@ class DBVistrail(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_actions_id_index = dict((v.db_id, v) for v in cp._db_actions)
-        cp.db_tags_id_index = dict((v.db_id, v) for v in cp._db_tags)
-        cp.db_tags_name_index = dict((v.db_name, v) for v in cp._db_tags)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
-        cp.db_controlParameters_id_index = dict((v.db_id, v) for v in cp._db_controlParameters)
-        cp.db_controlParameters_name_index = dict((v.db_name, v) for v in cp._db_controlParameters)
-        cp.db_vistrailVariables_name_index = dict((v.db_name, v) for v in cp._db_vistrailVariables)
-        cp.db_vistrailVariables_uuid_index = dict((v.db_uuid, v) for v in cp._db_vistrailVariables)
-        cp.db_parameter_explorations_id_index = dict((v.db_id, v) for v in cp._db_parameter_explorations)
-        cp.db_actionAnnotations_id_index = dict((v.db_id, v) for v in cp._db_actionAnnotations)
-        cp.db_actionAnnotations_action_id_index = dict(((v.db_action_id,v.db_key), v) for v in cp._db_actionAnnotations)
-        cp.db_actionAnnotations_key_index = dict(((v.db_key,v.db_value), v) for v in cp._db_actionAnnotations)
+        if cp._db_actions:
+            cp.db_actions_id_index = dict((v.db_id, v) for v in cp._db_actions)
+        if cp._db_tags:
+            cp.db_tags_id_index = dict((v.db_id, v) for v in cp._db_tags)
+            cp.db_tags_name_index = dict((v.db_name, v) for v in cp._db_tags)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+            cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
+        if cp._db_controlParameters:
+            cp.db_controlParameters_id_index = dict((v.db_id, v) for v in cp._db_controlParameters)
+            cp.db_controlParameters_name_index = dict((v.db_name, v) for v in cp._db_controlParameters)
+        if cp._db_vistrailVariables:
+            cp.db_vistrailVariables_name_index = dict((v.db_name, v) for v in cp._db_vistrailVariables)
+            cp.db_vistrailVariables_uuid_index = dict((v.db_uuid, v) for v in cp._db_vistrailVariables)
+        if cp._db_parameter_explorations:
+            cp.db_parameter_explorations_id_index = dict((v.db_id, v) for v in cp._db_parameter_explorations)
+        if cp._db_actionAnnotations:
+            cp.db_actionAnnotations_id_index = dict((v.db_id, v) for v in cp._db_actionAnnotations)
+            cp.db_actionAnnotations_action_id_index = dict(((v.db_action_id,v.db_key), v) for v in cp._db_actionAnnotations)
+            cp.db_actionAnnotations_key_index = dict(((v.db_key,v.db_value), v) for v in cp._db_actionAnnotations)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -3472,21 +3871,28 @@ class DBVistrail(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_actions)
-        children.extend(self.db_deleted_tags)
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_controlParameters)
-        children.extend(self.db_deleted_vistrailVariables)
-        children.extend(self.db_deleted_parameter_explorations)
-        children.extend(self.db_deleted_actionAnnotations)
+        if self._db_deleted_actions is not None:
+            children.extend(self._db_deleted_actions)
+        if self._db_deleted_tags is not None:
+            children.extend(self._db_deleted_tags)
+        if self._db_deleted_annotations is not None:
+            children.extend(self._db_deleted_annotations)
+        if self._db_deleted_controlParameters is not None:
+            children.extend(self._db_deleted_controlParameters)
+        if self._db_deleted_vistrailVariables is not None:
+            children.extend(self._db_deleted_vistrailVariables)
+        if self._db_deleted_parameter_explorations is not None:
+            children.extend(self._db_deleted_parameter_explorations)
+        if self._db_deleted_actionAnnotations is not None:
+            children.extend(self._db_deleted_actionAnnotations)
         if remove:
-            self.db_deleted_actions = []
-            self.db_deleted_tags = []
-            self.db_deleted_annotations = []
-            self.db_deleted_controlParameters = []
-            self.db_deleted_vistrailVariables = []
-            self.db_deleted_parameter_explorations = []
-            self.db_deleted_actionAnnotations = []
+            self._db_deleted_actions = None
+            self._db_deleted_tags = None
+            self._db_deleted_annotations = None
+            self._db_deleted_controlParameters = None
+            self._db_deleted_vistrailVariables = None
+            self._db_deleted_parameter_explorations = None
+            self._db_deleted_actionAnnotations = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -3584,6 +3990,20 @@ class DBVistrail(object):
         self._db_actions = actions
         self.is_dirty = True
     db_actions = property(__get_db_actions, __set_db_actions)
+    def __get_db_deleted_actions(self):
+        if self._db_deleted_actions is None:
+            self._db_deleted_actions = []
+        return self._db_deleted_actions
+    def __set_db_deleted_actions(self, deleted):
+        self._db_deleted_actions = deleted
+    db_deleted_actions = property(__get_db_deleted_actions, __set_db_deleted_actions)
+    def __get_db_actions_id_index(self):
+        if self._db_actions_id_index is None:
+            self._db_actions_id_index = {}
+        return self._db_actions_id_index
+    def __set_db_actions_id_index(self, index):
+        self._db_actions_id_index = index
+    db_actions_id_index = property(__get_db_actions_id_index, __set_db_actions_id_index)
     def db_get_actions(self):
         return self._db_actions
     def db_add_action(self, action):
@@ -3626,6 +4046,27 @@ class DBVistrail(object):
         self._db_tags = tags
         self.is_dirty = True
     db_tags = property(__get_db_tags, __set_db_tags)
+    def __get_db_deleted_tags(self):
+        if self._db_deleted_tags is None:
+            self._db_deleted_tags = []
+        return self._db_deleted_tags
+    def __set_db_deleted_tags(self, deleted):
+        self._db_deleted_tags = deleted
+    db_deleted_tags = property(__get_db_deleted_tags, __set_db_deleted_tags)
+    def __get_db_tags_id_index(self):
+        if self._db_tags_id_index is None:
+            self._db_tags_id_index = {}
+        return self._db_tags_id_index
+    def __set_db_tags_id_index(self, index):
+        self._db_tags_id_index = index
+    db_tags_id_index = property(__get_db_tags_id_index, __set_db_tags_id_index)
+    def __get_db_tags_name_index(self):
+        if self._db_tags_name_index is None:
+            self._db_tags_name_index = {}
+        return self._db_tags_name_index
+    def __set_db_tags_name_index(self, index):
+        self._db_tags_name_index = index
+    db_tags_name_index = property(__get_db_tags_name_index, __set_db_tags_name_index)
     def db_get_tags(self):
         return self._db_tags
     def db_add_tag(self, tag):
@@ -3675,6 +4116,27 @@ class DBVistrail(object):
         self._db_annotations = annotations
         self.is_dirty = True
     db_annotations = property(__get_db_annotations, __set_db_annotations)
+    def __get_db_deleted_annotations(self):
+        if self._db_deleted_annotations is None:
+            self._db_deleted_annotations = []
+        return self._db_deleted_annotations
+    def __set_db_deleted_annotations(self, deleted):
+        self._db_deleted_annotations = deleted
+    db_deleted_annotations = property(__get_db_deleted_annotations, __set_db_deleted_annotations)
+    def __get_db_annotations_id_index(self):
+        if self._db_annotations_id_index is None:
+            self._db_annotations_id_index = {}
+        return self._db_annotations_id_index
+    def __set_db_annotations_id_index(self, index):
+        self._db_annotations_id_index = index
+    db_annotations_id_index = property(__get_db_annotations_id_index, __set_db_annotations_id_index)
+    def __get_db_annotations_key_index(self):
+        if self._db_annotations_key_index is None:
+            self._db_annotations_key_index = {}
+        return self._db_annotations_key_index
+    def __set_db_annotations_key_index(self, index):
+        self._db_annotations_key_index = index
+    db_annotations_key_index = property(__get_db_annotations_key_index, __set_db_annotations_key_index)
     def db_get_annotations(self):
         return self._db_annotations
     def db_add_annotation(self, annotation):
@@ -3724,6 +4186,27 @@ class DBVistrail(object):
         self._db_controlParameters = controlParameters
         self.is_dirty = True
     db_controlParameters = property(__get_db_controlParameters, __set_db_controlParameters)
+    def __get_db_deleted_controlParameters(self):
+        if self._db_deleted_controlParameters is None:
+            self._db_deleted_controlParameters = []
+        return self._db_deleted_controlParameters
+    def __set_db_deleted_controlParameters(self, deleted):
+        self._db_deleted_controlParameters = deleted
+    db_deleted_controlParameters = property(__get_db_deleted_controlParameters, __set_db_deleted_controlParameters)
+    def __get_db_controlParameters_id_index(self):
+        if self._db_controlParameters_id_index is None:
+            self._db_controlParameters_id_index = {}
+        return self._db_controlParameters_id_index
+    def __set_db_controlParameters_id_index(self, index):
+        self._db_controlParameters_id_index = index
+    db_controlParameters_id_index = property(__get_db_controlParameters_id_index, __set_db_controlParameters_id_index)
+    def __get_db_controlParameters_name_index(self):
+        if self._db_controlParameters_name_index is None:
+            self._db_controlParameters_name_index = {}
+        return self._db_controlParameters_name_index
+    def __set_db_controlParameters_name_index(self, index):
+        self._db_controlParameters_name_index = index
+    db_controlParameters_name_index = property(__get_db_controlParameters_name_index, __set_db_controlParameters_name_index)
     def db_get_controlParameters(self):
         return self._db_controlParameters
     def db_add_controlParameter(self, controlParameter):
@@ -3773,6 +4256,27 @@ class DBVistrail(object):
         self._db_vistrailVariables = vistrailVariables
         self.is_dirty = True
     db_vistrailVariables = property(__get_db_vistrailVariables, __set_db_vistrailVariables)
+    def __get_db_deleted_vistrailVariables(self):
+        if self._db_deleted_vistrailVariables is None:
+            self._db_deleted_vistrailVariables = []
+        return self._db_deleted_vistrailVariables
+    def __set_db_deleted_vistrailVariables(self, deleted):
+        self._db_deleted_vistrailVariables = deleted
+    db_deleted_vistrailVariables = property(__get_db_deleted_vistrailVariables, __set_db_deleted_vistrailVariables)
+    def __get_db_vistrailVariables_name_index(self):
+        if self._db_vistrailVariables_name_index is None:
+            self._db_vistrailVariables_name_index = {}
+        return self._db_vistrailVariables_name_index
+    def __set_db_vistrailVariables_name_index(self, index):
+        self._db_vistrailVariables_name_index = index
+    db_vistrailVariables_name_index = property(__get_db_vistrailVariables_name_index, __set_db_vistrailVariables_name_index)
+    def __get_db_vistrailVariables_uuid_index(self):
+        if self._db_vistrailVariables_uuid_index is None:
+            self._db_vistrailVariables_uuid_index = {}
+        return self._db_vistrailVariables_uuid_index
+    def __set_db_vistrailVariables_uuid_index(self, index):
+        self._db_vistrailVariables_uuid_index = index
+    db_vistrailVariables_uuid_index = property(__get_db_vistrailVariables_uuid_index, __set_db_vistrailVariables_uuid_index)
     def db_get_vistrailVariables(self):
         return self._db_vistrailVariables
     def db_add_vistrailVariable(self, vistrailVariable):
@@ -3822,6 +4326,20 @@ class DBVistrail(object):
         self._db_parameter_explorations = parameter_explorations
         self.is_dirty = True
     db_parameter_explorations = property(__get_db_parameter_explorations, __set_db_parameter_explorations)
+    def __get_db_deleted_parameter_explorations(self):
+        if self._db_deleted_parameter_explorations is None:
+            self._db_deleted_parameter_explorations = []
+        return self._db_deleted_parameter_explorations
+    def __set_db_deleted_parameter_explorations(self, deleted):
+        self._db_deleted_parameter_explorations = deleted
+    db_deleted_parameter_explorations = property(__get_db_deleted_parameter_explorations, __set_db_deleted_parameter_explorations)
+    def __get_db_parameter_explorations_id_index(self):
+        if self._db_parameter_explorations_id_index is None:
+            self._db_parameter_explorations_id_index = {}
+        return self._db_parameter_explorations_id_index
+    def __set_db_parameter_explorations_id_index(self, index):
+        self._db_parameter_explorations_id_index = index
+    db_parameter_explorations_id_index = property(__get_db_parameter_explorations_id_index, __set_db_parameter_explorations_id_index)
     def db_get_parameter_explorations(self):
         return self._db_parameter_explorations
     def db_add_parameter_exploration(self, parameter_exploration):
@@ -3864,6 +4382,34 @@ class DBVistrail(object):
         self._db_actionAnnotations = actionAnnotations
         self.is_dirty = True
     db_actionAnnotations = property(__get_db_actionAnnotations, __set_db_actionAnnotations)
+    def __get_db_deleted_actionAnnotations(self):
+        if self._db_deleted_actionAnnotations is None:
+            self._db_deleted_actionAnnotations = []
+        return self._db_deleted_actionAnnotations
+    def __set_db_deleted_actionAnnotations(self, deleted):
+        self._db_deleted_actionAnnotations = deleted
+    db_deleted_actionAnnotations = property(__get_db_deleted_actionAnnotations, __set_db_deleted_actionAnnotations)
+    def __get_db_actionAnnotations_id_index(self):
+        if self._db_actionAnnotations_id_index is None:
+            self._db_actionAnnotations_id_index = {}
+        return self._db_actionAnnotations_id_index
+    def __set_db_actionAnnotations_id_index(self, index):
+        self._db_actionAnnotations_id_index = index
+    db_actionAnnotations_id_index = property(__get_db_actionAnnotations_id_index, __set_db_actionAnnotations_id_index)
+    def __get_db_actionAnnotations_action_id_index(self):
+        if self._db_actionAnnotations_action_id_index is None:
+            self._db_actionAnnotations_action_id_index = {}
+        return self._db_actionAnnotations_action_id_index
+    def __set_db_actionAnnotations_action_id_index(self, index):
+        self._db_actionAnnotations_action_id_index = index
+    db_actionAnnotations_action_id_index = property(__get_db_actionAnnotations_action_id_index, __set_db_actionAnnotations_action_id_index)
+    def __get_db_actionAnnotations_key_index(self):
+        if self._db_actionAnnotations_key_index is None:
+            self._db_actionAnnotations_key_index = {}
+        return self._db_actionAnnotations_key_index
+    def __set_db_actionAnnotations_key_index(self, index):
+        self._db_actionAnnotations_key_index = index
+    db_actionAnnotations_key_index = property(__get_db_actionAnnotations_key_index, __set_db_actionAnnotations_key_index)
     def db_get_actionAnnotations(self):
         return self._db_actionAnnotations
     def db_add_actionAnnotation(self, actionAnnotation):
@@ -3922,10 +4468,14 @@ class DBVistrail(object):
 
 class DBOpmArtifactValue(object):
 
+    __slots__ = ('_db_value', '_db_deleted_value', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_artifact_value'
 
     def __init__(self, value=None):
-        self.db_deleted_value = []
+        self._db_deleted_value = None
         self._db_value = value
         self.is_dirty = True
         self.is_new = True
@@ -3991,9 +4541,10 @@ class DBOpmArtifactValue(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_value)
+        if self._db_deleted_value is not None:
+            children.extend(self._db_deleted_value)
         if remove:
-            self.db_deleted_value = []
+            self._db_deleted_value = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -4007,6 +4558,13 @@ class DBOpmArtifactValue(object):
         self._db_value = value
         self.is_dirty = True
     db_value = property(__get_db_value, __set_db_value)
+    def __get_db_deleted_value(self):
+        if self._db_deleted_value is None:
+            self._db_deleted_value = []
+        return self._db_deleted_value
+    def __set_db_deleted_value(self, deleted):
+        self._db_deleted_value = deleted
+    db_deleted_value = property(__get_db_deleted_value, __set_db_deleted_value)
     def db_add_value(self, value):
         self._db_value = value
     def db_change_value(self, value):
@@ -4020,6 +4578,9 @@ class DBOpmArtifactValue(object):
 
 class DBConfigStr(object):
 
+    __slots__ = ('_db_value', 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'config_str'
 
     def __init__(self, value=None):
@@ -4090,15 +4651,22 @@ class DBConfigStr(object):
 
 class DBStartup(object):
 
+    __slots__ = ('_db_version', '_db_configuration',
+                 '_db_deleted_configuration', '_db_enabled_packages',
+                 '_db_deleted_enabled_packages', '_db_disabled_packages',
+                 '_db_deleted_disabled_packages', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'startup'
 
     def __init__(self, version=None, configuration=None, enabled_packages=None, disabled_packages=None):
         self._db_version = version
-        self.db_deleted_configuration = []
+        self._db_deleted_configuration = None
         self._db_configuration = configuration
-        self.db_deleted_enabled_packages = []
+        self._db_deleted_enabled_packages = None
         self._db_enabled_packages = enabled_packages
-        self.db_deleted_disabled_packages = []
+        self._db_deleted_disabled_packages = None
         self._db_disabled_packages = disabled_packages
         self.is_dirty = True
         self.is_new = True
@@ -4194,13 +4762,16 @@ class DBStartup(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_configuration)
-        children.extend(self.db_deleted_enabled_packages)
-        children.extend(self.db_deleted_disabled_packages)
+        if self._db_deleted_configuration is not None:
+            children.extend(self._db_deleted_configuration)
+        if self._db_deleted_enabled_packages is not None:
+            children.extend(self._db_deleted_enabled_packages)
+        if self._db_deleted_disabled_packages is not None:
+            children.extend(self._db_deleted_disabled_packages)
         if remove:
-            self.db_deleted_configuration = []
-            self.db_deleted_enabled_packages = []
-            self.db_deleted_disabled_packages = []
+            self._db_deleted_configuration = None
+            self._db_deleted_enabled_packages = None
+            self._db_deleted_disabled_packages = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -4231,6 +4802,13 @@ class DBStartup(object):
         self._db_configuration = configuration
         self.is_dirty = True
     db_configuration = property(__get_db_configuration, __set_db_configuration)
+    def __get_db_deleted_configuration(self):
+        if self._db_deleted_configuration is None:
+            self._db_deleted_configuration = []
+        return self._db_deleted_configuration
+    def __set_db_deleted_configuration(self, deleted):
+        self._db_deleted_configuration = deleted
+    db_deleted_configuration = property(__get_db_deleted_configuration, __set_db_deleted_configuration)
     def db_add_configuration(self, configuration):
         self._db_configuration = configuration
     def db_change_configuration(self, configuration):
@@ -4246,6 +4824,13 @@ class DBStartup(object):
         self._db_enabled_packages = enabled_packages
         self.is_dirty = True
     db_enabled_packages = property(__get_db_enabled_packages, __set_db_enabled_packages)
+    def __get_db_deleted_enabled_packages(self):
+        if self._db_deleted_enabled_packages is None:
+            self._db_deleted_enabled_packages = []
+        return self._db_deleted_enabled_packages
+    def __set_db_deleted_enabled_packages(self, deleted):
+        self._db_deleted_enabled_packages = deleted
+    db_deleted_enabled_packages = property(__get_db_deleted_enabled_packages, __set_db_deleted_enabled_packages)
     def db_add_enabled_packages(self, enabled_packages):
         self._db_enabled_packages = enabled_packages
     def db_change_enabled_packages(self, enabled_packages):
@@ -4261,6 +4846,13 @@ class DBStartup(object):
         self._db_disabled_packages = disabled_packages
         self.is_dirty = True
     db_disabled_packages = property(__get_db_disabled_packages, __set_db_disabled_packages)
+    def __get_db_deleted_disabled_packages(self):
+        if self._db_deleted_disabled_packages is None:
+            self._db_deleted_disabled_packages = []
+        return self._db_deleted_disabled_packages
+    def __set_db_deleted_disabled_packages(self, deleted):
+        self._db_deleted_disabled_packages = deleted
+    db_deleted_disabled_packages = property(__get_db_deleted_disabled_packages, __set_db_deleted_disabled_packages)
     def db_add_disabled_packages(self, disabled_packages):
         self._db_disabled_packages = disabled_packages
     def db_change_disabled_packages(self, disabled_packages):
@@ -4283,19 +4875,19 @@ class DBModule(object):
         self._db_namespace = namespace
         self._db_package = package
         self._db_version = version
-        self.db_deleted_location = []
+        self._db_deleted_location = None
         self._db_location = location
-        self.db_deleted_functions = []
-        self.db_functions_id_index = {}
+        self._db_deleted_functions = None
+        self._db_functions_id_index = None
         if functions is None:
             self._db_functions = []
         else:
             self._db_functions = functions
             for v in self._db_functions:
                 self.db_functions_id_index[v.db_id] = v
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
-        self.db_annotations_key_index = {}
+        self._db_deleted_annotations = None
+        self._db_annotations_id_index = None
+        self._db_annotations_key_index = None
         if annotations is None:
             self._db_annotations = []
         else:
@@ -4303,9 +4895,9 @@ class DBModule(object):
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
                 self.db_annotations_key_index[v.db_key] = v
-        self.db_deleted_controlParameters = []
-        self.db_controlParameters_id_index = {}
-        self.db_controlParameters_name_index = {}
+        self._db_deleted_controlParameters = None
+        self._db_controlParameters_id_index = None
+        self._db_controlParameters_name_index = None
         if controlParameters is None:
             self._db_controlParameters = []
         else:
@@ -4313,9 +4905,9 @@ class DBModule(object):
             for v in self._db_controlParameters:
                 self.db_controlParameters_id_index[v.db_id] = v
                 self.db_controlParameters_name_index[v.db_name] = v
-        self.db_deleted_portSpecs = []
-        self.db_portSpecs_id_index = {}
-        self.db_portSpecs_name_index = {}
+        self._db_deleted_portSpecs = None
+        self._db_portSpecs_id_index = None
+        self._db_portSpecs_name_index = None
         if portSpecs is None:
             self._db_portSpecs = []
         else:
@@ -4365,13 +4957,17 @@ class DBModule(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_functions_id_index = dict((v.db_id, v) for v in cp._db_functions)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
-        cp.db_controlParameters_id_index = dict((v.db_id, v) for v in cp._db_controlParameters)
-        cp.db_controlParameters_name_index = dict((v.db_name, v) for v in cp._db_controlParameters)
-        cp.db_portSpecs_id_index = dict((v.db_id, v) for v in cp._db_portSpecs)
-        cp.db_portSpecs_name_index = dict(((v.db_name,v.db_type), v) for v in cp._db_portSpecs)
+        if cp._db_functions:
+            cp.db_functions_id_index = dict((v.db_id, v) for v in cp._db_functions)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+            cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
+        if cp._db_controlParameters:
+            cp.db_controlParameters_id_index = dict((v.db_id, v) for v in cp._db_controlParameters)
+            cp.db_controlParameters_name_index = dict((v.db_name, v) for v in cp._db_controlParameters)
+        if cp._db_portSpecs:
+            cp.db_portSpecs_id_index = dict((v.db_id, v) for v in cp._db_portSpecs)
+            cp.db_portSpecs_name_index = dict(((v.db_name,v.db_type), v) for v in cp._db_portSpecs)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -4510,17 +5106,22 @@ class DBModule(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_location)
-        children.extend(self.db_deleted_functions)
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_controlParameters)
-        children.extend(self.db_deleted_portSpecs)
+        if self._db_deleted_location is not None:
+            children.extend(self._db_deleted_location)
+        if self._db_deleted_functions is not None:
+            children.extend(self._db_deleted_functions)
+        if self._db_deleted_annotations is not None:
+            children.extend(self._db_deleted_annotations)
+        if self._db_deleted_controlParameters is not None:
+            children.extend(self._db_deleted_controlParameters)
+        if self._db_deleted_portSpecs is not None:
+            children.extend(self._db_deleted_portSpecs)
         if remove:
-            self.db_deleted_location = []
-            self.db_deleted_functions = []
-            self.db_deleted_annotations = []
-            self.db_deleted_controlParameters = []
-            self.db_deleted_portSpecs = []
+            self._db_deleted_location = None
+            self._db_deleted_functions = None
+            self._db_deleted_annotations = None
+            self._db_deleted_controlParameters = None
+            self._db_deleted_portSpecs = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -4624,6 +5225,13 @@ class DBModule(object):
         self._db_location = location
         self.is_dirty = True
     db_location = property(__get_db_location, __set_db_location)
+    def __get_db_deleted_location(self):
+        if self._db_deleted_location is None:
+            self._db_deleted_location = []
+        return self._db_deleted_location
+    def __set_db_deleted_location(self, deleted):
+        self._db_deleted_location = deleted
+    db_deleted_location = property(__get_db_deleted_location, __set_db_deleted_location)
     def db_add_location(self, location):
         self._db_location = location
     def db_change_location(self, location):
@@ -4639,6 +5247,20 @@ class DBModule(object):
         self._db_functions = functions
         self.is_dirty = True
     db_functions = property(__get_db_functions, __set_db_functions)
+    def __get_db_deleted_functions(self):
+        if self._db_deleted_functions is None:
+            self._db_deleted_functions = []
+        return self._db_deleted_functions
+    def __set_db_deleted_functions(self, deleted):
+        self._db_deleted_functions = deleted
+    db_deleted_functions = property(__get_db_deleted_functions, __set_db_deleted_functions)
+    def __get_db_functions_id_index(self):
+        if self._db_functions_id_index is None:
+            self._db_functions_id_index = {}
+        return self._db_functions_id_index
+    def __set_db_functions_id_index(self, index):
+        self._db_functions_id_index = index
+    db_functions_id_index = property(__get_db_functions_id_index, __set_db_functions_id_index)
     def db_get_functions(self):
         return self._db_functions
     def db_add_function(self, function):
@@ -4681,6 +5303,27 @@ class DBModule(object):
         self._db_annotations = annotations
         self.is_dirty = True
     db_annotations = property(__get_db_annotations, __set_db_annotations)
+    def __get_db_deleted_annotations(self):
+        if self._db_deleted_annotations is None:
+            self._db_deleted_annotations = []
+        return self._db_deleted_annotations
+    def __set_db_deleted_annotations(self, deleted):
+        self._db_deleted_annotations = deleted
+    db_deleted_annotations = property(__get_db_deleted_annotations, __set_db_deleted_annotations)
+    def __get_db_annotations_id_index(self):
+        if self._db_annotations_id_index is None:
+            self._db_annotations_id_index = {}
+        return self._db_annotations_id_index
+    def __set_db_annotations_id_index(self, index):
+        self._db_annotations_id_index = index
+    db_annotations_id_index = property(__get_db_annotations_id_index, __set_db_annotations_id_index)
+    def __get_db_annotations_key_index(self):
+        if self._db_annotations_key_index is None:
+            self._db_annotations_key_index = {}
+        return self._db_annotations_key_index
+    def __set_db_annotations_key_index(self, index):
+        self._db_annotations_key_index = index
+    db_annotations_key_index = property(__get_db_annotations_key_index, __set_db_annotations_key_index)
     def db_get_annotations(self):
         return self._db_annotations
     def db_add_annotation(self, annotation):
@@ -4730,6 +5373,27 @@ class DBModule(object):
         self._db_controlParameters = controlParameters
         self.is_dirty = True
     db_controlParameters = property(__get_db_controlParameters, __set_db_controlParameters)
+    def __get_db_deleted_controlParameters(self):
+        if self._db_deleted_controlParameters is None:
+            self._db_deleted_controlParameters = []
+        return self._db_deleted_controlParameters
+    def __set_db_deleted_controlParameters(self, deleted):
+        self._db_deleted_controlParameters = deleted
+    db_deleted_controlParameters = property(__get_db_deleted_controlParameters, __set_db_deleted_controlParameters)
+    def __get_db_controlParameters_id_index(self):
+        if self._db_controlParameters_id_index is None:
+            self._db_controlParameters_id_index = {}
+        return self._db_controlParameters_id_index
+    def __set_db_controlParameters_id_index(self, index):
+        self._db_controlParameters_id_index = index
+    db_controlParameters_id_index = property(__get_db_controlParameters_id_index, __set_db_controlParameters_id_index)
+    def __get_db_controlParameters_name_index(self):
+        if self._db_controlParameters_name_index is None:
+            self._db_controlParameters_name_index = {}
+        return self._db_controlParameters_name_index
+    def __set_db_controlParameters_name_index(self, index):
+        self._db_controlParameters_name_index = index
+    db_controlParameters_name_index = property(__get_db_controlParameters_name_index, __set_db_controlParameters_name_index)
     def db_get_controlParameters(self):
         return self._db_controlParameters
     def db_add_controlParameter(self, controlParameter):
@@ -4779,6 +5443,27 @@ class DBModule(object):
         self._db_portSpecs = portSpecs
         self.is_dirty = True
     db_portSpecs = property(__get_db_portSpecs, __set_db_portSpecs)
+    def __get_db_deleted_portSpecs(self):
+        if self._db_deleted_portSpecs is None:
+            self._db_deleted_portSpecs = []
+        return self._db_deleted_portSpecs
+    def __set_db_deleted_portSpecs(self, deleted):
+        self._db_deleted_portSpecs = deleted
+    db_deleted_portSpecs = property(__get_db_deleted_portSpecs, __set_db_deleted_portSpecs)
+    def __get_db_portSpecs_id_index(self):
+        if self._db_portSpecs_id_index is None:
+            self._db_portSpecs_id_index = {}
+        return self._db_portSpecs_id_index
+    def __set_db_portSpecs_id_index(self, index):
+        self._db_portSpecs_id_index = index
+    db_portSpecs_id_index = property(__get_db_portSpecs_id_index, __set_db_portSpecs_id_index)
+    def __get_db_portSpecs_name_index(self):
+        if self._db_portSpecs_name_index is None:
+            self._db_portSpecs_name_index = {}
+        return self._db_portSpecs_name_index
+    def __set_db_portSpecs_name_index(self, index):
+        self._db_portSpecs_name_index = index
+    db_portSpecs_name_index = property(__get_db_portSpecs_name_index, __set_db_portSpecs_name_index)
     def db_get_portSpecs(self):
         return self._db_portSpecs
     def db_add_portSpec(self, portSpec):
@@ -4827,6 +5512,11 @@ class DBModule(object):
 
 class DBPort(object):
 
+    __slots__ = ('_db_id', '_db_type', '_db_moduleId', '_db_moduleName',
+                 '_db_name', '_db_signature', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'port'
 
     def __init__(self, id=None, type=None, moduleId=None, moduleName=None, name=None, signature=None):
@@ -5000,11 +5690,15 @@ class DBPort(object):
 
 class DBOpmAgents(object):
 
+    __slots__ = ('_db_agents', '_db_deleted_agents', '_db_agents_id_index',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_agents'
 
     def __init__(self, agents=None):
-        self.db_deleted_agents = []
-        self.db_agents_id_index = {}
+        self._db_deleted_agents = None
+        self._db_agents_id_index = None
         if agents is None:
             self._db_agents = []
         else:
@@ -5034,7 +5728,8 @@ class DBOpmAgents(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_agents_id_index = dict((v.db_id, v) for v in cp._db_agents)
+        if cp._db_agents:
+            cp.db_agents_id_index = dict((v.db_id, v) for v in cp._db_agents)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -5075,9 +5770,10 @@ class DBOpmAgents(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_agents)
+        if self._db_deleted_agents is not None:
+            children.extend(self._db_deleted_agents)
         if remove:
-            self.db_deleted_agents = []
+            self._db_deleted_agents = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -5092,6 +5788,20 @@ class DBOpmAgents(object):
         self._db_agents = agents
         self.is_dirty = True
     db_agents = property(__get_db_agents, __set_db_agents)
+    def __get_db_deleted_agents(self):
+        if self._db_deleted_agents is None:
+            self._db_deleted_agents = []
+        return self._db_deleted_agents
+    def __set_db_deleted_agents(self, deleted):
+        self._db_deleted_agents = deleted
+    db_deleted_agents = property(__get_db_deleted_agents, __set_db_deleted_agents)
+    def __get_db_agents_id_index(self):
+        if self._db_agents_id_index is None:
+            self._db_agents_id_index = {}
+        return self._db_agents_id_index
+    def __set_db_agents_id_index(self, index):
+        self._db_agents_id_index = index
+    db_agents_id_index = property(__get_db_agents_id_index, __set_db_agents_id_index)
     def db_get_agents(self):
         return self._db_agents
     def db_add_agent(self, agent):
@@ -5132,10 +5842,14 @@ class DBOpmAgents(object):
 
 class DBOpmDependencies(object):
 
+    __slots__ = ('_db_dependencys', '_db_deleted_dependencys', 'is_dirty',
+                 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_dependencies'
 
     def __init__(self, dependencys=None):
-        self.db_deleted_dependencys = []
+        self._db_deleted_dependencys = None
         if dependencys is None:
             self._db_dependencys = []
         else:
@@ -5225,9 +5939,10 @@ class DBOpmDependencies(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_dependencys)
+        if self._db_deleted_dependencys is not None:
+            children.extend(self._db_deleted_dependencys)
         if remove:
-            self.db_deleted_dependencys = []
+            self._db_deleted_dependencys = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -5242,6 +5957,13 @@ class DBOpmDependencies(object):
         self._db_dependencys = dependencys
         self.is_dirty = True
     db_dependencys = property(__get_db_dependencys, __set_db_dependencys)
+    def __get_db_deleted_dependencys(self):
+        if self._db_deleted_dependencys is None:
+            self._db_deleted_dependencys = []
+        return self._db_deleted_dependencys
+    def __set_db_deleted_dependencys(self, deleted):
+        self._db_deleted_dependencys = deleted
+    db_deleted_dependencys = property(__get_db_deleted_dependencys, __set_db_deleted_dependencys)
     def db_get_dependencys(self):
         return self._db_dependencys
     def db_add_dependency(self, dependency):
@@ -5260,6 +5982,12 @@ class DBOpmDependencies(object):
 
 class DBPEFunction(object):
 
+    __slots__ = ('_db_id', '_db_module_id', '_db_port_name', '_db_is_alias',
+                 '_db_parameters', '_db_deleted_parameters',
+                 '_db_parameters_id_index', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'pe_function'
 
     def __init__(self, id=None, module_id=None, port_name=None, is_alias=None, parameters=None):
@@ -5267,8 +5995,8 @@ class DBPEFunction(object):
         self._db_module_id = module_id
         self._db_port_name = port_name
         self._db_is_alias = is_alias
-        self.db_deleted_parameters = []
-        self.db_parameters_id_index = {}
+        self._db_deleted_parameters = None
+        self._db_parameters_id_index = None
         if parameters is None:
             self._db_parameters = []
         else:
@@ -5303,7 +6031,8 @@ class DBPEFunction(object):
                 cp._db_module_id = id_remap[('module', self._db_module_id)]
         
         # recreate indices and set flags
-        cp.db_parameters_id_index = dict((v.db_id, v) for v in cp._db_parameters)
+        if cp._db_parameters:
+            cp.db_parameters_id_index = dict((v.db_id, v) for v in cp._db_parameters)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -5364,9 +6093,10 @@ class DBPEFunction(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_parameters)
+        if self._db_deleted_parameters is not None:
+            children.extend(self._db_deleted_parameters)
         if remove:
-            self.db_deleted_parameters = []
+            self._db_deleted_parameters = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -5433,6 +6163,20 @@ class DBPEFunction(object):
         self._db_parameters = parameters
         self.is_dirty = True
     db_parameters = property(__get_db_parameters, __set_db_parameters)
+    def __get_db_deleted_parameters(self):
+        if self._db_deleted_parameters is None:
+            self._db_deleted_parameters = []
+        return self._db_deleted_parameters
+    def __set_db_deleted_parameters(self, deleted):
+        self._db_deleted_parameters = deleted
+    db_deleted_parameters = property(__get_db_deleted_parameters, __set_db_deleted_parameters)
+    def __get_db_parameters_id_index(self):
+        if self._db_parameters_id_index is None:
+            self._db_parameters_id_index = {}
+        return self._db_parameters_id_index
+    def __set_db_parameters_id_index(self, index):
+        self._db_parameters_id_index = index
+    db_parameters_id_index = property(__get_db_parameters_id_index, __set_db_parameters_id_index)
     def db_get_parameters(self):
         return self._db_parameters
     def db_add_parameter(self, parameter):
@@ -5474,11 +6218,23 @@ class DBPEFunction(object):
 
 class DBWorkflow(object):
 
+    __slots__ = ('_db_modules', '_db_deleted_modules', '_db_modules_id_index',
+                 '_db_id', '_db_entity_type', '_db_name', '_db_version',
+                 '_db_last_modified', '_db_connections',
+                 '_db_deleted_connections', '_db_connections_id_index',
+                 '_db_annotations', '_db_deleted_annotations',
+                 '_db_annotations_id_index', '_db_plugin_datas',
+                 '_db_deleted_plugin_datas', '_db_plugin_datas_id_index',
+                 '_db_others', '_db_deleted_others', '_db_others_id_index',
+                 '_db_vistrail_id', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'workflow'
 
     def __init__(self, modules=None, id=None, entity_type=None, name=None, version=None, last_modified=None, connections=None, annotations=None, plugin_datas=None, others=None, vistrail_id=None):
-        self.db_deleted_modules = []
-        self.db_modules_id_index = {}
+        self._db_deleted_modules = None
+        self._db_modules_id_index = None
         if modules is None:
             self._db_modules = []
         else:
@@ -5490,32 +6246,32 @@ class DBWorkflow(object):
         self._db_name = name
         self._db_version = version
         self._db_last_modified = last_modified
-        self.db_deleted_connections = []
-        self.db_connections_id_index = {}
+        self._db_deleted_connections = None
+        self._db_connections_id_index = None
         if connections is None:
             self._db_connections = []
         else:
             self._db_connections = connections
             for v in self._db_connections:
                 self.db_connections_id_index[v.db_id] = v
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
+        self._db_deleted_annotations = None
+        self._db_annotations_id_index = None
         if annotations is None:
             self._db_annotations = []
         else:
             self._db_annotations = annotations
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
-        self.db_deleted_plugin_datas = []
-        self.db_plugin_datas_id_index = {}
+        self._db_deleted_plugin_datas = None
+        self._db_plugin_datas_id_index = None
         if plugin_datas is None:
             self._db_plugin_datas = []
         else:
             self._db_plugin_datas = plugin_datas
             for v in self._db_plugin_datas:
                 self.db_plugin_datas_id_index[v.db_id] = v
-        self.db_deleted_others = []
-        self.db_others_id_index = {}
+        self._db_deleted_others = None
+        self._db_others_id_index = None
         if others is None:
             self._db_others = []
         else:
@@ -5569,11 +6325,16 @@ class DBWorkflow(object):
                 cp._db_vistrail_id = id_remap[('vistrail', self._db_vistrail_id)]
         
         # recreate indices and set flags
-        cp.db_modules_id_index = dict((v.db_id, v) for v in cp._db_modules)
-        cp.db_connections_id_index = dict((v.db_id, v) for v in cp._db_connections)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_plugin_datas_id_index = dict((v.db_id, v) for v in cp._db_plugin_datas)
-        cp.db_others_id_index = dict((v.db_id, v) for v in cp._db_others)
+        if cp._db_modules:
+            cp.db_modules_id_index = dict((v.db_id, v) for v in cp._db_modules)
+        if cp._db_connections:
+            cp.db_connections_id_index = dict((v.db_id, v) for v in cp._db_connections)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+        if cp._db_plugin_datas:
+            cp.db_plugin_datas_id_index = dict((v.db_id, v) for v in cp._db_plugin_datas)
+        if cp._db_others:
+            cp.db_others_id_index = dict((v.db_id, v) for v in cp._db_others)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -5728,17 +6489,22 @@ class DBWorkflow(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_connections)
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_plugin_datas)
-        children.extend(self.db_deleted_others)
-        children.extend(self.db_deleted_modules)
+        if self._db_deleted_connections is not None:
+            children.extend(self._db_deleted_connections)
+        if self._db_deleted_annotations is not None:
+            children.extend(self._db_deleted_annotations)
+        if self._db_deleted_plugin_datas is not None:
+            children.extend(self._db_deleted_plugin_datas)
+        if self._db_deleted_others is not None:
+            children.extend(self._db_deleted_others)
+        if self._db_deleted_modules is not None:
+            children.extend(self._db_deleted_modules)
         if remove:
-            self.db_deleted_connections = []
-            self.db_deleted_annotations = []
-            self.db_deleted_plugin_datas = []
-            self.db_deleted_others = []
-            self.db_deleted_modules = []
+            self._db_deleted_connections = None
+            self._db_deleted_annotations = None
+            self._db_deleted_plugin_datas = None
+            self._db_deleted_others = None
+            self._db_deleted_modules = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -5765,6 +6531,20 @@ class DBWorkflow(object):
         self._db_modules = modules
         self.is_dirty = True
     db_modules = property(__get_db_modules, __set_db_modules)
+    def __get_db_deleted_modules(self):
+        if self._db_deleted_modules is None:
+            self._db_deleted_modules = []
+        return self._db_deleted_modules
+    def __set_db_deleted_modules(self, deleted):
+        self._db_deleted_modules = deleted
+    db_deleted_modules = property(__get_db_deleted_modules, __set_db_deleted_modules)
+    def __get_db_modules_id_index(self):
+        if self._db_modules_id_index is None:
+            self._db_modules_id_index = {}
+        return self._db_modules_id_index
+    def __set_db_modules_id_index(self, index):
+        self._db_modules_id_index = index
+    db_modules_id_index = property(__get_db_modules_id_index, __set_db_modules_id_index)
     def db_get_modules(self):
         return self._db_modules
     def db_add_module(self, module):
@@ -5872,6 +6652,20 @@ class DBWorkflow(object):
         self._db_connections = connections
         self.is_dirty = True
     db_connections = property(__get_db_connections, __set_db_connections)
+    def __get_db_deleted_connections(self):
+        if self._db_deleted_connections is None:
+            self._db_deleted_connections = []
+        return self._db_deleted_connections
+    def __set_db_deleted_connections(self, deleted):
+        self._db_deleted_connections = deleted
+    db_deleted_connections = property(__get_db_deleted_connections, __set_db_deleted_connections)
+    def __get_db_connections_id_index(self):
+        if self._db_connections_id_index is None:
+            self._db_connections_id_index = {}
+        return self._db_connections_id_index
+    def __set_db_connections_id_index(self, index):
+        self._db_connections_id_index = index
+    db_connections_id_index = property(__get_db_connections_id_index, __set_db_connections_id_index)
     def db_get_connections(self):
         return self._db_connections
     def db_add_connection(self, connection):
@@ -5914,6 +6708,20 @@ class DBWorkflow(object):
         self._db_annotations = annotations
         self.is_dirty = True
     db_annotations = property(__get_db_annotations, __set_db_annotations)
+    def __get_db_deleted_annotations(self):
+        if self._db_deleted_annotations is None:
+            self._db_deleted_annotations = []
+        return self._db_deleted_annotations
+    def __set_db_deleted_annotations(self, deleted):
+        self._db_deleted_annotations = deleted
+    db_deleted_annotations = property(__get_db_deleted_annotations, __set_db_deleted_annotations)
+    def __get_db_annotations_id_index(self):
+        if self._db_annotations_id_index is None:
+            self._db_annotations_id_index = {}
+        return self._db_annotations_id_index
+    def __set_db_annotations_id_index(self, index):
+        self._db_annotations_id_index = index
+    db_annotations_id_index = property(__get_db_annotations_id_index, __set_db_annotations_id_index)
     def db_get_annotations(self):
         return self._db_annotations
     def db_add_annotation(self, annotation):
@@ -5956,6 +6764,20 @@ class DBWorkflow(object):
         self._db_plugin_datas = plugin_datas
         self.is_dirty = True
     db_plugin_datas = property(__get_db_plugin_datas, __set_db_plugin_datas)
+    def __get_db_deleted_plugin_datas(self):
+        if self._db_deleted_plugin_datas is None:
+            self._db_deleted_plugin_datas = []
+        return self._db_deleted_plugin_datas
+    def __set_db_deleted_plugin_datas(self, deleted):
+        self._db_deleted_plugin_datas = deleted
+    db_deleted_plugin_datas = property(__get_db_deleted_plugin_datas, __set_db_deleted_plugin_datas)
+    def __get_db_plugin_datas_id_index(self):
+        if self._db_plugin_datas_id_index is None:
+            self._db_plugin_datas_id_index = {}
+        return self._db_plugin_datas_id_index
+    def __set_db_plugin_datas_id_index(self, index):
+        self._db_plugin_datas_id_index = index
+    db_plugin_datas_id_index = property(__get_db_plugin_datas_id_index, __set_db_plugin_datas_id_index)
     def db_get_plugin_datas(self):
         return self._db_plugin_datas
     def db_add_plugin_data(self, plugin_data):
@@ -5998,6 +6820,20 @@ class DBWorkflow(object):
         self._db_others = others
         self.is_dirty = True
     db_others = property(__get_db_others, __set_db_others)
+    def __get_db_deleted_others(self):
+        if self._db_deleted_others is None:
+            self._db_deleted_others = []
+        return self._db_deleted_others
+    def __set_db_deleted_others(self, deleted):
+        self._db_deleted_others = deleted
+    db_deleted_others = property(__get_db_deleted_others, __set_db_deleted_others)
+    def __get_db_others_id_index(self):
+        if self._db_others_id_index is None:
+            self._db_others_id_index = {}
+        return self._db_others_id_index
+    def __set_db_others_id_index(self, index):
+        self._db_others_id_index = index
+    db_others_id_index = property(__get_db_others_id_index, __set_db_others_id_index)
     def db_get_others(self):
         return self._db_others
     def db_add_other(self, other):
@@ -6052,6 +6888,11 @@ class DBWorkflow(object):
 
 class DBMashupAction(object):
 
+    __slots__ = ('_db_id', '_db_prevId', '_db_date', '_db_user', '_db_mashup',
+                 '_db_deleted_mashup', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'mashup_action'
 
     def __init__(self, id=None, prevId=None, date=None, user=None, mashup=None):
@@ -6059,7 +6900,7 @@ class DBMashupAction(object):
         self._db_prevId = prevId
         self._db_date = date
         self._db_user = user
-        self.db_deleted_mashup = []
+        self._db_deleted_mashup = None
         self._db_mashup = mashup
         self.is_dirty = True
         self.is_new = True
@@ -6143,9 +6984,10 @@ class DBMashupAction(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_mashup)
+        if self._db_deleted_mashup is not None:
+            children.extend(self._db_deleted_mashup)
         if remove:
-            self.db_deleted_mashup = []
+            self._db_deleted_mashup = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -6211,6 +7053,13 @@ class DBMashupAction(object):
         self._db_mashup = mashup
         self.is_dirty = True
     db_mashup = property(__get_db_mashup, __set_db_mashup)
+    def __get_db_deleted_mashup(self):
+        if self._db_deleted_mashup is None:
+            self._db_deleted_mashup = []
+        return self._db_deleted_mashup
+    def __set_db_deleted_mashup(self, deleted):
+        self._db_deleted_mashup = deleted
+    db_deleted_mashup = property(__get_db_deleted_mashup, __set_db_deleted_mashup)
     def db_add_mashup(self, mashup):
         self._db_mashup = mashup
     def db_change_mashup(self, mashup):
@@ -6225,11 +7074,16 @@ class DBMashupAction(object):
 
 class DBConfiguration(object):
 
+    __slots__ = ('_db_config_keys', '_db_deleted_config_keys',
+                 '_db_config_keys_name_index', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'configuration'
 
     def __init__(self, config_keys=None):
-        self.db_deleted_config_keys = []
-        self.db_config_keys_name_index = {}
+        self._db_deleted_config_keys = None
+        self._db_config_keys_name_index = None
         if config_keys is None:
             self._db_config_keys = []
         else:
@@ -6259,7 +7113,8 @@ class DBConfiguration(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_config_keys_name_index = dict((v.db_name, v) for v in cp._db_config_keys)
+        if cp._db_config_keys:
+            cp.db_config_keys_name_index = dict((v.db_name, v) for v in cp._db_config_keys)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -6300,9 +7155,10 @@ class DBConfiguration(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_config_keys)
+        if self._db_deleted_config_keys is not None:
+            children.extend(self._db_deleted_config_keys)
         if remove:
-            self.db_deleted_config_keys = []
+            self._db_deleted_config_keys = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -6317,6 +7173,20 @@ class DBConfiguration(object):
         self._db_config_keys = config_keys
         self.is_dirty = True
     db_config_keys = property(__get_db_config_keys, __set_db_config_keys)
+    def __get_db_deleted_config_keys(self):
+        if self._db_deleted_config_keys is None:
+            self._db_deleted_config_keys = []
+        return self._db_deleted_config_keys
+    def __set_db_deleted_config_keys(self, deleted):
+        self._db_deleted_config_keys = deleted
+    db_deleted_config_keys = property(__get_db_deleted_config_keys, __set_db_deleted_config_keys)
+    def __get_db_config_keys_name_index(self):
+        if self._db_config_keys_name_index is None:
+            self._db_config_keys_name_index = {}
+        return self._db_config_keys_name_index
+    def __set_db_config_keys_name_index(self, index):
+        self._db_config_keys_name_index = index
+    db_config_keys_name_index = property(__get_db_config_keys_name_index, __set_db_config_keys_name_index)
     def db_get_config_keys(self):
         return self._db_config_keys
     def db_add_config_key(self, config_key):
@@ -6357,10 +7227,16 @@ class DBConfiguration(object):
 
 class DBChange(object):
 
+    __slots__ = ('_db_data', '_db_deleted_data', '_db_id', '_db_what',
+                 '_db_oldObjId', '_db_newObjId', '_db_parentObjId',
+                 '_db_parentObjType', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'change'
 
     def __init__(self, data=None, id=None, what=None, oldObjId=None, newObjId=None, parentObjId=None, parentObjType=None):
-        self.db_deleted_data = []
+        self._db_deleted_data = None
         self._db_data = data
         self._db_id = id
         self._db_what = what
@@ -6528,9 +7404,10 @@ class DBChange(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_data)
+        if self._db_deleted_data is not None:
+            children.extend(self._db_deleted_data)
         if remove:
-            self.db_deleted_data = []
+            self._db_deleted_data = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -6544,6 +7421,13 @@ class DBChange(object):
         self._db_data = data
         self.is_dirty = True
     db_data = property(__get_db_data, __set_db_data)
+    def __get_db_deleted_data(self):
+        if self._db_deleted_data is None:
+            self._db_deleted_data = []
+        return self._db_deleted_data
+    def __set_db_deleted_data(self, deleted):
+        self._db_deleted_data = deleted
+    db_deleted_data = property(__get_db_deleted_data, __set_db_deleted_data)
     def db_add_data(self, data):
         self._db_data = data
     def db_change_data(self, data):
@@ -6636,6 +7520,15 @@ class DBChange(object):
 
 class DBPackage(object):
 
+    __slots__ = ('_db_id', '_db_name', '_db_identifier', '_db_codepath',
+                 '_db_load_configuration', '_db_version',
+                 '_db_description', '_db_module_descriptors',
+                 '_db_deleted_module_descriptors',
+                 '_db_module_descriptors_id_index',
+                 '_db_module_descriptors_name_index', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'package'
 
     def __init__(self, id=None, name=None, identifier=None, codepath=None, load_configuration=None, version=None, description=None, module_descriptors=None):
@@ -6646,9 +7539,9 @@ class DBPackage(object):
         self._db_load_configuration = load_configuration
         self._db_version = version
         self._db_description = description
-        self.db_deleted_module_descriptors = []
-        self.db_module_descriptors_id_index = {}
-        self.db_module_descriptors_name_index = {}
+        self._db_deleted_module_descriptors = None
+        self._db_module_descriptors_id_index = None
+        self._db_module_descriptors_name_index = None
         if module_descriptors is None:
             self._db_module_descriptors = []
         else:
@@ -6685,8 +7578,9 @@ class DBPackage(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_module_descriptors_id_index = dict((v.db_id, v) for v in cp._db_module_descriptors)
-        cp.db_module_descriptors_name_index = dict(((v.db_name,v.db_namespace,v.db_version), v) for v in cp._db_module_descriptors)
+        if cp._db_module_descriptors:
+            cp.db_module_descriptors_id_index = dict((v.db_id, v) for v in cp._db_module_descriptors)
+            cp.db_module_descriptors_name_index = dict(((v.db_name,v.db_namespace,v.db_version), v) for v in cp._db_module_descriptors)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -6762,9 +7656,10 @@ class DBPackage(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_module_descriptors)
+        if self._db_deleted_module_descriptors is not None:
+            children.extend(self._db_deleted_module_descriptors)
         if remove:
-            self.db_deleted_module_descriptors = []
+            self._db_deleted_module_descriptors = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -6870,6 +7765,27 @@ class DBPackage(object):
         self._db_module_descriptors = module_descriptors
         self.is_dirty = True
     db_module_descriptors = property(__get_db_module_descriptors, __set_db_module_descriptors)
+    def __get_db_deleted_module_descriptors(self):
+        if self._db_deleted_module_descriptors is None:
+            self._db_deleted_module_descriptors = []
+        return self._db_deleted_module_descriptors
+    def __set_db_deleted_module_descriptors(self, deleted):
+        self._db_deleted_module_descriptors = deleted
+    db_deleted_module_descriptors = property(__get_db_deleted_module_descriptors, __set_db_deleted_module_descriptors)
+    def __get_db_module_descriptors_id_index(self):
+        if self._db_module_descriptors_id_index is None:
+            self._db_module_descriptors_id_index = {}
+        return self._db_module_descriptors_id_index
+    def __set_db_module_descriptors_id_index(self, index):
+        self._db_module_descriptors_id_index = index
+    db_module_descriptors_id_index = property(__get_db_module_descriptors_id_index, __set_db_module_descriptors_id_index)
+    def __get_db_module_descriptors_name_index(self):
+        if self._db_module_descriptors_name_index is None:
+            self._db_module_descriptors_name_index = {}
+        return self._db_module_descriptors_name_index
+    def __set_db_module_descriptors_name_index(self, index):
+        self._db_module_descriptors_name_index = index
+    db_module_descriptors_name_index = property(__get_db_module_descriptors_name_index, __set_db_module_descriptors_name_index)
     def db_get_module_descriptors(self):
         return self._db_module_descriptors
     def db_add_module_descriptor(self, module_descriptor):
@@ -6918,14 +7834,20 @@ class DBPackage(object):
 
 class DBLoopExec(object):
 
+    __slots__ = ('_db_id', '_db_ts_start', '_db_ts_end', '_db_loop_iterations',
+                 '_db_deleted_loop_iterations',
+                 '_db_loop_iterations_id_index', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'loop_exec'
 
     def __init__(self, id=None, ts_start=None, ts_end=None, loop_iterations=None):
         self._db_id = id
         self._db_ts_start = ts_start
         self._db_ts_end = ts_end
-        self.db_deleted_loop_iterations = []
-        self.db_loop_iterations_id_index = {}
+        self._db_deleted_loop_iterations = None
+        self._db_loop_iterations_id_index = None
         if loop_iterations is None:
             self._db_loop_iterations = []
         else:
@@ -6957,7 +7879,8 @@ class DBLoopExec(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_loop_iterations_id_index = dict((v.db_id, v) for v in cp._db_loop_iterations)
+        if cp._db_loop_iterations:
+            cp.db_loop_iterations_id_index = dict((v.db_id, v) for v in cp._db_loop_iterations)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -7013,9 +7936,10 @@ class DBLoopExec(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_loop_iterations)
+        if self._db_deleted_loop_iterations is not None:
+            children.extend(self._db_deleted_loop_iterations)
         if remove:
-            self.db_deleted_loop_iterations = []
+            self._db_deleted_loop_iterations = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -7069,6 +7993,20 @@ class DBLoopExec(object):
         self._db_loop_iterations = loop_iterations
         self.is_dirty = True
     db_loop_iterations = property(__get_db_loop_iterations, __set_db_loop_iterations)
+    def __get_db_deleted_loop_iterations(self):
+        if self._db_deleted_loop_iterations is None:
+            self._db_deleted_loop_iterations = []
+        return self._db_deleted_loop_iterations
+    def __set_db_deleted_loop_iterations(self, deleted):
+        self._db_deleted_loop_iterations = deleted
+    db_deleted_loop_iterations = property(__get_db_deleted_loop_iterations, __set_db_deleted_loop_iterations)
+    def __get_db_loop_iterations_id_index(self):
+        if self._db_loop_iterations_id_index is None:
+            self._db_loop_iterations_id_index = {}
+        return self._db_loop_iterations_id_index
+    def __set_db_loop_iterations_id_index(self, index):
+        self._db_loop_iterations_id_index = index
+    db_loop_iterations_id_index = property(__get_db_loop_iterations_id_index, __set_db_loop_iterations_id_index)
     def db_get_loop_iterations(self):
         return self._db_loop_iterations
     def db_add_loop_iteration(self, loop_iteration):
@@ -7110,13 +8048,18 @@ class DBLoopExec(object):
 
 class DBConnection(object):
 
+    __slots__ = ('_db_id', '_db_ports', '_db_deleted_ports',
+                 '_db_ports_id_index', '_db_ports_type_index', 'is_dirty',
+                 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'connection'
 
     def __init__(self, id=None, ports=None):
         self._db_id = id
-        self.db_deleted_ports = []
-        self.db_ports_id_index = {}
-        self.db_ports_type_index = {}
+        self._db_deleted_ports = None
+        self._db_ports_id_index = None
+        self._db_ports_type_index = None
         if ports is None:
             self._db_ports = []
         else:
@@ -7147,8 +8090,9 @@ class DBConnection(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_ports_id_index = dict((v.db_id, v) for v in cp._db_ports)
-        cp.db_ports_type_index = dict((v.db_type, v) for v in cp._db_ports)
+        if cp._db_ports:
+            cp.db_ports_id_index = dict((v.db_id, v) for v in cp._db_ports)
+            cp.db_ports_type_index = dict((v.db_type, v) for v in cp._db_ports)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -7194,9 +8138,10 @@ class DBConnection(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_ports)
+        if self._db_deleted_ports is not None:
+            children.extend(self._db_deleted_ports)
         if remove:
-            self.db_deleted_ports = []
+            self._db_deleted_ports = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -7224,6 +8169,27 @@ class DBConnection(object):
         self._db_ports = ports
         self.is_dirty = True
     db_ports = property(__get_db_ports, __set_db_ports)
+    def __get_db_deleted_ports(self):
+        if self._db_deleted_ports is None:
+            self._db_deleted_ports = []
+        return self._db_deleted_ports
+    def __set_db_deleted_ports(self, deleted):
+        self._db_deleted_ports = deleted
+    db_deleted_ports = property(__get_db_deleted_ports, __set_db_deleted_ports)
+    def __get_db_ports_id_index(self):
+        if self._db_ports_id_index is None:
+            self._db_ports_id_index = {}
+        return self._db_ports_id_index
+    def __set_db_ports_id_index(self, index):
+        self._db_ports_id_index = index
+    db_ports_id_index = property(__get_db_ports_id_index, __set_db_ports_id_index)
+    def __get_db_ports_type_index(self):
+        if self._db_ports_type_index is None:
+            self._db_ports_type_index = {}
+        return self._db_ports_type_index
+    def __set_db_ports_type_index(self, index):
+        self._db_ports_type_index = index
+    db_ports_type_index = property(__get_db_ports_type_index, __set_db_ports_type_index)
     def db_get_ports(self):
         return self._db_ports
     def db_add_port(self, port):
@@ -7272,6 +8238,9 @@ class DBConnection(object):
 
 class DBConfigBool(object):
 
+    __slots__ = ('_db_value', 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'config_bool'
 
     def __init__(self, value=None):
@@ -7342,11 +8311,19 @@ class DBConfigBool(object):
 
 class DBAction(object):
 
+    __slots__ = ('_db_operations', '_db_deleted_operations',
+                 '_db_operations_id_index', '_db_id', '_db_prevId',
+                 '_db_date', '_db_session', '_db_user', '_db_annotations',
+                 '_db_deleted_annotations', '_db_annotations_id_index',
+                 '_db_annotations_key_index', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'action'
 
     def __init__(self, operations=None, id=None, prevId=None, date=None, session=None, user=None, annotations=None):
-        self.db_deleted_operations = []
-        self.db_operations_id_index = {}
+        self._db_deleted_operations = None
+        self._db_operations_id_index = None
         if operations is None:
             self._db_operations = []
         else:
@@ -7358,9 +8335,9 @@ class DBAction(object):
         self._db_date = date
         self._db_session = session
         self._db_user = user
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
-        self.db_annotations_key_index = {}
+        self._db_deleted_annotations = None
+        self._db_annotations_id_index = None
+        self._db_annotations_key_index = None
         if annotations is None:
             self._db_annotations = []
         else:
@@ -7401,9 +8378,11 @@ class DBAction(object):
                 cp._db_prevId = id_remap[('action', self._db_prevId)]
         
         # recreate indices and set flags
-        cp.db_operations_id_index = dict((v.db_id, v) for v in cp._db_operations)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
+        if cp._db_operations:
+            cp.db_operations_id_index = dict((v.db_id, v) for v in cp._db_operations)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+            cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -7499,11 +8478,13 @@ class DBAction(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_operations)
+        if self._db_deleted_annotations is not None:
+            children.extend(self._db_deleted_annotations)
+        if self._db_deleted_operations is not None:
+            children.extend(self._db_deleted_operations)
         if remove:
-            self.db_deleted_annotations = []
-            self.db_deleted_operations = []
+            self._db_deleted_annotations = None
+            self._db_deleted_operations = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -7521,6 +8502,20 @@ class DBAction(object):
         self._db_operations = operations
         self.is_dirty = True
     db_operations = property(__get_db_operations, __set_db_operations)
+    def __get_db_deleted_operations(self):
+        if self._db_deleted_operations is None:
+            self._db_deleted_operations = []
+        return self._db_deleted_operations
+    def __set_db_deleted_operations(self, deleted):
+        self._db_deleted_operations = deleted
+    db_deleted_operations = property(__get_db_deleted_operations, __set_db_deleted_operations)
+    def __get_db_operations_id_index(self):
+        if self._db_operations_id_index is None:
+            self._db_operations_id_index = {}
+        return self._db_operations_id_index
+    def __set_db_operations_id_index(self, index):
+        self._db_operations_id_index = index
+    db_operations_id_index = property(__get_db_operations_id_index, __set_db_operations_id_index)
     def db_get_operations(self):
         return self._db_operations
     def db_add_operation(self, operation):
@@ -7628,6 +8623,27 @@ class DBAction(object):
         self._db_annotations = annotations
         self.is_dirty = True
     db_annotations = property(__get_db_annotations, __set_db_annotations)
+    def __get_db_deleted_annotations(self):
+        if self._db_deleted_annotations is None:
+            self._db_deleted_annotations = []
+        return self._db_deleted_annotations
+    def __set_db_deleted_annotations(self, deleted):
+        self._db_deleted_annotations = deleted
+    db_deleted_annotations = property(__get_db_deleted_annotations, __set_db_deleted_annotations)
+    def __get_db_annotations_id_index(self):
+        if self._db_annotations_id_index is None:
+            self._db_annotations_id_index = {}
+        return self._db_annotations_id_index
+    def __set_db_annotations_id_index(self, index):
+        self._db_annotations_id_index = index
+    db_annotations_id_index = property(__get_db_annotations_id_index, __set_db_annotations_id_index)
+    def __get_db_annotations_key_index(self):
+        if self._db_annotations_key_index is None:
+            self._db_annotations_key_index = {}
+        return self._db_annotations_key_index
+    def __set_db_annotations_key_index(self, index):
+        self._db_annotations_key_index = index
+    db_annotations_key_index = property(__get_db_annotations_key_index, __set_db_annotations_key_index)
     def db_get_annotations(self):
         return self._db_annotations
     def db_add_annotation(self, annotation):
@@ -7676,11 +8692,15 @@ class DBAction(object):
 
 class DBStartupPackage(object):
 
+    __slots__ = ('_db_name', '_db_configuration', '_db_deleted_configuration',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'startup_package'
 
     def __init__(self, name=None, configuration=None):
         self._db_name = name
-        self.db_deleted_configuration = []
+        self._db_deleted_configuration = None
         self._db_configuration = configuration
         self.is_dirty = True
         self.is_new = True
@@ -7744,9 +8764,10 @@ class DBStartupPackage(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_configuration)
+        if self._db_deleted_configuration is not None:
+            children.extend(self._db_deleted_configuration)
         if remove:
-            self.db_deleted_configuration = []
+            self._db_deleted_configuration = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -7773,6 +8794,13 @@ class DBStartupPackage(object):
         self._db_configuration = configuration
         self.is_dirty = True
     db_configuration = property(__get_db_configuration, __set_db_configuration)
+    def __get_db_deleted_configuration(self):
+        if self._db_deleted_configuration is None:
+            self._db_deleted_configuration = []
+        return self._db_deleted_configuration
+    def __set_db_deleted_configuration(self, deleted):
+        self._db_deleted_configuration = deleted
+    db_deleted_configuration = property(__get_db_deleted_configuration, __set_db_deleted_configuration)
     def db_add_configuration(self, configuration):
         self._db_configuration = configuration
     def db_change_configuration(self, configuration):
@@ -7786,6 +8814,9 @@ class DBStartupPackage(object):
 
 class DBConfigInt(object):
 
+    __slots__ = ('_db_value', 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'config_int'
 
     def __init__(self, value=None):
@@ -7856,6 +8887,9 @@ class DBConfigInt(object):
 
 class DBOpmProcessIdEffect(object):
 
+    __slots__ = ('_db_id', 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_process_id_effect'
 
     def __init__(self, id=None):
@@ -7928,6 +8962,10 @@ class DBOpmProcessIdEffect(object):
 
 class DBRefProvPlan(object):
 
+    __slots__ = ('_db_prov_ref', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'ref_prov_plan'
 
     def __init__(self, prov_ref=None):
@@ -8000,18 +9038,24 @@ class DBRefProvPlan(object):
 
 class DBOpmAccounts(object):
 
+    __slots__ = ('_db_accounts', '_db_deleted_accounts',
+                 '_db_accounts_id_index', '_db_opm_overlapss',
+                 '_db_deleted_opm_overlapss', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_accounts'
 
     def __init__(self, accounts=None, opm_overlapss=None):
-        self.db_deleted_accounts = []
-        self.db_accounts_id_index = {}
+        self._db_deleted_accounts = None
+        self._db_accounts_id_index = None
         if accounts is None:
             self._db_accounts = []
         else:
             self._db_accounts = accounts
             for v in self._db_accounts:
                 self.db_accounts_id_index[v.db_id] = v
-        self.db_deleted_opm_overlapss = []
+        self._db_deleted_opm_overlapss = None
         if opm_overlapss is None:
             self._db_opm_overlapss = []
         else:
@@ -8043,7 +9087,8 @@ class DBOpmAccounts(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_accounts_id_index = dict((v.db_id, v) for v in cp._db_accounts)
+        if cp._db_accounts:
+            cp.db_accounts_id_index = dict((v.db_id, v) for v in cp._db_accounts)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -8102,11 +9147,13 @@ class DBOpmAccounts(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_opm_overlapss)
+        if self._db_deleted_accounts is not None:
+            children.extend(self._db_deleted_accounts)
+        if self._db_deleted_opm_overlapss is not None:
+            children.extend(self._db_deleted_opm_overlapss)
         if remove:
-            self.db_deleted_accounts = []
-            self.db_deleted_opm_overlapss = []
+            self._db_deleted_accounts = None
+            self._db_deleted_opm_overlapss = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -8124,6 +9171,20 @@ class DBOpmAccounts(object):
         self._db_accounts = accounts
         self.is_dirty = True
     db_accounts = property(__get_db_accounts, __set_db_accounts)
+    def __get_db_deleted_accounts(self):
+        if self._db_deleted_accounts is None:
+            self._db_deleted_accounts = []
+        return self._db_deleted_accounts
+    def __set_db_deleted_accounts(self, deleted):
+        self._db_deleted_accounts = deleted
+    db_deleted_accounts = property(__get_db_deleted_accounts, __set_db_deleted_accounts)
+    def __get_db_accounts_id_index(self):
+        if self._db_accounts_id_index is None:
+            self._db_accounts_id_index = {}
+        return self._db_accounts_id_index
+    def __set_db_accounts_id_index(self, index):
+        self._db_accounts_id_index = index
+    db_accounts_id_index = property(__get_db_accounts_id_index, __set_db_accounts_id_index)
     def db_get_accounts(self):
         return self._db_accounts
     def db_add_account(self, account):
@@ -8166,6 +9227,13 @@ class DBOpmAccounts(object):
         self._db_opm_overlapss = opm_overlapss
         self.is_dirty = True
     db_opm_overlapss = property(__get_db_opm_overlapss, __set_db_opm_overlapss)
+    def __get_db_deleted_opm_overlapss(self):
+        if self._db_deleted_opm_overlapss is None:
+            self._db_deleted_opm_overlapss = []
+        return self._db_deleted_opm_overlapss
+    def __set_db_deleted_opm_overlapss(self, deleted):
+        self._db_deleted_opm_overlapss = deleted
+    db_deleted_opm_overlapss = property(__get_db_deleted_opm_overlapss, __set_db_deleted_opm_overlapss)
     def db_get_opm_overlapss(self):
         return self._db_opm_overlapss
     def db_add_opm_overlaps(self, opm_overlaps):
@@ -8184,6 +9252,10 @@ class DBOpmAccounts(object):
 
 class DBRefProvAgent(object):
 
+    __slots__ = ('_db_prov_ref', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'ref_prov_agent'
 
     def __init__(self, prov_ref=None):
@@ -8256,6 +9328,13 @@ class DBRefProvAgent(object):
 
 class DBPortSpec(object):
 
+    __slots__ = ('_db_id', '_db_name', '_db_type', '_db_optional', '_db_depth',
+                 '_db_sort_key', '_db_portSpecItems',
+                 '_db_deleted_portSpecItems', '_db_portSpecItems_id_index',
+                 '_db_min_conns', '_db_max_conns', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'portSpec'
 
     def __init__(self, id=None, name=None, type=None, optional=None, depth=None, sort_key=None, portSpecItems=None, min_conns=None, max_conns=None):
@@ -8265,8 +9344,8 @@ class DBPortSpec(object):
         self._db_optional = optional
         self._db_depth = depth
         self._db_sort_key = sort_key
-        self.db_deleted_portSpecItems = []
-        self.db_portSpecItems_id_index = {}
+        self._db_deleted_portSpecItems = None
+        self._db_portSpecItems_id_index = None
         if portSpecItems is None:
             self._db_portSpecItems = []
         else:
@@ -8305,7 +9384,8 @@ class DBPortSpec(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_portSpecItems_id_index = dict((v.db_id, v) for v in cp._db_portSpecItems)
+        if cp._db_portSpecItems:
+            cp.db_portSpecItems_id_index = dict((v.db_id, v) for v in cp._db_portSpecItems)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -8382,9 +9462,10 @@ class DBPortSpec(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_portSpecItems)
+        if self._db_deleted_portSpecItems is not None:
+            children.extend(self._db_deleted_portSpecItems)
         if remove:
-            self.db_deleted_portSpecItems = []
+            self._db_deleted_portSpecItems = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -8477,6 +9558,20 @@ class DBPortSpec(object):
         self._db_portSpecItems = portSpecItems
         self.is_dirty = True
     db_portSpecItems = property(__get_db_portSpecItems, __set_db_portSpecItems)
+    def __get_db_deleted_portSpecItems(self):
+        if self._db_deleted_portSpecItems is None:
+            self._db_deleted_portSpecItems = []
+        return self._db_deleted_portSpecItems
+    def __set_db_deleted_portSpecItems(self, deleted):
+        self._db_deleted_portSpecItems = deleted
+    db_deleted_portSpecItems = property(__get_db_deleted_portSpecItems, __set_db_deleted_portSpecItems)
+    def __get_db_portSpecItems_id_index(self):
+        if self._db_portSpecItems_id_index is None:
+            self._db_portSpecItems_id_index = {}
+        return self._db_portSpecItems_id_index
+    def __set_db_portSpecItems_id_index(self, index):
+        self._db_portSpecItems_id_index = index
+    db_portSpecItems_id_index = property(__get_db_portSpecItems_id_index, __set_db_portSpecItems_id_index)
     def db_get_portSpecItems(self):
         return self._db_portSpecItems
     def db_add_portSpecItem(self, portSpecItem):
@@ -8544,11 +9639,16 @@ class DBPortSpec(object):
 
 class DBEnabledPackages(object):
 
+    __slots__ = ('_db_packages', '_db_deleted_packages',
+                 '_db_packages_name_index', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'enabled_packages'
 
     def __init__(self, packages=None):
-        self.db_deleted_packages = []
-        self.db_packages_name_index = {}
+        self._db_deleted_packages = None
+        self._db_packages_name_index = None
         if packages is None:
             self._db_packages = []
         else:
@@ -8578,7 +9678,8 @@ class DBEnabledPackages(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_packages_name_index = dict((v.db_name, v) for v in cp._db_packages)
+        if cp._db_packages:
+            cp.db_packages_name_index = dict((v.db_name, v) for v in cp._db_packages)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -8619,9 +9720,10 @@ class DBEnabledPackages(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_packages)
+        if self._db_deleted_packages is not None:
+            children.extend(self._db_deleted_packages)
         if remove:
-            self.db_deleted_packages = []
+            self._db_deleted_packages = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -8636,6 +9738,20 @@ class DBEnabledPackages(object):
         self._db_packages = packages
         self.is_dirty = True
     db_packages = property(__get_db_packages, __set_db_packages)
+    def __get_db_deleted_packages(self):
+        if self._db_deleted_packages is None:
+            self._db_deleted_packages = []
+        return self._db_deleted_packages
+    def __set_db_deleted_packages(self, deleted):
+        self._db_deleted_packages = deleted
+    db_deleted_packages = property(__get_db_deleted_packages, __set_db_deleted_packages)
+    def __get_db_packages_name_index(self):
+        if self._db_packages_name_index is None:
+            self._db_packages_name_index = {}
+        return self._db_packages_name_index
+    def __set_db_packages_name_index(self, index):
+        self._db_packages_name_index = index
+    db_packages_name_index = property(__get_db_packages_name_index, __set_db_packages_name_index)
     def db_get_packages(self):
         return self._db_packages
     def db_add_package(self, package):
@@ -8660,13 +9776,18 @@ class DBEnabledPackages(object):
 
 class DBOpmArtifact(object):
 
+    __slots__ = ('_db_id', '_db_value', '_db_deleted_value', '_db_accounts',
+                 '_db_deleted_accounts', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_artifact'
 
     def __init__(self, id=None, value=None, accounts=None):
         self._db_id = id
-        self.db_deleted_value = []
+        self._db_deleted_value = None
         self._db_value = value
-        self.db_deleted_accounts = []
+        self._db_deleted_accounts = None
         if accounts is None:
             self._db_accounts = []
         else:
@@ -8755,11 +9876,13 @@ class DBOpmArtifact(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_value)
-        children.extend(self.db_deleted_accounts)
+        if self._db_deleted_value is not None:
+            children.extend(self._db_deleted_value)
+        if self._db_deleted_accounts is not None:
+            children.extend(self._db_deleted_accounts)
         if remove:
-            self.db_deleted_value = []
-            self.db_deleted_accounts = []
+            self._db_deleted_value = None
+            self._db_deleted_accounts = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -8789,6 +9912,13 @@ class DBOpmArtifact(object):
         self._db_value = value
         self.is_dirty = True
     db_value = property(__get_db_value, __set_db_value)
+    def __get_db_deleted_value(self):
+        if self._db_deleted_value is None:
+            self._db_deleted_value = []
+        return self._db_deleted_value
+    def __set_db_deleted_value(self, deleted):
+        self._db_deleted_value = deleted
+    db_deleted_value = property(__get_db_deleted_value, __set_db_deleted_value)
     def db_add_value(self, value):
         self._db_value = value
     def db_change_value(self, value):
@@ -8804,6 +9934,13 @@ class DBOpmArtifact(object):
         self._db_accounts = accounts
         self.is_dirty = True
     db_accounts = property(__get_db_accounts, __set_db_accounts)
+    def __get_db_deleted_accounts(self):
+        if self._db_deleted_accounts is None:
+            self._db_deleted_accounts = []
+        return self._db_deleted_accounts
+    def __set_db_deleted_accounts(self, deleted):
+        self._db_deleted_accounts = deleted
+    db_deleted_accounts = property(__get_db_deleted_accounts, __set_db_deleted_accounts)
     def db_get_accounts(self):
         return self._db_accounts
     def db_add_account(self, account):
@@ -8823,6 +9960,13 @@ class DBOpmArtifact(object):
 
 class DBLog(object):
 
+    __slots__ = ('_db_id', '_db_entity_type', '_db_version', '_db_name',
+                 '_db_last_modified', '_db_workflow_execs',
+                 '_db_deleted_workflow_execs',
+                 '_db_workflow_execs_id_index', '_db_vistrail_id',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'log'
 
     def __init__(self, id=None, entity_type=None, version=None, name=None, last_modified=None, workflow_execs=None, vistrail_id=None):
@@ -8831,8 +9975,8 @@ class DBLog(object):
         self._db_version = version
         self._db_name = name
         self._db_last_modified = last_modified
-        self.db_deleted_workflow_execs = []
-        self.db_workflow_execs_id_index = {}
+        self._db_deleted_workflow_execs = None
+        self._db_workflow_execs_id_index = None
         if workflow_execs is None:
             self._db_workflow_execs = []
         else:
@@ -8870,7 +10014,8 @@ class DBLog(object):
                 cp._db_vistrail_id = id_remap[('vistrail', self._db_vistrail_id)]
         
         # recreate indices and set flags
-        cp.db_workflow_execs_id_index = dict((v.db_id, v) for v in cp._db_workflow_execs)
+        if cp._db_workflow_execs:
+            cp.db_workflow_execs_id_index = dict((v.db_id, v) for v in cp._db_workflow_execs)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -8941,9 +10086,10 @@ class DBLog(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_workflow_execs)
+        if self._db_deleted_workflow_execs is not None:
+            children.extend(self._db_deleted_workflow_execs)
         if remove:
-            self.db_deleted_workflow_execs = []
+            self._db_deleted_workflow_execs = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -9023,6 +10169,20 @@ class DBLog(object):
         self._db_workflow_execs = workflow_execs
         self.is_dirty = True
     db_workflow_execs = property(__get_db_workflow_execs, __set_db_workflow_execs)
+    def __get_db_deleted_workflow_execs(self):
+        if self._db_deleted_workflow_execs is None:
+            self._db_deleted_workflow_execs = []
+        return self._db_deleted_workflow_execs
+    def __set_db_deleted_workflow_execs(self, deleted):
+        self._db_deleted_workflow_execs = deleted
+    db_deleted_workflow_execs = property(__get_db_deleted_workflow_execs, __set_db_deleted_workflow_execs)
+    def __get_db_workflow_execs_id_index(self):
+        if self._db_workflow_execs_id_index is None:
+            self._db_workflow_execs_id_index = {}
+        return self._db_workflow_execs_id_index
+    def __set_db_workflow_execs_id_index(self, index):
+        self._db_workflow_execs_id_index = index
+    db_workflow_execs_id_index = property(__get_db_workflow_execs_id_index, __set_db_workflow_execs_id_index)
     def db_get_workflow_execs(self):
         return self._db_workflow_execs
     def db_add_workflow_exec(self, workflow_exec):
@@ -9077,11 +10237,18 @@ class DBLog(object):
 
 class DBLoopIteration(object):
 
+    __slots__ = ('_db_item_execs', '_db_deleted_item_execs',
+                 '_db_item_execs_id_index', '_db_id', '_db_ts_start',
+                 '_db_ts_end', '_db_iteration', '_db_completed',
+                 '_db_error', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'loop_iteration'
 
     def __init__(self, item_execs=None, id=None, ts_start=None, ts_end=None, iteration=None, completed=None, error=None):
-        self.db_deleted_item_execs = []
-        self.db_item_execs_id_index = {}
+        self._db_deleted_item_execs = None
+        self._db_item_execs_id_index = None
         if item_execs is None:
             self._db_item_execs = []
         else:
@@ -9122,7 +10289,8 @@ class DBLoopIteration(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_item_execs_id_index = dict((v.db_id, v) for v in cp._db_item_execs)
+        if cp._db_item_execs:
+            cp.db_item_execs_id_index = dict((v.db_id, v) for v in cp._db_item_execs)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -9205,9 +10373,10 @@ class DBLoopIteration(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_item_execs)
+        if self._db_deleted_item_execs is not None:
+            children.extend(self._db_deleted_item_execs)
         if remove:
-            self.db_deleted_item_execs = []
+            self._db_deleted_item_execs = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -9222,6 +10391,20 @@ class DBLoopIteration(object):
         self._db_item_execs = item_execs
         self.is_dirty = True
     db_item_execs = property(__get_db_item_execs, __set_db_item_execs)
+    def __get_db_deleted_item_execs(self):
+        if self._db_deleted_item_execs is None:
+            self._db_deleted_item_execs = []
+        return self._db_deleted_item_execs
+    def __set_db_deleted_item_execs(self, deleted):
+        self._db_deleted_item_execs = deleted
+    db_deleted_item_execs = property(__get_db_deleted_item_execs, __set_db_deleted_item_execs)
+    def __get_db_item_execs_id_index(self):
+        if self._db_item_execs_id_index is None:
+            self._db_item_execs_id_index = {}
+        return self._db_item_execs_id_index
+    def __set_db_item_execs_id_index(self, index):
+        self._db_item_execs_id_index = index
+    db_item_execs_id_index = property(__get_db_item_execs_id_index, __set_db_item_execs_id_index)
     def db_get_item_execs(self):
         return self._db_item_execs
     def db_add_item_exec(self, item_exec):
@@ -9341,6 +10524,9 @@ class DBLoopIteration(object):
 
 class DBOpmProcessIdCause(object):
 
+    __slots__ = ('_db_id', 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_process_id_cause'
 
     def __init__(self, id=None):
@@ -9413,11 +10599,16 @@ class DBOpmProcessIdCause(object):
 
 class DBOpmArtifacts(object):
 
+    __slots__ = ('_db_artifacts', '_db_deleted_artifacts',
+                 '_db_artifacts_id_index', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_artifacts'
 
     def __init__(self, artifacts=None):
-        self.db_deleted_artifacts = []
-        self.db_artifacts_id_index = {}
+        self._db_deleted_artifacts = None
+        self._db_artifacts_id_index = None
         if artifacts is None:
             self._db_artifacts = []
         else:
@@ -9447,7 +10638,8 @@ class DBOpmArtifacts(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_artifacts_id_index = dict((v.db_id, v) for v in cp._db_artifacts)
+        if cp._db_artifacts:
+            cp.db_artifacts_id_index = dict((v.db_id, v) for v in cp._db_artifacts)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -9488,9 +10680,10 @@ class DBOpmArtifacts(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_artifacts)
+        if self._db_deleted_artifacts is not None:
+            children.extend(self._db_deleted_artifacts)
         if remove:
-            self.db_deleted_artifacts = []
+            self._db_deleted_artifacts = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -9505,6 +10698,20 @@ class DBOpmArtifacts(object):
         self._db_artifacts = artifacts
         self.is_dirty = True
     db_artifacts = property(__get_db_artifacts, __set_db_artifacts)
+    def __get_db_deleted_artifacts(self):
+        if self._db_deleted_artifacts is None:
+            self._db_deleted_artifacts = []
+        return self._db_deleted_artifacts
+    def __set_db_deleted_artifacts(self, deleted):
+        self._db_deleted_artifacts = deleted
+    db_deleted_artifacts = property(__get_db_deleted_artifacts, __set_db_deleted_artifacts)
+    def __get_db_artifacts_id_index(self):
+        if self._db_artifacts_id_index is None:
+            self._db_artifacts_id_index = {}
+        return self._db_artifacts_id_index
+    def __set_db_artifacts_id_index(self, index):
+        self._db_artifacts_id_index = index
+    db_artifacts_id_index = property(__get_db_artifacts_id_index, __set_db_artifacts_id_index)
     def db_get_artifacts(self):
         return self._db_artifacts
     def db_add_artifact(self, artifact):
@@ -9545,6 +10752,11 @@ class DBOpmArtifacts(object):
 
 class DBPEParameter(object):
 
+    __slots__ = ('_db_id', '_db_pos', '_db_interpolator', '_db_value',
+                 '_db_dimension', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'pe_parameter'
 
     def __init__(self, id=None, pos=None, interpolator=None, value=None, dimension=None):
@@ -9696,11 +10908,22 @@ class DBPEParameter(object):
 
 class DBWorkflowExec(object):
 
+    __slots__ = ('_db_item_execs', '_db_deleted_item_execs',
+                 '_db_item_execs_id_index', '_db_id', '_db_user', '_db_ip',
+                 '_db_session', '_db_vt_version', '_db_ts_start',
+                 '_db_ts_end', '_db_parent_id', '_db_parent_type',
+                 '_db_parent_version', '_db_completed', '_db_name',
+                 '_db_annotations', '_db_deleted_annotations',
+                 '_db_annotations_id_index', '_db_machines',
+                 '_db_deleted_machines', '_db_machines_id_index',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'workflow_exec'
 
     def __init__(self, item_execs=None, id=None, user=None, ip=None, session=None, vt_version=None, ts_start=None, ts_end=None, parent_id=None, parent_type=None, parent_version=None, completed=None, name=None, annotations=None, machines=None):
-        self.db_deleted_item_execs = []
-        self.db_item_execs_id_index = {}
+        self._db_deleted_item_execs = None
+        self._db_item_execs_id_index = None
         if item_execs is None:
             self._db_item_execs = []
         else:
@@ -9719,16 +10942,16 @@ class DBWorkflowExec(object):
         self._db_parent_version = parent_version
         self._db_completed = completed
         self._db_name = name
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
+        self._db_deleted_annotations = None
+        self._db_annotations_id_index = None
         if annotations is None:
             self._db_annotations = []
         else:
             self._db_annotations = annotations
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
-        self.db_deleted_machines = []
-        self.db_machines_id_index = {}
+        self._db_deleted_machines = None
+        self._db_machines_id_index = None
         if machines is None:
             self._db_machines = []
         else:
@@ -9777,9 +11000,12 @@ class DBWorkflowExec(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_item_execs_id_index = dict((v.db_id, v) for v in cp._db_item_execs)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_machines_id_index = dict((v.db_id, v) for v in cp._db_machines)
+        if cp._db_item_execs:
+            cp.db_item_execs_id_index = dict((v.db_id, v) for v in cp._db_item_execs)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+        if cp._db_machines:
+            cp.db_machines_id_index = dict((v.db_id, v) for v in cp._db_machines)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -9928,13 +11154,16 @@ class DBWorkflowExec(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_machines)
-        children.extend(self.db_deleted_item_execs)
+        if self._db_deleted_annotations is not None:
+            children.extend(self._db_deleted_annotations)
+        if self._db_deleted_machines is not None:
+            children.extend(self._db_deleted_machines)
+        if self._db_deleted_item_execs is not None:
+            children.extend(self._db_deleted_item_execs)
         if remove:
-            self.db_deleted_annotations = []
-            self.db_deleted_machines = []
-            self.db_deleted_item_execs = []
+            self._db_deleted_annotations = None
+            self._db_deleted_machines = None
+            self._db_deleted_item_execs = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -9955,6 +11184,20 @@ class DBWorkflowExec(object):
         self._db_item_execs = item_execs
         self.is_dirty = True
     db_item_execs = property(__get_db_item_execs, __set_db_item_execs)
+    def __get_db_deleted_item_execs(self):
+        if self._db_deleted_item_execs is None:
+            self._db_deleted_item_execs = []
+        return self._db_deleted_item_execs
+    def __set_db_deleted_item_execs(self, deleted):
+        self._db_deleted_item_execs = deleted
+    db_deleted_item_execs = property(__get_db_deleted_item_execs, __set_db_deleted_item_execs)
+    def __get_db_item_execs_id_index(self):
+        if self._db_item_execs_id_index is None:
+            self._db_item_execs_id_index = {}
+        return self._db_item_execs_id_index
+    def __set_db_item_execs_id_index(self, index):
+        self._db_item_execs_id_index = index
+    db_item_execs_id_index = property(__get_db_item_execs_id_index, __set_db_item_execs_id_index)
     def db_get_item_execs(self):
         return self._db_item_execs
     def db_add_item_exec(self, item_exec):
@@ -10153,6 +11396,20 @@ class DBWorkflowExec(object):
         self._db_annotations = annotations
         self.is_dirty = True
     db_annotations = property(__get_db_annotations, __set_db_annotations)
+    def __get_db_deleted_annotations(self):
+        if self._db_deleted_annotations is None:
+            self._db_deleted_annotations = []
+        return self._db_deleted_annotations
+    def __set_db_deleted_annotations(self, deleted):
+        self._db_deleted_annotations = deleted
+    db_deleted_annotations = property(__get_db_deleted_annotations, __set_db_deleted_annotations)
+    def __get_db_annotations_id_index(self):
+        if self._db_annotations_id_index is None:
+            self._db_annotations_id_index = {}
+        return self._db_annotations_id_index
+    def __set_db_annotations_id_index(self, index):
+        self._db_annotations_id_index = index
+    db_annotations_id_index = property(__get_db_annotations_id_index, __set_db_annotations_id_index)
     def db_get_annotations(self):
         return self._db_annotations
     def db_add_annotation(self, annotation):
@@ -10195,6 +11452,20 @@ class DBWorkflowExec(object):
         self._db_machines = machines
         self.is_dirty = True
     db_machines = property(__get_db_machines, __set_db_machines)
+    def __get_db_deleted_machines(self):
+        if self._db_deleted_machines is None:
+            self._db_deleted_machines = []
+        return self._db_deleted_machines
+    def __set_db_deleted_machines(self, deleted):
+        self._db_deleted_machines = deleted
+    db_deleted_machines = property(__get_db_deleted_machines, __set_db_deleted_machines)
+    def __get_db_machines_id_index(self):
+        if self._db_machines_id_index is None:
+            self._db_machines_id_index = {}
+        return self._db_machines_id_index
+    def __set_db_machines_id_index(self, index):
+        self._db_machines_id_index = index
+    db_machines_id_index = property(__get_db_machines_id_index, __set_db_machines_id_index)
     def db_get_machines(self):
         return self._db_machines
     def db_add_machine(self, machine):
@@ -10236,6 +11507,10 @@ class DBWorkflowExec(object):
 
 class DBLocation(object):
 
+    __slots__ = ('_db_id', '_db_x', '_db_y', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'location'
 
     def __init__(self, id=None, x=None, y=None):
@@ -10347,14 +11622,19 @@ class DBLocation(object):
 
 class DBFunction(object):
 
+    __slots__ = ('_db_id', '_db_pos', '_db_name', '_db_parameters',
+                 '_db_deleted_parameters', '_db_parameters_id_index',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'function'
 
     def __init__(self, id=None, pos=None, name=None, parameters=None):
         self._db_id = id
         self._db_pos = pos
         self._db_name = name
-        self.db_deleted_parameters = []
-        self.db_parameters_id_index = {}
+        self._db_deleted_parameters = None
+        self._db_parameters_id_index = None
         if parameters is None:
             self._db_parameters = []
         else:
@@ -10386,7 +11666,8 @@ class DBFunction(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_parameters_id_index = dict((v.db_id, v) for v in cp._db_parameters)
+        if cp._db_parameters:
+            cp.db_parameters_id_index = dict((v.db_id, v) for v in cp._db_parameters)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -10442,9 +11723,10 @@ class DBFunction(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_parameters)
+        if self._db_deleted_parameters is not None:
+            children.extend(self._db_deleted_parameters)
         if remove:
-            self.db_deleted_parameters = []
+            self._db_deleted_parameters = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -10498,6 +11780,20 @@ class DBFunction(object):
         self._db_parameters = parameters
         self.is_dirty = True
     db_parameters = property(__get_db_parameters, __set_db_parameters)
+    def __get_db_deleted_parameters(self):
+        if self._db_deleted_parameters is None:
+            self._db_deleted_parameters = []
+        return self._db_deleted_parameters
+    def __set_db_deleted_parameters(self, deleted):
+        self._db_deleted_parameters = deleted
+    db_deleted_parameters = property(__get_db_deleted_parameters, __set_db_deleted_parameters)
+    def __get_db_parameters_id_index(self):
+        if self._db_parameters_id_index is None:
+            self._db_parameters_id_index = {}
+        return self._db_parameters_id_index
+    def __set_db_parameters_id_index(self, index):
+        self._db_parameters_id_index = index
+    db_parameters_id_index = property(__get_db_parameters_id_index, __set_db_parameters_id_index)
     def db_get_parameters(self):
         return self._db_parameters
     def db_add_parameter(self, parameter):
@@ -10539,6 +11835,11 @@ class DBFunction(object):
 
 class DBActionAnnotation(object):
 
+    __slots__ = ('_db_id', '_db_key', '_db_value', '_db_action_id', '_db_date',
+                 '_db_user', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'actionAnnotation'
 
     def __init__(self, id=None, key=None, value=None, action_id=None, date=None, user=None):
@@ -10712,6 +12013,13 @@ class DBActionAnnotation(object):
 
 class DBProvActivity(object):
 
+    __slots__ = ('_db_id', '_db_startTime', '_db_endTime', '_db_vt_id',
+                 '_db_vt_type', '_db_vt_cached', '_db_vt_completed',
+                 '_db_vt_machine_id', '_db_vt_error', '_db_is_part_of',
+                 '_db_deleted_is_part_of', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'prov_activity'
 
     def __init__(self, id=None, startTime=None, endTime=None, vt_id=None, vt_type=None, vt_cached=None, vt_completed=None, vt_machine_id=None, vt_error=None, is_part_of=None):
@@ -10724,7 +12032,7 @@ class DBProvActivity(object):
         self._db_vt_completed = vt_completed
         self._db_vt_machine_id = vt_machine_id
         self._db_vt_error = vt_error
-        self.db_deleted_is_part_of = []
+        self._db_deleted_is_part_of = None
         self._db_is_part_of = is_part_of
         self.is_dirty = True
         self.is_new = True
@@ -10836,9 +12144,10 @@ class DBProvActivity(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_is_part_of)
+        if self._db_deleted_is_part_of is not None:
+            children.extend(self._db_deleted_is_part_of)
         if remove:
-            self.db_deleted_is_part_of = []
+            self._db_deleted_is_part_of = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -10969,6 +12278,13 @@ class DBProvActivity(object):
         self._db_is_part_of = is_part_of
         self.is_dirty = True
     db_is_part_of = property(__get_db_is_part_of, __set_db_is_part_of)
+    def __get_db_deleted_is_part_of(self):
+        if self._db_deleted_is_part_of is None:
+            self._db_deleted_is_part_of = []
+        return self._db_deleted_is_part_of
+    def __set_db_deleted_is_part_of(self, deleted):
+        self._db_deleted_is_part_of = deleted
+    db_deleted_is_part_of = property(__get_db_deleted_is_part_of, __set_db_deleted_is_part_of)
     def db_add_is_part_of(self, is_part_of):
         self._db_is_part_of = is_part_of
     def db_change_is_part_of(self, is_part_of):
@@ -10983,12 +12299,18 @@ class DBProvActivity(object):
 
 class DBProvUsage(object):
 
+    __slots__ = ('_db_prov_activity', '_db_deleted_prov_activity',
+                 '_db_prov_entity', '_db_deleted_prov_entity',
+                 '_db_prov_role', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'prov_usage'
 
     def __init__(self, prov_activity=None, prov_entity=None, prov_role=None):
-        self.db_deleted_prov_activity = []
+        self._db_deleted_prov_activity = None
         self._db_prov_activity = prov_activity
-        self.db_deleted_prov_entity = []
+        self._db_deleted_prov_entity = None
         self._db_prov_entity = prov_entity
         self._db_prov_role = prov_role
         self.is_dirty = True
@@ -11069,11 +12391,13 @@ class DBProvUsage(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_prov_activity)
-        children.extend(self.db_deleted_prov_entity)
+        if self._db_deleted_prov_activity is not None:
+            children.extend(self._db_deleted_prov_activity)
+        if self._db_deleted_prov_entity is not None:
+            children.extend(self._db_deleted_prov_entity)
         if remove:
-            self.db_deleted_prov_activity = []
-            self.db_deleted_prov_entity = []
+            self._db_deleted_prov_activity = None
+            self._db_deleted_prov_entity = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -11089,6 +12413,13 @@ class DBProvUsage(object):
         self._db_prov_activity = prov_activity
         self.is_dirty = True
     db_prov_activity = property(__get_db_prov_activity, __set_db_prov_activity)
+    def __get_db_deleted_prov_activity(self):
+        if self._db_deleted_prov_activity is None:
+            self._db_deleted_prov_activity = []
+        return self._db_deleted_prov_activity
+    def __set_db_deleted_prov_activity(self, deleted):
+        self._db_deleted_prov_activity = deleted
+    db_deleted_prov_activity = property(__get_db_deleted_prov_activity, __set_db_deleted_prov_activity)
     def db_add_prov_activity(self, prov_activity):
         self._db_prov_activity = prov_activity
     def db_change_prov_activity(self, prov_activity):
@@ -11104,6 +12435,13 @@ class DBProvUsage(object):
         self._db_prov_entity = prov_entity
         self.is_dirty = True
     db_prov_entity = property(__get_db_prov_entity, __set_db_prov_entity)
+    def __get_db_deleted_prov_entity(self):
+        if self._db_deleted_prov_entity is None:
+            self._db_deleted_prov_entity = []
+        return self._db_deleted_prov_entity
+    def __set_db_deleted_prov_entity(self, deleted):
+        self._db_deleted_prov_entity = deleted
+    db_deleted_prov_entity = property(__get_db_deleted_prov_entity, __set_db_deleted_prov_entity)
     def db_add_prov_entity(self, prov_entity):
         self._db_prov_entity = prov_entity
     def db_change_prov_entity(self, prov_entity):
@@ -11130,6 +12468,9 @@ class DBProvUsage(object):
 
 class DBOpmArtifactIdEffect(object):
 
+    __slots__ = ('_db_id', 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_artifact_id_effect'
 
     def __init__(self, id=None):
@@ -11202,18 +12543,26 @@ class DBOpmArtifactIdEffect(object):
 
 class DBOpmGraph(object):
 
+    __slots__ = ('_db_accounts', '_db_deleted_accounts', '_db_processes',
+                 '_db_deleted_processes', '_db_artifacts',
+                 '_db_deleted_artifacts', '_db_agents',
+                 '_db_deleted_agents', '_db_dependencies',
+                 '_db_deleted_dependencies', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_graph'
 
     def __init__(self, accounts=None, processes=None, artifacts=None, agents=None, dependencies=None):
-        self.db_deleted_accounts = []
+        self._db_deleted_accounts = None
         self._db_accounts = accounts
-        self.db_deleted_processes = []
+        self._db_deleted_processes = None
         self._db_processes = processes
-        self.db_deleted_artifacts = []
+        self._db_deleted_artifacts = None
         self._db_artifacts = artifacts
-        self.db_deleted_agents = []
+        self._db_deleted_agents = None
         self._db_agents = agents
-        self.db_deleted_dependencies = []
+        self._db_deleted_dependencies = None
         self._db_dependencies = dependencies
         self.is_dirty = True
         self.is_new = True
@@ -11336,17 +12685,22 @@ class DBOpmGraph(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_processes)
-        children.extend(self.db_deleted_artifacts)
-        children.extend(self.db_deleted_agents)
-        children.extend(self.db_deleted_dependencies)
+        if self._db_deleted_accounts is not None:
+            children.extend(self._db_deleted_accounts)
+        if self._db_deleted_processes is not None:
+            children.extend(self._db_deleted_processes)
+        if self._db_deleted_artifacts is not None:
+            children.extend(self._db_deleted_artifacts)
+        if self._db_deleted_agents is not None:
+            children.extend(self._db_deleted_agents)
+        if self._db_deleted_dependencies is not None:
+            children.extend(self._db_deleted_dependencies)
         if remove:
-            self.db_deleted_accounts = []
-            self.db_deleted_processes = []
-            self.db_deleted_artifacts = []
-            self.db_deleted_agents = []
-            self.db_deleted_dependencies = []
+            self._db_deleted_accounts = None
+            self._db_deleted_processes = None
+            self._db_deleted_artifacts = None
+            self._db_deleted_agents = None
+            self._db_deleted_dependencies = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -11368,6 +12722,13 @@ class DBOpmGraph(object):
         self._db_accounts = accounts
         self.is_dirty = True
     db_accounts = property(__get_db_accounts, __set_db_accounts)
+    def __get_db_deleted_accounts(self):
+        if self._db_deleted_accounts is None:
+            self._db_deleted_accounts = []
+        return self._db_deleted_accounts
+    def __set_db_deleted_accounts(self, deleted):
+        self._db_deleted_accounts = deleted
+    db_deleted_accounts = property(__get_db_deleted_accounts, __set_db_deleted_accounts)
     def db_add_accounts(self, accounts):
         self._db_accounts = accounts
     def db_change_accounts(self, accounts):
@@ -11383,6 +12744,13 @@ class DBOpmGraph(object):
         self._db_processes = processes
         self.is_dirty = True
     db_processes = property(__get_db_processes, __set_db_processes)
+    def __get_db_deleted_processes(self):
+        if self._db_deleted_processes is None:
+            self._db_deleted_processes = []
+        return self._db_deleted_processes
+    def __set_db_deleted_processes(self, deleted):
+        self._db_deleted_processes = deleted
+    db_deleted_processes = property(__get_db_deleted_processes, __set_db_deleted_processes)
     def db_add_processes(self, processes):
         self._db_processes = processes
     def db_change_processes(self, processes):
@@ -11398,6 +12766,13 @@ class DBOpmGraph(object):
         self._db_artifacts = artifacts
         self.is_dirty = True
     db_artifacts = property(__get_db_artifacts, __set_db_artifacts)
+    def __get_db_deleted_artifacts(self):
+        if self._db_deleted_artifacts is None:
+            self._db_deleted_artifacts = []
+        return self._db_deleted_artifacts
+    def __set_db_deleted_artifacts(self, deleted):
+        self._db_deleted_artifacts = deleted
+    db_deleted_artifacts = property(__get_db_deleted_artifacts, __set_db_deleted_artifacts)
     def db_add_artifacts(self, artifacts):
         self._db_artifacts = artifacts
     def db_change_artifacts(self, artifacts):
@@ -11413,6 +12788,13 @@ class DBOpmGraph(object):
         self._db_agents = agents
         self.is_dirty = True
     db_agents = property(__get_db_agents, __set_db_agents)
+    def __get_db_deleted_agents(self):
+        if self._db_deleted_agents is None:
+            self._db_deleted_agents = []
+        return self._db_deleted_agents
+    def __set_db_deleted_agents(self, deleted):
+        self._db_deleted_agents = deleted
+    db_deleted_agents = property(__get_db_deleted_agents, __set_db_deleted_agents)
     def db_add_agents(self, agents):
         self._db_agents = agents
     def db_change_agents(self, agents):
@@ -11428,6 +12810,13 @@ class DBOpmGraph(object):
         self._db_dependencies = dependencies
         self.is_dirty = True
     db_dependencies = property(__get_db_dependencies, __set_db_dependencies)
+    def __get_db_deleted_dependencies(self):
+        if self._db_deleted_dependencies is None:
+            self._db_deleted_dependencies = []
+        return self._db_deleted_dependencies
+    def __set_db_deleted_dependencies(self, deleted):
+        self._db_deleted_dependencies = deleted
+    db_deleted_dependencies = property(__get_db_deleted_dependencies, __set_db_deleted_dependencies)
     def db_add_dependencies(self, dependencies):
         self._db_dependencies = dependencies
     def db_change_dependencies(self, dependencies):
@@ -11441,6 +12830,10 @@ class DBOpmGraph(object):
 
 class DBIsPartOf(object):
 
+    __slots__ = ('_db_prov_ref', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'is_part_of'
 
     def __init__(self, prov_ref=None):
@@ -11511,21 +12904,28 @@ class DBIsPartOf(object):
 
 class DBOpmWasDerivedFrom(object):
 
+    __slots__ = ('_db_effect', '_db_deleted_effect', '_db_role',
+                 '_db_deleted_role', '_db_cause', '_db_deleted_cause',
+                 '_db_accounts', '_db_deleted_accounts', '_db_opm_times',
+                 '_db_deleted_opm_times', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_was_derived_from'
 
     def __init__(self, effect=None, role=None, cause=None, accounts=None, opm_times=None):
-        self.db_deleted_effect = []
+        self._db_deleted_effect = None
         self._db_effect = effect
-        self.db_deleted_role = []
+        self._db_deleted_role = None
         self._db_role = role
-        self.db_deleted_cause = []
+        self._db_deleted_cause = None
         self._db_cause = cause
-        self.db_deleted_accounts = []
+        self._db_deleted_accounts = None
         if accounts is None:
             self._db_accounts = []
         else:
             self._db_accounts = accounts
-        self.db_deleted_opm_times = []
+        self._db_deleted_opm_times = None
         if opm_times is None:
             self._db_opm_times = []
         else:
@@ -11663,17 +13063,22 @@ class DBOpmWasDerivedFrom(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_effect)
-        children.extend(self.db_deleted_role)
-        children.extend(self.db_deleted_cause)
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_opm_times)
+        if self._db_deleted_effect is not None:
+            children.extend(self._db_deleted_effect)
+        if self._db_deleted_role is not None:
+            children.extend(self._db_deleted_role)
+        if self._db_deleted_cause is not None:
+            children.extend(self._db_deleted_cause)
+        if self._db_deleted_accounts is not None:
+            children.extend(self._db_deleted_accounts)
+        if self._db_deleted_opm_times is not None:
+            children.extend(self._db_deleted_opm_times)
         if remove:
-            self.db_deleted_effect = []
-            self.db_deleted_role = []
-            self.db_deleted_cause = []
-            self.db_deleted_accounts = []
-            self.db_deleted_opm_times = []
+            self._db_deleted_effect = None
+            self._db_deleted_role = None
+            self._db_deleted_cause = None
+            self._db_deleted_accounts = None
+            self._db_deleted_opm_times = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -11697,6 +13102,13 @@ class DBOpmWasDerivedFrom(object):
         self._db_effect = effect
         self.is_dirty = True
     db_effect = property(__get_db_effect, __set_db_effect)
+    def __get_db_deleted_effect(self):
+        if self._db_deleted_effect is None:
+            self._db_deleted_effect = []
+        return self._db_deleted_effect
+    def __set_db_deleted_effect(self, deleted):
+        self._db_deleted_effect = deleted
+    db_deleted_effect = property(__get_db_deleted_effect, __set_db_deleted_effect)
     def db_add_effect(self, effect):
         self._db_effect = effect
     def db_change_effect(self, effect):
@@ -11712,6 +13124,13 @@ class DBOpmWasDerivedFrom(object):
         self._db_role = role
         self.is_dirty = True
     db_role = property(__get_db_role, __set_db_role)
+    def __get_db_deleted_role(self):
+        if self._db_deleted_role is None:
+            self._db_deleted_role = []
+        return self._db_deleted_role
+    def __set_db_deleted_role(self, deleted):
+        self._db_deleted_role = deleted
+    db_deleted_role = property(__get_db_deleted_role, __set_db_deleted_role)
     def db_add_role(self, role):
         self._db_role = role
     def db_change_role(self, role):
@@ -11727,6 +13146,13 @@ class DBOpmWasDerivedFrom(object):
         self._db_cause = cause
         self.is_dirty = True
     db_cause = property(__get_db_cause, __set_db_cause)
+    def __get_db_deleted_cause(self):
+        if self._db_deleted_cause is None:
+            self._db_deleted_cause = []
+        return self._db_deleted_cause
+    def __set_db_deleted_cause(self, deleted):
+        self._db_deleted_cause = deleted
+    db_deleted_cause = property(__get_db_deleted_cause, __set_db_deleted_cause)
     def db_add_cause(self, cause):
         self._db_cause = cause
     def db_change_cause(self, cause):
@@ -11742,6 +13168,13 @@ class DBOpmWasDerivedFrom(object):
         self._db_accounts = accounts
         self.is_dirty = True
     db_accounts = property(__get_db_accounts, __set_db_accounts)
+    def __get_db_deleted_accounts(self):
+        if self._db_deleted_accounts is None:
+            self._db_deleted_accounts = []
+        return self._db_deleted_accounts
+    def __set_db_deleted_accounts(self, deleted):
+        self._db_deleted_accounts = deleted
+    db_deleted_accounts = property(__get_db_deleted_accounts, __set_db_deleted_accounts)
     def db_get_accounts(self):
         return self._db_accounts
     def db_add_account(self, account):
@@ -11762,6 +13195,13 @@ class DBOpmWasDerivedFrom(object):
         self._db_opm_times = opm_times
         self.is_dirty = True
     db_opm_times = property(__get_db_opm_times, __set_db_opm_times)
+    def __get_db_deleted_opm_times(self):
+        if self._db_deleted_opm_times is None:
+            self._db_deleted_opm_times = []
+        return self._db_deleted_opm_times
+    def __set_db_deleted_opm_times(self, deleted):
+        self._db_deleted_opm_times = deleted
+    db_deleted_opm_times = property(__get_db_deleted_opm_times, __set_db_deleted_opm_times)
     def db_get_opm_times(self):
         return self._db_opm_times
     def db_add_opm_time(self, opm_time):
@@ -11780,6 +13220,10 @@ class DBOpmWasDerivedFrom(object):
 
 class DBControlParameter(object):
 
+    __slots__ = ('_db_id', '_db_name', '_db_value', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'controlParameter'
 
     def __init__(self, id=None, name=None, value=None):
@@ -11891,6 +13335,10 @@ class DBControlParameter(object):
 
 class DBPluginData(object):
 
+    __slots__ = ('_db_id', '_db_data', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'plugin_data'
 
     def __init__(self, id=None, data=None):
@@ -11982,6 +13430,11 @@ class DBPluginData(object):
 
 class DBDelete(object):
 
+    __slots__ = ('_db_id', '_db_what', '_db_objectId', '_db_parentObjId',
+                 '_db_parentObjType', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'delete'
 
     def __init__(self, id=None, what=None, objectId=None, parentObjId=None, parentObjType=None):
@@ -12137,6 +13590,11 @@ class DBDelete(object):
 
 class DBVistrailVariable(object):
 
+    __slots__ = ('_db_name', '_db_uuid', '_db_package', '_db_module',
+                 '_db_namespace', '_db_value', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'vistrailVariable'
 
     def __init__(self, name=None, uuid=None, package=None, module=None, namespace=None, value=None):
@@ -12308,10 +13766,14 @@ class DBVistrailVariable(object):
 
 class DBOpmOverlaps(object):
 
+    __slots__ = ('_db_opm_account_ids', '_db_deleted_opm_account_ids',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_overlaps'
 
     def __init__(self, opm_account_ids=None):
-        self.db_deleted_opm_account_ids = []
+        self._db_deleted_opm_account_ids = None
         if opm_account_ids is None:
             self._db_opm_account_ids = []
         else:
@@ -12379,9 +13841,10 @@ class DBOpmOverlaps(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_opm_account_ids)
+        if self._db_deleted_opm_account_ids is not None:
+            children.extend(self._db_deleted_opm_account_ids)
         if remove:
-            self.db_deleted_opm_account_ids = []
+            self._db_deleted_opm_account_ids = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -12396,6 +13859,13 @@ class DBOpmOverlaps(object):
         self._db_opm_account_ids = opm_account_ids
         self.is_dirty = True
     db_opm_account_ids = property(__get_db_opm_account_ids, __set_db_opm_account_ids)
+    def __get_db_deleted_opm_account_ids(self):
+        if self._db_deleted_opm_account_ids is None:
+            self._db_deleted_opm_account_ids = []
+        return self._db_deleted_opm_account_ids
+    def __set_db_deleted_opm_account_ids(self, deleted):
+        self._db_deleted_opm_account_ids = deleted
+    db_deleted_opm_account_ids = property(__get_db_deleted_opm_account_ids, __set_db_deleted_opm_account_ids)
     def db_get_opm_account_ids(self):
         return self._db_opm_account_ids
     def db_add_opm_account_id(self, opm_account_id):
@@ -12414,21 +13884,28 @@ class DBOpmOverlaps(object):
 
 class DBOpmWasTriggeredBy(object):
 
+    __slots__ = ('_db_effect', '_db_deleted_effect', '_db_role',
+                 '_db_deleted_role', '_db_cause', '_db_deleted_cause',
+                 '_db_accounts', '_db_deleted_accounts', '_db_opm_times',
+                 '_db_deleted_opm_times', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_was_triggered_by'
 
     def __init__(self, effect=None, role=None, cause=None, accounts=None, opm_times=None):
-        self.db_deleted_effect = []
+        self._db_deleted_effect = None
         self._db_effect = effect
-        self.db_deleted_role = []
+        self._db_deleted_role = None
         self._db_role = role
-        self.db_deleted_cause = []
+        self._db_deleted_cause = None
         self._db_cause = cause
-        self.db_deleted_accounts = []
+        self._db_deleted_accounts = None
         if accounts is None:
             self._db_accounts = []
         else:
             self._db_accounts = accounts
-        self.db_deleted_opm_times = []
+        self._db_deleted_opm_times = None
         if opm_times is None:
             self._db_opm_times = []
         else:
@@ -12566,17 +14043,22 @@ class DBOpmWasTriggeredBy(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_effect)
-        children.extend(self.db_deleted_role)
-        children.extend(self.db_deleted_cause)
-        children.extend(self.db_deleted_accounts)
-        children.extend(self.db_deleted_opm_times)
+        if self._db_deleted_effect is not None:
+            children.extend(self._db_deleted_effect)
+        if self._db_deleted_role is not None:
+            children.extend(self._db_deleted_role)
+        if self._db_deleted_cause is not None:
+            children.extend(self._db_deleted_cause)
+        if self._db_deleted_accounts is not None:
+            children.extend(self._db_deleted_accounts)
+        if self._db_deleted_opm_times is not None:
+            children.extend(self._db_deleted_opm_times)
         if remove:
-            self.db_deleted_effect = []
-            self.db_deleted_role = []
-            self.db_deleted_cause = []
-            self.db_deleted_accounts = []
-            self.db_deleted_opm_times = []
+            self._db_deleted_effect = None
+            self._db_deleted_role = None
+            self._db_deleted_cause = None
+            self._db_deleted_accounts = None
+            self._db_deleted_opm_times = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -12600,6 +14082,13 @@ class DBOpmWasTriggeredBy(object):
         self._db_effect = effect
         self.is_dirty = True
     db_effect = property(__get_db_effect, __set_db_effect)
+    def __get_db_deleted_effect(self):
+        if self._db_deleted_effect is None:
+            self._db_deleted_effect = []
+        return self._db_deleted_effect
+    def __set_db_deleted_effect(self, deleted):
+        self._db_deleted_effect = deleted
+    db_deleted_effect = property(__get_db_deleted_effect, __set_db_deleted_effect)
     def db_add_effect(self, effect):
         self._db_effect = effect
     def db_change_effect(self, effect):
@@ -12615,6 +14104,13 @@ class DBOpmWasTriggeredBy(object):
         self._db_role = role
         self.is_dirty = True
     db_role = property(__get_db_role, __set_db_role)
+    def __get_db_deleted_role(self):
+        if self._db_deleted_role is None:
+            self._db_deleted_role = []
+        return self._db_deleted_role
+    def __set_db_deleted_role(self, deleted):
+        self._db_deleted_role = deleted
+    db_deleted_role = property(__get_db_deleted_role, __set_db_deleted_role)
     def db_add_role(self, role):
         self._db_role = role
     def db_change_role(self, role):
@@ -12630,6 +14126,13 @@ class DBOpmWasTriggeredBy(object):
         self._db_cause = cause
         self.is_dirty = True
     db_cause = property(__get_db_cause, __set_db_cause)
+    def __get_db_deleted_cause(self):
+        if self._db_deleted_cause is None:
+            self._db_deleted_cause = []
+        return self._db_deleted_cause
+    def __set_db_deleted_cause(self, deleted):
+        self._db_deleted_cause = deleted
+    db_deleted_cause = property(__get_db_deleted_cause, __set_db_deleted_cause)
     def db_add_cause(self, cause):
         self._db_cause = cause
     def db_change_cause(self, cause):
@@ -12645,6 +14148,13 @@ class DBOpmWasTriggeredBy(object):
         self._db_accounts = accounts
         self.is_dirty = True
     db_accounts = property(__get_db_accounts, __set_db_accounts)
+    def __get_db_deleted_accounts(self):
+        if self._db_deleted_accounts is None:
+            self._db_deleted_accounts = []
+        return self._db_deleted_accounts
+    def __set_db_deleted_accounts(self, deleted):
+        self._db_deleted_accounts = deleted
+    db_deleted_accounts = property(__get_db_deleted_accounts, __set_db_deleted_accounts)
     def db_get_accounts(self):
         return self._db_accounts
     def db_add_account(self, account):
@@ -12665,6 +14175,13 @@ class DBOpmWasTriggeredBy(object):
         self._db_opm_times = opm_times
         self.is_dirty = True
     db_opm_times = property(__get_db_opm_times, __set_db_opm_times)
+    def __get_db_deleted_opm_times(self):
+        if self._db_deleted_opm_times is None:
+            self._db_deleted_opm_times = []
+        return self._db_deleted_opm_times
+    def __set_db_deleted_opm_times(self, deleted):
+        self._db_deleted_opm_times = deleted
+    db_deleted_opm_times = property(__get_db_deleted_opm_times, __set_db_deleted_opm_times)
     def db_get_opm_times(self):
         return self._db_opm_times
     def db_add_opm_time(self, opm_time):
@@ -12683,6 +14200,14 @@ class DBOpmWasTriggeredBy(object):
 
 class DBModuleDescriptor(object):
 
+    __slots__ = ('_db_id', '_db_name', '_db_package', '_db_namespace',
+                 '_db_package_version', '_db_version',
+                 '_db_base_descriptor_id', '_db_portSpecs',
+                 '_db_deleted_portSpecs', '_db_portSpecs_id_index',
+                 '_db_portSpecs_name_index', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'module_descriptor'
 
     def __init__(self, id=None, name=None, package=None, namespace=None, package_version=None, version=None, base_descriptor_id=None, portSpecs=None):
@@ -12693,9 +14218,9 @@ class DBModuleDescriptor(object):
         self._db_package_version = package_version
         self._db_version = version
         self._db_base_descriptor_id = base_descriptor_id
-        self.db_deleted_portSpecs = []
-        self.db_portSpecs_id_index = {}
-        self.db_portSpecs_name_index = {}
+        self._db_deleted_portSpecs = None
+        self._db_portSpecs_id_index = None
+        self._db_portSpecs_name_index = None
         if portSpecs is None:
             self._db_portSpecs = []
         else:
@@ -12734,8 +14259,9 @@ class DBModuleDescriptor(object):
                 cp._db_base_descriptor_id = id_remap[('module_descriptor', self._db_base_descriptor_id)]
         
         # recreate indices and set flags
-        cp.db_portSpecs_id_index = dict((v.db_id, v) for v in cp._db_portSpecs)
-        cp.db_portSpecs_name_index = dict(((v.db_name,v.db_type), v) for v in cp._db_portSpecs)
+        if cp._db_portSpecs:
+            cp.db_portSpecs_id_index = dict((v.db_id, v) for v in cp._db_portSpecs)
+            cp.db_portSpecs_name_index = dict(((v.db_name,v.db_type), v) for v in cp._db_portSpecs)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -12811,9 +14337,10 @@ class DBModuleDescriptor(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_portSpecs)
+        if self._db_deleted_portSpecs is not None:
+            children.extend(self._db_deleted_portSpecs)
         if remove:
-            self.db_deleted_portSpecs = []
+            self._db_deleted_portSpecs = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -12919,6 +14446,27 @@ class DBModuleDescriptor(object):
         self._db_portSpecs = portSpecs
         self.is_dirty = True
     db_portSpecs = property(__get_db_portSpecs, __set_db_portSpecs)
+    def __get_db_deleted_portSpecs(self):
+        if self._db_deleted_portSpecs is None:
+            self._db_deleted_portSpecs = []
+        return self._db_deleted_portSpecs
+    def __set_db_deleted_portSpecs(self, deleted):
+        self._db_deleted_portSpecs = deleted
+    db_deleted_portSpecs = property(__get_db_deleted_portSpecs, __set_db_deleted_portSpecs)
+    def __get_db_portSpecs_id_index(self):
+        if self._db_portSpecs_id_index is None:
+            self._db_portSpecs_id_index = {}
+        return self._db_portSpecs_id_index
+    def __set_db_portSpecs_id_index(self, index):
+        self._db_portSpecs_id_index = index
+    db_portSpecs_id_index = property(__get_db_portSpecs_id_index, __set_db_portSpecs_id_index)
+    def __get_db_portSpecs_name_index(self):
+        if self._db_portSpecs_name_index is None:
+            self._db_portSpecs_name_index = {}
+        return self._db_portSpecs_name_index
+    def __set_db_portSpecs_name_index(self, index):
+        self._db_portSpecs_name_index = index
+    db_portSpecs_name_index = property(__get_db_portSpecs_name_index, __set_db_portSpecs_name_index)
     def db_get_portSpecs(self):
         return self._db_portSpecs
     def db_add_portSpec(self, portSpec):
@@ -12967,6 +14515,10 @@ class DBModuleDescriptor(object):
 
 class DBTag(object):
 
+    __slots__ = ('_db_id', '_db_name', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'tag'
 
     def __init__(self, id=None, name=None):
@@ -13060,6 +14612,9 @@ class DBTag(object):
 
 class DBOpmRole(object):
 
+    __slots__ = ('_db_value', 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_role'
 
     def __init__(self, value=None):
@@ -13130,52 +14685,65 @@ class DBOpmRole(object):
 
 class DBProvDocument(object):
 
+    __slots__ = ('_db_prov_entitys', '_db_deleted_prov_entitys',
+                 '_db_prov_entitys_id_index', '_db_prov_activitys',
+                 '_db_deleted_prov_activitys',
+                 '_db_prov_activitys_id_index', '_db_prov_agents',
+                 '_db_deleted_prov_agents', '_db_prov_agents_id_index',
+                 '_db_vt_connections', '_db_deleted_vt_connections',
+                 '_db_vt_connections_id_index', '_db_prov_usages',
+                 '_db_deleted_prov_usages', '_db_prov_generations',
+                 '_db_deleted_prov_generations', '_db_prov_associations',
+                 '_db_deleted_prov_associations', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'prov_document'
 
     def __init__(self, prov_entitys=None, prov_activitys=None, prov_agents=None, vt_connections=None, prov_usages=None, prov_generations=None, prov_associations=None):
-        self.db_deleted_prov_entitys = []
-        self.db_prov_entitys_id_index = {}
+        self._db_deleted_prov_entitys = None
+        self._db_prov_entitys_id_index = None
         if prov_entitys is None:
             self._db_prov_entitys = []
         else:
             self._db_prov_entitys = prov_entitys
             for v in self._db_prov_entitys:
                 self.db_prov_entitys_id_index[v.db_id] = v
-        self.db_deleted_prov_activitys = []
-        self.db_prov_activitys_id_index = {}
+        self._db_deleted_prov_activitys = None
+        self._db_prov_activitys_id_index = None
         if prov_activitys is None:
             self._db_prov_activitys = []
         else:
             self._db_prov_activitys = prov_activitys
             for v in self._db_prov_activitys:
                 self.db_prov_activitys_id_index[v.db_id] = v
-        self.db_deleted_prov_agents = []
-        self.db_prov_agents_id_index = {}
+        self._db_deleted_prov_agents = None
+        self._db_prov_agents_id_index = None
         if prov_agents is None:
             self._db_prov_agents = []
         else:
             self._db_prov_agents = prov_agents
             for v in self._db_prov_agents:
                 self.db_prov_agents_id_index[v.db_id] = v
-        self.db_deleted_vt_connections = []
-        self.db_vt_connections_id_index = {}
+        self._db_deleted_vt_connections = None
+        self._db_vt_connections_id_index = None
         if vt_connections is None:
             self._db_vt_connections = []
         else:
             self._db_vt_connections = vt_connections
             for v in self._db_vt_connections:
                 self.db_vt_connections_id_index[v.db_id] = v
-        self.db_deleted_prov_usages = []
+        self._db_deleted_prov_usages = None
         if prov_usages is None:
             self._db_prov_usages = []
         else:
             self._db_prov_usages = prov_usages
-        self.db_deleted_prov_generations = []
+        self._db_deleted_prov_generations = None
         if prov_generations is None:
             self._db_prov_generations = []
         else:
             self._db_prov_generations = prov_generations
-        self.db_deleted_prov_associations = []
+        self._db_deleted_prov_associations = None
         if prov_associations is None:
             self._db_prov_associations = []
         else:
@@ -13227,10 +14795,14 @@ class DBProvDocument(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_prov_entitys_id_index = dict((v.db_id, v) for v in cp._db_prov_entitys)
-        cp.db_prov_activitys_id_index = dict((v.db_id, v) for v in cp._db_prov_activitys)
-        cp.db_prov_agents_id_index = dict((v.db_id, v) for v in cp._db_prov_agents)
-        cp.db_vt_connections_id_index = dict((v.db_id, v) for v in cp._db_vt_connections)
+        if cp._db_prov_entitys:
+            cp.db_prov_entitys_id_index = dict((v.db_id, v) for v in cp._db_prov_entitys)
+        if cp._db_prov_activitys:
+            cp.db_prov_activitys_id_index = dict((v.db_id, v) for v in cp._db_prov_activitys)
+        if cp._db_prov_agents:
+            cp.db_prov_agents_id_index = dict((v.db_id, v) for v in cp._db_prov_agents)
+        if cp._db_vt_connections:
+            cp.db_vt_connections_id_index = dict((v.db_id, v) for v in cp._db_vt_connections)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -13379,21 +14951,28 @@ class DBProvDocument(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_prov_entitys)
-        children.extend(self.db_deleted_prov_activitys)
-        children.extend(self.db_deleted_prov_agents)
-        children.extend(self.db_deleted_vt_connections)
-        children.extend(self.db_deleted_prov_usages)
-        children.extend(self.db_deleted_prov_generations)
-        children.extend(self.db_deleted_prov_associations)
+        if self._db_deleted_prov_entitys is not None:
+            children.extend(self._db_deleted_prov_entitys)
+        if self._db_deleted_prov_activitys is not None:
+            children.extend(self._db_deleted_prov_activitys)
+        if self._db_deleted_prov_agents is not None:
+            children.extend(self._db_deleted_prov_agents)
+        if self._db_deleted_vt_connections is not None:
+            children.extend(self._db_deleted_vt_connections)
+        if self._db_deleted_prov_usages is not None:
+            children.extend(self._db_deleted_prov_usages)
+        if self._db_deleted_prov_generations is not None:
+            children.extend(self._db_deleted_prov_generations)
+        if self._db_deleted_prov_associations is not None:
+            children.extend(self._db_deleted_prov_associations)
         if remove:
-            self.db_deleted_prov_entitys = []
-            self.db_deleted_prov_activitys = []
-            self.db_deleted_prov_agents = []
-            self.db_deleted_vt_connections = []
-            self.db_deleted_prov_usages = []
-            self.db_deleted_prov_generations = []
-            self.db_deleted_prov_associations = []
+            self._db_deleted_prov_entitys = None
+            self._db_deleted_prov_activitys = None
+            self._db_deleted_prov_agents = None
+            self._db_deleted_vt_connections = None
+            self._db_deleted_prov_usages = None
+            self._db_deleted_prov_generations = None
+            self._db_deleted_prov_associations = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -13426,6 +15005,20 @@ class DBProvDocument(object):
         self._db_prov_entitys = prov_entitys
         self.is_dirty = True
     db_prov_entitys = property(__get_db_prov_entitys, __set_db_prov_entitys)
+    def __get_db_deleted_prov_entitys(self):
+        if self._db_deleted_prov_entitys is None:
+            self._db_deleted_prov_entitys = []
+        return self._db_deleted_prov_entitys
+    def __set_db_deleted_prov_entitys(self, deleted):
+        self._db_deleted_prov_entitys = deleted
+    db_deleted_prov_entitys = property(__get_db_deleted_prov_entitys, __set_db_deleted_prov_entitys)
+    def __get_db_prov_entitys_id_index(self):
+        if self._db_prov_entitys_id_index is None:
+            self._db_prov_entitys_id_index = {}
+        return self._db_prov_entitys_id_index
+    def __set_db_prov_entitys_id_index(self, index):
+        self._db_prov_entitys_id_index = index
+    db_prov_entitys_id_index = property(__get_db_prov_entitys_id_index, __set_db_prov_entitys_id_index)
     def db_get_prov_entitys(self):
         return self._db_prov_entitys
     def db_add_prov_entity(self, prov_entity):
@@ -13468,6 +15061,20 @@ class DBProvDocument(object):
         self._db_prov_activitys = prov_activitys
         self.is_dirty = True
     db_prov_activitys = property(__get_db_prov_activitys, __set_db_prov_activitys)
+    def __get_db_deleted_prov_activitys(self):
+        if self._db_deleted_prov_activitys is None:
+            self._db_deleted_prov_activitys = []
+        return self._db_deleted_prov_activitys
+    def __set_db_deleted_prov_activitys(self, deleted):
+        self._db_deleted_prov_activitys = deleted
+    db_deleted_prov_activitys = property(__get_db_deleted_prov_activitys, __set_db_deleted_prov_activitys)
+    def __get_db_prov_activitys_id_index(self):
+        if self._db_prov_activitys_id_index is None:
+            self._db_prov_activitys_id_index = {}
+        return self._db_prov_activitys_id_index
+    def __set_db_prov_activitys_id_index(self, index):
+        self._db_prov_activitys_id_index = index
+    db_prov_activitys_id_index = property(__get_db_prov_activitys_id_index, __set_db_prov_activitys_id_index)
     def db_get_prov_activitys(self):
         return self._db_prov_activitys
     def db_add_prov_activity(self, prov_activity):
@@ -13510,6 +15117,20 @@ class DBProvDocument(object):
         self._db_prov_agents = prov_agents
         self.is_dirty = True
     db_prov_agents = property(__get_db_prov_agents, __set_db_prov_agents)
+    def __get_db_deleted_prov_agents(self):
+        if self._db_deleted_prov_agents is None:
+            self._db_deleted_prov_agents = []
+        return self._db_deleted_prov_agents
+    def __set_db_deleted_prov_agents(self, deleted):
+        self._db_deleted_prov_agents = deleted
+    db_deleted_prov_agents = property(__get_db_deleted_prov_agents, __set_db_deleted_prov_agents)
+    def __get_db_prov_agents_id_index(self):
+        if self._db_prov_agents_id_index is None:
+            self._db_prov_agents_id_index = {}
+        return self._db_prov_agents_id_index
+    def __set_db_prov_agents_id_index(self, index):
+        self._db_prov_agents_id_index = index
+    db_prov_agents_id_index = property(__get_db_prov_agents_id_index, __set_db_prov_agents_id_index)
     def db_get_prov_agents(self):
         return self._db_prov_agents
     def db_add_prov_agent(self, prov_agent):
@@ -13552,6 +15173,20 @@ class DBProvDocument(object):
         self._db_vt_connections = vt_connections
         self.is_dirty = True
     db_vt_connections = property(__get_db_vt_connections, __set_db_vt_connections)
+    def __get_db_deleted_vt_connections(self):
+        if self._db_deleted_vt_connections is None:
+            self._db_deleted_vt_connections = []
+        return self._db_deleted_vt_connections
+    def __set_db_deleted_vt_connections(self, deleted):
+        self._db_deleted_vt_connections = deleted
+    db_deleted_vt_connections = property(__get_db_deleted_vt_connections, __set_db_deleted_vt_connections)
+    def __get_db_vt_connections_id_index(self):
+        if self._db_vt_connections_id_index is None:
+            self._db_vt_connections_id_index = {}
+        return self._db_vt_connections_id_index
+    def __set_db_vt_connections_id_index(self, index):
+        self._db_vt_connections_id_index = index
+    db_vt_connections_id_index = property(__get_db_vt_connections_id_index, __set_db_vt_connections_id_index)
     def db_get_vt_connections(self):
         return self._db_vt_connections
     def db_add_vt_connection(self, vt_connection):
@@ -13594,6 +15229,13 @@ class DBProvDocument(object):
         self._db_prov_usages = prov_usages
         self.is_dirty = True
     db_prov_usages = property(__get_db_prov_usages, __set_db_prov_usages)
+    def __get_db_deleted_prov_usages(self):
+        if self._db_deleted_prov_usages is None:
+            self._db_deleted_prov_usages = []
+        return self._db_deleted_prov_usages
+    def __set_db_deleted_prov_usages(self, deleted):
+        self._db_deleted_prov_usages = deleted
+    db_deleted_prov_usages = property(__get_db_deleted_prov_usages, __set_db_deleted_prov_usages)
     def db_get_prov_usages(self):
         return self._db_prov_usages
     def db_add_prov_usage(self, prov_usage):
@@ -13614,6 +15256,13 @@ class DBProvDocument(object):
         self._db_prov_generations = prov_generations
         self.is_dirty = True
     db_prov_generations = property(__get_db_prov_generations, __set_db_prov_generations)
+    def __get_db_deleted_prov_generations(self):
+        if self._db_deleted_prov_generations is None:
+            self._db_deleted_prov_generations = []
+        return self._db_deleted_prov_generations
+    def __set_db_deleted_prov_generations(self, deleted):
+        self._db_deleted_prov_generations = deleted
+    db_deleted_prov_generations = property(__get_db_deleted_prov_generations, __set_db_deleted_prov_generations)
     def db_get_prov_generations(self):
         return self._db_prov_generations
     def db_add_prov_generation(self, prov_generation):
@@ -13634,6 +15283,13 @@ class DBProvDocument(object):
         self._db_prov_associations = prov_associations
         self.is_dirty = True
     db_prov_associations = property(__get_db_prov_associations, __set_db_prov_associations)
+    def __get_db_deleted_prov_associations(self):
+        if self._db_deleted_prov_associations is None:
+            self._db_deleted_prov_associations = []
+        return self._db_deleted_prov_associations
+    def __set_db_deleted_prov_associations(self, deleted):
+        self._db_deleted_prov_associations = deleted
+    db_deleted_prov_associations = property(__get_db_deleted_prov_associations, __set_db_deleted_prov_associations)
     def db_get_prov_associations(self):
         return self._db_prov_associations
     def db_add_prov_association(self, prov_association):
@@ -13652,11 +15308,16 @@ class DBProvDocument(object):
 
 class DBOpmProcesses(object):
 
+    __slots__ = ('_db_processs', '_db_deleted_processs',
+                 '_db_processs_id_index', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_processes'
 
     def __init__(self, processs=None):
-        self.db_deleted_processs = []
-        self.db_processs_id_index = {}
+        self._db_deleted_processs = None
+        self._db_processs_id_index = None
         if processs is None:
             self._db_processs = []
         else:
@@ -13686,7 +15347,8 @@ class DBOpmProcesses(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_processs_id_index = dict((v.db_id, v) for v in cp._db_processs)
+        if cp._db_processs:
+            cp.db_processs_id_index = dict((v.db_id, v) for v in cp._db_processs)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -13727,9 +15389,10 @@ class DBOpmProcesses(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_processs)
+        if self._db_deleted_processs is not None:
+            children.extend(self._db_deleted_processs)
         if remove:
-            self.db_deleted_processs = []
+            self._db_deleted_processs = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -13744,6 +15407,20 @@ class DBOpmProcesses(object):
         self._db_processs = processs
         self.is_dirty = True
     db_processs = property(__get_db_processs, __set_db_processs)
+    def __get_db_deleted_processs(self):
+        if self._db_deleted_processs is None:
+            self._db_deleted_processs = []
+        return self._db_deleted_processs
+    def __set_db_deleted_processs(self, deleted):
+        self._db_deleted_processs = deleted
+    db_deleted_processs = property(__get_db_deleted_processs, __set_db_deleted_processs)
+    def __get_db_processs_id_index(self):
+        if self._db_processs_id_index is None:
+            self._db_processs_id_index = {}
+        return self._db_processs_id_index
+    def __set_db_processs_id_index(self, index):
+        self._db_processs_id_index = index
+    db_processs_id_index = property(__get_db_processs_id_index, __set_db_processs_id_index)
     def db_get_processs(self):
         return self._db_processs
     def db_add_process(self, process):
@@ -13784,6 +15461,9 @@ class DBOpmProcesses(object):
 
 class DBOpmAccountId(object):
 
+    __slots__ = ('_db_id', 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_account_id'
 
     def __init__(self, id=None):
@@ -13856,6 +15536,12 @@ class DBOpmAccountId(object):
 
 class DBPortSpecItem(object):
 
+    __slots__ = ('_db_id', '_db_pos', '_db_module', '_db_package',
+                 '_db_namespace', '_db_label', '_db_default', '_db_values',
+                 '_db_entry_type', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'portSpecItem'
 
     def __init__(self, id=None, pos=None, module=None, package=None, namespace=None, label=None, default=None, values=None, entry_type=None):
@@ -14087,6 +15773,14 @@ class DBPortSpecItem(object):
 
 class DBMashupComponent(object):
 
+    __slots__ = ('_db_id', '_db_vtid', '_db_vttype', '_db_vtparent_type',
+                 '_db_vtparent_id', '_db_vtpos', '_db_vtmid', '_db_pos',
+                 '_db_type', '_db_val', '_db_minVal', '_db_maxVal',
+                 '_db_stepSize', '_db_strvaluelist', '_db_widget',
+                 '_db_seq', '_db_parent', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'mashup_component'
 
     def __init__(self, id=None, vtid=None, vttype=None, vtparent_type=None, vtparent_id=None, vtpos=None, vtmid=None, pos=None, type=None, val=None, minVal=None, maxVal=None, stepSize=None, strvaluelist=None, widget=None, seq=None, parent=None):
@@ -14478,14 +16172,20 @@ class DBMashupComponent(object):
 
 class DBMashup(object):
 
+    __slots__ = ('_db_id', '_db_name', '_db_version', '_db_aliases',
+                 '_db_deleted_aliases', '_db_aliases_id_index', '_db_type',
+                 '_db_vtid', '_db_layout', '_db_geometry', '_db_has_seq',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'mashup'
 
     def __init__(self, id=None, name=None, version=None, aliases=None, type=None, vtid=None, layout=None, geometry=None, has_seq=None):
         self._db_id = id
         self._db_name = name
         self._db_version = version
-        self.db_deleted_aliases = []
-        self.db_aliases_id_index = {}
+        self._db_deleted_aliases = None
+        self._db_aliases_id_index = None
         if aliases is None:
             self._db_aliases = []
         else:
@@ -14529,7 +16229,8 @@ class DBMashup(object):
                 cp._db_vtid = id_remap[('vistrail', self._db_vtid)]
         
         # recreate indices and set flags
-        cp.db_aliases_id_index = dict((v.db_id, v) for v in cp._db_aliases)
+        if cp._db_aliases:
+            cp.db_aliases_id_index = dict((v.db_id, v) for v in cp._db_aliases)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -14610,9 +16311,10 @@ class DBMashup(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_aliases)
+        if self._db_deleted_aliases is not None:
+            children.extend(self._db_deleted_aliases)
         if remove:
-            self.db_deleted_aliases = []
+            self._db_deleted_aliases = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -14666,6 +16368,20 @@ class DBMashup(object):
         self._db_aliases = aliases
         self.is_dirty = True
     db_aliases = property(__get_db_aliases, __set_db_aliases)
+    def __get_db_deleted_aliases(self):
+        if self._db_deleted_aliases is None:
+            self._db_deleted_aliases = []
+        return self._db_deleted_aliases
+    def __set_db_deleted_aliases(self, deleted):
+        self._db_deleted_aliases = deleted
+    db_deleted_aliases = property(__get_db_deleted_aliases, __set_db_deleted_aliases)
+    def __get_db_aliases_id_index(self):
+        if self._db_aliases_id_index is None:
+            self._db_aliases_id_index = {}
+        return self._db_aliases_id_index
+    def __set_db_aliases_id_index(self, index):
+        self._db_aliases_id_index = index
+    db_aliases_id_index = property(__get_db_aliases_id_index, __set_db_aliases_id_index)
     def db_get_aliases(self):
         return self._db_aliases
     def db_add_alias(self, alias):
@@ -14772,6 +16488,11 @@ class DBMashup(object):
 
 class DBMachine(object):
 
+    __slots__ = ('_db_id', '_db_name', '_db_os', '_db_architecture',
+                 '_db_processor', '_db_ram', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'machine'
 
     def __init__(self, id=None, name=None, os=None, architecture=None, processor=None, ram=None):
@@ -14945,6 +16666,9 @@ class DBMachine(object):
 
 class DBConfigFloat(object):
 
+    __slots__ = ('_db_value', 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'config_float'
 
     def __init__(self, value=None):
@@ -15015,6 +16739,10 @@ class DBConfigFloat(object):
 
 class DBOther(object):
 
+    __slots__ = ('_db_id', '_db_key', '_db_value', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'other'
 
     def __init__(self, id=None, key=None, value=None):
@@ -15126,6 +16854,10 @@ class DBOther(object):
 
 class DBRefProvActivity(object):
 
+    __slots__ = ('_db_prov_ref', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'ref_prov_activity'
 
     def __init__(self, prov_ref=None):
@@ -15208,19 +16940,19 @@ class DBAbstraction(object):
         self._db_package = package
         self._db_version = version
         self._db_internal_version = internal_version
-        self.db_deleted_location = []
+        self._db_deleted_location = None
         self._db_location = location
-        self.db_deleted_functions = []
-        self.db_functions_id_index = {}
+        self._db_deleted_functions = None
+        self._db_functions_id_index = None
         if functions is None:
             self._db_functions = []
         else:
             self._db_functions = functions
             for v in self._db_functions:
                 self.db_functions_id_index[v.db_id] = v
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
-        self.db_annotations_key_index = {}
+        self._db_deleted_annotations = None
+        self._db_annotations_id_index = None
+        self._db_annotations_key_index = None
         if annotations is None:
             self._db_annotations = []
         else:
@@ -15228,9 +16960,9 @@ class DBAbstraction(object):
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
                 self.db_annotations_key_index[v.db_key] = v
-        self.db_deleted_controlParameters = []
-        self.db_controlParameters_id_index = {}
-        self.db_controlParameters_name_index = {}
+        self._db_deleted_controlParameters = None
+        self._db_controlParameters_id_index = None
+        self._db_controlParameters_name_index = None
         if controlParameters is None:
             self._db_controlParameters = []
         else:
@@ -15277,11 +17009,14 @@ class DBAbstraction(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_functions_id_index = dict((v.db_id, v) for v in cp._db_functions)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
-        cp.db_controlParameters_id_index = dict((v.db_id, v) for v in cp._db_controlParameters)
-        cp.db_controlParameters_name_index = dict((v.db_name, v) for v in cp._db_controlParameters)
+        if cp._db_functions:
+            cp.db_functions_id_index = dict((v.db_id, v) for v in cp._db_functions)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+            cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
+        if cp._db_controlParameters:
+            cp.db_controlParameters_id_index = dict((v.db_id, v) for v in cp._db_controlParameters)
+            cp.db_controlParameters_name_index = dict((v.db_name, v) for v in cp._db_controlParameters)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -15407,15 +17142,19 @@ class DBAbstraction(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_location)
-        children.extend(self.db_deleted_functions)
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_controlParameters)
+        if self._db_deleted_location is not None:
+            children.extend(self._db_deleted_location)
+        if self._db_deleted_functions is not None:
+            children.extend(self._db_deleted_functions)
+        if self._db_deleted_annotations is not None:
+            children.extend(self._db_deleted_annotations)
+        if self._db_deleted_controlParameters is not None:
+            children.extend(self._db_deleted_controlParameters)
         if remove:
-            self.db_deleted_location = []
-            self.db_deleted_functions = []
-            self.db_deleted_annotations = []
-            self.db_deleted_controlParameters = []
+            self._db_deleted_location = None
+            self._db_deleted_functions = None
+            self._db_deleted_annotations = None
+            self._db_deleted_controlParameters = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -15529,6 +17268,13 @@ class DBAbstraction(object):
         self._db_location = location
         self.is_dirty = True
     db_location = property(__get_db_location, __set_db_location)
+    def __get_db_deleted_location(self):
+        if self._db_deleted_location is None:
+            self._db_deleted_location = []
+        return self._db_deleted_location
+    def __set_db_deleted_location(self, deleted):
+        self._db_deleted_location = deleted
+    db_deleted_location = property(__get_db_deleted_location, __set_db_deleted_location)
     def db_add_location(self, location):
         self._db_location = location
     def db_change_location(self, location):
@@ -15544,6 +17290,20 @@ class DBAbstraction(object):
         self._db_functions = functions
         self.is_dirty = True
     db_functions = property(__get_db_functions, __set_db_functions)
+    def __get_db_deleted_functions(self):
+        if self._db_deleted_functions is None:
+            self._db_deleted_functions = []
+        return self._db_deleted_functions
+    def __set_db_deleted_functions(self, deleted):
+        self._db_deleted_functions = deleted
+    db_deleted_functions = property(__get_db_deleted_functions, __set_db_deleted_functions)
+    def __get_db_functions_id_index(self):
+        if self._db_functions_id_index is None:
+            self._db_functions_id_index = {}
+        return self._db_functions_id_index
+    def __set_db_functions_id_index(self, index):
+        self._db_functions_id_index = index
+    db_functions_id_index = property(__get_db_functions_id_index, __set_db_functions_id_index)
     def db_get_functions(self):
         return self._db_functions
     def db_add_function(self, function):
@@ -15586,6 +17346,27 @@ class DBAbstraction(object):
         self._db_annotations = annotations
         self.is_dirty = True
     db_annotations = property(__get_db_annotations, __set_db_annotations)
+    def __get_db_deleted_annotations(self):
+        if self._db_deleted_annotations is None:
+            self._db_deleted_annotations = []
+        return self._db_deleted_annotations
+    def __set_db_deleted_annotations(self, deleted):
+        self._db_deleted_annotations = deleted
+    db_deleted_annotations = property(__get_db_deleted_annotations, __set_db_deleted_annotations)
+    def __get_db_annotations_id_index(self):
+        if self._db_annotations_id_index is None:
+            self._db_annotations_id_index = {}
+        return self._db_annotations_id_index
+    def __set_db_annotations_id_index(self, index):
+        self._db_annotations_id_index = index
+    db_annotations_id_index = property(__get_db_annotations_id_index, __set_db_annotations_id_index)
+    def __get_db_annotations_key_index(self):
+        if self._db_annotations_key_index is None:
+            self._db_annotations_key_index = {}
+        return self._db_annotations_key_index
+    def __set_db_annotations_key_index(self, index):
+        self._db_annotations_key_index = index
+    db_annotations_key_index = property(__get_db_annotations_key_index, __set_db_annotations_key_index)
     def db_get_annotations(self):
         return self._db_annotations
     def db_add_annotation(self, annotation):
@@ -15635,6 +17416,27 @@ class DBAbstraction(object):
         self._db_controlParameters = controlParameters
         self.is_dirty = True
     db_controlParameters = property(__get_db_controlParameters, __set_db_controlParameters)
+    def __get_db_deleted_controlParameters(self):
+        if self._db_deleted_controlParameters is None:
+            self._db_deleted_controlParameters = []
+        return self._db_deleted_controlParameters
+    def __set_db_deleted_controlParameters(self, deleted):
+        self._db_deleted_controlParameters = deleted
+    db_deleted_controlParameters = property(__get_db_deleted_controlParameters, __set_db_deleted_controlParameters)
+    def __get_db_controlParameters_id_index(self):
+        if self._db_controlParameters_id_index is None:
+            self._db_controlParameters_id_index = {}
+        return self._db_controlParameters_id_index
+    def __set_db_controlParameters_id_index(self, index):
+        self._db_controlParameters_id_index = index
+    db_controlParameters_id_index = property(__get_db_controlParameters_id_index, __set_db_controlParameters_id_index)
+    def __get_db_controlParameters_name_index(self):
+        if self._db_controlParameters_name_index is None:
+            self._db_controlParameters_name_index = {}
+        return self._db_controlParameters_name_index
+    def __set_db_controlParameters_name_index(self, index):
+        self._db_controlParameters_name_index = index
+    db_controlParameters_name_index = property(__get_db_controlParameters_name_index, __set_db_controlParameters_name_index)
     def db_get_controlParameters(self):
         return self._db_controlParameters
     def db_add_controlParameter(self, controlParameter):
@@ -15683,6 +17485,12 @@ class DBAbstraction(object):
 
 class DBProvAgent(object):
 
+    __slots__ = ('_db_id', '_db_vt_id', '_db_prov_type', '_db_prov_label',
+                 '_db_vt_machine_os', '_db_vt_machine_architecture',
+                 '_db_vt_machine_processor', '_db_vt_machine_ram',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'prov_agent'
 
     def __init__(self, id=None, vt_id=None, prov_type=None, prov_label=None, vt_machine_os=None, vt_machine_architecture=None, vt_machine_processor=None, vt_machine_ram=None):
@@ -15894,6 +17702,18 @@ class DBProvAgent(object):
 
 class DBMashuptrail(object):
 
+    __slots__ = ('_db_id', '_db_name', '_db_version', '_db_vtVersion',
+                 '_db_last_modified', '_db_actions', '_db_deleted_actions',
+                 '_db_actions_id_index', '_db_annotations',
+                 '_db_deleted_annotations', '_db_annotations_id_index',
+                 '_db_annotations_key_index', '_db_actionAnnotations',
+                 '_db_deleted_actionAnnotations',
+                 '_db_actionAnnotations_id_index',
+                 '_db_actionAnnotations_action_id_index',
+                 '_db_actionAnnotations_key_index', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'mashuptrail'
 
     def __init__(self, id=None, name=None, version=None, vtVersion=None, last_modified=None, actions=None, annotations=None, actionAnnotations=None):
@@ -15902,17 +17722,17 @@ class DBMashuptrail(object):
         self._db_version = version
         self._db_vtVersion = vtVersion
         self._db_last_modified = last_modified
-        self.db_deleted_actions = []
-        self.db_actions_id_index = {}
+        self._db_deleted_actions = None
+        self._db_actions_id_index = None
         if actions is None:
             self._db_actions = []
         else:
             self._db_actions = actions
             for v in self._db_actions:
                 self.db_actions_id_index[v.db_id] = v
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
-        self.db_annotations_key_index = {}
+        self._db_deleted_annotations = None
+        self._db_annotations_id_index = None
+        self._db_annotations_key_index = None
         if annotations is None:
             self._db_annotations = []
         else:
@@ -15920,10 +17740,10 @@ class DBMashuptrail(object):
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
                 self.db_annotations_key_index[v.db_key] = v
-        self.db_deleted_actionAnnotations = []
-        self.db_actionAnnotations_id_index = {}
-        self.db_actionAnnotations_action_id_index = {}
-        self.db_actionAnnotations_key_index = {}
+        self._db_deleted_actionAnnotations = None
+        self._db_actionAnnotations_id_index = None
+        self._db_actionAnnotations_action_id_index = None
+        self._db_actionAnnotations_key_index = None
         if actionAnnotations is None:
             self._db_actionAnnotations = []
         else:
@@ -15967,12 +17787,15 @@ class DBMashuptrail(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_actions_id_index = dict((v.db_id, v) for v in cp._db_actions)
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
-        cp.db_actionAnnotations_id_index = dict((v.db_id, v) for v in cp._db_actionAnnotations)
-        cp.db_actionAnnotations_action_id_index = dict(((v.db_action_id,v.db_key), v) for v in cp._db_actionAnnotations)
-        cp.db_actionAnnotations_key_index = dict(((v.db_key,v.db_value), v) for v in cp._db_actionAnnotations)
+        if cp._db_actions:
+            cp.db_actions_id_index = dict((v.db_id, v) for v in cp._db_actions)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+            cp.db_annotations_key_index = dict((v.db_key, v) for v in cp._db_annotations)
+        if cp._db_actionAnnotations:
+            cp.db_actionAnnotations_id_index = dict((v.db_id, v) for v in cp._db_actionAnnotations)
+            cp.db_actionAnnotations_action_id_index = dict(((v.db_action_id,v.db_key), v) for v in cp._db_actionAnnotations)
+            cp.db_actionAnnotations_key_index = dict(((v.db_key,v.db_value), v) for v in cp._db_actionAnnotations)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -16074,13 +17897,16 @@ class DBMashuptrail(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_actions)
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_actionAnnotations)
+        if self._db_deleted_actions is not None:
+            children.extend(self._db_deleted_actions)
+        if self._db_deleted_annotations is not None:
+            children.extend(self._db_deleted_annotations)
+        if self._db_deleted_actionAnnotations is not None:
+            children.extend(self._db_deleted_actionAnnotations)
         if remove:
-            self.db_deleted_actions = []
-            self.db_deleted_annotations = []
-            self.db_deleted_actionAnnotations = []
+            self._db_deleted_actions = None
+            self._db_deleted_annotations = None
+            self._db_deleted_actionAnnotations = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -16166,6 +17992,20 @@ class DBMashuptrail(object):
         self._db_actions = actions
         self.is_dirty = True
     db_actions = property(__get_db_actions, __set_db_actions)
+    def __get_db_deleted_actions(self):
+        if self._db_deleted_actions is None:
+            self._db_deleted_actions = []
+        return self._db_deleted_actions
+    def __set_db_deleted_actions(self, deleted):
+        self._db_deleted_actions = deleted
+    db_deleted_actions = property(__get_db_deleted_actions, __set_db_deleted_actions)
+    def __get_db_actions_id_index(self):
+        if self._db_actions_id_index is None:
+            self._db_actions_id_index = {}
+        return self._db_actions_id_index
+    def __set_db_actions_id_index(self, index):
+        self._db_actions_id_index = index
+    db_actions_id_index = property(__get_db_actions_id_index, __set_db_actions_id_index)
     def db_get_actions(self):
         return self._db_actions
     def db_add_action(self, action):
@@ -16208,6 +18048,27 @@ class DBMashuptrail(object):
         self._db_annotations = annotations
         self.is_dirty = True
     db_annotations = property(__get_db_annotations, __set_db_annotations)
+    def __get_db_deleted_annotations(self):
+        if self._db_deleted_annotations is None:
+            self._db_deleted_annotations = []
+        return self._db_deleted_annotations
+    def __set_db_deleted_annotations(self, deleted):
+        self._db_deleted_annotations = deleted
+    db_deleted_annotations = property(__get_db_deleted_annotations, __set_db_deleted_annotations)
+    def __get_db_annotations_id_index(self):
+        if self._db_annotations_id_index is None:
+            self._db_annotations_id_index = {}
+        return self._db_annotations_id_index
+    def __set_db_annotations_id_index(self, index):
+        self._db_annotations_id_index = index
+    db_annotations_id_index = property(__get_db_annotations_id_index, __set_db_annotations_id_index)
+    def __get_db_annotations_key_index(self):
+        if self._db_annotations_key_index is None:
+            self._db_annotations_key_index = {}
+        return self._db_annotations_key_index
+    def __set_db_annotations_key_index(self, index):
+        self._db_annotations_key_index = index
+    db_annotations_key_index = property(__get_db_annotations_key_index, __set_db_annotations_key_index)
     def db_get_annotations(self):
         return self._db_annotations
     def db_add_annotation(self, annotation):
@@ -16257,6 +18118,34 @@ class DBMashuptrail(object):
         self._db_actionAnnotations = actionAnnotations
         self.is_dirty = True
     db_actionAnnotations = property(__get_db_actionAnnotations, __set_db_actionAnnotations)
+    def __get_db_deleted_actionAnnotations(self):
+        if self._db_deleted_actionAnnotations is None:
+            self._db_deleted_actionAnnotations = []
+        return self._db_deleted_actionAnnotations
+    def __set_db_deleted_actionAnnotations(self, deleted):
+        self._db_deleted_actionAnnotations = deleted
+    db_deleted_actionAnnotations = property(__get_db_deleted_actionAnnotations, __set_db_deleted_actionAnnotations)
+    def __get_db_actionAnnotations_id_index(self):
+        if self._db_actionAnnotations_id_index is None:
+            self._db_actionAnnotations_id_index = {}
+        return self._db_actionAnnotations_id_index
+    def __set_db_actionAnnotations_id_index(self, index):
+        self._db_actionAnnotations_id_index = index
+    db_actionAnnotations_id_index = property(__get_db_actionAnnotations_id_index, __set_db_actionAnnotations_id_index)
+    def __get_db_actionAnnotations_action_id_index(self):
+        if self._db_actionAnnotations_action_id_index is None:
+            self._db_actionAnnotations_action_id_index = {}
+        return self._db_actionAnnotations_action_id_index
+    def __set_db_actionAnnotations_action_id_index(self, index):
+        self._db_actionAnnotations_action_id_index = index
+    db_actionAnnotations_action_id_index = property(__get_db_actionAnnotations_action_id_index, __set_db_actionAnnotations_action_id_index)
+    def __get_db_actionAnnotations_key_index(self):
+        if self._db_actionAnnotations_key_index is None:
+            self._db_actionAnnotations_key_index = {}
+        return self._db_actionAnnotations_key_index
+    def __set_db_actionAnnotations_key_index(self, index):
+        self._db_actionAnnotations_key_index = index
+    db_actionAnnotations_key_index = property(__get_db_actionAnnotations_key_index, __set_db_actionAnnotations_key_index)
     def db_get_actionAnnotations(self):
         return self._db_actionAnnotations
     def db_add_actionAnnotation(self, actionAnnotation):
@@ -16315,6 +18204,13 @@ class DBMashuptrail(object):
 
 class DBRegistry(object):
 
+    __slots__ = ('_db_id', '_db_entity_type', '_db_version',
+                 '_db_root_descriptor_id', '_db_name', '_db_last_modified',
+                 '_db_packages', '_db_deleted_packages',
+                 '_db_packages_id_index', '_db_packages_identifier_index',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'registry'
 
     def __init__(self, id=None, entity_type=None, version=None, root_descriptor_id=None, name=None, last_modified=None, packages=None):
@@ -16324,9 +18220,9 @@ class DBRegistry(object):
         self._db_root_descriptor_id = root_descriptor_id
         self._db_name = name
         self._db_last_modified = last_modified
-        self.db_deleted_packages = []
-        self.db_packages_id_index = {}
-        self.db_packages_identifier_index = {}
+        self._db_deleted_packages = None
+        self._db_packages_id_index = None
+        self._db_packages_identifier_index = None
         if packages is None:
             self._db_packages = []
         else:
@@ -16364,8 +18260,9 @@ class DBRegistry(object):
                 cp._db_root_descriptor_id = id_remap[('module_descriptor', self._db_root_descriptor_id)]
         
         # recreate indices and set flags
-        cp.db_packages_id_index = dict((v.db_id, v) for v in cp._db_packages)
-        cp.db_packages_identifier_index = dict(((v.db_identifier,v.db_version), v) for v in cp._db_packages)
+        if cp._db_packages:
+            cp.db_packages_id_index = dict((v.db_id, v) for v in cp._db_packages)
+            cp.db_packages_identifier_index = dict(((v.db_identifier,v.db_version), v) for v in cp._db_packages)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -16436,9 +18333,10 @@ class DBRegistry(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_packages)
+        if self._db_deleted_packages is not None:
+            children.extend(self._db_deleted_packages)
         if remove:
-            self.db_deleted_packages = []
+            self._db_deleted_packages = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -16531,6 +18429,27 @@ class DBRegistry(object):
         self._db_packages = packages
         self.is_dirty = True
     db_packages = property(__get_db_packages, __set_db_packages)
+    def __get_db_deleted_packages(self):
+        if self._db_deleted_packages is None:
+            self._db_deleted_packages = []
+        return self._db_deleted_packages
+    def __set_db_deleted_packages(self, deleted):
+        self._db_deleted_packages = deleted
+    db_deleted_packages = property(__get_db_deleted_packages, __set_db_deleted_packages)
+    def __get_db_packages_id_index(self):
+        if self._db_packages_id_index is None:
+            self._db_packages_id_index = {}
+        return self._db_packages_id_index
+    def __set_db_packages_id_index(self, index):
+        self._db_packages_id_index = index
+    db_packages_id_index = property(__get_db_packages_id_index, __set_db_packages_id_index)
+    def __get_db_packages_identifier_index(self):
+        if self._db_packages_identifier_index is None:
+            self._db_packages_identifier_index = {}
+        return self._db_packages_identifier_index
+    def __set_db_packages_identifier_index(self, index):
+        self._db_packages_identifier_index = index
+    db_packages_identifier_index = property(__get_db_packages_identifier_index, __set_db_packages_identifier_index)
     def db_get_packages(self):
         return self._db_packages
     def db_add_package(self, package):
@@ -16579,12 +18498,16 @@ class DBRegistry(object):
 
 class DBOpmAgent(object):
 
+    __slots__ = ('_db_id', '_db_value', '_db_accounts', '_db_deleted_accounts',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_agent'
 
     def __init__(self, id=None, value=None, accounts=None):
         self._db_id = id
         self._db_value = value
-        self.db_deleted_accounts = []
+        self._db_deleted_accounts = None
         if accounts is None:
             self._db_accounts = []
         else:
@@ -16663,9 +18586,10 @@ class DBOpmAgent(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_accounts)
+        if self._db_deleted_accounts is not None:
+            children.extend(self._db_deleted_accounts)
         if remove:
-            self.db_deleted_accounts = []
+            self._db_deleted_accounts = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -16706,6 +18630,13 @@ class DBOpmAgent(object):
         self._db_accounts = accounts
         self.is_dirty = True
     db_accounts = property(__get_db_accounts, __set_db_accounts)
+    def __get_db_deleted_accounts(self):
+        if self._db_deleted_accounts is None:
+            self._db_deleted_accounts = []
+        return self._db_deleted_accounts
+    def __set_db_deleted_accounts(self, deleted):
+        self._db_deleted_accounts = deleted
+    db_deleted_accounts = property(__get_db_deleted_accounts, __set_db_deleted_accounts)
     def db_get_accounts(self):
         return self._db_accounts
     def db_add_account(self, account):
@@ -16725,6 +18656,14 @@ class DBOpmAgent(object):
 
 class DBProvEntity(object):
 
+    __slots__ = ('_db_id', '_db_prov_type', '_db_prov_label', '_db_prov_value',
+                 '_db_vt_id', '_db_vt_type', '_db_vt_desc',
+                 '_db_vt_package', '_db_vt_version', '_db_vt_cache',
+                 '_db_vt_location_x', '_db_vt_location_y',
+                 '_db_is_part_of', '_db_deleted_is_part_of', 'is_dirty',
+                 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'prov_entity'
 
     def __init__(self, id=None, prov_type=None, prov_label=None, prov_value=None, vt_id=None, vt_type=None, vt_desc=None, vt_package=None, vt_version=None, vt_cache=None, vt_location_x=None, vt_location_y=None, is_part_of=None):
@@ -16740,7 +18679,7 @@ class DBProvEntity(object):
         self._db_vt_cache = vt_cache
         self._db_vt_location_x = vt_location_x
         self._db_vt_location_y = vt_location_y
-        self.db_deleted_is_part_of = []
+        self._db_deleted_is_part_of = None
         self._db_is_part_of = is_part_of
         self.is_dirty = True
         self.is_new = True
@@ -16870,9 +18809,10 @@ class DBProvEntity(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_is_part_of)
+        if self._db_deleted_is_part_of is not None:
+            children.extend(self._db_deleted_is_part_of)
         if remove:
-            self.db_deleted_is_part_of = []
+            self._db_deleted_is_part_of = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -17042,6 +18982,13 @@ class DBProvEntity(object):
         self._db_is_part_of = is_part_of
         self.is_dirty = True
     db_is_part_of = property(__get_db_is_part_of, __set_db_is_part_of)
+    def __get_db_deleted_is_part_of(self):
+        if self._db_deleted_is_part_of is None:
+            self._db_deleted_is_part_of = []
+        return self._db_deleted_is_part_of
+    def __set_db_deleted_is_part_of(self, deleted):
+        self._db_deleted_is_part_of = deleted
+    db_deleted_is_part_of = property(__get_db_deleted_is_part_of, __set_db_deleted_is_part_of)
     def db_add_is_part_of(self, is_part_of):
         self._db_is_part_of = is_part_of
     def db_change_is_part_of(self, is_part_of):
@@ -17056,6 +19003,10 @@ class DBProvEntity(object):
 
 class DBAnnotation(object):
 
+    __slots__ = ('_db_id', '_db_key', '_db_value', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'annotation'
 
     def __init__(self, id=None, key=None, value=None):
@@ -17167,6 +19118,10 @@ class DBAnnotation(object):
 
 class DBOpmTime(object):
 
+    __slots__ = ('_db_no_later_than', '_db_no_earlier_than', '_db_clock_id',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_time'
 
     def __init__(self, no_later_than=None, no_earlier_than=None, clock_id=None):
@@ -17277,6 +19232,12 @@ class DBOpmTime(object):
 
 class DBParameterExploration(object):
 
+    __slots__ = ('_db_id', '_db_action_id', '_db_name', '_db_date', '_db_user',
+                 '_db_dims', '_db_layout', '_db_functions',
+                 '_db_deleted_functions', '_db_functions_id_index',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'parameter_exploration'
 
     def __init__(self, id=None, action_id=None, name=None, date=None, user=None, dims=None, layout=None, functions=None):
@@ -17287,8 +19248,8 @@ class DBParameterExploration(object):
         self._db_user = user
         self._db_dims = dims
         self._db_layout = layout
-        self.db_deleted_functions = []
-        self.db_functions_id_index = {}
+        self._db_deleted_functions = None
+        self._db_functions_id_index = None
         if functions is None:
             self._db_functions = []
         else:
@@ -17326,7 +19287,8 @@ class DBParameterExploration(object):
                 cp._db_action_id = id_remap[('action', self._db_action_id)]
         
         # recreate indices and set flags
-        cp.db_functions_id_index = dict((v.db_id, v) for v in cp._db_functions)
+        if cp._db_functions:
+            cp.db_functions_id_index = dict((v.db_id, v) for v in cp._db_functions)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -17402,9 +19364,10 @@ class DBParameterExploration(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_functions)
+        if self._db_deleted_functions is not None:
+            children.extend(self._db_deleted_functions)
         if remove:
-            self.db_deleted_functions = []
+            self._db_deleted_functions = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -17510,6 +19473,20 @@ class DBParameterExploration(object):
         self._db_functions = functions
         self.is_dirty = True
     db_functions = property(__get_db_functions, __set_db_functions)
+    def __get_db_deleted_functions(self):
+        if self._db_deleted_functions is None:
+            self._db_deleted_functions = []
+        return self._db_deleted_functions
+    def __set_db_deleted_functions(self, deleted):
+        self._db_deleted_functions = deleted
+    db_deleted_functions = property(__get_db_deleted_functions, __set_db_deleted_functions)
+    def __get_db_functions_id_index(self):
+        if self._db_functions_id_index is None:
+            self._db_functions_id_index = {}
+        return self._db_functions_id_index
+    def __set_db_functions_id_index(self, index):
+        self._db_functions_id_index = index
+    db_functions_id_index = property(__get_db_functions_id_index, __set_db_functions_id_index)
     def db_get_functions(self):
         return self._db_functions
     def db_add_function(self, function):
@@ -17551,6 +19528,11 @@ class DBParameterExploration(object):
 
 class DBMashupActionAnnotation(object):
 
+    __slots__ = ('_db_id', '_db_key', '_db_value', '_db_action_id', '_db_date',
+                 '_db_user', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'mashup_actionAnnotation'
 
     def __init__(self, id=None, key=None, value=None, action_id=None, date=None, user=None):
@@ -17724,13 +19706,18 @@ class DBMashupActionAnnotation(object):
 
 class DBOpmProcess(object):
 
+    __slots__ = ('_db_id', '_db_value', '_db_deleted_value', '_db_accounts',
+                 '_db_deleted_accounts', 'is_dirty', 'is_new', '__dict__',
+                 '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_process'
 
     def __init__(self, id=None, value=None, accounts=None):
         self._db_id = id
-        self.db_deleted_value = []
+        self._db_deleted_value = None
         self._db_value = value
-        self.db_deleted_accounts = []
+        self._db_deleted_accounts = None
         if accounts is None:
             self._db_accounts = []
         else:
@@ -17819,11 +19806,13 @@ class DBOpmProcess(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_value)
-        children.extend(self.db_deleted_accounts)
+        if self._db_deleted_value is not None:
+            children.extend(self._db_deleted_value)
+        if self._db_deleted_accounts is not None:
+            children.extend(self._db_deleted_accounts)
         if remove:
-            self.db_deleted_value = []
-            self.db_deleted_accounts = []
+            self._db_deleted_value = None
+            self._db_deleted_accounts = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -17853,6 +19842,13 @@ class DBOpmProcess(object):
         self._db_value = value
         self.is_dirty = True
     db_value = property(__get_db_value, __set_db_value)
+    def __get_db_deleted_value(self):
+        if self._db_deleted_value is None:
+            self._db_deleted_value = []
+        return self._db_deleted_value
+    def __set_db_deleted_value(self, deleted):
+        self._db_deleted_value = deleted
+    db_deleted_value = property(__get_db_deleted_value, __set_db_deleted_value)
     def db_add_value(self, value):
         self._db_value = value
     def db_change_value(self, value):
@@ -17868,6 +19864,13 @@ class DBOpmProcess(object):
         self._db_accounts = accounts
         self.is_dirty = True
     db_accounts = property(__get_db_accounts, __set_db_accounts)
+    def __get_db_deleted_accounts(self):
+        if self._db_deleted_accounts is None:
+            self._db_deleted_accounts = []
+        return self._db_deleted_accounts
+    def __set_db_deleted_accounts(self, deleted):
+        self._db_deleted_accounts = deleted
+    db_deleted_accounts = property(__get_db_deleted_accounts, __set_db_deleted_accounts)
     def db_get_accounts(self):
         return self._db_accounts
     def db_add_account(self, account):
@@ -17887,11 +19890,16 @@ class DBOpmProcess(object):
 
 class DBDisabledPackages(object):
 
+    __slots__ = ('_db_packages', '_db_deleted_packages',
+                 '_db_packages_name_index', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'disabled_packages'
 
     def __init__(self, packages=None):
-        self.db_deleted_packages = []
-        self.db_packages_name_index = {}
+        self._db_deleted_packages = None
+        self._db_packages_name_index = None
         if packages is None:
             self._db_packages = []
         else:
@@ -17921,7 +19929,8 @@ class DBDisabledPackages(object):
             cp.db_id = new_id
         
         # recreate indices and set flags
-        cp.db_packages_name_index = dict((v.db_name, v) for v in cp._db_packages)
+        if cp._db_packages:
+            cp.db_packages_name_index = dict((v.db_name, v) for v in cp._db_packages)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -17962,9 +19971,10 @@ class DBDisabledPackages(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_packages)
+        if self._db_deleted_packages is not None:
+            children.extend(self._db_deleted_packages)
         if remove:
-            self.db_deleted_packages = []
+            self._db_deleted_packages = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -17979,6 +19989,20 @@ class DBDisabledPackages(object):
         self._db_packages = packages
         self.is_dirty = True
     db_packages = property(__get_db_packages, __set_db_packages)
+    def __get_db_deleted_packages(self):
+        if self._db_deleted_packages is None:
+            self._db_deleted_packages = []
+        return self._db_deleted_packages
+    def __set_db_deleted_packages(self, deleted):
+        self._db_deleted_packages = deleted
+    db_deleted_packages = property(__get_db_deleted_packages, __set_db_deleted_packages)
+    def __get_db_packages_name_index(self):
+        if self._db_packages_name_index is None:
+            self._db_packages_name_index = {}
+        return self._db_packages_name_index
+    def __set_db_packages_name_index(self, index):
+        self._db_packages_name_index = index
+    db_packages_name_index = property(__get_db_packages_name_index, __set_db_packages_name_index)
     def db_get_packages(self):
         return self._db_packages
     def db_add_package(self, package):
@@ -18003,6 +20027,15 @@ class DBDisabledPackages(object):
 
 class DBModuleExec(object):
 
+    __slots__ = ('_db_id', '_db_ts_start', '_db_ts_end', '_db_cached',
+                 '_db_module_id', '_db_module_name', '_db_completed',
+                 '_db_error', '_db_machine_id', '_db_annotations',
+                 '_db_deleted_annotations', '_db_annotations_id_index',
+                 '_db_loop_execs', '_db_deleted_loop_execs',
+                 '_db_loop_execs_id_index', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'module_exec'
 
     def __init__(self, id=None, ts_start=None, ts_end=None, cached=None, module_id=None, module_name=None, completed=None, error=None, machine_id=None, annotations=None, loop_execs=None):
@@ -18015,16 +20048,16 @@ class DBModuleExec(object):
         self._db_completed = completed
         self._db_error = error
         self._db_machine_id = machine_id
-        self.db_deleted_annotations = []
-        self.db_annotations_id_index = {}
+        self._db_deleted_annotations = None
+        self._db_annotations_id_index = None
         if annotations is None:
             self._db_annotations = []
         else:
             self._db_annotations = annotations
             for v in self._db_annotations:
                 self.db_annotations_id_index[v.db_id] = v
-        self.db_deleted_loop_execs = []
-        self.db_loop_execs_id_index = {}
+        self._db_deleted_loop_execs = None
+        self._db_loop_execs_id_index = None
         if loop_execs is None:
             self._db_loop_execs = []
         else:
@@ -18070,8 +20103,10 @@ class DBModuleExec(object):
                 cp._db_machine_id = id_remap[('machine', self._db_machine_id)]
         
         # recreate indices and set flags
-        cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
-        cp.db_loop_execs_id_index = dict((v.db_id, v) for v in cp._db_loop_execs)
+        if cp._db_annotations:
+            cp.db_annotations_id_index = dict((v.db_id, v) for v in cp._db_annotations)
+        if cp._db_loop_execs:
+            cp.db_loop_execs_id_index = dict((v.db_id, v) for v in cp._db_loop_execs)
         if not new_ids:
             cp.is_dirty = self.is_dirty
             cp.is_new = self.is_new
@@ -18175,11 +20210,13 @@ class DBModuleExec(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_annotations)
-        children.extend(self.db_deleted_loop_execs)
+        if self._db_deleted_annotations is not None:
+            children.extend(self._db_deleted_annotations)
+        if self._db_deleted_loop_execs is not None:
+            children.extend(self._db_deleted_loop_execs)
         if remove:
-            self.db_deleted_annotations = []
-            self.db_deleted_loop_execs = []
+            self._db_deleted_annotations = None
+            self._db_deleted_loop_execs = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -18314,6 +20351,20 @@ class DBModuleExec(object):
         self._db_annotations = annotations
         self.is_dirty = True
     db_annotations = property(__get_db_annotations, __set_db_annotations)
+    def __get_db_deleted_annotations(self):
+        if self._db_deleted_annotations is None:
+            self._db_deleted_annotations = []
+        return self._db_deleted_annotations
+    def __set_db_deleted_annotations(self, deleted):
+        self._db_deleted_annotations = deleted
+    db_deleted_annotations = property(__get_db_deleted_annotations, __set_db_deleted_annotations)
+    def __get_db_annotations_id_index(self):
+        if self._db_annotations_id_index is None:
+            self._db_annotations_id_index = {}
+        return self._db_annotations_id_index
+    def __set_db_annotations_id_index(self, index):
+        self._db_annotations_id_index = index
+    db_annotations_id_index = property(__get_db_annotations_id_index, __set_db_annotations_id_index)
     def db_get_annotations(self):
         return self._db_annotations
     def db_add_annotation(self, annotation):
@@ -18356,6 +20407,20 @@ class DBModuleExec(object):
         self._db_loop_execs = loop_execs
         self.is_dirty = True
     db_loop_execs = property(__get_db_loop_execs, __set_db_loop_execs)
+    def __get_db_deleted_loop_execs(self):
+        if self._db_deleted_loop_execs is None:
+            self._db_deleted_loop_execs = []
+        return self._db_deleted_loop_execs
+    def __set_db_deleted_loop_execs(self, deleted):
+        self._db_deleted_loop_execs = deleted
+    db_deleted_loop_execs = property(__get_db_deleted_loop_execs, __set_db_deleted_loop_execs)
+    def __get_db_loop_execs_id_index(self):
+        if self._db_loop_execs_id_index is None:
+            self._db_loop_execs_id_index = {}
+        return self._db_loop_execs_id_index
+    def __set_db_loop_execs_id_index(self, index):
+        self._db_loop_execs_id_index = index
+    db_loop_execs_id_index = property(__get_db_loop_execs_id_index, __set_db_loop_execs_id_index)
     def db_get_loop_execs(self):
         return self._db_loop_execs
     def db_add_loop_exec(self, loop_exec):
@@ -18397,14 +20462,20 @@ class DBModuleExec(object):
 
 class DBProvAssociation(object):
 
+    __slots__ = ('_db_prov_activity', '_db_deleted_prov_activity',
+                 '_db_prov_agent', '_db_deleted_prov_agent',
+                 '_db_prov_plan', '_db_deleted_prov_plan', '_db_prov_role',
+                 'is_dirty', 'is_new', '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'prov_association'
 
     def __init__(self, prov_activity=None, prov_agent=None, prov_plan=None, prov_role=None):
-        self.db_deleted_prov_activity = []
+        self._db_deleted_prov_activity = None
         self._db_prov_activity = prov_activity
-        self.db_deleted_prov_agent = []
+        self._db_deleted_prov_agent = None
         self._db_prov_agent = prov_agent
-        self.db_deleted_prov_plan = []
+        self._db_deleted_prov_plan = None
         self._db_prov_plan = prov_plan
         self._db_prov_role = prov_role
         self.is_dirty = True
@@ -18501,13 +20572,16 @@ class DBProvAssociation(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_prov_activity)
-        children.extend(self.db_deleted_prov_agent)
-        children.extend(self.db_deleted_prov_plan)
+        if self._db_deleted_prov_activity is not None:
+            children.extend(self._db_deleted_prov_activity)
+        if self._db_deleted_prov_agent is not None:
+            children.extend(self._db_deleted_prov_agent)
+        if self._db_deleted_prov_plan is not None:
+            children.extend(self._db_deleted_prov_plan)
         if remove:
-            self.db_deleted_prov_activity = []
-            self.db_deleted_prov_agent = []
-            self.db_deleted_prov_plan = []
+            self._db_deleted_prov_activity = None
+            self._db_deleted_prov_agent = None
+            self._db_deleted_prov_plan = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -18525,6 +20599,13 @@ class DBProvAssociation(object):
         self._db_prov_activity = prov_activity
         self.is_dirty = True
     db_prov_activity = property(__get_db_prov_activity, __set_db_prov_activity)
+    def __get_db_deleted_prov_activity(self):
+        if self._db_deleted_prov_activity is None:
+            self._db_deleted_prov_activity = []
+        return self._db_deleted_prov_activity
+    def __set_db_deleted_prov_activity(self, deleted):
+        self._db_deleted_prov_activity = deleted
+    db_deleted_prov_activity = property(__get_db_deleted_prov_activity, __set_db_deleted_prov_activity)
     def db_add_prov_activity(self, prov_activity):
         self._db_prov_activity = prov_activity
     def db_change_prov_activity(self, prov_activity):
@@ -18540,6 +20621,13 @@ class DBProvAssociation(object):
         self._db_prov_agent = prov_agent
         self.is_dirty = True
     db_prov_agent = property(__get_db_prov_agent, __set_db_prov_agent)
+    def __get_db_deleted_prov_agent(self):
+        if self._db_deleted_prov_agent is None:
+            self._db_deleted_prov_agent = []
+        return self._db_deleted_prov_agent
+    def __set_db_deleted_prov_agent(self, deleted):
+        self._db_deleted_prov_agent = deleted
+    db_deleted_prov_agent = property(__get_db_deleted_prov_agent, __set_db_deleted_prov_agent)
     def db_add_prov_agent(self, prov_agent):
         self._db_prov_agent = prov_agent
     def db_change_prov_agent(self, prov_agent):
@@ -18555,6 +20643,13 @@ class DBProvAssociation(object):
         self._db_prov_plan = prov_plan
         self.is_dirty = True
     db_prov_plan = property(__get_db_prov_plan, __set_db_prov_plan)
+    def __get_db_deleted_prov_plan(self):
+        if self._db_deleted_prov_plan is None:
+            self._db_deleted_prov_plan = []
+        return self._db_deleted_prov_plan
+    def __set_db_deleted_prov_plan(self, deleted):
+        self._db_deleted_prov_plan = deleted
+    db_deleted_prov_plan = property(__get_db_deleted_prov_plan, __set_db_deleted_prov_plan)
     def db_add_prov_plan(self, prov_plan):
         self._db_prov_plan = prov_plan
     def db_change_prov_plan(self, prov_plan):
@@ -18581,10 +20676,14 @@ class DBProvAssociation(object):
 
 class DBOpmProcessValue(object):
 
+    __slots__ = ('_db_value', '_db_deleted_value', 'is_dirty', 'is_new',
+                 '__dict__', '__weakref__')
+    __getstate__ = _getstate
+
     vtType = 'opm_process_value'
 
     def __init__(self, value=None):
-        self.db_deleted_value = []
+        self._db_deleted_value = None
         self._db_value = value
         self.is_dirty = True
         self.is_new = True
@@ -18655,9 +20754,10 @@ class DBOpmProcessValue(object):
         return children
     def db_deleted_children(self, remove=False):
         children = []
-        children.extend(self.db_deleted_value)
+        if self._db_deleted_value is not None:
+            children.extend(self._db_deleted_value)
         if remove:
-            self.db_deleted_value = []
+            self._db_deleted_value = None
         return children
     def has_changes(self):
         if self.is_dirty:
@@ -18671,6 +20771,13 @@ class DBOpmProcessValue(object):
         self._db_value = value
         self.is_dirty = True
     db_value = property(__get_db_value, __set_db_value)
+    def __get_db_deleted_value(self):
+        if self._db_deleted_value is None:
+            self._db_deleted_value = []
+        return self._db_deleted_value
+    def __set_db_deleted_value(self, deleted):
+        self._db_deleted_value = deleted
+    db_deleted_value = property(__get_db_deleted_value, __set_db_deleted_value)
     def db_add_value(self, value):
         self._db_value = value
     def db_change_value(self, value):
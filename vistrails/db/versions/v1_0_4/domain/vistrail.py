@@ -218,3 +218,64 @@ class DBVistrail(_DBVistrail):
             for v in action_annotations[k]:
                 m.update(str(v))
         return m.hexdigest()
+
+
+import unittest
+
+
+class TestLazyFields(unittest.TestCase):
+    """Indices and lists of deleted children are created on first use;
+    they still have to be carried over by copies and translations.
+    """
+    def make_function(self):
+        from auto_gen import DBFunction, DBParameter
+        params = [DBParameter(id=i, pos=i, val=str(i)) for i in xrange(3)]
+        for param in params:
+            param.is_new = False
+        function = DBFunction(id=1, name='value', parameters=params)
+        function.db_delete_parameter(params[2])
+        return function
+
+    def check_function(self, function):
+        self.assertEqual(sorted(function.db_parameters_id_index), [0, 1])
+        self.assertEqual(function.db_get_parameter_by_id(1).db_val, '1')
+        self.assertEqual([p.db_id for p in function.db_deleted_parameters],
+                         [2])
+
+    def test_copy(self):
+        from auto_gen import DBFunction, DBParameter
+        function = self.make_function()
+        cp = function.do_copy()
+        self.assertEqual(sorted(cp.db_parameters_id_index), [0, 1])
+        self.assertEqual(cp.db_get_parameter_by_id(1).db_val, '1')
+        # deleted children are not copied
+        self.assertEqual(cp.db_deleted_parameters, [])
+
+        id_scope = IdScope()
+        cp = function.do_copy(True, id_scope, {})
+        self.assertEqual(sorted(cp.db_parameters_id_index),
+                         sorted(p.db_id for p in cp.db_parameters))
+
+        cp = DBFunction(id=2).do_copy()
+        self.assertEqual(cp.db_parameters_id_index, {})
+        cp.db_add_parameter(DBParameter(id=4))
+        self.assertTrue(cp.db_has_parameter_with_id(4))
+
+    def test_update_version(self):
+        from auto_gen import DBFunction
+        self.check_function(DBFunction.update_version(self.make_function(),
+                                                      {}))
+
+    def test_pickle(self):
+        import cPickle
+        from auto_gen import DBFunction
+        for protocol in xrange(cPickle.HIGHEST_PROTOCOL + 1):
+            function = cPickle.loads(cPickle.dumps(self.make_function(),
+                                                   protocol))
+            self.check_function(function)
+            self.assertTrue(function.is_dirty)
+
+            function = cPickle.loads(cPickle.dumps(DBFunction(id=2),
+                                                   protocol))
+            self.assertEqual(function.db_parameters_id_index, {})
+            self.assertEqual(function.db_deleted_parameters, [])
@@ -39,6 +39,7 @@ from vistrails.core import debug
 from vistrails.core.system import strftime, time_strptime
 from vistrails.db import VistrailsDBException
 from vistrails.db.services.io import get_db_lib
+from vistrails.db.services.sqlite import is_sqlite_connection
 
 class SQLDAO:
     def __init__(self):
@@ -55,12 +56,13 @@ class SQLDAO:
             elif type == 'int':
                 return int(value)
             elif type == 'date':
-                if db_type == 'date':
+                if db_type == 'date' and isinstance(value, date):
                     return value
                 else:
                     return date(*time_strptime(str(value), '%Y-%m-%d')[0:3])
             elif type == 'datetime':
-                if db_type == 'datetime':
+                # sqlite3 returns strings for datetime columns
+                if db_type == 'datetime' and isinstance(value, datetime):
                     return value
                 else:
                     return datetime(*time_strptime(str(value),
@@ -219,6 +221,8 @@ class SQLDAO:
         """ Executes a command consisting of multiple SELECT statements
             It returns a list of results from the SELECT statements
         """
+        if is_sqlite_connection(db):
+            return db.execute_group(dbCommandList, isFetch)
         data = []
         # break up into bundles
         BUNDLE_SIZE = 10000
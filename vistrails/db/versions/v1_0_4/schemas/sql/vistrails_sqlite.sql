@@ -0,0 +1,590 @@
+--#############################################################################
+--
+-- Copyright (C) 2011-2014, NYU-Poly.
+-- Copyright (C) 2006-2011, University of Utah. 
+-- All rights reserved.
+-- Contact: contact@vistrails.org
+--
+-- This file is part of VisTrails.
+--
+-- "Redistribution and use in source and binary forms, with or without 
+-- modification, are permitted provided that the following conditions are met:
+--
+--  - Redistributions of source code must retain the above copyright notice, 
+--    this list of conditions and the following disclaimer.
+--  - Redistributions in binary form must reproduce the above copyright 
+--    notice, this list of conditions and the following disclaimer in the 
+--    documentation and/or other materials provided with the distribution.
+--  - Neither the name of the University of Utah nor the names of its 
+--    contributors may be used to endorse or promote products derived from 
+--    this software without specific prior written permission.
+--
+-- THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+-- AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+-- THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+-- PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+-- CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+-- EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+-- PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+-- OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+-- WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+-- OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+-- ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+--
+--#############################################################################
+
+-- SQLite version of vistrails.sql: no storage engine, integer primary keys
+-- for auto-incremented ids and an index on the entity of each object
+
+CREATE TABLE `vistrails_version`(`version` char(16));
+INSERT INTO `vistrails_version`(`version`) VALUES ('1.0.4');
+
+CREATE TABLE thumbnail(
+    id integer primary key autoincrement,
+    file_name varchar(255),
+    image_bytes mediumblob,
+    last_modified datetime
+);
+CREATE INDEX thumbnail_file_name_idx ON thumbnail(file_name);
+
+-- generated automatically by generate.py
+
+CREATE TABLE mashup_alias(
+    id int,
+    name varchar(255),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX mashup_alias_entity_idx ON mashup_alias(entity_id, entity_type);
+
+CREATE TABLE group_tbl(
+    id int,
+    cache int,
+    name varchar(255),
+    namespace varchar(255),
+    package varchar(511),
+    version varchar(255),
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX group_tbl_entity_idx ON group_tbl(entity_id, entity_type);
+
+CREATE TABLE add_tbl(
+    id int,
+    what varchar(255),
+    object_id int,
+    par_obj_id int,
+    par_obj_type char(16),
+    action_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX add_tbl_entity_idx ON add_tbl(entity_id, entity_type);
+
+CREATE TABLE group_exec(
+    id int,
+    ts_start datetime,
+    ts_end datetime,
+    cached int,
+    module_id int,
+    group_name varchar(255),
+    group_type varchar(255),
+    completed int,
+    error varchar(1023),
+    machine_id int,
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX group_exec_entity_idx ON group_exec(entity_id, entity_type);
+
+CREATE TABLE parameter(
+    id int,
+    pos int,
+    name varchar(255),
+    type varchar(255),
+    val mediumtext,
+    alias varchar(255),
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX parameter_entity_idx ON parameter(entity_id, entity_type);
+
+CREATE TABLE vistrail(
+    id integer primary key autoincrement,
+    entity_type char(16),
+    version char(16),
+    name varchar(255),
+    last_modified datetime
+);
+
+CREATE TABLE module(
+    id int,
+    cache int,
+    name varchar(255),
+    namespace varchar(255),
+    package varchar(511),
+    version varchar(255),
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX module_entity_idx ON module(entity_id, entity_type);
+
+CREATE TABLE port(
+    id int,
+    type varchar(255),
+    moduleId int,
+    moduleName varchar(255),
+    name varchar(255),
+    signature varchar(4095),
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX port_entity_idx ON port(entity_id, entity_type);
+
+CREATE TABLE pe_function(
+    id int,
+    module_id int,
+    port_name varchar(255),
+    is_alias int,
+    parent_type char(32),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX pe_function_entity_idx ON pe_function(entity_id, entity_type);
+
+CREATE TABLE workflow(
+    id integer primary key autoincrement,
+    entity_id int,
+    entity_type char(16),
+    name varchar(255),
+    version char(16),
+    last_modified datetime,
+    vistrail_id int,
+    parent_id int
+);
+CREATE INDEX workflow_entity_idx ON workflow(entity_id, entity_type);
+
+CREATE TABLE mashup_action(
+    id int,
+    prev_id int,
+    date datetime,
+    user varchar(255),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX mashup_action_entity_idx ON mashup_action(entity_id, entity_type);
+
+CREATE TABLE change_tbl(
+    id int,
+    what varchar(255),
+    old_obj_id int,
+    new_obj_id int,
+    par_obj_id int,
+    par_obj_type char(16),
+    action_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX change_tbl_entity_idx ON change_tbl(entity_id, entity_type);
+
+CREATE TABLE package(
+    id integer primary key autoincrement,
+    name varchar(255),
+    identifier varchar(1023),
+    codepath varchar(1023),
+    load_configuration int,
+    version varchar(255),
+    description varchar(1023),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX package_entity_idx ON package(entity_id, entity_type);
+
+CREATE TABLE loop_exec(
+    id int,
+    ts_start datetime,
+    ts_end datetime,
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX loop_exec_entity_idx ON loop_exec(entity_id, entity_type);
+
+CREATE TABLE connection_tbl(
+    id int,
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX connection_tbl_entity_idx ON connection_tbl(entity_id, entity_type);
+
+CREATE TABLE action(
+    id int,
+    prev_id int,
+    date datetime,
+    session int,
+    user varchar(255),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX action_entity_idx ON action(entity_id, entity_type);
+
+CREATE TABLE port_spec(
+    id int,
+    name varchar(255),
+    type varchar(255),
+    optional int,
+    depth int,
+    sort_key int,
+    min_conns int,
+    max_conns int,
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX port_spec_entity_idx ON port_spec(entity_id, entity_type);
+
+CREATE TABLE log_tbl(
+    id integer primary key autoincrement,
+    entity_type char(16),
+    version char(16),
+    name varchar(255),
+    last_modified datetime,
+    vistrail_id int
+);
+
+CREATE TABLE loop_iteration(
+    id int,
+    ts_start datetime,
+    ts_end datetime,
+    iteration int,
+    completed int,
+    error varchar(1023),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX loop_iteration_entity_idx ON loop_iteration(entity_id, entity_type);
+
+CREATE TABLE pe_parameter(
+    id int,
+    pos int,
+    interpolator varchar(255),
+    value mediumtext,
+    dimension int,
+    parent_type char(32),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX pe_parameter_entity_idx ON pe_parameter(entity_id, entity_type);
+
+CREATE TABLE workflow_exec(
+    id int,
+    user varchar(255),
+    ip varchar(255),
+    session int,
+    vt_version varchar(255),
+    ts_start datetime,
+    ts_end datetime,
+    parent_id int,
+    parent_type varchar(255),
+    parent_version int,
+    completed int,
+    name varchar(255),
+    log_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX workflow_exec_entity_idx ON workflow_exec(entity_id, entity_type);
+
+CREATE TABLE location(
+    id int,
+    x DECIMAL(18,12),
+    y DECIMAL(18,12),
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX location_entity_idx ON location(entity_id, entity_type);
+
+CREATE TABLE function(
+    id int,
+    pos int,
+    name varchar(255),
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX function_entity_idx ON function(entity_id, entity_type);
+
+CREATE TABLE action_annotation(
+    id int,
+    akey varchar(255),
+    value varchar(8191),
+    action_id int,
+    date datetime,
+    user varchar(255),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX action_annotation_entity_idx ON action_annotation(entity_id, entity_type);
+
+CREATE TABLE control_parameter(
+    id int,
+    name varchar(255),
+    value mediumtext,
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX control_parameter_entity_idx ON control_parameter(entity_id, entity_type);
+
+CREATE TABLE plugin_data(
+    id int,
+    data varchar(8191),
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX plugin_data_entity_idx ON plugin_data(entity_id, entity_type);
+
+CREATE TABLE delete_tbl(
+    id int,
+    what varchar(255),
+    object_id int,
+    par_obj_id int,
+    par_obj_type char(16),
+    action_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX delete_tbl_entity_idx ON delete_tbl(entity_id, entity_type);
+
+CREATE TABLE vistrail_variable(
+    name varchar(255),
+    uuid char(36),
+    package varchar(255),
+    module varchar(255),
+    namespace varchar(255),
+    value varchar(8191),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX vistrail_variable_entity_idx ON vistrail_variable(entity_id, entity_type);
+
+CREATE TABLE module_descriptor(
+    id int,
+    name varchar(255),
+    package varchar(255),
+    namespace varchar(255),
+    package_version varchar(255),
+    version varchar(255),
+    base_descriptor_id int,
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX module_descriptor_entity_idx ON module_descriptor(entity_id, entity_type);
+
+CREATE TABLE tag(
+    id int,
+    name varchar(255),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX tag_entity_idx ON tag(entity_id, entity_type);
+
+CREATE TABLE port_spec_item(
+    id int,
+    pos int,
+    module varchar(255),
+    package varchar(255),
+    namespace varchar(255),
+    label varchar(4095),
+    _default varchar(4095),
+    _values mediumtext,
+    entry_type varchar(255),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX port_spec_item_entity_idx ON port_spec_item(entity_id, entity_type);
+
+CREATE TABLE mashup_component(
+    id int,
+    vtid int,
+    vttype varchar(255),
+    vtparent_type char(32),
+    vtparent_id int,
+    vtpos int,
+    vtmid int,
+    pos int,
+    type varchar(255),
+    val mediumtext,
+    minVal varchar(255),
+    maxVal varchar(255),
+    stepSize varchar(255),
+    strvaluelist mediumtext,
+    widget varchar(255),
+    seq int,
+    parent varchar(255),
+    alias_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX mashup_component_entity_idx ON mashup_component(entity_id, entity_type);
+
+CREATE TABLE mashup(
+    id int,
+    name varchar(255),
+    version int,
+    type varchar(255),
+    vtid int,
+    layout mediumtext,
+    geometry mediumtext,
+    has_seq int,
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX mashup_entity_idx ON mashup(entity_id, entity_type);
+
+CREATE TABLE machine(
+    id int,
+    name varchar(255),
+    os varchar(255),
+    architecture varchar(255),
+    processor varchar(255),
+    ram bigint,
+    vt_id int,
+    log_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX machine_entity_idx ON machine(entity_id, entity_type);
+
+CREATE TABLE other(
+    id int,
+    okey varchar(255),
+    value varchar(255),
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX other_entity_idx ON other(entity_id, entity_type);
+
+CREATE TABLE abstraction(
+    id int,
+    cache int,
+    name varchar(255),
+    namespace varchar(255),
+    package varchar(511),
+    version varchar(255),
+    internal_version varchar(255),
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX abstraction_entity_idx ON abstraction(entity_id, entity_type);
+
+CREATE TABLE mashuptrail(
+    id integer primary key autoincrement,
+    name char(36),
+    version char(16),
+    vt_version int,
+    last_modified datetime,
+    entity_type char(16)
+);
+
+CREATE TABLE registry(
+    id integer primary key autoincrement,
+    entity_type char(16),
+    version char(16),
+    root_descriptor_id int,
+    name varchar(255),
+    last_modified datetime
+);
+
+CREATE TABLE annotation(
+    id int,
+    akey varchar(255),
+    value mediumtext,
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX annotation_entity_idx ON annotation(entity_id, entity_type);
+
+CREATE TABLE parameter_exploration(
+    id int,
+    action_id int,
+    name varchar(255),
+    date datetime,
+    user varchar(255),
+    dims varchar(255),
+    layout varchar(255),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX parameter_exploration_entity_idx ON parameter_exploration(entity_id, entity_type);
+
+CREATE TABLE mashup_action_annotation(
+    id int,
+    akey varchar(255),
+    value varchar(8191),
+    action_id int,
+    date datetime,
+    user varchar(255),
+    parent_id int,
+    entity_id int,
+    entity_type char(16)
+);
+CREATE INDEX mashup_action_annotation_entity_idx ON mashup_action_annotation(entity_id, entity_type);
+
+CREATE TABLE module_exec(
+    id int,
+    ts_start datetime,
+    ts_end datetime,
+    cached int,
+    module_id int,
+    module_name varchar(255),
+    completed int,
+    error varchar(1023),
+    machine_id int,
+    parent_type char(32),
+    entity_id int,
+    entity_type char(16),
+    parent_id int
+);
+CREATE INDEX module_exec_entity_idx ON module_exec(entity_id, entity_type);
+
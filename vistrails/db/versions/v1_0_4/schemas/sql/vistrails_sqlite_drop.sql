@@ -0,0 +1,85 @@
+--#############################################################################
+--
+-- Copyright (C) 2011-2014, NYU-Poly.
+-- Copyright (C) 2006-2011, University of Utah. 
+-- All rights reserved.
+-- Contact: contact@vistrails.org
+--
+-- This file is part of VisTrails.
+--
+-- "Redistribution and use in source and binary forms, with or without 
+-- modification, are permitted provided that the following conditions are met:
+--
+--  - Redistributions of source code must retain the above copyright notice, 
+--    this list of conditions and the following disclaimer.
+--  - Redistributions in binary form must reproduce the above copyright 
+--    notice, this list of conditions and the following disclaimer in the 
+--    documentation and/or other materials provided with the distribution.
+--  - Neither the name of the University of Utah nor the names of its 
+--    contributors may be used to endorse or promote products derived from 
+--    this software without specific prior written permission.
+--
+-- THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+-- AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+-- THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+-- PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+-- CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+-- EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+-- PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+-- OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+-- WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+-- OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+-- ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+--
+--#############################################################################
+
+-- SQLite version of vistrails_drop.sql: one table per statement
+
+DROP TABLE IF EXISTS `vistrails_version`;
+
+DROP TABLE IF EXISTS thumbnail;
+
+-- generated automatically by generate.py
+
+DROP TABLE IF EXISTS mashup_alias;
+DROP TABLE IF EXISTS group_tbl;
+DROP TABLE IF EXISTS add_tbl;
+DROP TABLE IF EXISTS group_exec;
+DROP TABLE IF EXISTS parameter;
+DROP TABLE IF EXISTS vistrail;
+DROP TABLE IF EXISTS module;
+DROP TABLE IF EXISTS port;
+DROP TABLE IF EXISTS pe_function;
+DROP TABLE IF EXISTS workflow;
+DROP TABLE IF EXISTS mashup_action;
+DROP TABLE IF EXISTS change_tbl;
+DROP TABLE IF EXISTS package;
+DROP TABLE IF EXISTS loop_exec;
+DROP TABLE IF EXISTS connection_tbl;
+DROP TABLE IF EXISTS action;
+DROP TABLE IF EXISTS port_spec;
+DROP TABLE IF EXISTS log_tbl;
+DROP TABLE IF EXISTS loop_iteration;
+DROP TABLE IF EXISTS pe_parameter;
+DROP TABLE IF EXISTS workflow_exec;
+DROP TABLE IF EXISTS location;
+DROP TABLE IF EXISTS function;
+DROP TABLE IF EXISTS action_annotation;
+DROP TABLE IF EXISTS control_parameter;
+DROP TABLE IF EXISTS plugin_data;
+DROP TABLE IF EXISTS delete_tbl;
+DROP TABLE IF EXISTS vistrail_variable;
+DROP TABLE IF EXISTS module_descriptor;
+DROP TABLE IF EXISTS tag;
+DROP TABLE IF EXISTS port_spec_item;
+DROP TABLE IF EXISTS mashup_component;
+DROP TABLE IF EXISTS mashup;
+DROP TABLE IF EXISTS machine;
+DROP TABLE IF EXISTS other;
+DROP TABLE IF EXISTS abstraction;
+DROP TABLE IF EXISTS mashuptrail;
+DROP TABLE IF EXISTS registry;
+DROP TABLE IF EXISTS annotation;
+DROP TABLE IF EXISTS parameter_exploration;
+DROP TABLE IF EXISTS mashup_action_annotation;
+DROP TABLE IF EXISTS module_exec;
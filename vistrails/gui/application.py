@@ -214,7 +214,9 @@ class VistrailsApplicationSingleton(VistrailsApplicationInterface,
             
         # self.vistrailsStartup.init()
         self.package_manager.initialize_packages(
-                report_missing_dependencies=not self.startup.first_run)
+                report_missing_dependencies=not self.startup.first_run,
+                lazy=(not interactive and
+                      bool(self.temp_configuration.check('lazyPackages'))))
 
         # ugly workaround for configuration initialization order issue
         # If we go through the configuration too late,
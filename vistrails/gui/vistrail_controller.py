@@ -327,7 +327,6 @@ class VistrailController(QtCore.QObject, BaseController):
         if action is not None:
             BaseController.add_new_action(self, action, description)
             self.emit(QtCore.SIGNAL("new_action"), action)
-            self.recompute_terse_graph()
 
     ##########################################################################
 
@@ -629,7 +628,18 @@ class VistrailController(QtCore.QObject, BaseController):
 
     def recompute_terse_graph(self):
         BaseController.recompute_terse_graph(self)
-        self._previous_graph_layout = copy.deepcopy(self._current_graph_layout)
+        self._relayout_terse_graph()
+
+    def update_terse_graph(self, added=(), changed=(), pruned=()):
+        if self._update_terse_graph(added, changed, pruned):
+            self._relayout_terse_graph()
+        else:
+            self.recompute_terse_graph()
+
+    def _relayout_terse_graph(self):
+        # layout_from() replaces all the nodes, so the previous layout can
+        # share them
+        self._previous_graph_layout = copy.copy(self._current_graph_layout)
         self._current_graph_layout.layout_from(self.vistrail,
                                                self._current_terse_graph)
 
@@ -758,6 +768,7 @@ class VistrailController(QtCore.QObject, BaseController):
                 # we're going from one boring node to another,
                 # so just rename the node on the terse graph
                 self._current_terse_graph.rename_vertex(current, new_version)
+                self._terse_graph_current = new_version
                 self.replace_unnamed_node_in_version_tree(current, new_version)
             else:
                 # bail, for now
@@ -806,6 +817,7 @@ class VistrailController(QtCore.QObject, BaseController):
             full = self._current_full_graph
         changed = False
         new_current_version = None
+        pruned = []
         for v in versions:
             if v!=0: # not root
                 highest = v
@@ -821,11 +833,12 @@ class VistrailController(QtCore.QObject, BaseController):
                     if highest == self.current_version:
                         new_current_version = full.parent(highest)
                 self.vistrail.pruneVersion(highest)
+                pruned.append(highest)
         if changed:
             self.set_changed(True)
         if new_current_version is not None:
             self.change_selected_version(new_current_version)
-        self.recompute_terse_graph()
+        self.update_terse_graph(pruned=pruned)
         self.invalidate_version_tree(False)
 
     def hide_versions_below(self, v=None):
@@ -991,7 +1004,7 @@ class VistrailController(QtCore.QObject, BaseController):
                          "Please enter a different one." % tag)
             return False
         self.set_changed(True)
-        self.recompute_terse_graph()
+        self.update_terse_graph(changed=[self.current_version])
         self.invalidate_version_tree(False)
         return True
 
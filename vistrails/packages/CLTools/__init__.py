@@ -38,4 +38,6 @@ from vistrails.core.configuration import ConfigurationObject
 
 from identifiers import *
 
-configuration = ConfigurationObject(env=(None, str))
+configuration = ConfigurationObject(env=(None, str),
+                                    cache_results=False,
+                                    cache_directory=(None, str))
@@ -36,11 +36,11 @@
 import errno
 import json
 import os
-import shutil
 import subprocess
 import sys
 
-from vistrails.core.modules.vistrails_module import Module, ModuleError, IncompleteImplementation, new_module
+from vistrails.core.modules.vistrails_module import Module, ModuleError, \
+    IncompleteImplementation, ThreadSafe, new_module
 import vistrails.core.modules.module_registry
 from vistrails.core import debug
 from vistrails.core.packagemanager import get_package_manager
@@ -48,16 +48,42 @@ import vistrails.core.system
 from vistrails.core.system import packages_directory, vistrails_root_directory
 
 import identifiers
+from result_cache import ResultCache, clone_file, compute_key, hash_path
 
 
 cl_tools = {}
 
+_result_cache = None
 
-class CLTools(Module):
+
+def get_result_cache():
+    """Returns the ResultCache, or None if caching is disabled.
+
+    Caching is enabled by the 'cache_results' setting of the package; tools
+    with the 'no_cache' option are never cached.
+    """
+    global _result_cache
+    if not configuration.check('cache_results'):
+        return None
+    if configuration.check('cache_directory'):
+        directory = configuration.cache_directory
+    else:
+        directory = os.path.join(
+                vistrails.core.system.current_dot_vistrails(),
+                'CLTools_cache')
+    if _result_cache is None or _result_cache.directory != directory:
+        _result_cache = ResultCache(directory)
+    return _result_cache
+
+
+class CLTools(ThreadSafe, Module):
     """ CLTools is the base Module.
      We will create a SUDSWebService Module for each method published by 
      the web service.
 
+    Tools only run an external command, so they can be updated
+    concurrently by the parallel scheduler.
+
     """
     def compute(self):
         raise IncompleteImplementation # pragma: no cover
@@ -104,6 +130,9 @@ def _add_tool(path):
         """
         # add all arguments as an unordered list
         args = [self.conf['command']]
+        # stands for args in the cache key, with files replaced by their hash
+        key_args = []
+        outputs = {} # name -> filename - files written by the tool
         file_std = 'options' in self.conf and 'std_using_files' in self.conf['options']
         fail_with_cmd = 'options' in self.conf and 'fail_with_cmd' in self.conf['options']
         setOutput = [] # (name, File) - set File contents as output for name
@@ -139,6 +168,9 @@ def _add_tool(path):
                             value = name
                     elif klass in ('file', 'directory', 'path'):
                         value = value.name
+                        key_args.append((name, hash_path(value)))
+                    if klass not in ('file', 'directory', 'path'):
+                        key_args.append((name, value))
                     # check for flag and append file name
                     if not 'flag' == klass and 'flag' in options:
                         args.append(options['flag'])
@@ -156,6 +188,8 @@ def _add_tool(path):
                 if 'flag' in options:
                     args.append(options['flag'])
                 args.append(fname)
+                key_args.append((name, 'output'))
+                outputs[name] = file.name
                 if "file" == klass:
                     self.set_output(name, file)
                 elif "string" == klass:
@@ -169,9 +203,11 @@ def _add_tool(path):
                 # create copy of infile to operate on
                 outfile = self.interpreter.filePool.create_file(
                         suffix=options.get('suffix', DEFAULTFILESUFFIX))
+                key_args.append((name, hash_path(value.name)))
+                outputs[name] = outfile.name
                 try:
-                    shutil.copyfile(value.name, outfile.name)
-                except IOError, e: # pragma: no cover
+                    clone_file(value.name, outfile.name)
+                except (IOError, OSError), e: # pragma: no cover
                     raise ModuleError(self,
                                       "Error copying file '%s': %s" %
                                       (value.name, debug.format_exception(e)))
@@ -187,6 +223,7 @@ def _add_tool(path):
             if self.has_input(name):
                 value = self.get_input(name)
                 if "file" == type:
+                    key_args.append((name, hash_path(value.name)))
                     if file_std:
                         f = open(value.name, 'rb')
                     else:
@@ -194,6 +231,7 @@ def _add_tool(path):
                         stdin = f.read()
                         f.close()
                 elif "string" == type:
+                    key_args.append((name, value))
                     if file_std:
                         file = self.interpreter.filePool.create_file()
                         f = open(file.name, 'wb')
@@ -215,6 +253,7 @@ def _add_tool(path):
                 type = type.lower()
                 file = self.interpreter.filePool.create_file(
                         suffix=DEFAULTFILESUFFIX)
+                outputs[name] = file.name
                 if "file" == type:
                     self.set_output(name, file)
                 elif "string" == type:
@@ -232,6 +271,7 @@ def _add_tool(path):
                 type = type.lower()
                 file = self.interpreter.filePool.create_file(
                         suffix=DEFAULTFILESUFFIX)
+                outputs[name] = file.name
                 if "file" == type:
                     self.set_output(name, file)
                 elif "string" == type:
@@ -296,6 +336,14 @@ def _add_tool(path):
                                       "Error parsing env port: %s" % (
                                       debug.format_exception(e)))
 
+        cache = None
+        if not ('options' in self.conf and
+                'no_cache' in self.conf['options']):
+            cache = get_result_cache()
+        if cache is not None:
+            key = compute_key(self.conf, key_args, sorted(env.iteritems()),
+                              self.conf.get('dir'))
+
         if env:
             kwargs['env'] = dict(os.environ)
             kwargs['env'].update(env)
@@ -306,28 +354,52 @@ def _add_tool(path):
         if 'dir' in self.conf:
             kwargs['cwd'] = self.conf['dir']
 
-        process = subprocess.Popen(args, **kwargs)
-        if file_std:
-            process.wait()
+        manifest = None
+        if cache is not None:
+            manifest = cache.restore(key, outputs)
+        if manifest is not None:
+            # same tool, arguments and inputs: reuse the stored result
+            self.annotate({'cached_result': key})
+            returncode = manifest['return_code']
+            if not file_std:
+                stdout = stderr = None
+                if '<stdout>' in manifest['files']:
+                    stdout = cache.read_value(key, manifest, '<stdout>')
+                if '<stderr>' in manifest['files']:
+                    stderr = cache.read_value(key, manifest, '<stderr>')
         else:
-            #if stdin:
-            #    print "stdin:", len(stdin), stdin[:30]
-            stdout, stderr = _eintr_retry_call(process.communicate, stdin)
-            #stdout, stderr = process.communicate(stdin)
-            #if stdout:
-            #    print "stdout:", len(stdout), stdout[:30]
-            #if stderr:
-            #    print "stderr:", len(stderr), stderr[:30]
+            process = subprocess.Popen(args, **kwargs)
+            if file_std:
+                process.wait()
+            else:
+                #if stdin:
+                #    print "stdin:", len(stdin), stdin[:30]
+                stdout, stderr = _eintr_retry_call(process.communicate, stdin)
+                #stdout, stderr = process.communicate(stdin)
+                #if stdout:
+                #    print "stdout:", len(stdout), stdout[:30]
+                #if stderr:
+                #    print "stderr:", len(stderr), stderr[:30]
+            returncode = process.returncode
 
         if return_code is not None:
-            if process.returncode != return_code:
+            if returncode != return_code:
                 raise ModuleError(self, "Command returned %d (!= %d)" % (
-                                  process.returncode, return_code))
-        self.set_output('return_code', process.returncode)
+                                  returncode, return_code))
+        self.set_output('return_code', returncode)
 
         for f in open_files:
             f.close()
 
+        if cache is not None and manifest is None:
+            values = {}
+            if not file_std:
+                if stdout is not None:
+                    values['<stdout>'] = stdout
+                if stderr is not None:
+                    values['<stderr>'] = stderr
+            cache.store(key, outputs, returncode, values)
+
         for name, file in setOutput:
             f = open(file.name, 'rb')
             self.set_output(name, f.read())
@@ -581,3 +653,28 @@ class TestCLTools(unittest.TestCase):
         """With std_using_files: use files instead of pipes.
         """
         self.do_the_test('intern_cltools_2')
+
+    def test_result_cache(self):
+        """Results are reused from the cache instead of running the tool.
+        """
+        import tempfile
+        import shutil
+        old_config = (configuration.cache_results,
+                      configuration.cache_directory
+                      if configuration.check('cache_directory') else None)
+        cache_dir = tempfile.mkdtemp(prefix='vt_cltools_cache_')
+        old_popen = subprocess.Popen
+        try:
+            configuration.cache_results = True
+            configuration.cache_directory = cache_dir
+            self.do_the_test('intern_cltools_1')
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            def popen(*args, **kwargs):
+                self.fail("Tool was run instead of using the cache")
+            subprocess.Popen = popen
+            self.do_the_test('intern_cltools_1')
+        finally:
+            subprocess.Popen = old_popen
+            (configuration.cache_results,
+             configuration.cache_directory) = old_config
+            shutil.rmtree(cache_dir)
@@ -0,0 +1,294 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Result cache for CLTools modules.
+
+Results of command line tools are stored on disk, keyed by a hash of the
+tool description, the argument values and the content of the input files,
+so that a tool doesn't need to run again for the same inputs, even in a new
+session.
+
+Each entry is a directory holding the output files and a manifest, and is
+moved in place only once complete, so concurrent runs never see a partial
+entry.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+try:
+    import fcntl
+except ImportError: # pragma: no cover
+    fcntl = None
+
+from vistrails.core import debug
+
+
+# ioctl(2) request to make a copy-on-write clone of a file on Linux (btrfs,
+# XFS with reflink, ...)
+FICLONE = 0x40049409
+
+MANIFEST = 'manifest.json'
+
+
+def clone_file(src, dst):
+    """Copies a file, sharing its blocks if the filesystem supports it.
+
+    This tries a copy-on-write clone, which is safe to modify, and falls
+    back to a regular copy.
+    """
+    if fcntl is not None and hasattr(fcntl, 'ioctl'):
+        with open(src, 'rb') as fsrc:
+            with open(dst, 'wb') as fdst:
+                try:
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                except (IOError, OSError):
+                    pass
+                else:
+                    shutil.copymode(src, dst)
+                    return
+    shutil.copyfile(src, dst)
+
+
+def link_file(src, dst):
+    """Makes dst the same file as src, replacing it.
+
+    A hardlink is used when possible, so this should only be used for files
+    that are never modified in place. Falls back to clone_file().
+    """
+    try:
+        os.remove(dst)
+    except OSError, e:
+        if e.errno != errno.ENOENT: # pragma: no cover
+            raise
+    if hasattr(os, 'link'):
+        try:
+            os.link(src, dst)
+        except OSError:
+            pass
+        else:
+            return
+    clone_file(src, dst)
+
+
+def hash_path(path):
+    """Hashes the content of a file or directory.
+
+    Directories are hashed recursively, from the names and content of their
+    files. The name of path itself is not part of the hash, only its
+    extension is, since tools often look at it.
+    """
+    h = hashlib.sha1()
+    h.update(os.path.splitext(path)[1])
+    if os.path.isdir(path):
+        h.update('d')
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            h.update(os.path.relpath(dirpath, path) + '\0')
+            for fname in sorted(filenames):
+                h.update(fname + '\0')
+                h.update(hash_path(os.path.join(dirpath, fname)))
+    elif os.path.isfile(path):
+        h.update('f')
+        with open(path, 'rb') as fp:
+            chunk = fp.read(65536)
+            while chunk:
+                h.update(chunk)
+                chunk = fp.read(65536)
+    else:
+        # Might be a path the tool will create
+        h.update('n' + path)
+    return h.hexdigest()
+
+
+def compute_key(conf, args, env=None, cwd=None):
+    """Computes the key of a tool invocation.
+
+    args is a list of JSON-serializable values standing for the arguments,
+    where files have already been replaced by their hash.
+    """
+    h = hashlib.sha1()
+    h.update(json.dumps([conf, args, env, cwd], sort_keys=True))
+    return h.hexdigest()
+
+
+class ResultCache(object):
+    """A store of tool results in a directory.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def lookup(self, key):
+        """Returns the manifest and directory of a cached result, or None.
+        """
+        entry = self._entry(key)
+        try:
+            with open(os.path.join(entry, MANIFEST), 'rb') as fp:
+                manifest = json.load(fp)
+        except (IOError, ValueError):
+            return None
+        return manifest, entry
+
+    def restore(self, key, files):
+        """Gets a cached result into the given files.
+
+        files is a dict of names to filenames, that will be made the same as
+        the cached files. Returns the manifest, or None if the key is not in
+        the cache.
+        """
+        found = self.lookup(key)
+        if found is None:
+            return None
+        manifest, entry = found
+        if set(files) - set(manifest['files']):
+            return None
+        try:
+            for name, filename in files.iteritems():
+                link_file(os.path.join(entry, manifest['files'][name]),
+                          filename)
+        except (IOError, OSError), e:
+            debug.warning("CLTools couldn't read cached result %s" % key, e)
+            return None
+        return manifest
+
+    def store(self, key, files, return_code, values=None):
+        """Adds a result to the cache.
+
+        files is a dict of names to the output files, which are linked into
+        the cache; they shouldn't be modified afterwards. values is a dict of
+        strings, that are written to files as well.
+        """
+        entry = self._entry(key)
+        if os.path.exists(entry):
+            return
+        parent = os.path.dirname(entry)
+        try:
+            if not os.path.isdir(parent):
+                os.makedirs(parent)
+            tmp = tempfile.mkdtemp(prefix='.tmp', dir=parent)
+        except OSError, e:
+            debug.warning("CLTools couldn't create cache entry", e)
+            return
+        try:
+            manifest = {'return_code': return_code, 'files': {}}
+            for i, (name, filename) in enumerate(sorted(files.iteritems())):
+                fname = 'file%d' % i
+                link_file(filename, os.path.join(tmp, fname))
+                manifest['files'][name] = fname
+            for i, (name, value) in enumerate(sorted((values or {})
+                                                     .iteritems())):
+                fname = 'value%d' % i
+                with open(os.path.join(tmp, fname), 'wb') as fp:
+                    fp.write(value)
+                manifest['files'][name] = fname
+            with open(os.path.join(tmp, MANIFEST), 'wb') as fp:
+                json.dump(manifest, fp)
+            os.rename(tmp, entry)
+        except (IOError, OSError), e:
+            # Another process might have stored it first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.exists(entry): # pragma: no cover
+                debug.warning("CLTools couldn't store result in cache", e)
+
+    def read_value(self, key, manifest, name):
+        """Reads a string stored with the values of store().
+        """
+        with open(os.path.join(self._entry(key),
+                               manifest['files'][name]), 'rb') as fp:
+            return fp.read()
+
+
+###############################################################################
+
+import unittest
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='vt_cltools_')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'wb') as fp:
+            fp.write(content)
+        return path
+
+    def read(self, path):
+        with open(path, 'rb') as fp:
+            return fp.read()
+
+    def test_clone(self):
+        src = self.write('src', 'contents')
+        dst = os.path.join(self.tmp, 'dst')
+        clone_file(src, dst)
+        with open(dst, 'ab') as fp:
+            fp.write(' changed')
+        self.assertEqual(self.read(src), 'contents')
+        self.assertEqual(self.read(dst), 'contents changed')
+
+    def test_hash(self):
+        a = self.write('a.txt', 'hello')
+        b = self.write('b.txt', 'hello')
+        c = self.write('c.dat', 'hello')
+        self.assertEqual(hash_path(a), hash_path(b))
+        self.assertNotEqual(hash_path(a), hash_path(c))
+        d = os.path.join(self.tmp, 'dir')
+        os.mkdir(d)
+        h1 = hash_path(d)
+        self.write('dir/f', 'x')
+        self.assertNotEqual(hash_path(d), h1)
+
+    def test_store(self):
+        cache = ResultCache(os.path.join(self.tmp, 'cache'))
+        key = compute_key({'command': 'true'}, ['a', 1])
+        self.assertIsNone(cache.lookup(key))
+        out = self.write('out', 'result')
+        cache.store(key, {'f_out': out}, 0, {'stdout': 'printed'})
+        dst = self.write('dst', 'old')
+        manifest = cache.restore(key, {'f_out': dst})
+        self.assertEqual(manifest['return_code'], 0)
+        self.assertEqual(self.read(dst), 'result')
+        self.assertEqual(cache.read_value(key, manifest, 'stdout'), 'printed')
+        self.assertIsNone(cache.restore(key, {'other': dst}))
+        self.assertNotEqual(key, compute_key({'command': 'true'}, ['a', 2]))
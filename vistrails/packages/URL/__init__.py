@@ -43,4 +43,13 @@ way, files that haven't been changed do not need to be downloaded again. The
 check is performed efficiently using HTTP headers.
 """
 
+from vistrails.core.configuration import ConfigurationObject
+
 from identifiers import *
+
+# buffer_size: size of the reads and writes when downloading, in bytes
+# concurrent_downloads: how many files HTTPDirectory downloads at once
+# connections_per_host: how many idle connections are kept open to a host
+configuration = ConfigurationObject(buffer_size=262144,
+                                    concurrent_downloads=4,
+                                    connections_per_host=4)
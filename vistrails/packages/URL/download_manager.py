@@ -0,0 +1,528 @@
+"""Download manager shared by the modules of the URL package.
+
+The DownloadManager keeps HTTP connections open between requests, so that
+several files from the same server don't each need a new connection (and TLS
+handshake). It can run several downloads at once, and resumes interrupted
+downloads with Range requests.
+
+A download is written to a '.part' file next to its destination, which is
+renamed once complete. If the server identified the file (ETag or
+Last-Modified header), this is stored in a '.part.validator' file, and the
+next download of the same URL to the same destination only requests the
+missing bytes (if the file didn't change on the server).
+"""
+
+import httplib
+from multiprocessing.pool import ThreadPool
+import os
+import re
+import socket
+import threading
+import urllib
+import urllib2
+import urlparse
+
+from .https_if_available import https_connection
+
+
+__all__ = ['DownloadManager', 'Response', 'get_download_manager',
+           'close_download_manager']
+
+
+_content_range = re.compile(r'^bytes ([0-9]+)-([0-9]+)/([0-9]+|\*)$')
+
+
+class Response(object):
+    """A response to a request made with DownloadManager#open().
+
+    The connection is given back to the manager once the body has been read
+    entirely. Call close() if you don't read it, the connection will then be
+    closed instead.
+    """
+    def __init__(self, manager, key, connection, response, url):
+        self.url = url
+        self.code = response.status
+        self.msg = response.reason
+        self.headers = response.msg
+        self._manager = manager
+        self._key = key
+        self._connection = connection
+        self._response = response
+        if response.length == 0:
+            self.read()
+
+    def info(self):
+        return self.headers
+
+    def read(self, size=None):
+        if self._response is None:
+            return ''
+        if size is None:
+            data = self._response.read()
+        else:
+            data = self._response.read(size)
+        if self._response.isclosed():
+            self._response = None
+            self._manager._release(self._key, self._connection)
+        return data
+
+    def close(self):
+        if self._response is not None:
+            # The rest of the body would have to be read before sending
+            # another request, just drop the connection
+            self._response.close()
+            self._connection.close()
+            self._response = None
+
+
+class DownloadManager(object):
+    """Downloads files over HTTP(S), reusing connections.
+
+    buffer_size is the size of the reads and writes to files.
+    concurrent_downloads is the number of threads used by map() and
+    download_all().
+    connections_per_host is the maximum number of idle connections kept open
+    for each host.
+    """
+    max_redirects = 10
+
+    def __init__(self, buffer_size=262144, concurrent_downloads=4,
+                 connections_per_host=4, timeout=None):
+        self.buffer_size = buffer_size
+        self.concurrent_downloads = concurrent_downloads
+        self.connections_per_host = connections_per_host
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._pool = None
+
+    def _route(self, url, insecure):
+        """Gets the connection key and request path for a URL.
+        """
+        parts = urlparse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https') or not parts.hostname:
+            raise urllib2.URLError("unsupported URL %r" % url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        proxy = urllib.getproxies().get(scheme)
+        if proxy and urllib.proxy_bypass(parts.hostname):
+            proxy = None
+        if proxy and scheme == 'http':
+            # requests through an HTTP proxy use the absolute URL
+            path = urlparse.urlunsplit((scheme, parts.netloc, path, '', ''))
+        return (scheme, parts.hostname, parts.port, insecure, proxy), path
+
+    def _connect(self, key):
+        scheme, host, port, insecure, proxy = key
+        kwargs = {}
+        if self.timeout is not None:
+            kwargs['timeout'] = self.timeout
+        if not proxy:
+            if scheme == 'https':
+                return https_connection(host, port, insecure=insecure,
+                                        **kwargs)
+            else:
+                return httplib.HTTPConnection(host, port, **kwargs)
+        if '://' not in proxy:
+            proxy = 'http://' + proxy
+        proxy = urlparse.urlsplit(proxy)
+        if scheme == 'https':
+            connection = https_connection(proxy.hostname, proxy.port,
+                                          insecure=insecure, **kwargs)
+            connection.set_tunnel(host, port)
+            return connection
+        else:
+            return httplib.HTTPConnection(proxy.hostname, proxy.port,
+                                          **kwargs)
+
+    def _release(self, key, connection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.connections_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _request(self, key, path, headers):
+        """Sends a request, on an idle connection if there is one.
+
+        If the server closed the idle connection, the request is sent again
+        on a new one.
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            connection = idle.pop() if idle else None
+        if connection is not None:
+            try:
+                connection.request('GET', path, headers=headers)
+                return connection, connection.getresponse()
+            except (httplib.HTTPException, socket.error):
+                connection.close()
+        connection = self._connect(key)
+        try:
+            connection.request('GET', path, headers=headers)
+            return connection, connection.getresponse()
+        except Exception:
+            connection.close()
+            raise
+
+    def open(self, url, headers=None, insecure=False, resume=None):
+        """Requests a URL, following redirections.
+
+        Returns a Response. Errors are reported like urllib2 does, as
+        URLError or HTTPError (for 4xx and 5xx status codes).
+
+        If resume is the name of a file being downloaded with save(), and a
+        part of it has already been downloaded, only the rest is requested.
+        """
+        headers = dict(headers or {})
+        if resume is not None:
+            headers.update(self._resume_headers(resume))
+        for i in xrange(self.max_redirects + 1):
+            key, path = self._route(url, insecure)
+            try:
+                connection, response = self._request(key, path, headers)
+            except (httplib.HTTPException, socket.error), e:
+                raise urllib2.URLError(e)
+            result = Response(self, key, connection, response, url)
+            location = response.getheader('location')
+            if response.status in (301, 302, 303, 307) and location:
+                result.close()
+                url = urlparse.urljoin(url, location)
+                continue
+            if response.status >= 400:
+                result.close()
+                raise urllib2.HTTPError(url, response.status,
+                                        response.reason, response.msg, None)
+            return result
+        raise urllib2.HTTPError(url, response.status,
+                                "Too many redirections", response.msg, None)
+
+    @staticmethod
+    def _resume_headers(filename):
+        try:
+            offset = os.path.getsize(filename + '.part')
+            with open(filename + '.part.validator', 'rb') as fp:
+                validator = fp.read()
+        except (IOError, OSError):
+            return {}
+        if not offset or not validator:
+            return {}
+        return {'Range': 'bytes=%d-' % offset, 'If-Range': validator}
+
+    def save(self, response, filename, progress=None):
+        """Writes the body of a response to a file.
+
+        If the response only has the end of the file (206 status, see the
+        'resume' argument to open()), it is appended to the part previously
+        downloaded. If the download fails, the part that was received is
+        kept so that it can be resumed.
+
+        progress, if given, is called with the number of bytes received and
+        the total size (or None if unknown).
+        """
+        part = filename + '.part'
+        validator_file = part + '.validator'
+        total = response.headers.getheader('content-length')
+        total = int(total) if total and total.isdigit() else None
+        offset = 0
+        if response.code == 206:
+            m = _content_range.match(
+                    response.headers.getheader('content-range') or '')
+            if m is None or int(m.group(1)) != os.path.getsize(part):
+                response.close()
+                self._remove(part, validator_file)
+                raise urllib2.URLError("invalid partial response for %s" %
+                                       response.url)
+            offset = int(m.group(1))
+            if m.group(3) != '*':
+                total = int(m.group(3))
+            mode = 'ab'
+        else:
+            mode = 'wb'
+            validator = (response.headers.getheader('etag') or
+                         response.headers.getheader('last-modified'))
+            if validator:
+                with open(validator_file, 'wb') as fp:
+                    fp.write(validator)
+            else:
+                self._remove(validator_file)
+
+        done = offset
+        try:
+            with open(part, mode) as fp:
+                while True:
+                    if progress is not None:
+                        progress(done, total)
+                    chunk = response.read(self.buffer_size)
+                    if not chunk:
+                        break
+                    fp.write(chunk)
+                    done += len(chunk)
+        except (httplib.HTTPException, socket.error), e:
+            response.close()
+            raise urllib2.URLError(e)
+        except:
+            response.close()
+            raise
+        if total is not None and done != total:
+            raise urllib2.URLError("incomplete download of %s: got %d of %d "
+                                   "bytes" % (response.url, done, total))
+
+        if os.name == 'nt' and os.path.exists(filename):
+            os.remove(filename)
+        os.rename(part, filename)
+        self._remove(validator_file)
+
+    @staticmethod
+    def _remove(*filenames):
+        for filename in filenames:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+    def download(self, url, filename, headers=None, insecure=False,
+                 progress=None):
+        """Downloads a URL to a file, resuming a previous download.
+
+        Returns the Response, whose body has been read.
+        """
+        response = self.open(url, headers, insecure, resume=filename)
+        self.save(response, filename, progress)
+        return response
+
+    def map(self, function, iterable):
+        """Calls function on each item, concurrently.
+
+        function should not itself call map().
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPool(self.concurrent_downloads)
+        return self._pool.map(function, iterable)
+
+    def download_all(self, downloads, insecure=False):
+        """Downloads a list of (url, filename) pairs concurrently.
+        """
+        return self.map(lambda (url, filename): self.download(
+                                url, filename, insecure=insecure),
+                        downloads)
+
+    def close(self):
+        """Closes the idle connections and stops the threads.
+        """
+        with self._lock:
+            for connections in self._idle.itervalues():
+                for connection in connections:
+                    connection.close()
+            self._idle = {}
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_download_manager():
+    """Returns the DownloadManager shared by the modules of the package.
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            from . import configuration
+            _manager = DownloadManager(
+                    buffer_size=configuration.buffer_size,
+                    concurrent_downloads=configuration.concurrent_downloads,
+                    connections_per_host=configuration.connections_per_host)
+        return _manager
+
+def close_download_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.close()
+            _manager = None
+
+
+###############################################################################
+
+import unittest
+
+
+class LocalHTTPServer(object):
+    """An HTTP/1.1 server for the tests, serving files from a dict.
+
+    It supports keep-alive, ETag and Range requests, and records the
+    requests and the number of connections it got.
+    """
+    def __init__(self, files):
+        import BaseHTTPServer
+
+        server = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                server.connections += 1
+                BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+
+            def do_GET(self):
+                server.requests.append((self.path, dict(self.headers)))
+                try:
+                    content_type, data = server.files[self.path]
+                except KeyError:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                etag = '"%x"' % (hash(data) & 0xFFFFFFFF)
+                if self.headers.getheader('if-none-match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                start = 0
+                range_ = self.headers.getheader('range')
+                if (range_ and
+                        self.headers.getheader('if-range') in (None, etag)):
+                    start = int(range_[6:-1])
+                    self.send_response(206)
+                    self.send_header('Content-Range', 'bytes %d-%d/%d' % (
+                                     start, len(data) - 1, len(data)))
+                else:
+                    self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data) - start))
+                self.end_headers()
+                self.wfile.write(data[start:])
+
+            def log_message(self, format, *args):
+                pass
+
+        self.files = files
+        self.requests = []
+        self.connections = 0
+        import SocketServer
+
+        class Server(SocketServer.ThreadingMixIn,
+                     BaseHTTPServer.HTTPServer):
+            daemon_threads = True
+
+            def handle_error(self, request, client_address):
+                # Clients closing connections early is expected
+                pass
+
+        self._server = Server(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:%d' % self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def shutdown(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class TestDownloadManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = ''.join(chr(i % 251) for i in xrange(100000))
+        cls.server = LocalHTTPServer({
+                '/big.bin': ('application/octet-stream', cls.data),
+                '/a.txt': ('text/plain', 'aa\n'),
+                '/b.txt': ('text/plain', 'bb\n'),
+            })
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp(prefix='vt_test_dl_')
+        self.server.requests = []
+        self.server.connections = 0
+        self.manager = DownloadManager(buffer_size=4096)
+
+    def tearDown(self):
+        import shutil
+        self.manager.close()
+        shutil.rmtree(self.directory)
+
+    def test_keepalive(self):
+        """Downloads several files on a single connection."""
+        for name in ('a.txt', 'b.txt', 'big.bin'):
+            filename = os.path.join(self.directory, name)
+            self.manager.download(self.server.url + '/' + name, filename)
+        with open(os.path.join(self.directory, 'big.bin'), 'rb') as fp:
+            self.assertEqual(fp.read(), self.data)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_resume(self):
+        """Resumes a partial download."""
+        filename = os.path.join(self.directory, 'big.bin')
+        response = self.manager.open(self.server.url + '/big.bin')
+        with open(filename + '.part', 'wb') as fp:
+            fp.write(response.read(30000))
+        with open(filename + '.part.validator', 'wb') as fp:
+            fp.write(response.headers.getheader('etag'))
+        response.close()
+
+        response = self.manager.download(self.server.url + '/big.bin',
+                                         filename)
+        self.assertEqual(response.code, 206)
+        self.assertEqual(self.server.requests[-1][1]['range'],
+                         'bytes=30000-')
+        with open(filename, 'rb') as fp:
+            self.assertEqual(fp.read(), self.data)
+        self.assertFalse(os.path.exists(filename + '.part'))
+        self.assertFalse(os.path.exists(filename + '.part.validator'))
+
+    def test_resume_changed(self):
+        """Downloads the whole file if it changed since the partial download.
+        """
+        filename = os.path.join(self.directory, 'big.bin')
+        with open(filename + '.part', 'wb') as fp:
+            fp.write('x' * 500)
+        with open(filename + '.part.validator', 'wb') as fp:
+            fp.write('"oldetag"')
+        response = self.manager.download(self.server.url + '/big.bin',
+                                         filename)
+        self.assertEqual(response.code, 200)
+        with open(filename, 'rb') as fp:
+            self.assertEqual(fp.read(), self.data)
+
+    def test_not_modified(self):
+        response = self.manager.open(self.server.url + '/a.txt')
+        etag = response.headers.getheader('etag')
+        response.read()
+        response = self.manager.open(self.server.url + '/a.txt',
+                                     {'If-None-Match': etag})
+        self.assertEqual(response.code, 304)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_errors(self):
+        with self.assertRaises(urllib2.HTTPError) as cm:
+            self.manager.open(self.server.url + '/missing')
+        self.assertEqual(cm.exception.code, 404)
+        with self.assertRaises(urllib2.URLError):
+            self.manager.open('http://127.0.0.1:1/')
+
+    def test_concurrent(self):
+        downloads = [(self.server.url + '/' + name,
+                      os.path.join(self.directory, '%s.%d' % (name, i)))
+                     for i in xrange(5)
+                     for name in ('a.txt', 'b.txt', 'big.bin')]
+        self.manager.download_all(downloads)
+        for url, filename in downloads:
+            with open(filename, 'rb') as fp:
+                path = '/' + url.rsplit('/', 1)[1]
+                self.assertEqual(fp.read(), self.server.files[path][1])
+        self.assertLessEqual(self.server.connections, 4)
@@ -4,7 +4,7 @@ from HTMLParser import HTMLParser
 import os
 import re
 
-from .https_if_available import build_opener
+from .download_manager import get_download_manager
 
 
 re_url = re.compile(r'^(([a-zA-Z_-]+)://([^/]+))(/.*)?$')
@@ -55,23 +55,34 @@ class ListingParser(HTMLParser):
 
 
 def download_directory(url, target, insecure=False):
-    def mkdir():
-        if not mkdir.done:
-            try:
-                os.mkdir(target)
-            except OSError:
-                pass
-            mkdir.done = True
-    mkdir.done = False
+    """Downloads the files linked from a directory listing, recursively.
+
+    Each level of the hierarchy is downloaded concurrently, through the
+    package's DownloadManager.
+    """
+    manager = get_download_manager()
+    entries = [(url, target)]
+    while entries:
+        results = manager.map(
+                lambda (url, target): download_entry(manager, url, target,
+                                                     insecure),
+                entries)
+        entries = [entry for result in results for entry in result]
+
 
-    opener = build_opener(insecure=insecure)
-    response = opener.open(url)
+def download_entry(manager, url, target, insecure=False):
+    """Downloads a file, or reads a directory listing.
+
+    Returns the (url, target) pairs of the links to download next.
+    """
+    response = manager.open(url, insecure=insecure)
 
     if response.info().type == 'text/html':
         contents = response.read()
 
         parser = ListingParser(url)
         parser.feed(contents)
+        entries = []
         for link in parser.links:
             link = resolve_link(link, url)
             if link[-1] == '/':
@@ -81,9 +92,13 @@ def download_directory(url, target, insecure=False):
             name = link.rsplit('/', 1)[1]
             if '?' in name:
                 continue
-            mkdir()
-            download_directory(link, os.path.join(target, name), insecure)
-        if not mkdir.done:
+            entries.append((link, os.path.join(target, name)))
+        if entries:
+            try:
+                os.mkdir(target)
+            except OSError:
+                pass
+        else:
             # We didn't find anything to write inside this directory
             # Maybe it's a HTML file?
             if url[-1] != '/':
@@ -92,13 +107,10 @@ def download_directory(url, target, insecure=False):
                     target = target + '.html'
                 with open(target, 'wb') as fp:
                     fp.write(contents)
+        return entries
     else:
-        buffer_size = 4096
-        with open(target, 'wb') as fp:
-            chunk = response.read(buffer_size)
-            while chunk:
-                fp.write(chunk)
-                chunk = response.read(buffer_size)
+        manager.save(response, target)
+        return []
 
 
 ###############################################################################
@@ -12,7 +12,8 @@ import certifi
 from backports.ssl_match_hostname import match_hostname
 
 
-__all__ = ['VerifiedHTTPSHandler', 'https_handler', 'build_opener']
+__all__ = ['VerifiedHTTPSHandler', 'https_handler', 'build_opener',
+           'https_connection']
 
 
 class CertValidatingHTTPSConnection(httplib.HTTPConnection):
@@ -37,7 +38,8 @@ class CertValidatingHTTPSConnection(httplib.HTTPConnection):
                                     ca_certs=self.ca_certs)
         if self.cert_reqs & ssl.CERT_REQUIRED:
             cert = self.sock.getpeercert()
-            hostname = self.host.split(':', 0)[0]
+            # through a proxy, the certificate is the tunneled host's
+            hostname = (self._tunnel_host or self.host).split(':', 0)[0]
             match_hostname(cert, hostname)
 
 
@@ -69,3 +71,12 @@ def build_opener(*handlers, **kwargs):
         handlers = handlers + (https_handler,)
     handlers = handlers + (urllib2.ProxyHandler(),)
     return urllib2.build_opener(*handlers)
+
+
+def https_connection(host, port=None, insecure=False, **kwargs):
+    if insecure:
+        if hasattr(ssl, '_create_unverified_context'):
+            kwargs['context'] = ssl._create_unverified_context()
+        return httplib.HTTPSConnection(host, port, **kwargs)
+    return CertValidatingHTTPSConnection(host, port, ca_certs=certifi.where(),
+                                         **kwargs)
@@ -66,7 +66,9 @@ from vistrails.gui.utils import show_warning
 from vistrails.core.repository.poster.encode import multipart_encode
 from vistrails.core.repository.poster.streaminghttp import register_openers
 
+from . import configuration
 from .identifiers import identifier
+from .download_manager import get_download_manager, close_download_manager
 from .http_directory import download_directory
 from .https_if_available import build_opener
 
@@ -80,6 +82,7 @@ class Downloader(object):
     def __init__(self, url, module, insecure):
         self.url = url
         self.module = module
+        self.insecure = insecure
         self.opener = build_opener(insecure=insecure)
 
     def execute(self):
@@ -133,7 +136,7 @@ class Downloader(object):
     def download(self, response):
         try:
             dl_size = 0
-            CHUNKSIZE = 4096
+            CHUNKSIZE = configuration.buffer_size
             f2 = open(self.local_filename, 'wb')
             while True:
                 if self.size_header is not None:
@@ -166,6 +169,11 @@ class Downloader(object):
 
 
 class HTTPDownloader(Downloader):
+    """Downloads files over HTTP(S) through the package's DownloadManager.
+
+    Connections are reused across modules, and interrupted downloads are
+    resumed.
+    """
     def pre_download(self):
         # Get ETag from disk
         try:
@@ -175,27 +183,24 @@ class HTTPDownloader(Downloader):
             self.etag = None
 
     def send_request(self):
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
         try:
-            request = urllib2.Request(self.url)
-            if self.etag is not None:
-                request.add_header(
-                    'If-None-Match',
-                    self.etag)
-            try:
-                mtime = email.utils.formatdate(
-                        os.path.getmtime(self.local_filename),
-                        usegmt=True)
-                request.add_header(
-                    'If-Modified-Since',
-                    mtime)
-            except OSError:
-                pass
-            return self.opener.open(request)
-        except urllib2.HTTPError, e:
-            if e.code == 304:
-                # Not modified
-                return None
-            raise
+            mtime = email.utils.formatdate(
+                    os.path.getmtime(self.local_filename),
+                    usegmt=True)
+            headers['If-Modified-Since'] = mtime
+        except OSError:
+            pass
+        response = get_download_manager().open(self.url, headers,
+                                               self.insecure,
+                                               resume=self.local_filename)
+        if response.code == 304:
+            # Not modified
+            response.close()
+            return None
+        return response
 
     def read_headers(self, response):
         try:
@@ -231,7 +236,20 @@ class HTTPDownloader(Downloader):
     def download(self, response):
         if (not self.is_in_local_cache or
                 not self.mod_header or self._is_outdated()):
-            Downloader.download(self, response)
+            def progress(dl_size, size):
+                if size:
+                    self.module.logging.update_progress(self.module,
+                                                        dl_size*1.0/size)
+            try:
+                get_download_manager().save(response, self.local_filename,
+                                            progress)
+            except Exception, e:
+                raise ModuleError(
+                        self.module,
+                        "Error retrieving URL: %s" %
+                        debug.format_exception(e))
+        else:
+            response.close()
 
     def post_download(self, response):
         try:
@@ -524,7 +542,8 @@ class RepoSync(Module):
                 if not self._file_is_in_local_cache(local_filename):
                     # file not in cache, download.
                     try:
-                        urllib.urlretrieve(self.url, local_filename)
+                        get_download_manager().download(self.url,
+                                                        local_filename)
                     except IOError, e:
                         raise ModuleError(self, ("Invalid URL: %s" % e))
                 out_file = PathObject(local_filename)
@@ -649,6 +668,10 @@ def initialize(*args, **keywords):
                                package_directory, e)
 
 
+def finalize():
+    close_download_manager()
+
+
 def handle_module_upgrade_request(controller, module_id, pipeline):
     module_remap = {
             # HTTPFile was renamed DownloadFile
@@ -695,8 +718,66 @@ class TestDownloadFile(unittest.TestCase):
                 ]),
             ]))
 
+    def test_local_cache(self):
+        """Downloads a file twice, the second time is a conditional request.
+        """
+        from vistrails.tests.utils import execute, intercept_result
+        from .download_manager import LocalHTTPServer
+        server = LocalHTTPServer({'/file.txt': ('text/plain', 'hello\n')})
+        url = server.url + '/file.txt'
+        local_filename = os.path.join(package_directory,
+                                      urllib.quote_plus(url))
+        try:
+            for i in xrange(2):
+                with intercept_result(DownloadFile,
+                                      'local_filename') as results:
+                    self.assertFalse(execute([
+                            ('DownloadFile', identifier, [
+                                ('url', [('String', url)]),
+                            ]),
+                        ]))
+                self.assertEqual(results, [local_filename])
+                with open(local_filename, 'rb') as fp:
+                    self.assertEqual(fp.read(), 'hello\n')
+            self.assertEqual(len(server.requests), 2)
+            with open(local_filename + '.etag', 'rb') as fp:
+                self.assertEqual(server.requests[1][1]['if-none-match'],
+                                 fp.read())
+        finally:
+            server.shutdown()
+            for filename in (local_filename, local_filename + '.etag'):
+                if os.path.exists(filename):
+                    os.remove(filename)
+
 
 class TestHTTPDirectory(unittest.TestCase):
+    def test_download_local(self):
+        from .download_manager import LocalHTTPServer
+        server = LocalHTTPServer({
+                '/dir/': ('text/html',
+                          '<a href="a">a</a><a href="sub/">sub/</a>'
+                          '<a href="/">Parent</a>'),
+                '/dir/a': ('text/plain', 'aa\n'),
+                '/dir/sub': ('text/html', '<a href="c">c</a>'),
+                '/dir/sub/c': ('application/octet-stream', 'cc\n'),
+            })
+
+        import shutil
+        import tempfile
+        testdir = tempfile.mkdtemp(prefix='vt_test_http_')
+        try:
+            target = os.path.join(testdir, 'dir')
+            download_directory(server.url + '/dir/', target)
+            with open(os.path.join(target, 'a'), 'rb') as fp:
+                self.assertEqual(fp.read(), 'aa\n')
+            with open(os.path.join(target, 'sub', 'c'), 'rb') as fp:
+                self.assertEqual(fp.read(), 'cc\n')
+            # 'a' and 'sub' are downloaded at the same time
+            self.assertLessEqual(server.connections, 2)
+        finally:
+            server.shutdown()
+            shutil.rmtree(testdir)
+
     def test_download(self):
         url = 'http://www.vistrails.org/testing/httpdirectory/test/'
 
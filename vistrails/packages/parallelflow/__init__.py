@@ -1,3 +1,12 @@
+from vistrails.core.configuration import ConfigurationObject
+
 identifier="edu.poly.vistrails.parallel_flow"
 name="Parallel Flow"
 version="0.1.1"
+
+# profile: the IPython profile of the cluster to use; if unset, local worker
+#   processes are used unless a profile is selected from the menu
+# local_processes: the number of local worker processes, defaults to the
+#   number of CPUs
+configuration = ConfigurationObject(profile=(None, str),
+                                    local_processes=(None, int))
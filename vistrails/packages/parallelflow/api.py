@@ -12,19 +12,29 @@ load_balanced_view() returns a LoadBalancedView of the cluster. It is
 equivalent to get_client().load_balanced_view(), with the difference that it
 will prompt the user to create new engines if none are started.
 
-parallel_map() might use IPython's parallel map_sync(), or the standard map()
-function if IPython cannot be used.
+get_executor() returns the Executor to run functions with: the IPython cluster
+if a profile is configured (or was selected from the menu), else a pool of
+local worker processes.
+
+parallel_map() runs a function with get_executor(), or with the standard map()
+function if the function cannot be sent to local worker processes.
 If the 'ipython' keyword argument is True, the function will return an
 additional boolean indicating whether this was computed through IPython (True)
-or with the default map() function (False).
+or locally (False).
 
 All of these functions have an 'ask' parameter, that indicates whether to
 prompt the user to start a cluster if none is available. It is True by default
-(except for parallel_map).
+(except for get_executor and parallel_map).
 """
 
 
-__all__ = ['get_client', 'direct_view', 'load_balanced_view', 'parallel_map']
+import cPickle as pickle
+
+from executors import IPythonExecutor, get_local_executor
+
+
+__all__ = ['get_client', 'direct_view', 'load_balanced_view', 'get_executor',
+           'parallel_map']
 
 
 def get_client(ask=True):
@@ -73,42 +83,67 @@ def load_balanced_view(ask=True):
         return None
 
 
+def get_executor(ask=False):
+    """Returns the Executor that parallel operations should use.
+
+    This is an IPythonExecutor if IPython is available, a profile is
+    configured (or was selected) and engines are running. Else, it is the
+    LocalExecutor, which runs functions in local worker processes.
+
+    If ask is True, the user will be prompted to start a controller or
+    engines for the configured profile if none are running.
+    """
+    from . import configuration
+    try:
+        import IPython.parallel
+    except ImportError:
+        return get_local_executor()
+    from engine_manager import EngineManager
+    if EngineManager.profile is None and not configuration.check('profile'):
+        return get_local_executor()
+
+    c = EngineManager.ensure_controller(connect_only=not ask)
+    if c is not None and ask and not c.ids:
+        EngineManager.start_engines(
+                prompt="A module is performing a parallelizable "
+                "operation, however no IPython engines are running. Do "
+                "you want to start some?")
+    if c is not None and c.ids:
+        return IPythonExecutor(c)
+    else:
+        return get_local_executor()
+
+
 def parallel_map(function, *args, **kwargs):
-    """Wrapper around IPython's map_sync() that defaults to map().
+    """Runs map() through get_executor().
 
-    This might use IPython's parallel map_sync(), or the standard map()
-    function if IPython cannot be used.
+    This might use IPython's parallel map_sync(), local worker processes, or
+    the standard map() function if function cannot be pickled (for instance
+    if it is a lambda) and IPython is not used.
 
     If the 'ask' keyword argument is true, the user will be prompted to start
-    IPython engines, but the function will still default to map() if the user
-    cancels.
+    IPython engines for the configured profile, but the function will still
+    default to local processes if the user cancels.
     If the 'ipython' keyword argument is True, the function will return an
     additional boolean indicating whether this was computed through IPython
-    (True) or with the default map() function (False).
+    (True) or locally (False).
     """
     say_ipython = kwargs.pop('ipython', False)
     ask = kwargs.pop('ask', False)
     if kwargs:
         raise TypeError("map() got unexpected keyword arguments")
 
-    try:
-        import IPython.parallel
-    except ImportError:
-        result, ipython = map(function, *args), False
+    executor = get_executor(ask)
+    ipython = isinstance(executor, IPythonExecutor)
+    if not ipython:
+        try:
+            pickle.dumps(function, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError):
+            executor = None
+    if executor is None:
+        result = map(function, *args)
     else:
-        from engine_manager import EngineManager
-        c = EngineManager.ensure_controller(connect_only=not ask)
-        if c is not None and not c.ids:
-            EngineManager.start_engines(
-                    prompt="A module is performing a parallelizable "
-                    "operation, however no IPython engines are running. Do "
-                    "you want to start some?")
-
-        if c is None or not c.ids:
-            result, ipython = map(function, *args), False
-        else:
-            ldview = c.load_balanced_view()
-            result, ipython = ldview.map_sync(function, *args), True
+        result = executor.map_sync(function, *args)
 
     if say_ipython:
         return result, ipython
@@ -9,6 +9,8 @@ from IPython.parallel import error
 
 from vistrails.core.system import vistrails_root_directory
 
+from . import configuration
+
 
 try:
     from PyQt4 import QtCore, QtGui
@@ -79,6 +81,10 @@ class EngineManager(object):
         self._client = None
 
     def _select_profile(self):
+        if configuration.check('profile'):
+            self.profile = configuration.profile
+            return
+
         # See IPython.core.profileapp:list_profile_in()
         profiles = []
         for filename in os.listdir(get_ipython_dir()):
@@ -0,0 +1,262 @@
+"""Executors run functions in parallel for the parallelflow package.
+
+get_executor() in api returns either an IPythonExecutor, that uses the engines
+of an IPython cluster, or the LocalExecutor, that uses worker processes on
+this machine. Both implement the Executor interface.
+
+Functions and arguments given to the LocalExecutor are pickled, so the
+functions have to be defined at the top level of a module.
+"""
+
+from collections import deque
+from itertools import izip
+import multiprocessing
+import traceback
+
+
+__all__ = ['Executor', 'IPythonExecutor', 'LocalExecutor', 'ExecutionError',
+           'get_local_executor', 'shutdown_local_executor']
+
+
+class ExecutionError(Exception):
+    """An exception raised by a function in a worker process.
+
+    traceback contains the formatted traceback from the worker.
+    """
+    def __init__(self, msg, traceback):
+        Exception.__init__(self, msg)
+        self.traceback = traceback
+
+
+class Executor(object):
+    """Interface of the executors.
+    """
+    def map(self, function, *iterables, **kwargs):
+        """Calls function on the items of the iterables, in parallel.
+
+        This returns an iterator over the results. If the 'ordered' keyword
+        argument is False, results are returned as soon as they are
+        available instead of in the order of the arguments.
+        """
+        raise NotImplementedError
+
+    def map_sync(self, function, *iterables):
+        """Calls function on the items of the iterables and returns the list
+        of results.
+        """
+        return list(self.map(function, *iterables))
+
+    def apply_all(self, function, *args):
+        """Calls function on every worker, before the following tasks.
+
+        This is used to set up data that later tasks reuse. The function
+        might be called again on the same worker, so it should do nothing
+        if the data is already there.
+        """
+        raise NotImplementedError
+
+    def shutdown(self):
+        """Stops the workers that this executor started.
+        """
+
+
+class IPythonExecutor(Executor):
+    """Runs functions on the engines of an IPython cluster.
+    """
+    def __init__(self, client):
+        self.client = client
+
+    def map(self, function, *iterables, **kwargs):
+        ordered = kwargs.pop('ordered', True)
+        if kwargs:
+            raise TypeError("map() got unexpected keyword arguments")
+        ldview = self.client.load_balanced_view()
+        return iter(ldview.map_async(function, *iterables, ordered=ordered))
+
+    def map_sync(self, function, *iterables):
+        ldview = self.client.load_balanced_view()
+        return ldview.map_sync(function, *iterables)
+
+    def apply_all(self, function, *args):
+        self.client[:].apply_sync(function, *args)
+
+
+# Error raised by the setup calls in this worker process, if any
+_setup_error = None
+
+def _init_worker(setup):
+    global _setup_error
+    from vistrails.core.application import get_vistrails_application, init
+    # When the pool is forked, the application is already there
+    if get_vistrails_application() is None:
+        init({'spawned': True, 'batch': True}, args=[])
+    try:
+        for function, args in setup:
+            function(*args)
+    except Exception, e:
+        _setup_error = (str(e), traceback.format_exc())
+
+def _run_task((function, args)):
+    if _setup_error is not None:
+        return False, _setup_error
+    try:
+        return True, function(*args)
+    except Exception, e:
+        return False, (str(e), traceback.format_exc())
+
+
+class LocalExecutor(Executor):
+    """Runs functions in a pool of worker processes on this machine.
+
+    The pool is started on first use and kept, so that the workers only
+    start VisTrails and load packages once.
+
+    Calls from apply_all() (only the last few are kept) are made by each
+    worker when it starts, so their arguments are sent once per worker
+    rather than with every task. When a new call is added, the next map()
+    starts a new pool; the previous one finishes its pending tasks first.
+    """
+    max_setup = 8
+
+    def __init__(self, processes=None):
+        self.processes = processes
+        self._pool = None
+        self._old_pools = []
+        self._setup = deque(maxlen=self.max_setup)
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.processes,
+                                              initializer=_init_worker,
+                                              initargs=(tuple(self._setup),))
+        return self._pool
+
+    def map(self, function, *iterables, **kwargs):
+        ordered = kwargs.pop('ordered', True)
+        if kwargs:
+            raise TypeError("map() got unexpected keyword arguments")
+        pool = self._get_pool()
+        tasks = ((function, args) for args in izip(*iterables))
+        if ordered:
+            results = pool.imap(_run_task, tasks)
+        else:
+            results = pool.imap_unordered(_run_task, tasks)
+        return self._unwrap(results)
+
+    @staticmethod
+    def _unwrap(results):
+        for success, result in results:
+            if not success:
+                raise ExecutionError(*result)
+            yield result
+
+    def apply_all(self, function, *args):
+        call = (function, args)
+        if call in self._setup:
+            return
+        self._setup.append(call)
+        if self._pool is not None:
+            # Workers exit once the tasks already sent are done
+            self._pool.close()
+            self._old_pools.append(self._pool)
+            self._pool = None
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._old_pools.append(self._pool)
+            self._pool = None
+        for pool in self._old_pools:
+            pool.terminate()
+            pool.join()
+        self._old_pools = []
+        self._setup.clear()
+
+
+_local_executor = None
+
+def get_local_executor():
+    """Returns the LocalExecutor, creating it if needed.
+
+    The number of processes comes from the 'local_processes' setting of the
+    package, and defaults to the number of CPUs.
+    """
+    global _local_executor
+    if _local_executor is None:
+        from . import configuration
+        processes = None
+        if configuration.check('local_processes'):
+            processes = configuration.local_processes
+        _local_executor = LocalExecutor(processes)
+    return _local_executor
+
+def shutdown_local_executor():
+    global _local_executor
+    if _local_executor is not None:
+        _local_executor.shutdown()
+        _local_executor = None
+
+
+def _square(x):
+    return x * x
+
+def _fail(x):
+    raise ValueError("bad value %r" % x)
+
+_value = None
+
+def _set_value(value):
+    global _value
+    _value = value
+
+def _get_value(x):
+    return _value
+
+
+import unittest
+
+class TestLocalExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = LocalExecutor(2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_map(self):
+        self.assertEqual(list(self.executor.map(_square, range(10))),
+                         [x * x for x in xrange(10)])
+        self.assertEqual(
+                sorted(self.executor.map(_square, range(10), ordered=False)),
+                [x * x for x in xrange(10)])
+        self.assertRaises(TypeError,
+                          self.executor.map, _square, range(10), chunks=2)
+
+    def test_map_sync(self):
+        self.assertEqual(self.executor.map_sync(_square, [1, 2, 3]),
+                         [1, 4, 9])
+
+    def test_error(self):
+        with self.assertRaises(ExecutionError) as cm:
+            self.executor.map_sync(_fail, [4])
+        self.assertEqual(str(cm.exception), "bad value 4")
+        self.assertIn('ValueError', cm.exception.traceback)
+
+    def test_apply_all(self):
+        self.executor.apply_all(_set_value, 1)
+        self.assertEqual(self.executor.map_sync(_get_value, range(6)),
+                         [1] * 6)
+        pool = self.executor._pool
+        # Same call: the workers are kept
+        self.executor.apply_all(_set_value, 1)
+        self.assertEqual(self.executor.map_sync(_get_value, range(6)),
+                         [1] * 6)
+        self.assertIs(self.executor._pool, pool)
+        # New call: new workers make both calls, in order
+        self.executor.apply_all(_set_value, 2)
+        self.assertEqual(self.executor.map_sync(_get_value, range(6)),
+                         [2] * 6)
+        self.assertIsNot(self.executor._pool, pool)
+
+    def test_setup_error(self):
+        self.executor.apply_all(_fail, 3)
+        self.assertRaises(ExecutionError,
+                          self.executor.map_sync, _square, [1, 2])
@@ -1,8 +1,8 @@
 from vistrails.core.modules.vistrails_module import Module
 from vistrails.core.modules.module_registry import get_module_registry
-from vistrails.core.modules.basic_modules import List, String
+from vistrails.core.modules.basic_modules import Integer, List, String
 
-from engine_manager import EngineManager
+from executors import shutdown_local_executor
 from map import Map
 
 
@@ -14,14 +14,25 @@ def initialize(*args,**keywords):
     reg.add_input_port(Map, 'InputList', (List, ''))
     reg.add_input_port(Map, 'InputPort', (List, ''))
     reg.add_input_port(Map, 'OutputPort', (String, ''))
+    reg.add_input_port(Map, 'BatchSize', (Integer, ''), optional=True)
     reg.add_output_port(Map, 'Result', (List, ''))
 
 
 def finalize():
-    EngineManager.cleanup()
+    shutdown_local_executor()
+    try:
+        from engine_manager import EngineManager
+    except ImportError:
+        pass
+    else:
+        EngineManager.cleanup()
 
 
 def menu_items():
+    try:
+        from engine_manager import EngineManager
+    except ImportError:
+        return ()
     return (
             ("Start new engine processes",
              lambda: EngineManager.start_engines()),
@@ -11,6 +11,7 @@ import vistrails.core.modules.module_registry
 import vistrails.core.modules.utils
 from vistrails.core.modules.vistrails_module import Module, ModuleError, \
     InvalidOutput
+from vistrails.core.utils import DummyView
 from vistrails.core.vistrail.annotation import Annotation
 from vistrails.core.vistrail.controller import VistrailController
 from vistrails.core.vistrail.group import Group
@@ -21,6 +22,7 @@ from vistrails.core.vistrail.vistrail import Vistrail
 from vistrails.db.domain import IdScope
 import vistrails.db.versions
 
+from collections import deque
 import copy
 import inspect
 from itertools import izip
@@ -29,9 +31,17 @@ import re
 import sys
 import tempfile
 
-from IPython.parallel.error import CompositeError
+try:
+    from IPython.parallel.error import CompositeError, RemoteError
+except ImportError:
+    # IPython is only needed to use a cluster, these are never raised
+    class CompositeError(Exception):
+        pass
+    class RemoteError(Exception):
+        pass
 
-from .api import get_client
+from .api import get_executor
+from .executors import ExecutionError, IPythonExecutor
 
 try:
     import hashlib
@@ -138,6 +148,155 @@ def execute_wf(wf, output_port):
     finally:
         os.unlink(temp_wf)
 
+###############################################################################
+# Warm-engine execution
+#
+# Instead of sending a complete workflow for each element, the module is sent
+# once to every engine (setup_wf), which loads it and keeps the controller.
+# Then only the parameter values of each element are sent, in batches
+# (execute_wf_batch); the interpreter is not flushed between elements, so its
+# cache is reused.
+#
+# The functions sent to the engines get the engine's namespace as globals, so
+# they import this module by name and call the functions below.
+#
+# Only the last few workflows are kept on an engine; this is the same number
+# as the setup calls kept by the LocalExecutor.
+#
+
+MAX_ENGINE_WORKFLOWS = 8
+
+_engine_workflows = {} # sha1 of the workflow -> (controller, module_id)
+_engine_workflows_order = deque() # keys, least recently used first
+
+def _touch_engine_wf(key):
+    _engine_workflows_order.remove(key)
+    _engine_workflows_order.append(key)
+
+def setup_wf(module_name, key, wf, module_id):
+    import importlib
+    importlib.import_module(module_name).load_engine_wf(key, wf, module_id)
+
+def execute_wf_batch(module_name, key, start, elements, output_port):
+    import importlib
+    return importlib.import_module(module_name).execute_engine_wf(
+            key, start, elements, output_port)
+
+def load_engine_wf(key, wf, module_id):
+    """Loads a workflow on this engine, unless it is already loaded.
+    """
+    if key in _engine_workflows:
+        _touch_engine_wf(key)
+        return
+    pipeline = unserialize(wf, Pipeline)
+
+    # Build a Vistrail from this single Pipeline
+    vistrail = Vistrail()
+    action_list = []
+    for module in pipeline.module_list:
+        action_list.append(('add', module))
+    for connection in pipeline.connection_list:
+        action_list.append(('add', connection))
+    action = vistrails.core.db.action.create_action(action_list)
+
+    vistrail.add_action(action, 0L)
+    vistrail.update_id_scope()
+    tag = 'parallel flow'
+    vistrail.addTag(tag, action.id)
+
+    controller = VistrailController()
+    controller.set_vistrail(vistrail, None)
+    controller.change_selected_version(vistrail.get_version_number(tag))
+    _engine_workflows[key] = controller, module_id
+    _engine_workflows_order.append(key)
+    while len(_engine_workflows_order) > MAX_ENGINE_WORKFLOWS:
+        old_controller, _ = _engine_workflows.pop(
+                _engine_workflows_order.popleft())
+        old_controller.close_vistrail(None)
+
+def execute_engine_wf(key, start, elements, output_port):
+    """Executes a workflow loaded by load_engine_wf() for each element.
+
+    Each element is a list of (port_name, type, value) to set on the module.
+    Returns start and the list of results, in the same format as
+    execute_wf().
+    """
+    controller, module_id = _engine_workflows[key]
+    _touch_engine_wf(key)
+    base_module = controller.current_pipeline.modules[module_id]
+    if base_module.functions:
+        high_id = max(function.db_id for function in base_module.functions)
+    else:
+        high_id = 0
+
+    results = []
+    for element in elements:
+        module = base_module.do_copy()
+        for i, (port_name, type, value) in enumerate(element):
+            mod_function = ModuleFunction(id=high_id + 1 + i,
+                                          pos=0,
+                                          name=port_name)
+            mod_function.add_parameter(ModuleParam(id=0L,
+                                                   pos=0,
+                                                   type=type,
+                                                   val=value))
+            module.add_function(mod_function)
+        pipeline = Pipeline()
+        pipeline.add_module(module)
+
+        execution, _ = controller.execute_workflow_list([(
+                None, controller.current_version, pipeline, DummyView(),
+                None, None, 'API Pipeline Execution', None, None)])
+        results.append(get_engine_result(controller, pipeline, execution[0],
+                                         output_port))
+        # Only the log of the latest execution is needed
+        controller.log.delete_all_workflow_execs()
+    return start, results
+
+def get_engine_result(controller, pipeline, execution, output_port):
+    """Builds the result of an execution, sent back to the client.
+    """
+    errors = []
+    if execution.errors:
+        for key in execution.errors:
+            module = pipeline.modules[key]
+            errors.append('%s: %s' % (module.name, execution.errors[key]))
+
+    # Get the execution log from the controller
+    xml_log = machine_log = None
+    if controller.logging_on():
+        try:
+            workflow_exec = controller.log.workflow_execs[-1]
+            module_log = workflow_exec.item_execs[0]
+        except IndexError:
+            errors.append("Module log not found")
+            return dict(errors=errors)
+        machine = workflow_exec.machines[module_log.machine_id]
+        xml_log = serialize(module_log)
+        machine_log = serialize(machine)
+
+    # Get the output value
+    output = None
+    serializable = None
+    if not execution.errors:
+        executed_module, = execution.executed
+        executed_module = execution.objects[executed_module]
+        try:
+            output = executed_module.get_output(output_port)
+        except ModuleError:
+            errors.append("Output port not found: %s" % output_port)
+            return dict(errors=errors)
+        reg = vistrails.core.modules.module_registry.get_module_registry()
+        if isinstance(output, Module):
+            serializable = reg.get_descriptor(type(output)).sigstring
+            output = output.serialize()
+
+    return dict(errors=errors,
+                output=output,
+                serializable=serializable,
+                xml_log=xml_log,
+                machine_log=machine_log)
+
 ###############################################################################
 
 _ansi_code = re.compile(r'%s(?:(?:\[[^A-Za-z]*[A-Za-z])|[^\[])' % '\x1B')
@@ -149,11 +308,15 @@ def strip_ansi_codes(s):
 # Map Operator
 #
 class Map(Module):
-    """The Map Module executes a map operator in parallel on IPython engines.
+    """The Map Module executes a map operator in parallel on IPython engines,
+    or on local worker processes if no IPython cluster is configured.
 
     The FunctionPort should be connected to the 'self' output of the module you
     want to execute.
     The InputList is the list of values to be scattered on the engines.
+    If BatchSize is set, the module is only loaded once on each engine, which
+    then receives the input values by batches of that size and doesn't clear
+    its cache between them.
     """
     def __init__(self):
         Module.__init__(self)
@@ -194,129 +357,71 @@ class Map(Module):
                                   e_msg)
                 for e_type, e_msg, tb, infos in e.elist)
 
-    def updateFunctionPort(self):
+    def get_function_module(self, connector):
+        """Gets a copy of the module connected to FunctionPort, as it should
+        be sent to the engines.
         """
-        Function to be used inside the updateUsptream method of the Map module. It
-        updates the module connected to the FunctionPort port, executing it in
-        parallel.
+        original_pipeline = connector.obj.moduleInfo['pipeline']
+        module_id = connector.obj.moduleInfo['moduleId']
+        vtType = original_pipeline.modules[module_id].vtType
+
+        pipeline_db_module = original_pipeline.modules[module_id].do_copy()
+
+        # transforming a subworkflow in a group
+        # TODO: should we also transform inner subworkflows?
+        if pipeline_db_module.is_abstraction():
+            group = Group(id=pipeline_db_module.id,
+                          cache=pipeline_db_module.cache,
+                          location=pipeline_db_module.location,
+                          functions=pipeline_db_module.functions,
+                          annotations=pipeline_db_module.annotations)
+
+            source_port_specs = pipeline_db_module.sourcePorts()
+            dest_port_specs = pipeline_db_module.destinationPorts()
+            for source_port_spec in source_port_specs:
+                group.add_port_spec(source_port_spec)
+            for dest_port_spec in dest_port_specs:
+                group.add_port_spec(dest_port_spec)
+
+            group.pipeline = pipeline_db_module.pipeline
+            pipeline_db_module = group
+
+        return pipeline_db_module, vtType
+
+    def get_input_types(self, pipeline_db_module, nameInput):
+        """Gets the type of the parameters to set on each input port.
+        """
+        types = []
+        for inputPort in nameInput:
+            p_spec = pipeline_db_module.get_port_spec(inputPort, 'input')
+            descrs = p_spec.descriptors()
+            if len(descrs) != 1:
+                raise ModuleError(
+                        self,
+                        "Tuple input ports are not supported")
+            if not issubclass(descrs[0].module, Constant):
+                raise ModuleError(
+                        self,
+                        "Module inputs should be Constant types")
+            types.append(p_spec.sigstring[1:-1])
+        return types
+
+    def get_executor(self):
+        """Gets the executor to run on, initializing the IPython engines if
+        needed.
+
+        Local worker processes are used unless an IPython cluster is
+        configured.
         """
-        nameInput = self.get_input('InputPort')
-        nameOutput = self.get_input('OutputPort')
-        rawInputList = self.get_input('InputList')
-
-        # Create inputList to always have iterable elements
-        # to simplify code
-        if len(nameInput) == 1:
-            element_is_iter = False
-            inputList = [[element] for element in rawInputList]
-        else:
-            element_is_iter = True
-            inputList = rawInputList
-
-        workflows = []
-        module = None
-        vtType = None
-
-        # iterating through the connectors
-        for connector in self.inputPorts.get('FunctionPort'):
-            module = connector.obj
-
-            # pipeline
-            original_pipeline = connector.obj.moduleInfo['pipeline']
-
-            # module
-            module_id = connector.obj.moduleInfo['moduleId']
-            vtType = original_pipeline.modules[module_id].vtType
-
-            # serialize the module for each value in the list
-            for i, element in enumerate(inputList):
-                if element_is_iter:
-                    self.element = element
-                else:
-                    self.element = element[0]
-
-                # checking type and setting input in the module
-                self.typeChecking(connector.obj, nameInput, inputList)
-                self.setInputValues(connector.obj, nameInput, element, i)
-
-                pipeline_db_module = original_pipeline.modules[module_id].do_copy()
-
-                # transforming a subworkflow in a group
-                # TODO: should we also transform inner subworkflows?
-                if pipeline_db_module.is_abstraction():
-                    group = Group(id=pipeline_db_module.id,
-                                  cache=pipeline_db_module.cache,
-                                  location=pipeline_db_module.location,
-                                  functions=pipeline_db_module.functions,
-                                  annotations=pipeline_db_module.annotations)
-
-                    source_port_specs = pipeline_db_module.sourcePorts()
-                    dest_port_specs = pipeline_db_module.destinationPorts()
-                    for source_port_spec in source_port_specs:
-                        group.add_port_spec(source_port_spec)
-                    for dest_port_spec in dest_port_specs:
-                        group.add_port_spec(dest_port_spec)
-
-                    group.pipeline = pipeline_db_module.pipeline
-                    pipeline_db_module = group
-
-                # getting highest id between functions to guarantee unique ids
-                # TODO: can get current IdScope here?
-                if pipeline_db_module.functions:
-                    high_id = max(function.db_id
-                                  for function in pipeline_db_module.functions)
-                else:
-                    high_id = 0
-
-                # adding function and parameter to module in pipeline
-                # TODO: 'pos' should not be always 0 here
-                id_scope = IdScope(beginId=long(high_id+1))
-                for elementValue, inputPort in izip(element, nameInput):
-
-                    p_spec = pipeline_db_module.get_port_spec(inputPort, 'input')
-                    descrs = p_spec.descriptors()
-                    if len(descrs) != 1:
-                        raise ModuleError(
-                                self,
-                                "Tuple input ports are not supported")
-                    if not issubclass(descrs[0].module, Constant):
-                        raise ModuleError(
-                                self,
-                                "Module inputs should be Constant types")
-                    type = p_spec.sigstring[1:-1]
-
-                    mod_function = ModuleFunction(id=id_scope.getNewId(ModuleFunction.vtType),
-                                                  pos=0,
-                                                  name=inputPort)
-                    mod_param = ModuleParam(id=0L,
-                                            pos=0,
-                                            type=type,
-                                            val=elementValue)
-
-                    mod_function.add_parameter(mod_param)
-                    pipeline_db_module.add_function(mod_function)
-
-                # serializing module
-                wf = self.serialize_module(pipeline_db_module)
-                workflows.append(wf)
-
-            # getting first connector, ignoring the rest
-            break
-
-        # IPython stuff
         try:
-            rc = get_client()
+            executor = get_executor(ask=True)
         except Exception, error:
             raise ModuleError(self, "Exception while loading IPython: %s" %
                               debug.format_exception(error))
-        if rc is None:
-            raise ModuleError(self, "Couldn't get an IPython connection")
+        if not isinstance(executor, IPythonExecutor):
+            return executor
+        rc = executor.client
         engines = rc.ids
-        if not engines:
-            raise ModuleError(
-                    self,
-                    "Exception while loading IPython: No IPython engines "
-                    "detected!")
 
         # initializes each engine
         # importing modules and initializing the VisTrails application
@@ -361,18 +466,97 @@ class Map(Module):
 
             init_view['init'] = True
 
+        return executor
+
+    def updateFunctionPort(self):
+        """
+        Function to be used inside the updateUsptream method of the Map module. It
+        updates the module connected to the FunctionPort port, executing it in
+        parallel.
+        """
+        nameInput = self.get_input('InputPort')
+        nameOutput = self.get_input('OutputPort')
+        rawInputList = self.get_input('InputList')
+
+        # Create inputList to always have iterable elements
+        # to simplify code
+        if len(nameInput) == 1:
+            element_is_iter = False
+            inputList = [[element] for element in rawInputList]
+        else:
+            element_is_iter = True
+            inputList = rawInputList
+
+        # getting first connector, ignoring the rest
+        connector = self.inputPorts.get('FunctionPort')[0]
+        module = connector.obj
+
+        batch_size = self.force_get_input('BatchSize', None)
+        if batch_size is not None:
+            self.update_batched(connector, nameInput, nameOutput, inputList,
+                                batch_size)
+            return
+
+        workflows = []
+
+        # serialize the module for each value in the list
+        for i, element in enumerate(inputList):
+            if element_is_iter:
+                self.element = element
+            else:
+                self.element = element[0]
+
+            # checking type and setting input in the module
+            self.typeChecking(connector.obj, nameInput, inputList)
+            self.setInputValues(connector.obj, nameInput, element, i)
+
+            pipeline_db_module, vtType = self.get_function_module(connector)
+            types = self.get_input_types(pipeline_db_module, nameInput)
+
+            # getting highest id between functions to guarantee unique ids
+            # TODO: can get current IdScope here?
+            if pipeline_db_module.functions:
+                high_id = max(function.db_id
+                              for function in pipeline_db_module.functions)
+            else:
+                high_id = 0
+
+            # adding function and parameter to module in pipeline
+            # TODO: 'pos' should not be always 0 here
+            id_scope = IdScope(beginId=long(high_id+1))
+            for elementValue, inputPort, type in izip(element, nameInput,
+                                                      types):
+                mod_function = ModuleFunction(id=id_scope.getNewId(ModuleFunction.vtType),
+                                              pos=0,
+                                              name=inputPort)
+                mod_param = ModuleParam(id=0L,
+                                        pos=0,
+                                        type=type,
+                                        val=elementValue)
+
+                mod_function.add_parameter(mod_param)
+                pipeline_db_module.add_function(mod_function)
+
+            # serializing module
+            wf = self.serialize_module(pipeline_db_module)
+            workflows.append(wf)
+
+        executor = self.get_executor()
+
         # setting computing color
         module.logging.set_computing(module)
 
         # executing function in engines
         # each map returns a dictionary
         try:
-            ldview = rc.load_balanced_view()
-            map_result = ldview.map_sync(execute_wf, workflows, [nameOutput]*len(workflows))
+            map_result = executor.map_sync(execute_wf, workflows, [nameOutput]*len(workflows))
         except CompositeError, e:
             self.print_compositeerror(e)
             raise ModuleError(self, "Error from IPython engines:\n"
                               "%s" % self.list_exceptions(e))
+        except ExecutionError, e:
+            sys.stderr.write("%s\n" % e.traceback)
+            raise ModuleError(self, "Error from worker process:\n%s" % e)
 
         # verifying errors
         errors = []
@@ -389,59 +573,151 @@ class Map(Module):
         # setting success color
         module.logging.signalSuccess(module)
 
-        reg = vistrails.core.modules.module_registry.get_module_registry()
-        self.result = []
-        for map_execution in map_result:
-            serializable = map_execution['serializable']
-            output = None
-            if not serializable:
-                output = map_execution['output']
-            else:
-                d_tuple = vistrails.core.modules.utils.parse_descriptor_string(serializable)
-                d = reg.get_descriptor_by_name(*d_tuple)
-                module_klass = d.module
-                output = module_klass().deserialize(map_execution['output'])
-            self.result.append(output)
+        self.result = [self.get_map_output(map_execution)
+                       for map_execution in map_result]
 
         # including execution logs
-        for engine in range(len(map_result)):
-            log = map_result[engine]['xml_log']
-            exec_ = None
-            if (vtType == 'abstraction') or (vtType == 'group'):
-                exec_ = unserialize(log, GroupExec)
-            elif (vtType == 'module'):
-                exec_ = unserialize(log, ModuleExec)
-            else:
-                # something is wrong...
-                continue
+        for map_execution in map_result:
+            self.add_map_log(map_execution, vtType)
+
+    def update_batched(self, connector, nameInput, nameOutput, inputList,
+                       batch_size):
+        """Executes the module connected to FunctionPort on warm engines.
+
+        The module is sent once to each engine, then only the values of the
+        input ports are sent, batch_size elements at a time. Results are
+        handled as batches complete.
+        """
+        module = connector.obj
+        self.typeChecking(module, nameInput, inputList)
+        if not inputList:
+            self.result = []
+            return
+
+        pipeline_db_module, vtType = self.get_function_module(connector)
+        types = self.get_input_types(pipeline_db_module, nameInput)
+        wf = self.serialize_module(pipeline_db_module)
+        key = sha1_hash(wf).hexdigest()
+
+        reg = vistrails.core.modules.module_registry.get_module_registry()
+        elements = []
+        for element in inputList:
+            values = []
+            for elementValue, inputPort, type in izip(element, nameInput,
+                                                      types):
+                descriptor = reg.get_descriptor_by_name(
+                        *vistrails.core.modules.utils.parse_descriptor_string(
+                                type))
+                values.append((inputPort, type,
+                               descriptor.module.translate_to_string(
+                                       elementValue)))
+            elements.append(values)
+
+        executor = self.get_executor()
+
+        # setting computing color
+        module.logging.set_computing(module)
+
+        batch_size = max(batch_size, 1)
+        starts = range(0, len(elements), batch_size)
+        try:
+            executor.apply_all(setup_wf, __name__, key, wf,
+                               pipeline_db_module.id)
+            map_result = executor.map(
+                    execute_wf_batch,
+                    [__name__] * len(starts),
+                    [key] * len(starts),
+                    starts,
+                    [elements[start:start + batch_size] for start in starts],
+                    [nameOutput] * len(starts),
+                    ordered=False)
+
+            self.result = [None] * len(elements)
+            errors = []
+            for start, batch in map_result:
+                for i, map_execution in enumerate(batch, start):
+                    if map_execution['errors']:
+                        errors.append("ModuleError in element %d: '%s'" % (
+                                      i, ', '.join(map_execution['errors'])))
+                        continue
+                    self.result[i] = self.get_map_output(map_execution)
+                    self.add_map_log(map_execution, vtType)
+                self.logging.update_progress(
+                        self, float(start + len(batch)) / len(elements))
+        except CompositeError, e:
+            self.print_compositeerror(e)
+            raise ModuleError(self, "Error from IPython engines:\n"
+                              "%s" % self.list_exceptions(e))
+        except RemoteError, e:
+            sys.stderr.write("%s\n" % strip_ansi_codes(e.traceback))
+            raise ModuleError(self, "Error from IPython engine:\n"
+                              "%s: %s" % (e.ename, e.evalue))
+        except ExecutionError, e:
+            sys.stderr.write("%s\n" % e.traceback)
+            raise ModuleError(self, "Error from worker process:\n%s" % e)
+
+        if errors:
+            raise ModuleError(self, '\n'.join(errors))
+
+        # setting success color
+        module.logging.signalSuccess(module)
+
+    def get_map_output(self, map_execution):
+        """Gets the output value from the result of an engine.
+        """
+        serializable = map_execution['serializable']
+        if not serializable:
+            return map_execution['output']
+        else:
+            reg = vistrails.core.modules.module_registry.get_module_registry()
+            d_tuple = vistrails.core.modules.utils.parse_descriptor_string(serializable)
+            d = reg.get_descriptor_by_name(*d_tuple)
+            module_klass = d.module
+            return module_klass().deserialize(map_execution['output'])
+
+    def add_map_log(self, map_execution, vtType):
+        """Adds the execution log from the result of an engine to ours.
+        """
+        log = map_execution['xml_log']
+        if log is None or not hasattr(self.logging.log, 'log'):
+            # execution is not being logged (DummyLogController)
+            return
+        exec_ = None
+        if (vtType == 'abstraction') or (vtType == 'group'):
+            exec_ = unserialize(log, GroupExec)
+        elif (vtType == 'module'):
+            exec_ = unserialize(log, ModuleExec)
+        else:
+            # something is wrong...
+            return
 
-            # assigning new ids to existing annotations
-            exec_annotations = exec_.annotations
-            for i in range(len(exec_annotations)):
-                exec_annotations[i].id = self.logging.log.log.id_scope.getNewId(Annotation.vtType)
+        # assigning new ids to existing annotations
+        exec_annotations = exec_.annotations
+        for i in range(len(exec_annotations)):
+            exec_annotations[i].id = self.logging.log.log.id_scope.getNewId(Annotation.vtType)
 
-            parallel_annotation = Annotation(key='parallel_execution', value=True)
-            parallel_annotation.id = self.logging.log.log.id_scope.getNewId(Annotation.vtType)
-            annotations = [parallel_annotation] + exec_annotations
-            exec_.annotations = annotations
+        parallel_annotation = Annotation(key='parallel_execution', value=True)
+        parallel_annotation.id = self.logging.log.log.id_scope.getNewId(Annotation.vtType)
+        annotations = [parallel_annotation] + exec_annotations
+        exec_.annotations = annotations
 
-            # before adding the execution log, we need to get the machine information
-            machine = unserialize(map_result[engine]['machine_log'], Machine)
-            machine_id = self.logging.add_machine(machine)
+        # before adding the execution log, we need to get the machine information
+        machine = unserialize(map_execution['machine_log'], Machine)
+        machine_id = self.logging.add_machine(machine)
 
-            # recursively add machine information to execution items
-            def add_machine_recursive(exec_):
-                for item in exec_.item_execs:
-                    if hasattr(item, 'machine_id'):
-                        item.machine_id = machine_id
-                        if item.vtType in ('abstraction', 'group'):
-                            add_machine_recursive(item)
+        # recursively add machine information to execution items
+        def add_machine_recursive(exec_):
+            for item in exec_.item_execs:
+                if hasattr(item, 'machine_id'):
+                    item.machine_id = machine_id
+                    if item.vtType in ('abstraction', 'group'):
+                        add_machine_recursive(item)
 
-            exec_.machine_id = machine_id
-            if (vtType == 'abstraction') or (vtType == 'group'):
-                add_machine_recursive(exec_)
+        exec_.machine_id = machine_id
+        if (vtType == 'abstraction') or (vtType == 'group'):
+            add_machine_recursive(exec_)
 
-            self.logging.add_exec(exec_)
+        self.logging.add_exec(exec_)
 
 
     def serialize_module(self, module):
@@ -520,3 +796,42 @@ def get_module(value, signature):
         debug.warning("Could not identify the type of the list element.")
         debug.warning("Type checking is not going to be done inside Map module.")
         return None
+
+
+###############################################################################
+
+import unittest
+
+
+class TestEngineWorkflows(unittest.TestCase):
+    def setUp(self):
+        self.old_workflows = _engine_workflows.copy()
+        self.old_order = list(_engine_workflows_order)
+        _engine_workflows.clear()
+        _engine_workflows_order.clear()
+
+    def tearDown(self):
+        _engine_workflows.clear()
+        _engine_workflows.update(self.old_workflows)
+        _engine_workflows_order.clear()
+        _engine_workflows_order.extend(self.old_order)
+
+    def test_eviction(self):
+        """Only the most recently used workflows are kept.
+        """
+        from vistrails.core.system import get_vistrails_basic_pkg_id
+        from vistrails.core.vistrail.module import Module as PipelineModule
+        pipeline = Pipeline()
+        pipeline.add_module(PipelineModule(
+                id=0, name='String', package=get_vistrails_basic_pkg_id()))
+        wf = serialize(pipeline)
+        for i in xrange(MAX_ENGINE_WORKFLOWS):
+            load_engine_wf('wf%d' % i, wf, 0)
+        controller = _engine_workflows['wf0'][0]
+        # Using wf0 again keeps it, wf1 is evicted instead
+        load_engine_wf('wf0', wf, 0)
+        load_engine_wf('new', wf, 0)
+        self.assertEqual(len(_engine_workflows), MAX_ENGINE_WORKFLOWS)
+        self.assertNotIn('wf1', _engine_workflows)
+        self.assertIs(_engine_workflows['wf0'][0], controller)
+        self.assertEqual(list(_engine_workflows_order)[-2:], ['wf0', 'new'])
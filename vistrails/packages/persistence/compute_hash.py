@@ -41,7 +41,15 @@ except ImportError:
     import sha
     sha_hash = sha.new
 
-def compute_hash(persistent_path, is_dir=None):
+from hash_index import SHA1
+
+def compute_hash(persistent_path, is_dir=None, hash_index=None):
+    """Computes the sha1 of a file, or of the names and contents of the
+    files in a directory.
+
+    If a HashIndex is given, the hash is only computed again if the file or
+    one of the files in the directory changed.
+    """
     def hash_file(filename, hasher):
         f = open(filename, 'rb')
         while True:
@@ -50,7 +58,16 @@ def compute_hash(persistent_path, is_dir=None):
                 break
             hasher.update(block)
 
-    sha_hasher = sha_hash()
+    def hash_files(base_dir, fnames):
+        sha_hasher = sha_hash()
+        # hash filenames and files to ensure directory structure
+        # is accounted for
+        for fname in fnames:
+            # print fname
+            sha_hasher.update(fname)
+            hash_file(os.path.join(base_dir, fname), sha_hasher)
+        return sha_hasher.hexdigest()
+
     if is_dir is None:
         is_dir = os.path.isdir(persistent_path)
     if is_dir:
@@ -67,15 +84,17 @@ def compute_hash(persistent_path, is_dir=None):
                 else:
                     fnames.append(name)
 
-        # hash filenames and files to ensure directory structure
-        # is accounted for
-        for fname in fnames:
-            # print fname
-            sha_hasher.update(fname)
-            hash_file(os.path.join(base_dir, fname), sha_hasher)
+        if hash_index is not None:
+            return hash_index.directory_hash(
+                    base_dir, fnames,
+                    lambda dirname: hash_files(dirname, fnames))
+        return hash_files(base_dir, fnames)
     else:
+        if hash_index is not None:
+            return hash_index.file_hash(persistent_path, SHA1)
+        sha_hasher = sha_hash()
         hash_file(persistent_path, sha_hasher)
-    return sha_hasher.hexdigest()
+        return sha_hasher.hexdigest()
 
 if __name__ == '__main__':
     import sys
@@ -44,6 +44,7 @@ if vistrails_src not in sys.path:
     sys.path.append(vistrails_src)
 
 import vistrails.db.services.io
+from vistrails.db.services.log_store import open_log_store
 
 from identifiers import identifier as persistence_pkg, \
     old_identifiers as persistence_old_ids
@@ -56,7 +57,6 @@ def find_files(filename, version=None):
     vistrail = save_bundle.vistrail
     # FIXME hack for now, should change in the future
     log_fname = vistrail.db_log_filename
-    log = vistrails.db.services.io.open_log_from_xml(log_fname, True)
 
     if version:
         if isinstance(version, basestring):
@@ -75,10 +75,14 @@ def find_files(filename, version=None):
                 
     filenames = {}
     tags = {}
-    for workflow_exec in log.db_workflow_execs:
+    # the executions of the version are looked up in the indexed log
+    store = open_log_store(log_fname)
+    try:
+        workflow_execs = store.find(parent_version=version)
+    finally:
+        store.close()
+    for workflow_exec in workflow_execs:
         cur_version = workflow_exec.db_parent_version
-        if version is not None and cur_version != version:
-            continue
         if cur_version in vistrail.db_tags_id_index:
             tags[cur_version] = vistrail.db_tags_id_index[cur_version].db_name
         
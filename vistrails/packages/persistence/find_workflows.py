@@ -50,9 +50,16 @@ if vistrails_src not in sys.path:
     sys.path.append(vistrails_src)
     
 import vistrails.db.services.io    
+from vistrails.db.services.log_store import open_log_store
+
+import repo
 
 def find_workflows(path_name, vistrail_dir):
-    file_hash = compute_hash(path_name)
+    # the index of the local repository avoids reading unchanged files
+    hash_index = None
+    if repo.get_current_repo() is not None:
+        hash_index = repo.get_current_repo().hash_index
+    file_hash = compute_hash(path_name, hash_index=hash_index)
     vt_files = []
     dir_stack = [vistrail_dir]
     while dir_stack:
@@ -70,7 +77,11 @@ def find_workflows(path_name, vistrail_dir):
             vistrails.db.services.io.open_vistrail_bundle_from_zip_xml(filename)
         vistrail = save_bundle.vistrail
         log_fname = vistrail.db_log_filename
-        log = vistrails.db.services.io.open_log_from_xml(log_fname, True)
+        store = open_log_store(log_fname)
+        try:
+            workflow_execs = store.find()
+        finally:
+            store.close()
         
         persistent_module_ids = set()
         for action in vistrail.db_actions:
@@ -83,7 +94,7 @@ def find_workflows(path_name, vistrail_dir):
 
         execs = {}
         tags = {}
-        for workflow_exec in log.db_workflow_execs:
+        for workflow_exec in workflow_execs:
             cur_version = workflow_exec.db_parent_version
             if cur_version in vistrail.db_tags_id_index:
                 tags[cur_version] = \
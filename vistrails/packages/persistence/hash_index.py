@@ -0,0 +1,327 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Index of the hashes of persistent files.
+
+Hashing a large file or directory means reading every byte of it, which
+happened each time a persistent path was checked. The index records the
+hash of each file along with its size, modification time and inode; a file
+for which those haven't changed is not read again.
+
+The files that do need hashing are hashed in parallel, in threads (hashlib
+releases the GIL while hashing).
+"""
+
+import hashlib
+from multiprocessing.pool import ThreadPool
+import os
+import sqlite3
+import sys
+import time
+
+
+# Kinds of hashes kept in the index
+GIT_BLOB = 'git-blob'   # what git computes for a file (see git_blob_hash)
+SHA1 = 'sha1'           # sha1 of the content of a file
+SHA1_DIR = 'sha1-dir'   # compute_hash() of a directory
+
+# Files modified this recently are not recorded, as they might still be
+# changed without their modification time changing
+RACY_DELAY = 2.0
+
+
+def git_blob_hash(filename, chunk_size=1<<16):
+    """Computes the hash git gives to a file, i.e. the sha1 of the file's
+    content prefixed with the 'blob <size>\\0' header.
+    """
+    hasher = hashlib.sha1('blob %d\0' % os.path.getsize(filename))
+    with open(filename, 'rb') as fp:
+        for block in iter(lambda: fp.read(chunk_size), ''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+def sha1_file(filename, chunk_size=1<<16):
+    hasher = hashlib.sha1()
+    with open(filename, 'rb') as fp:
+        for block in iter(lambda: fp.read(chunk_size), ''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+hash_functions = {GIT_BLOB: git_blob_hash, SHA1: sha1_file}
+
+def db_path(path):
+    """Returns the path as unicode, as it is stored in the database.
+    """
+    if isinstance(path, bytes):
+        return path.decode(sys.getfilesystemencoding() or 'utf-8',
+                           'replace')
+    return path
+
+
+class HashIndex(object):
+    """Keeps the hashes of files in a SQLite database.
+
+    An entry is used if the path, size, modification time and inode of the
+    file are the same as when it was hashed. Directories get an entry whose
+    stamp is a digest of the same information for all the files they
+    contain.
+    """
+    def __init__(self, filename, workers=None):
+        self.filename = filename
+        if workers is None:
+            try:
+                import multiprocessing
+                workers = multiprocessing.cpu_count()
+            except NotImplementedError:
+                workers = 1
+        self.workers = workers
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS hashes ("
+                          "path TEXT NOT NULL, "
+                          "kind TEXT NOT NULL, "
+                          "size INTEGER NOT NULL, "
+                          "mtime REAL NOT NULL, "
+                          "inode INTEGER NOT NULL, "
+                          "stamp TEXT, "
+                          "hash TEXT NOT NULL, "
+                          "PRIMARY KEY (path, kind))")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def _key(st):
+        return (st.st_size, st.st_mtime, st.st_ino)
+
+    def _lookup(self, kind, paths):
+        """Gets the entries for paths, as a dict path -> (key, stamp, hash).
+
+        The paths in the result are unicode (see db_path()).
+        """
+        paths = [db_path(p) for p in paths]
+        if len(paths) == 1:
+            rows = self.conn.execute(
+                    "SELECT path, size, mtime, inode, stamp, hash "
+                    "FROM hashes WHERE kind = ? AND path = ?",
+                    (kind, paths[0]))
+        else:
+            # Reads all the entries under the common directory
+            prefix = os.path.commonprefix(paths)
+            rows = self.conn.execute(
+                    "SELECT path, size, mtime, inode, stamp, hash "
+                    "FROM hashes WHERE kind = ? AND path >= ? AND path < ?",
+                    (kind, prefix, prefix + u'\U0010ffff'))
+        return dict((path, ((size, mtime, inode), stamp, str(hash_)))
+                    for path, size, mtime, inode, stamp, hash_ in rows)
+
+    def _store(self, kind, entries):
+        """Records entries, a list of (path, key, stamp, hash).
+        """
+        limit = time.time() - RACY_DELAY
+        rows = [(db_path(path), kind, key[0], key[1], key[2], stamp, hash_)
+                for path, key, stamp, hash_ in entries
+                if key[1] < limit]
+        if rows:
+            self.conn.executemany(
+                    "INSERT OR REPLACE INTO hashes(path, kind, size, mtime, "
+                    "inode, stamp, hash) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows)
+            self.conn.commit()
+
+    def file_hashes(self, filenames, kind=GIT_BLOB):
+        """Returns the hashes of files, as a dict filename -> hash.
+
+        Only the files that changed since they were last hashed are read;
+        they are hashed in parallel.
+        """
+        filenames = [os.path.abspath(f) for f in filenames]
+        if not filenames:
+            return {}
+        keys = dict((f, self._key(os.stat(f))) for f in filenames)
+        known = self._lookup(kind, filenames)
+        hashes = {}
+        todo = []
+        for filename in filenames:
+            entry = known.get(db_path(filename))
+            if entry is not None and entry[0] == keys[filename]:
+                hashes[filename] = entry[2]
+            else:
+                todo.append(filename)
+
+        function = hash_functions[kind]
+        if len(todo) > 1 and self.workers > 1:
+            pool = ThreadPool(min(self.workers, len(todo)))
+            try:
+                new_hashes = pool.map(function, todo)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            new_hashes = map(function, todo)
+
+        self._store(kind, [(filename, keys[filename], None, hash_)
+                           for filename, hash_ in zip(todo, new_hashes)])
+        hashes.update(zip(todo, new_hashes))
+        return hashes
+
+    def file_hash(self, filename, kind=GIT_BLOB):
+        filename = os.path.abspath(filename)
+        return self.file_hashes([filename], kind)[filename]
+
+    def directory_hash(self, dirname, fnames, function, kind=SHA1_DIR):
+        """Returns the hash of a directory, calling function(dirname) to
+        compute it if any of the files in it changed.
+
+        fnames are the files in the directory, relative to it. Note that a
+        change to any file means function reads all of them again: the hash
+        of a directory is a single sha1 over all the names and contents, so
+        it can't be built from the hashes of the files.
+        """
+        dirname = os.path.abspath(dirname)
+        stamp, latest = directory_stamp(dirname, fnames)
+        key = (len(fnames), latest, os.stat(dirname).st_ino)
+        entry = self._lookup(kind, [dirname]).get(db_path(dirname))
+        if entry is not None and entry[0] == key and entry[1] == stamp:
+            return entry[2]
+        hash_ = function(dirname)
+        self._store(kind, [(dirname, key, stamp, hash_)])
+        return hash_
+
+
+def directory_stamp(base_dir, fnames):
+    """Digests the names, sizes, modification times and inodes of files.
+
+    It is used to know if anything changed in a directory; fnames are
+    relative to base_dir. Returns the digest and the latest modification
+    time.
+    """
+    hasher = hashlib.sha1()
+    latest = 0
+    for fname in fnames:
+        st = os.stat(os.path.join(base_dir, fname))
+        hasher.update('%s\0%d\0%r\0%d\0' % (fname, st.st_size, st.st_mtime,
+                                            st.st_ino))
+        latest = max(latest, st.st_mtime)
+    return hasher.hexdigest(), latest
+
+
+##############################################################################
+
+import shutil
+import tempfile
+import unittest
+
+
+class TestHashIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='vt_hash_index_')
+        self.index = HashIndex(os.path.join(self.directory, 'index.db'),
+                               workers=2)
+        self.files = []
+        for i in xrange(3):
+            filename = os.path.join(self.directory, 'file%d' % i)
+            with open(filename, 'wb') as fp:
+                fp.write('hello\n' * i)
+            # Not so recent that they wouldn't be recorded
+            os.utime(filename, (time.time() - 10, time.time() - 10))
+            self.files.append(filename)
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def test_git_hash(self):
+        # Same as 'git hash-object'
+        self.assertEqual(git_blob_hash(self.files[1]),
+                         'ce013625030ba8dba906f756967f9e9ca394464a')
+        self.assertEqual(git_blob_hash(self.files[0]),
+                         'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391')
+
+    def test_index(self):
+        hashes = self.index.file_hashes(self.files)
+        self.assertEqual(hashes, dict((f, git_blob_hash(f))
+                                      for f in self.files))
+        self.assertEqual(self.index.file_hash(self.files[2], SHA1),
+                         hashlib.sha1('hello\n' * 2).hexdigest())
+
+        # Unchanged files are not read again
+        called = []
+        def function(filename):
+            called.append(filename)
+            return git_blob_hash(filename)
+        old_function = hash_functions[GIT_BLOB]
+        hash_functions[GIT_BLOB] = function
+        try:
+            self.assertEqual(self.index.file_hashes(self.files), hashes)
+            self.assertEqual(called, [])
+
+            with open(self.files[1], 'ab') as fp:
+                fp.write('world\n')
+            os.utime(self.files[1], (time.time() - 5, time.time() - 5))
+            new_hashes = self.index.file_hashes(self.files)
+            self.assertEqual(called, [self.files[1]])
+            self.assertNotEqual(new_hashes[self.files[1]],
+                                hashes[self.files[1]])
+        finally:
+            hash_functions[GIT_BLOB] = old_function
+
+    def test_recent_files(self):
+        os.utime(self.files[0], None)
+        self.index.file_hashes(self.files)
+        self.assertEqual(
+                set(self.index._lookup(GIT_BLOB, self.files).keys()),
+                set(db_path(f) for f in self.files[1:]))
+
+    def test_directory(self):
+        fnames = ['file0', 'file1', 'file2']
+        called = []
+        def function(dirname):
+            called.append(dirname)
+            return 'dirhash'
+        for i in xrange(2):
+            self.assertEqual(
+                    self.index.directory_hash(self.directory, fnames,
+                                              function),
+                    'dirhash')
+        self.assertEqual(len(called), 1)
+        self.assertEqual(
+                self.index.directory_hash(self.directory, fnames[1:],
+                                          function),
+                'dirhash')
+        self.assertEqual(len(called), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
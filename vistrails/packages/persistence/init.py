@@ -57,6 +57,7 @@ from widgets import PersistentRefInlineWidget, \
     PersistentInputDirConfiguration, PersistentOutputDirConfiguration, \
     PersistentRefModel, PersistentConfiguration
 from db_utils import DatabaseAccessSingleton
+from hash_index import HashIndex
 import repo
 
 try:
@@ -584,7 +585,12 @@ def initialize():
             except OSError:
                 raise RuntimeError('local_db "%s" does not exist' % local_db)
 
-    local_repo = repo.get_repo(local_db)
+    # The hashes of the files are kept so that unchanged files are not read
+    # every time they are checked
+    hash_index = None
+    if configuration.hash_index:
+        hash_index = HashIndex(os.path.join(local_db, '.hash_index.db'))
+    local_repo = repo.get_repo(local_db, hash_index)
     repo.set_current_repo(local_repo)
 
     debug_print('creating DatabaseAccess')
@@ -616,6 +622,8 @@ def finalize():
             os.remove(fname)
         elif os.path.isdir(fname):
             shutil.rmtree(fname)
+    if repo.get_current_repo().hash_index is not None:
+        repo.get_current_repo().hash_index.close()
     db_access.finalize()
     if _configuration_widget is not None:
         _configuration_widget.deleteLater()
@@ -53,7 +53,7 @@ import stat
 import tempfile
 
 class GitRepo(object):
-    def __init__(self, path):
+    def __init__(self, path, hash_index=None):
         if os.path.exists(path):
             if not os.path.isdir(path):
                 raise IOError('Git repository "%s" must be a directory.' %
@@ -65,6 +65,8 @@ class GitRepo(object):
             self.repo = Repo.init(path, not os.path.exists(path))
     
         self.temp_persist_files = []
+        # HashIndex used to avoid hashing files that didn't change
+        self.hash_index = hash_index
 
     def _get_commit(self, version="HEAD"):
         commit = self.repo[version]
@@ -161,25 +163,51 @@ class GitRepo(object):
             return iter_sha1(my_iter)
 
     @staticmethod
-    def compute_tree_hash(dirname):
+    def list_tree_files(dirname):
+        """Lists the files that compute_tree_hash() hashes.
+        """
+        files = []
+        for entry in sorted(os.listdir(dirname)):
+            fname = os.path.join(dirname, entry)
+            if os.path.isdir(fname):
+                files.extend(GitRepo.list_tree_files(fname))
+            elif os.path.isfile(fname):
+                files.append(fname)
+        return files
+
+    @staticmethod
+    def compute_tree_hash(dirname, hash_index=None, blob_hashes=None):
+        """Computes the hash of the git tree for a directory.
+
+        If a HashIndex is given, the hashes of the files are gotten from it
+        first (which only hashes the files that changed, in parallel).
+        """
+        if hash_index is not None:
+            blob_hashes = hash_index.file_hashes(
+                    GitRepo.list_tree_files(dirname))
         tree = Tree()
         for entry in sorted(os.listdir(dirname)):
             fname = os.path.join(dirname, entry)
             if os.path.isdir(fname):
-                thash = GitRepo.compute_tree_hash(fname)
+                thash = GitRepo.compute_tree_hash(fname,
+                                                  blob_hashes=blob_hashes)
                 mode = stat.S_IFDIR # os.stat(fname)[stat.ST_MODE]
                 tree.add(entry, mode, thash)
             elif os.path.isfile(fname):
-                bhash = GitRepo.compute_blob_hash(fname)
+                if blob_hashes is not None:
+                    bhash = blob_hashes[os.path.abspath(fname)]
+                else:
+                    bhash = GitRepo.compute_blob_hash(fname)
                 mode = os.stat(fname)[stat.ST_MODE]
                 tree.add(entry, mode, bhash)
         return tree.id
 
-    @staticmethod
-    def compute_hash(path):
+    def compute_hash(self, path):
         if os.path.isdir(path):
-            return GitRepo.compute_tree_hash(path)
+            return GitRepo.compute_tree_hash(path, self.hash_index)
         elif os.path.isfile(path):
+            if self.hash_index is not None:
+                return self.hash_index.file_hash(path)
             return GitRepo.compute_blob_hash(path)
         raise TypeError("Do not support this type of path")
 
@@ -230,8 +258,8 @@ def set_current_repo(repo):
     global current_repo
     current_repo = repo
 
-def get_repo(path):
-    return GitRepo(path)
+def get_repo(path, hash_index=None):
+    return GitRepo(path, hash_index)
 
 def run_get_file_test():
     r = GitRepo("/vistrails/src/git")
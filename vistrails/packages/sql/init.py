@@ -33,11 +33,17 @@
 ##
 ###############################################################################
 
+from itertools import izip
 from sqlalchemy.engine import create_engine
 from sqlalchemy.engine.url import URL
 from sqlalchemy.exc import SQLAlchemyError
 import urllib
 
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
 from vistrails.core.db.action import create_action
 from vistrails.core.bundles.installbundle import install
 from vistrails.core import debug
@@ -47,7 +53,11 @@ from vistrails.core.modules.vistrails_module import Module, ModuleError
 from vistrails.core.upgradeworkflow import UpgradeWorkflowHandler
 from vistrails.core.utils import versions_increasing
 
-from vistrails.packages.tabledata.common import TableObject
+from vistrails.packages.tabledata.common import TableObject, ColumnarTable
+
+
+# Engines are kept across executions, so that their connection pool is reused
+_engines = {}
 
 
 class DBConnection(Module):
@@ -55,6 +65,8 @@ class DBConnection(Module):
 
     If the URI you enter uses a driver which is not currently installed,
     VisTrails will try to set it up.
+
+    The engine for each URL is kept, and connections are taken from its pool.
     """
     _input_ports = [('protocol', '(basic:String)'),
                     ('user', '(basic:String)',
@@ -76,6 +88,14 @@ class DBConnection(Module):
                   port=self.force_get_input('port', None),
                   database=self.get_input('db_name'))
 
+        key = str(url)
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = self.create_engine(url)
+
+        self.set_output('connection', engine.connect())
+
+    def create_engine(self, url):
         try:
             engine = create_engine(url)
         except ImportError, e:
@@ -131,16 +151,68 @@ class DBConnection(Module):
                     self,
                     "SQLAlchemy has no support for protocol %r -- are you "
                     "sure you spelled that correctly?" % url.drivername)
+        return engine
+
+
+def fetch_table(results, chunk_size):
+    """Reads a result set by chunks into a table.
+
+    Only one chunk is kept as rows; each chunk is turned into one array per
+    column (or appended to lists, if numpy is not available).
+    """
+    names = results.keys()
+    columns = [[] for name in names]
+    nb_rows = 0
+    while True:
+        rows = results.fetchmany(chunk_size)
+        if not rows:
+            break
+        nb_rows += len(rows)
+        for column, values in izip(columns, izip(*rows)):
+            if numpy is not None:
+                column.append(numpy.array(values))
+            else:
+                column.extend(values)
+    if numpy is None:
+        return TableObject(columns, nb_rows, names)
+    return ColumnarTable([concatenate_chunks(chunks) for chunks in columns],
+                         nb_rows, names)
 
-        self.set_output('connection', engine.connect())
+
+def concatenate_chunks(chunks):
+    """Concatenates the arrays read for a column.
+
+    Chunks of numbers are promoted to a common type; if there is anything
+    else in the column, the result holds Python objects.
+    """
+    if not chunks:
+        return numpy.array([])
+    kinds = set(chunk.dtype.kind for chunk in chunks)
+    if len(kinds) > 1 and not kinds <= set('iuf'):
+        chunks = [chunk.astype(object) for chunk in chunks]
+    return numpy.concatenate(chunks)
 
 
 class SQLSource(Module):
+    """Runs a SQL query on a database connection.
+
+    Input ports added to the module are passed to the query as parameters.
+
+    By default, the whole result set is read, and both outputs are set. For
+    large queries, set chunkSize: rows are then read that many at a time into
+    a columnar table on 'result', and 'resultSet' is not set. If streamRows is
+    set, 'result' is not set and the rows are streamed on 'resultSet' to the
+    downstream modules, reading chunkSize rows at a time (default 1000).
+    """
     _settings = ModuleSettings(configure_widget=
             'vistrails.packages.sql.widgets:SQLSourceConfigurationWidget')
     _input_ports = [('connection', '(DBConnection)'),
                     ('cacheResults', '(basic:Boolean)'),
-                    ('source', '(basic:String)')]
+                    ('source', '(basic:String)'),
+                    ('chunkSize', '(basic:Integer)',
+                     {'optional': True}),
+                    ('streamRows', '(basic:Boolean)',
+                     {'optional': True, 'defaults': "['False']"})]
     _output_ports = [('result', '(org.vistrails.vistrails.tabledata:Table)'),
                      ('resultSet', '(basic:List)')]
 
@@ -154,32 +226,68 @@ class SQLSource(Module):
             self.is_cacheable = lambda: cached
         connection = self.get_input('connection')
         inputs = dict((k, self.get_input(k)) for k in self.inputPorts.iterkeys()
-                  if k not in ('source', 'connection', 'cacheResults'))
+                  if k not in ('source', 'connection', 'cacheResults',
+                               'chunkSize', 'streamRows'))
         s = urllib.unquote(str(self.get_input('source')))
+        chunk_size = self.force_get_input('chunkSize', None)
+        stream = self.get_input('streamRows', allow_default=True)
 
         try:
             transaction = connection.begin()
             results = connection.execute(s, inputs)
-            try:
-                rows = results.fetchall()
-            except Exception:
+            if not getattr(results, 'returns_rows', True):
                 self.set_output('result', None)
                 self.set_output('resultSet', None)
+            elif stream:
+                # The transaction is committed once all rows are read
+                self.set_streaming_output(
+                        'resultSet',
+                        self.stream_rows(transaction, results,
+                                         chunk_size or 1000))
+                return
+            elif chunk_size:
+                self.set_output('result', fetch_table(results, chunk_size))
             else:
-                # results.returns_rows is True
-                # We don't use 'if return_rows' because this attribute didn't
-                # use to exist
-                table = TableObject.from_dicts(rows, results.keys())
-                self.set_output('result', table)
-                self.set_output('resultSet', rows)
+                try:
+                    rows = results.fetchall()
+                except Exception:
+                    self.set_output('result', None)
+                    self.set_output('resultSet', None)
+                else:
+                    # results.returns_rows is True
+                    # We don't use 'if return_rows' because this attribute
+                    # didn't use to exist
+                    table = TableObject.from_dicts(rows, results.keys())
+                    self.set_output('result', table)
+                    self.set_output('resultSet', rows)
             transaction.commit()
         except SQLAlchemyError, e:
             raise ModuleError(self, debug.format_exception(e))
 
+    @staticmethod
+    def stream_rows(transaction, results, chunk_size):
+        try:
+            while True:
+                rows = results.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+        except Exception:
+            transaction.rollback()
+            raise
+        transaction.commit()
+
 
 _modules = [DBConnection, SQLSource]
 
 
+def finalize():
+    for engine in _engines.itervalues():
+        engine.dispose()
+    _engines.clear()
+
+
 def handle_module_upgrade_request(controller, module_id, pipeline):
     # Before 0.0.3, SQLSource's resultSet output was type ListOfElements (which
     #   doesn't exist anymore)
@@ -231,7 +339,156 @@ def handle_module_upgrade_request(controller, module_id, pipeline):
 import unittest
 
 
+class FakeResults(object):
+    """A result set returning the given rows, and failing after `fail_after`
+    chunks if set.
+    """
+    def __init__(self, names, rows, fail_after=None):
+        self.names = names
+        self.rows = rows
+        self.fail_after = fail_after
+        self.fetches = 0
+
+    def keys(self):
+        return self.names
+
+    def fetchmany(self, size):
+        if self.fail_after is not None and self.fetches >= self.fail_after:
+            raise ValueError("connection lost")
+        self.fetches += 1
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+
+class FakeTransaction(object):
+    def __init__(self):
+        self.state = None
+
+    def commit(self):
+        self.state = 'committed'
+
+    def rollback(self):
+        self.state = 'rolled back'
+
+
+class FakeEngine(object):
+    def __init__(self, url):
+        self.url = url
+        self.disposed = False
+
+    def connect(self):
+        return (self, object())
+
+    def dispose(self):
+        self.disposed = True
+
+
 class TestSQL(unittest.TestCase):
+    @unittest.skipIf(numpy is None, "numpy not available")
+    def test_fetch_table(self):
+        """Reads a result set by chunks into a columnar table.
+        """
+        results = FakeResults(['id', 'name', 'value'],
+                              [(1, 'a', 10),
+                               (2, 'b', 20),
+                               (3, 'c', None),
+                               (4, 'd', 40),
+                               (5, 'e', 50)])
+        table = fetch_table(results, 2)
+        self.assertIsInstance(table, ColumnarTable)
+        self.assertEqual(results.fetches, 4)
+        self.assertEqual((table.rows, table.columns), (5, 3))
+        self.assertEqual(table.names, ['id', 'name', 'value'])
+        self.assertEqual(table.get_array(0).dtype.kind, 'i')
+        self.assertEqual(table.get_column(0), [1, 2, 3, 4, 5])
+        self.assertEqual(table.get_column(1), ['a', 'b', 'c', 'd', 'e'])
+        # The chunk with None is of object type, so the column is too
+        self.assertEqual(table.get_array(2).dtype, object)
+        self.assertEqual(table.get_column(2), [10, 20, None, 40, 50])
+
+    @unittest.skipIf(numpy is None, "numpy not available")
+    def test_fetch_table_empty(self):
+        """Reads an empty result set.
+        """
+        table = fetch_table(FakeResults(['id', 'name'], []), 100)
+        self.assertIsInstance(table, ColumnarTable)
+        self.assertEqual((table.rows, table.columns), (0, 2))
+        self.assertEqual(table.get_column(0), [])
+        self.assertEqual(table.get_column(1), [])
+
+    @unittest.skipIf(numpy is None, "numpy not available")
+    def test_concatenate_chunks(self):
+        """Promotes the chunks of a column to a common type.
+        """
+        ints = numpy.array([1, 2])
+        floats = numpy.array([0.5])
+        objects = numpy.array([None, 4])
+        self.assertEqual(concatenate_chunks([ints, floats]).dtype.kind, 'f')
+        column = concatenate_chunks([ints, objects])
+        self.assertEqual(column.dtype, object)
+        self.assertEqual(column.tolist(), [1, 2, None, 4])
+        self.assertEqual(len(concatenate_chunks([])), 0)
+
+    def test_stream_rows(self):
+        """Streams rows, committing the transaction once they are all read.
+        """
+        transaction = FakeTransaction()
+        results = FakeResults(['id'], [(i,) for i in xrange(5)])
+        rows = SQLSource.stream_rows(transaction, results, 2)
+        self.assertEqual(next(rows), (0,))
+        self.assertIsNone(transaction.state)
+        self.assertEqual(list(rows), [(i,) for i in xrange(1, 5)])
+        self.assertEqual(transaction.state, 'committed')
+
+    def test_stream_rows_error(self):
+        """Rolls back the transaction if reading the rows fails.
+        """
+        transaction = FakeTransaction()
+        results = FakeResults(['id'], [(i,) for i in xrange(5)],
+                              fail_after=1)
+        rows = SQLSource.stream_rows(transaction, results, 2)
+        self.assertEqual([next(rows), next(rows)], [(0,), (1,)])
+        self.assertRaises(ValueError, next, rows)
+        self.assertEqual(transaction.state, 'rolled back')
+
+    def test_engine_reuse(self):
+        """Keeps one engine per URL, and disposes of them in finalize().
+        """
+        from vistrails.tests.utils import execute, intercept_result
+        identifier = 'org.vistrails.vistrails.sql'
+
+        created = []
+        def fake_create_engine(module, url):
+            engine = FakeEngine(str(url))
+            created.append(engine)
+            return engine
+
+        old_engines = dict(_engines)
+        _engines.clear()
+        old_create_engine = DBConnection.create_engine
+        DBConnection.create_engine = fake_create_engine
+        try:
+            connections = []
+            for db_name in ('one.db', 'one.db', 'two.db'):
+                with intercept_result(DBConnection, 'connection') as results:
+                    self.assertFalse(execute([
+                            ('DBConnection', identifier, [
+                                ('protocol', [('String', 'sqlite')]),
+                                ('db_name', [('String', db_name)]),
+                            ]),
+                        ]))
+                connections.extend(results)
+            self.assertEqual(len(created), 2)
+            self.assertEqual([c[0] for c in connections],
+                             [created[0], created[0], created[1]])
+            self.assertEqual(sorted(_engines.itervalues()), sorted(created))
+
+            finalize()
+            self.assertEqual(_engines, {})
+            self.assertTrue(all(engine.disposed for engine in created))
+        finally:
+            DBConnection.create_engine = old_create_engine
+            _engines.update(old_engines)
     def test_query_sqlite3(self):
         """Queries a SQLite3 database.
         """
@@ -21,11 +21,20 @@ extraction and conversion routines.
 # 2013-05-16 -- 0.1.0
 #   * Package created (for DAT project)
 
+from vistrails.core.configuration import ConfigurationObject
 from vistrails.core.packagemanager import get_package_manager
 
 from .identifiers import *
 
 
+# column_cache: directory where the columns of CSV files are kept as
+# memory-mapped numpy arrays, so that a file is only parsed once
+# column_cache_size: size of the column cache, in megabytes; the least
+# recently used tables are removed beyond that
+configuration = ConfigurationObject(column_cache=(None, str),
+                                    column_cache_size=1024)
+
+
 def package_dependencies():
     pm = get_package_manager()
     spreadsheet_identifier = 'org.vistrails.vistrails.spreadsheet'
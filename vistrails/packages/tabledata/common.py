@@ -1,3 +1,4 @@
+import os
 try:
     import numpy
 except ImportError: # pragma: no cover
@@ -44,6 +45,15 @@ class TableObject(object):
         else:
             return self._columns[i]
 
+    def get_array(self, i):
+        """Gets a column as a numpy array of the values as they are stored.
+
+        This returns None unless the table holds numpy arrays (see
+        ColumnarTable); operations use it to work on whole columns at once
+        and fall back to get_column() otherwise.
+        """
+        return None
+
     def get_column_by_name(self, name, numeric=False):
         """Gets a column from its name.
 
@@ -85,6 +95,87 @@ class TableObject(object):
         return cls(columns, count, keys)
 
 
+class ColumnarTable(TableObject):
+    """A table stored as one numpy array per column.
+
+    Columns are usually arrays of strings, as read from a file; the numeric
+    version of a column and its list of values are computed once and kept.
+    The arrays can be saved to a directory of .npy files and loaded back
+    memory-mapped, so that large tables don't need to be read again or held
+    in memory.
+
+    Rows can be selected with take(), which only does index operations on
+    the arrays.
+    """
+    def __init__(self, columns, nb_rows, names):
+        TableObject.__init__(self, [numpy.asanyarray(c) for c in columns],
+                             nb_rows, names)
+        self._numeric_columns = {}
+        self._list_columns = {}
+
+    def get_column(self, i, numeric=False):
+        if numeric:
+            try:
+                return self._numeric_columns[i]
+            except KeyError:
+                column = self._columns[i].astype(numpy.float32)
+                self._numeric_columns[i] = column
+                return column
+        else:
+            try:
+                return self._list_columns[i]
+            except KeyError:
+                column = self._columns[i].tolist()
+                self._list_columns[i] = column
+                return column
+
+    def get_array(self, i):
+        return self._columns[i]
+
+    def take(self, rows):
+        """Builds a new table from some of the rows of this one.
+
+        rows can be an array of indexes or a boolean mask.
+        """
+        columns = [column[rows] for column in self._columns]
+        if len(columns) > 0:
+            nb_rows = len(columns[0])
+        else:
+            nb_rows = 0
+        table = ColumnarTable(columns, nb_rows, self.names)
+        for i, column in self._numeric_columns.iteritems():
+            table._numeric_columns[i] = column[rows]
+        return table
+
+    def save(self, directory):
+        """Writes the columns as .npy files in a directory.
+
+        Columns of Python strings are written as fixed-width strings, so that
+        they can be memory-mapped when loaded.
+        """
+        for i, column in enumerate(self._columns):
+            if column.dtype == object:
+                column = column.astype(str)
+            numpy.save(os.path.join(directory, 'col_%d.npy' % i), column)
+
+    @classmethod
+    def load(cls, directory, nb_columns, names=None, mmap=True):
+        """Reads columns previously written by save().
+
+        With mmap=True (the default), the arrays are memory-mapped from the
+        files instead of being read in memory.
+        """
+        mmap_mode = 'r' if mmap else None
+        columns = [numpy.load(os.path.join(directory, 'col_%d.npy' % i),
+                              mmap_mode=mmap_mode)
+                   for i in xrange(nb_columns)]
+        if columns:
+            nb_rows = len(columns[0])
+        else:
+            nb_rows = 0
+        return cls(columns, nb_rows, names)
+
+
 class Table(Module):
     _input_ports = [('name', '(org.vistrails.vistrails.basic:String)')]
     _output_ports = [('value', 'Table')]
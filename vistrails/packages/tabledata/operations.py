@@ -2,6 +2,7 @@ try:
     import numpy
 except ImportError: # pragma: no cover
     numpy = None
+import operator
 import re
 
 from vistrails.core.modules.vistrails_module import ModuleError
@@ -20,6 +21,37 @@ def utf8(obj):
         return bytes(obj)
 
 
+def string_array(table, index):
+    """Gets a column as a numpy array of bytes, or None.
+
+    The vectorized operations are only used on such columns, for which they
+    give the same results as the per-row Python code. Columns of Python
+    strings, as read from CSV files, are converted for the operation.
+    """
+    if numpy is None:
+        return None
+    column = table.get_array(index)
+    if column is not None and column.dtype == object:
+        try:
+            column = column.astype(str)
+        except UnicodeError:
+            return None
+    if column is None or column.dtype.kind != 'S':
+        return None
+    return column
+
+
+def take_rows(column, rows, numeric=False):
+    """Selects rows (a list or array of indexes) from a column.
+    """
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        result = column[numpy.asarray(rows, dtype=numpy.intp)]
+        if not numeric:
+            result = result.tolist()
+        return result
+    return [column[i] for i in rows]
+
+
 class JoinedTables(TableObject):
     def __init__(self, left_t, right_t, left_key_col, right_key_col,
                  case_sensitive=False, always_prefix=False):
@@ -33,7 +65,6 @@ class JoinedTables(TableObject):
         self.build_column_names()
         self.compute_row_map()
         self.column_cache = {}
-        self.rows = len(self.row_map)
 
     def build_column_names(self):
         left_name = self.left_t.name
@@ -67,19 +98,17 @@ class JoinedTables(TableObject):
         if (index, numeric) in self.column_cache:
             return self.column_cache[(index, numeric)]
 
-        result = []
         if index < self.left_t.columns:
-            column = self.left_t.get_column(index, numeric)
-            for i in xrange(self.left_t.rows):
-                if i in self.row_map:
-                    result.append(column[i])
+            table, col, rows = self.left_t, index, self.left_rows
         else:
-            column = self.right_t.get_column(index - self.left_t.columns,
-                                             numeric)
-            for i in xrange(self.left_t.rows):
-                if i in self.row_map:
-                    j = self.row_map[i]
-                    result.append(column[j])
+            table, rows = self.right_t, self.right_rows
+            col = index - self.left_t.columns
+        column = None
+        if not numeric:
+            column = table.get_array(col)
+        if column is None:
+            column = table.get_column(col, numeric)
+        result = take_rows(column, rows, numeric)
 
         if numeric and numpy is not None:
             result = numpy.array(result, dtype=numpy.float32)
@@ -87,6 +116,50 @@ class JoinedTables(TableObject):
         return result
 
     def compute_row_map(self):
+        left_keys = string_array(self.left_t, self.left_key_col)
+        right_keys = string_array(self.right_t, self.right_key_col)
+        if left_keys is not None and right_keys is not None:
+            self.compute_row_map_numpy(left_keys, right_keys)
+        else:
+            self.compute_row_map_python()
+        self.rows = len(self.left_rows)
+
+    def normalize_keys(self, keys):
+        """Returns the distinct keys, normalized, and the inverse index.
+
+        numpy.char functions loop in Python, so they are only called once
+        for each distinct key.
+        """
+        unique, inverse = numpy.unique(keys, return_inverse=True)
+        unique = numpy.char.strip(unique)
+        if not self.case_sensitive:
+            unique = numpy.char.upper(unique)
+        return unique, inverse
+
+    def compute_row_map_numpy(self, left_keys, right_keys):
+        """Sort-based join of two columns of byte strings.
+        """
+        left_unique, left_inverse = self.normalize_keys(left_keys)
+        right_unique, right_inverse = self.normalize_keys(right_keys)
+        right_keys = right_unique[right_inverse]
+
+        # like the dict in compute_row_map_python(), the last right row wins
+        right_keys = right_keys[::-1]
+        right_unique, first = numpy.unique(right_keys, return_index=True)
+        right_idx = len(right_keys) - 1 - first
+
+        if len(right_unique) == 0:
+            self.left_rows = numpy.zeros(0, dtype=numpy.intp)
+            self.right_rows = numpy.zeros(0, dtype=numpy.intp)
+            return
+        # match each distinct left key, then expand to the left rows
+        pos = numpy.searchsorted(right_unique, left_unique)
+        pos[pos == len(right_unique)] = 0
+        matched = right_unique[pos] == left_unique
+        self.left_rows = numpy.nonzero(matched[left_inverse])[0]
+        self.right_rows = right_idx[pos[left_inverse[self.left_rows]]]
+
+    def compute_row_map_python(self):
         def build_key_dict(table, key_col):
             column = table.get_column(key_col)
             if self.case_sensitive:
@@ -99,14 +172,16 @@ class JoinedTables(TableObject):
 
         right_keys = build_key_dict(self.right_t, self.right_key_col)
 
-        self.row_map = {}
+        self.left_rows = []
+        self.right_rows = []
         for left_row_idx, key in enumerate(
                 self.left_t.get_column(self.left_key_col)):
             key = utf8(key).strip()
             if not self.case_sensitive:
                 key = key.upper()
             if key in right_keys:
-                self.row_map[left_row_idx] = right_keys[key]
+                self.left_rows.append(left_row_idx)
+                self.right_rows.append(right_keys[key])
 
 
 class JoinTables(Table):
@@ -169,6 +244,9 @@ class ProjectedTable(TableObject):
         mapped_idx = self.col_map[index]
         return self.table.get_column(mapped_idx, numeric)
 
+    def get_array(self, index):
+        return self.table.get_array(self.col_map[index])
+
     @property
     def rows(self):
         return self.table.rows
@@ -259,6 +337,58 @@ class SelectFromTable(Table):
         else:
             raise ValueError("Invalid comparison operator %r" % comparer)
 
+    vectorized_comparers = {'==': operator.eq,
+                            '!=': operator.ne,
+                            '<': operator.lt,
+                            '>': operator.gt,
+                            '<=': operator.le,
+                            '>=': operator.ge}
+
+    @classmethod
+    def match_rows(cls, table, idx, comparer, comparand):
+        """Returns the indexes of the rows matching a condition.
+
+        Comparisons on numeric columns and equality on byte string columns
+        are done on whole numpy arrays; anything else, e.g. regular
+        expressions, is checked row by row.
+        """
+        numeric = isinstance(comparand, float)
+        if numpy is not None and comparer in cls.vectorized_comparers:
+            op = cls.vectorized_comparers[comparer]
+            if numeric:
+                column = table.get_column(idx, True)
+                if isinstance(column, numpy.ndarray):
+                    # compares as doubles, like float(v) does
+                    column = column.astype(numpy.float64)
+                    return numpy.nonzero(op(column, comparand))[0]
+            elif (comparer in ('==', '!=') and
+                    isinstance(comparand, bytes)):
+                column = string_array(table, idx)
+                if column is not None:
+                    return numpy.nonzero(op(column, comparand))[0]
+
+        condition = cls.make_condition(comparand, comparer)
+        column = table.get_column(idx, numeric)
+        return [i
+                for i, col_val in enumerate(column)
+                if condition(col_val)]
+
+    @staticmethod
+    def select_rows(table, rows):
+        """Builds a table from some rows of another table.
+        """
+        if hasattr(table, 'get_table'):
+            table = table.get_table()
+        if hasattr(table, 'take'):
+            return table.take(numpy.asarray(rows, dtype=numpy.intp))
+        columns = []
+        for col in xrange(table.columns):
+            column = table.get_array(col)
+            if column is None:
+                column = table.get_column(col)
+            columns.append(take_rows(column, rows))
+        return TableObject(columns, len(rows), table.names)
+
     def compute(self):
         table = self.get_input('table')
 
@@ -282,17 +412,11 @@ class SelectFromTable(Table):
                                   "No column %d, table only has %d columns" % (
                                   idx, table.columns))
 
-        condition = self.make_condition(comparand, comparer)
-        numeric = isinstance(comparand, float)
-        column = table.get_column(idx, numeric)
-        matched_rows = [i
-                        for i, col_val in enumerate(column)
-                        if condition(col_val)]
-        columns = []
-        for col in xrange(table.columns):
-            column = table.get_column(col)
-            columns.append([column[row] for row in matched_rows])
-        selected_table = TableObject(columns, len(matched_rows), table.names)
+        try:
+            matched_rows = self.match_rows(table, idx, comparer, comparand)
+        except ValueError, e:
+            raise ModuleError(self, e.message)
+        selected_table = self.select_rows(table, matched_rows)
         self.set_output('value', selected_table)
 
 
@@ -306,6 +430,17 @@ class AggregatedTable(TableObject):
         self.build_map()
 
     def build_map(self):
+        keys = string_array(self.table, self.group_col)
+        if keys is not None:
+            self.build_map_numpy(keys)
+        else:
+            self.build_map_python()
+        self.columns = 2
+        if self.table.names is not None:
+            self.names = [self.table.names[self.group_col],
+                          self.table.names[self.col]]
+
+    def build_map_python(self):
         agg_map = {}
         for i, val in enumerate(self.table.get_column(self.group_col)):
             if val in agg_map:
@@ -314,13 +449,56 @@ class AggregatedTable(TableObject):
                 agg_map[val] = [i]
         self.agg_rows = [(min(rows), rows) for rows in agg_map.itervalues()]
         self.agg_rows.sort()
+        self.group_ids = None
         self.rows = len(self.agg_rows)
-        self.columns = 2
-        if self.table.names is not None:
-            self.names = [self.table.names[self.group_col],
-                          self.table.names[self.col]]
+
+    def build_map_numpy(self, keys):
+        """Groups the rows with numpy.unique().
+
+        Groups are numbered in the order they first appear, like
+        build_map_python() sorts them.
+        """
+        unique, first, inverse = numpy.unique(keys, return_index=True,
+                                              return_inverse=True)
+        order = numpy.argsort(first)
+        rank = numpy.empty_like(order)
+        rank[order] = numpy.arange(len(order))
+        self.group_ids = rank[inverse]
+        self.first_rows = first[order]
+        self.counts = numpy.bincount(self.group_ids, minlength=len(order))
+        self.rows = len(order)
+
+    def get_column_numpy(self, index, numeric):
+        if index == 0:
+            col = self.table.get_array(self.group_col)
+            if numeric:
+                col = self.table.get_column(self.group_col, True)
+            return col[self.first_rows].tolist()
+        elif self.op == 'count':
+            return self.counts.tolist()
+        elif self.rows == 0:
+            return []
+
+        values = numpy.asarray(self.table.get_column(self.col, True))
+        if self.op in ('sum', 'average'):
+            result = numpy.bincount(self.group_ids, weights=values,
+                                    minlength=self.rows)
+            if self.op == 'average':
+                result /= self.counts
+        elif self.op in ('min', 'max'):
+            ufunc = numpy.minimum if self.op == 'min' else numpy.maximum
+            sorted_rows = numpy.argsort(self.group_ids, kind='mergesort')
+            starts = numpy.zeros(self.rows, dtype=numpy.intp)
+            numpy.cumsum(self.counts[:-1], out=starts[1:])
+            result = ufunc.reduceat(values[sorted_rows], starts)
+        else:
+            raise ValueError('Unknown operation: "%s"' % self.op)
+        return result.tolist()
 
     def get_column(self, index, numeric=False):
+        if self.group_ids is not None:
+            return self.get_column_numpy(index, numeric)
+
         def average(value_iter):
             # value_iter can only be used once
             sum = 0
@@ -695,3 +873,63 @@ class TestAggregate(unittest.TestCase):
                                    ('group_by_index', [('Integer', '2')])])
         self.assertEqual(table.get_column(0, False), ['T', 'F'])
         self.assertEqual(table.get_column(1, True), [-7, 21])
+
+
+class TestVectorized(unittest.TestCase):
+    """Checks that the numpy code gives the same results as the Python code.
+    """
+    def make_tables(self, columns, names):
+        from .common import ColumnarTable
+        arrays = [numpy.array(c, dtype=str) for c in columns]
+        return (ColumnarTable(arrays, len(columns[0]), names),
+                TableObject(columns, len(columns[0]), names))
+
+    def test_select(self):
+        fast, slow = self.make_tables([['3', '1', '4', '1', '5'],
+                                       ['a', 'b', 'a', 'c', ' a']],
+                                      ['num', 'str'])
+        for idx, comparer, comparand in [(0, '<=', 3.0), (0, '!=', 1.0),
+                                         (1, '==', 'a'), (1, '!=', 'a'),
+                                         (1, '=~', 'a')]:
+            fast_rows = SelectFromTable.match_rows(fast, idx, comparer,
+                                                   comparand)
+            slow_rows = SelectFromTable.match_rows(slow, idx, comparer,
+                                                   comparand)
+            self.assertEqual(list(fast_rows), list(slow_rows))
+            self.assertEqual(
+                    SelectFromTable.select_rows(fast, fast_rows).get_column(1),
+                    SelectFromTable.select_rows(slow, slow_rows).get_column(1))
+
+    def test_aggregate(self):
+        fast, slow = self.make_tables([['b', 'a', 'b', 'c', 'a', 'b'],
+                                       ['1', '2', '3', '4', '5', '-6']],
+                                      ['key', 'value'])
+        for op in ['sum', 'count', 'average', 'min', 'max']:
+            fast_agg = AggregatedTable(fast, op, 1, 0)
+            slow_agg = AggregatedTable(slow, op, 1, 0)
+            self.assertIsNotNone(fast_agg.group_ids)
+            self.assertIsNone(slow_agg.group_ids)
+            self.assertEqual(fast_agg.rows, slow_agg.rows)
+            self.assertEqual(fast_agg.get_column(0), slow_agg.get_column(0))
+            self.assertEqual(list(fast_agg.get_column(1, True)),
+                             list(slow_agg.get_column(1, True)))
+
+    def test_join(self):
+        left_fast, left_slow = self.make_tables(
+                [['a', 'B', 'c ', 'd', 'b'], ['1', '2', '3', '4', '5']],
+                ['key', 'lv'])
+        right_fast, right_slow = self.make_tables(
+                [['b', 'C', 'a', 'b', 'e'], ['6', '7', '8', '9', '10']],
+                ['key', 'rv'])
+        for case_sensitive in (False, True):
+            fast = JoinedTables(left_fast, right_fast, 0, 0, case_sensitive)
+            slow = JoinedTables(left_slow, right_slow, 0, 0, case_sensitive)
+            self.assertEqual(fast.rows, slow.rows)
+            self.assertEqual(fast.names, slow.names)
+            for col in xrange(fast.columns):
+                self.assertEqual(fast.get_column(col), slow.get_column(col))
+            for col in (1, 3):
+                self.assertEqual(list(fast.get_column(col, True)),
+                                 list(slow.get_column(col, True)))
+        empty_fast, empty_slow = self.make_tables([[], []], ['key', 'rv'])
+        self.assertEqual(JoinedTables(left_fast, empty_fast, 0, 0).rows, 0)
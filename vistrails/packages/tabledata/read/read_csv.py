@@ -1,10 +1,16 @@
 import csv
+import hashlib
+from itertools import izip
+import os
+import shutil
+import tempfile
 try:
     import numpy
 except ImportError: # pragma: no cover
     numpy = None
 
-from ..common import TableObject, Table, InternalModuleError
+from .. import configuration
+from ..common import TableObject, ColumnarTable, Table, InternalModuleError
 
 
 def count_lines(fp):
@@ -14,10 +20,59 @@ def count_lines(fp):
     return lines
 
 
+def read_columns(fp, nb_columns, dialect=None, delimiter=None):
+    """Reads all the columns of a CSV file in a single pass.
+
+    Short rows are padded with empty strings; extra fields are dropped.
+    """
+    if dialect is not None:
+        reader = csv.reader(fp, dialect=dialect)
+    else:
+        reader = csv.reader(fp, delimiter=delimiter)
+    columns = [[] for i in xrange(nb_columns)]
+    appends = [column.append for column in columns]
+    for row in reader:
+        if len(row) < nb_columns:
+            row = row + [''] * (nb_columns - len(row))
+        for append, value in izip(appends, row):
+            append(value)
+    return columns
+
+
+def evict_column_cache(cache_dir, max_size, keep=None):
+    """Removes the least recently used tables from a column cache until it
+    holds at most max_size bytes.
+
+    The table in keep is never removed.
+    """
+    entries = []
+    total = 0
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.startswith('tmp_') or not os.path.isdir(path):
+            continue
+        try:
+            size = sum(os.path.getsize(os.path.join(path, f))
+                       for f in os.listdir(path))
+            entries.append((os.path.getmtime(path), size, path))
+        except OSError:
+            continue
+        total += size
+    entries.sort()
+    for mtime, size, path in entries:
+        if total <= max_size:
+            break
+        if path != keep:
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+
 # FIXME : test coverage for CSVTable
 class CSVTable(TableObject):
     def __init__(self, csv_file, header_present, delimiter,
-                 skip_lines=0, dialect=None, use_sniffer=True):
+                 skip_lines=0, dialect=None, use_sniffer=True,
+                 cache_dir=None, cache_size=None):
+        self._table = None
         self._rows = None
 
         self.header_present = header_present
@@ -25,6 +80,8 @@ class CSVTable(TableObject):
         self.filename = csv_file
         self.skip_lines = skip_lines
         self.dialect = dialect
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
 
         (self.columns, self.names, self.delimiter,
          self.header_present, self.dialect) = \
@@ -33,8 +90,6 @@ class CSVTable(TableObject):
         if self.header_present:
             self.skip_lines += 1
 
-        self.column_cache = {}
-
     @staticmethod
     def read_file(filename, delimiter=None, header_present=True,
                   skip_lines=0, dialect=None, use_sniffer=True):
@@ -87,39 +142,99 @@ class CSVTable(TableObject):
 
         return column_count, column_names, delimiter, header_present, dialect
 
-    def get_column(self, index, numeric=False):
-        if (index, numeric) in self.column_cache:
-            return self.column_cache[(index, numeric)]
-
-        if numeric and numpy is not None:
-            result = numpy.loadtxt(
-                    self.filename,
-                    dtype=numpy.float32,
-                    delimiter=self.delimiter,
-                    skiprows=self.skip_lines,
-                    usecols=[index])
+    def _cache_key(self):
+        stat = os.stat(self.filename)
+        if self.dialect is not None:
+            quotechar = getattr(self.dialect, 'quotechar', self.dialect)
         else:
-            with open(self.filename, 'rb') as fp:
-                for i in xrange(self.skip_lines):
-                    line = fp.readline()
-                    if not line:
-                        raise InternalModuleError("skip_lines greater than "
-                                                  "the number of lines in the "
-                                                  "file")
-                if self.dialect is not None:
-                    reader = csv.reader(fp, dialect=self.dialect)
+            quotechar = None
+        key = repr((os.path.abspath(self.filename), stat.st_size,
+                    stat.st_mtime, self.delimiter, quotechar,
+                    self.skip_lines, self.columns))
+        return hashlib.sha1(key).hexdigest()
+
+    def _read_table(self):
+        with open(self.filename, 'rb') as fp:
+            for i in xrange(self.skip_lines):
+                line = fp.readline()
+                if not line:
+                    raise InternalModuleError("skip_lines greater than "
+                                              "the number of lines in the "
+                                              "file")
+            columns = read_columns(fp, self.columns,
+                                   self.dialect, self.delimiter)
+        nb_rows = len(columns[0]) if columns else 0
+        if numpy is None:
+            return TableObject(columns, nb_rows, self.names)
+        # object arrays reference the strings read, while fixed-width
+        # strings would take the size of the longest value for each row
+        return ColumnarTable([numpy.array(column, dtype=object)
+                              for column in columns],
+                             nb_rows, self.names)
+
+    def _load(self):
+        if self._table is not None:
+            return self._table
+
+        cache_path = None
+        if self.cache_dir is not None and numpy is not None:
+            cache_path = os.path.join(self.cache_dir, self._cache_key())
+            if os.path.isdir(cache_path):
+                try:
+                    self._table = ColumnarTable.load(cache_path,
+                                                     self.columns,
+                                                     self.names)
+                except (IOError, ValueError):
+                    pass
                 else:
-                    reader = csv.reader(fp, delimiter=self.delimiter)
+                    try:
+                        # marks the table as recently used
+                        os.utime(cache_path, None)
+                    except OSError:
+                        pass
+                    return self._table
+
+        self._table = self._read_table()
+
+        if cache_path is not None:
+            # write to a temporary directory first, so that a partially
+            # written cache is never used
+            try:
+                if not os.path.isdir(self.cache_dir):
+                    os.makedirs(self.cache_dir)
+                tmp_path = tempfile.mkdtemp(prefix='tmp_',
+                                            dir=self.cache_dir)
+                self._table.save(tmp_path)
+                os.rename(tmp_path, cache_path)
+                if self.cache_size is not None:
+                    evict_column_cache(self.cache_dir, self.cache_size,
+                                       cache_path)
+            except OSError:
+                pass
+            else:
+                self._table = ColumnarTable.load(cache_path, self.columns,
+                                                 self.names)
+        return self._table
+
+    def get_column(self, index, numeric=False):
+        table = self._load()
+        if numeric and numpy is None:
+            return [float(e) for e in table.get_column(index)]
+        return table.get_column(index, numeric)
 
-                result = [row[index] for row in reader]
-            if numeric:
-                result = [float(e) for e in result]
+    def get_array(self, index):
+        return self._load().get_array(index)
 
-        self.column_cache[(index, numeric)] = result
-        return result
+    def get_table(self):
+        """Gets the table held in memory (or memory-mapped), reading the
+        file if necessary.
+        """
+        return self._load()
 
     @property
     def rows(self):
+        if self._table is not None:
+            return self._table.rows
         if self._rows is not None:
             return self._rows
         with open(self.filename, 'rb') as fp:
@@ -161,9 +276,15 @@ class CSVFile(Table):
         dialect = self.force_get_input('dialect', None)
         sniff_header = self.get_input('sniff_header')
 
+        cache_dir = cache_size = None
+        if configuration.check('column_cache'):
+            cache_dir = os.path.expanduser(configuration.column_cache)
+            if configuration.check('column_cache_size'):
+                cache_size = configuration.column_cache_size * 1024 * 1024
+
         try:
             table = CSVTable(csv_file, header_present, delimiter, skip_lines,
-                             dialect, sniff_header)
+                             dialect, sniff_header, cache_dir, cache_size)
         except InternalModuleError, e:
             e.raise_module_error(self)
 
@@ -277,6 +398,62 @@ class CSVTestCase(unittest.TestCase):
         self.assertEqual(results[0],
                          ['col moutarde', '4', 'not a number', '7'])
 
+    def test_csv_single_pass(self):
+        """Reads all the columns of a CSVTable, with a column cache.
+        """
+        import shutil
+        import tempfile
+        cache_dir = tempfile.mkdtemp(prefix='vt_tabledata')
+        try:
+            for i in xrange(2):
+                table = CSVTable(self._test_dir + '/test.csv', True, ';',
+                                 cache_dir=cache_dir)
+                self.assertEqual(table.rows, 3)
+                self.assertEqual(table.names,
+                                 ['col 1', 'col 2', 'col moutarde'])
+                self.assertEqual(list(table.get_column(1, True)),
+                                 [2.0, 3.0, 14.5])
+                self.assertEqual(table.get_column(2),
+                                 ['4', 'not a number', '7'])
+                self.assertIsInstance(table.get_table(), ColumnarTable)
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+            self.assertIsInstance(table.get_table().get_array(0),
+                                  numpy.memmap)
+            selected = table.get_table().take(numpy.array([2, 0]))
+            self.assertEqual(selected.rows, 2)
+            self.assertEqual(selected.get_column(0), ['6', '-1'])
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_csv_table_memory(self):
+        """Reads a CSVTable without a column cache.
+        """
+        table = CSVTable(self._test_dir + '/test.csv', True, ';')
+        # the rows are counted without parsing the file
+        self.assertEqual(table.rows, 3)
+        self.assertIsNone(table._table)
+        column = table.get_column(2)
+        self.assertEqual(column, ['4', 'not a number', '7'])
+        self.assertIs(table.get_column(2), column)
+        self.assertEqual(table.get_array(2).dtype, object)
+
+    def test_csv_cache_eviction(self):
+        """Fills the column cache beyond its size.
+        """
+        import shutil
+        import tempfile
+        cache_dir = tempfile.mkdtemp(prefix='vt_tabledata')
+        try:
+            for skip_lines in (0, 1):
+                table = CSVTable(self._test_dir + '/test.csv', True, ';',
+                                 skip_lines=skip_lines,
+                                 cache_dir=cache_dir, cache_size=0)
+                table.get_column(0)
+            self.assertEqual(os.listdir(cache_dir), [table._cache_key()])
+            self.assertEqual(table.get_column(0), ['2', '6'])
+        finally:
+            shutil.rmtree(cache_dir)
+
 
 class TestCountlines(unittest.TestCase):
     def test_countlines(self):
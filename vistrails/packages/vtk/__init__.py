@@ -39,6 +39,11 @@ the world. http://www.vtk.org"""
 
 from identifiers import *
 import vistrails.core
+from vistrails.core.configuration import ConfigurationObject
+
+# cache_introspection: keep the modules and ports built from the VTK classes
+# in a file, so that they don't have to be built again on the next start
+configuration = ConfigurationObject(cache_introspection=True)
 
 def package_dependencies():
     import vistrails.core.packagemanager
@@ -43,6 +43,7 @@ from vistrails.core.modules.module_registry import get_module_registry
 from vistrails.core.modules.vistrails_module import new_module, ModuleError
 from vistrails.core.system import get_vistrails_default_pkg_prefix
 from identifiers import identifier as vtk_pkg_identifier
+from . import configuration
 from vistrails.core.upgradeworkflow import UpgradeWorkflowHandler
 from vistrails.core.utils import all, any, InstanceObject
 from vistrails.core.vistrail.connection import Connection
@@ -60,6 +61,7 @@ from base_module import vtkBaseModule, vtkRendererOutput
 from class_tree import ClassTree
 import fix_classes
 import inspectors
+import module_cache
 import offscreen
 import tf_widget
 from vtk_parser import VTKMethodParser
@@ -1057,10 +1059,15 @@ disallowed_modules = set([
         'vtkGeoTerrainCache',
         'vtkMPIGroup'
         ])
-def createModule(baseModule, node):
-    """ createModule(baseModule: a Module subclass, node: TreeNode) -> None
+def createModule(baseModule, node, classes=None):
+    """ createModule(baseModule: a Module subclass, node: TreeNode,
+                     classes: list) -> None
     Construct a module inherits baseModule with specification from node
-    
+
+    If classes is given, (name, base name, abstract) is appended to it for
+    each module, so that they can be created again with
+    createCachedModules().
+
     """
     if node.name in disallowed_modules: return
     def obsolete_class_list():
@@ -1090,6 +1097,21 @@ def createModule(baseModule, node):
         except (TypeError, NotImplementedError): # VTK raises type error on abstract classes
             return True
         return False
+    abstract = is_abstract()
+    module = registerModule(baseModule, node, abstract)
+    if classes is not None:
+        classes.append((node.name, baseModule.__name__, abstract))
+    for child in node.children:
+        if child.name in disallowed_classes:
+            continue
+        createModule(module, child, classes)
+
+def registerModule(baseModule, node, abstract):
+    """ registerModule(baseModule: a Module subclass, node: TreeNode,
+                       abstract: bool) -> Module
+    Create the module for the class of node and add it to the registry
+
+    """
     module = new_module(baseModule, node.name,
                        class_dict(baseModule, node),
                        docstring=getattr(vtk, node.name).__doc__
@@ -1101,17 +1123,23 @@ def createModule(baseModule, node):
     else:
         module.vtkClass = node.klass
     registry = get_module_registry()
-    registry.add_module(module, abstract=is_abstract(), 
+    registry.add_module(module, abstract=abstract,
                         signatureCallable=vtk_hasher)
-    for child in node.children:
-        if child.name in disallowed_classes:
-            continue
-        createModule(module, child)
+    return module
+
+def createVTKObjectBase():
+    vtkObjectBase = new_module(vtkBaseModule, 'vtkObjectBase')
+    vtkObjectBase.vtkClass = vtk.vtkObjectBase
+    registry = get_module_registry()
+    registry.add_module(vtkObjectBase)
+    return vtkObjectBase
 
-def createAllModules(g):
-    """ createAllModules(g: ClassTree) -> None
+def createAllModules(g, classes=None):
+    """ createAllModules(g: ClassTree, classes: list) -> None
     Traverse the VTK class tree and add all modules into the module registry
-    
+
+    See createModule() for the classes argument.
+
     """
     v = vtk.vtkVersion()
     version = [v.GetVTKMajorVersion(),
@@ -1122,21 +1150,52 @@ def createAllModules(g):
         base = g.tree[0][0]
         assert base.name == 'vtkObjectBase'
 
-    vtkObjectBase = new_module(vtkBaseModule, 'vtkObjectBase')
-    vtkObjectBase.vtkClass = vtk.vtkObjectBase
-    registry = get_module_registry()
-    registry.add_module(vtkObjectBase)
+    vtkObjectBase = createVTKObjectBase()
     if version < [5, 7, 0]:
         for child in base.children:
             if child.name in disallowed_classes:
                 continue
-            createModule(vtkObjectBase, child)
+            createModule(vtkObjectBase, child, classes)
     else:
         for base in g.tree[0]:
             for child in base.children:
                 if child.name in disallowed_classes:
                     continue
-                createModule(vtkObjectBase, child)
+                createModule(vtkObjectBase, child, classes)
+
+def createCachedModules(classes):
+    """ createCachedModules(classes: list) -> None
+    Add the modules recorded by createAllModules() into the module registry,
+    without inspecting the VTK classes
+
+    """
+    modules = {'vtkObjectBase': createVTKObjectBase()}
+    for name, base_name, abstract in classes:
+        node = InstanceObject(name=name, klass=getattr(vtk, name))
+        modules[name] = registerModule(modules[base_name], node, abstract)
+
+def describeAllPorts(descriptor, ports):
+    """ describeAllPorts(descriptor: ModuleDescriptor, ports: list) -> None
+    Append the ports of descriptor and all of its children to ports, in the
+    order setAllPorts() added them
+
+    """
+    ports.append((descriptor.name,
+                  module_cache.describe_ports(descriptor)))
+    for child in descriptor.children:
+        describeAllPorts(child, ports)
+
+def setCachedPorts(ports):
+    """ setCachedPorts(ports: list) -> None
+    Add the ports recorded by describeAllPorts() to the modules
+
+    """
+    registry = get_module_registry()
+    for name, module_ports in ports:
+        module = registry.get_descriptor_by_name(vtk_pkg_identifier,
+                                                 name).module
+        _upgrade_self_to_instance_modules.add(module)
+        module_cache.add_ports(registry, module, module_ports)
 
 
 ################################################################################
@@ -1154,26 +1213,40 @@ def initialize():
     if version < [5, 0, 0]:
         raise RuntimeError("You need to upgrade your VTK install to version "
                            ">= 5.0.0")
-    inheritanceGraph = ClassTree(vtk)
-    inheritanceGraph.create()
+    registry = get_module_registry()
+    has_spreadsheet = registry.has_module(
+            '%s.spreadsheet' % get_vistrails_default_pkg_prefix(),
+            'SpreadsheetCell')
+
+    # The modules and ports built from the VTK classes are cached on disk
+    cache_key = cache = None
+    if configuration.cache_introspection:
+        cache_key = module_cache.cache_key(has_spreadsheet)
+        cache = module_cache.load_cache(cache_key)
 
     # Transfer Function constant
     tf_widget.initialize()
 
     delayed = InstanceObject(add_input_port=[])
     # Add VTK modules
-    registry = get_module_registry()
     registry.add_module(vtkBaseModule)
     registry.add_module(vtkRendererOutput)
-    createAllModules(inheritanceGraph)
-    setAllPorts(registry.get_descriptor_by_name(identifier,
-                                                'vtkObjectBase'),
-                delayed)
+    if cache is not None:
+        createCachedModules(cache['classes'])
+        setCachedPorts(cache['ports'])
+    else:
+        inheritanceGraph = ClassTree(vtk)
+        inheritanceGraph.create()
+        classes = []
+        createAllModules(inheritanceGraph, classes)
+        vtkObjectBase = registry.get_descriptor_by_name(
+                vtk_pkg_identifier, 'vtkObjectBase')
+        setAllPorts(vtkObjectBase, delayed)
+        ports = []
+        describeAllPorts(vtkObjectBase, ports)
 
     # Register the VTKCell and VTKHandler type if the spreadsheet is up
-    if registry.has_module('%s.spreadsheet' % \
-                           get_vistrails_default_pkg_prefix(),
-                           'SpreadsheetCell'):
+    if has_spreadsheet:
         import vtkhandler
         import vtkcell
         import vtkviewcell
@@ -1185,9 +1258,21 @@ def initialize():
     offscreen.register_self()
 
     # Now add all "delayed" ports - see comment on addSetGetPorts
-    for args in delayed.add_input_port:
-        
-        registry.add_input_port(*args)
+    if cache is not None:
+        setCachedPorts(cache['delayed_ports'])
+    else:
+        delayed_ports = []
+        for args in delayed.add_input_port:
+            registry.add_input_port(*args)
+            descriptor = registry.get_descriptor(args[0])
+            spec = descriptor.get_port_spec(args[1], 'input')
+            delayed_ports.append((descriptor.name,
+                                  [module_cache.describe_port(spec)]))
+        if cache_key is not None:
+            module_cache.save_cache(cache_key, {'classes': classes,
+                                                'ports': ports,
+                                                'delayed_ports':
+                                                    delayed_ports})
 
     # register Transfer Function adjustment
     # This can't be reordered -- TransferFunction needs to go before
@@ -0,0 +1,151 @@
+###############################################################################
+##
+## Copyright (C) 2011-2014, NYU-Poly.
+## Copyright (C) 2006-2011, University of Utah. 
+## All rights reserved.
+## Contact: contact@vistrails.org
+##
+## This file is part of VisTrails.
+##
+## "Redistribution and use in source and binary forms, with or without 
+## modification, are permitted provided that the following conditions are met:
+##
+##  - Redistributions of source code must retain the above copyright notice, 
+##    this list of conditions and the following disclaimer.
+##  - Redistributions in binary form must reproduce the above copyright 
+##    notice, this list of conditions and the following disclaimer in the 
+##    documentation and/or other materials provided with the distribution.
+##  - Neither the name of the University of Utah nor the names of its 
+##    contributors may be used to endorse or promote products derived from 
+##    this software without specific prior written permission.
+##
+## THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+## AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, 
+## THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR 
+## PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+## CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+## EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+## PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; 
+## OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+## WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR 
+## OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF 
+## ADVISED OF THE POSSIBILITY OF SUCH DAMAGE."
+##
+###############################################################################
+"""Cache of the modules and ports that the package builds from VTK.
+
+Building the modules requires instantiating every VTK class and parsing the
+docstrings of all their methods, which is most of the time spent loading the
+package. The result of that introspection is written to a file in the
+.vistrails directory and read back on the following starts, as long as the
+key (the VTK version and the code of this package) is the same.
+"""
+
+import cPickle
+import hashlib
+import os
+import tempfile
+
+import vtk
+
+from vistrails.core import debug
+from vistrails.core.system import current_dot_vistrails
+
+
+# Files in this package whose code decides what the modules and ports are
+_introspection_sources = ['init.py', 'base_module.py', 'class_tree.py',
+                          'fix_classes.py', 'vtk_parser.py',
+                          'module_cache.py']
+
+CACHE_VERSION = 1
+
+
+def cache_filename():
+    return os.path.join(current_dot_vistrails(), 'vtk_modules.cache')
+
+def cache_key(*extra):
+    """Computes the key that a cache file has to match to be used.
+
+    This includes the VTK version and location, and the hash of the code
+    that builds the modules. Extra values can be given for the state the
+    ports depend on (e.g. whether the spreadsheet is enabled).
+    """
+    h = hashlib.sha1()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in _introspection_sources:
+        filename = os.path.join(directory, name)
+        if not os.path.exists(filename):
+            # Only compiled files are installed
+            filename += 'c'
+        with open(filename, 'rb') as fp:
+            h.update(fp.read())
+    return (CACHE_VERSION,
+            vtk.vtkVersion.GetVTKSourceVersion(),
+            os.path.abspath(vtk.__file__),
+            h.hexdigest()) + extra
+
+def load_cache(key, filename=None):
+    """Reads the cache file, or returns None if it doesn't match key.
+    """
+    if filename is None:
+        filename = cache_filename()
+    try:
+        with open(filename, 'rb') as fp:
+            file_key, data = cPickle.load(fp)
+    except IOError:
+        return None
+    except Exception, e:
+        debug.warning("Couldn't read the cache of VTK modules, it will be "
+                      "rebuilt", e)
+        return None
+    if file_key != key:
+        return None
+    return data
+
+def save_cache(key, data, filename=None):
+    """Writes the cache file.
+
+    The file is written under a temporary name then renamed, so that another
+    process never reads an incomplete file.
+    """
+    if filename is None:
+        filename = cache_filename()
+    directory = os.path.dirname(filename)
+    try:
+        fd, temp = tempfile.mkstemp(prefix='vtk_modules', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                cPickle.dump((key, data), fp, cPickle.HIGHEST_PROTOCOL)
+            if os.name == 'nt' and os.path.exists(filename):
+                os.remove(filename)
+            os.rename(temp, filename)
+        except Exception:
+            os.remove(temp)
+            raise
+    except (IOError, OSError), e:
+        debug.warning("Couldn't write the cache of VTK modules", e)
+
+def describe_port(spec):
+    """Returns what is needed to add a port again, as simple values.
+    """
+    labels = spec.labels
+    if not any(labels):
+        labels = None
+    return (spec.type, spec.name, spec.sigstring, bool(spec.optional),
+            labels, spec.docstring())
+
+def describe_ports(descriptor):
+    """Describes the ports of a module (but not the ones it inherits).
+    """
+    return [describe_port(spec) for spec in descriptor.port_specs_list]
+
+def add_ports(registry, module, ports):
+    """Adds ports to a module from the result of describe_ports().
+    """
+    for port_type, name, sigstring, optional, labels, docstring in ports:
+        if port_type == 'input':
+            registry.add_input_port(module, name, sigstring, optional,
+                                    labels=labels, docstring=docstring)
+        else:
+            registry.add_output_port(module, name, sigstring, optional,
+                                     docstring=docstring)
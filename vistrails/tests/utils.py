@@ -27,6 +27,8 @@ def execute(modules, connections=[], add_port_specs=[],
                 ('Signature', 'value-as-string'),
             ]),
         ])]
+    A fourth element can be added to a module tuple to set control
+    parameters, as a list of ('name', 'value') pairs.
 
     connections is a list of tuples describing the connections to make, with
     the following format:
@@ -73,6 +75,8 @@ def execute(modules, connections=[], add_port_specs=[],
     from vistrails.core.utils import DummyView
     from vistrails.core.vistrail.connection import Connection
     from vistrails.core.vistrail.module import Module
+    from vistrails.core.vistrail.module_control_param import \
+        ModuleControlParam
     from vistrails.core.vistrail.module_function import ModuleFunction
     from vistrails.core.vistrail.module_param import ModuleParam
     from vistrails.core.vistrail.pipeline import Pipeline
@@ -98,7 +102,12 @@ def execute(modules, connections=[], add_port_specs=[],
 
     pipeline = Pipeline()
     module_list = []
-    for i, (name, identifier, functions) in enumerate(modules):
+    for i, module_tuple in enumerate(modules):
+        name, identifier, functions = module_tuple[:3]
+        if len(module_tuple) > 3:
+            control_params = module_tuple[3]
+        else:
+            control_params = []
         function_list = []
         try:
             pkg = pm.get_package(identifier)
@@ -132,7 +141,12 @@ def execute(modules, connections=[], add_port_specs=[],
                         package=identifier,
                         version=pkg.version,
                         id=i,
-                        functions=function_list)
+                        functions=function_list,
+                        controlParameters=[
+                                ModuleControlParam(id=j, name=cp_name,
+                                                   value=cp_value)
+                                for j, (cp_name, cp_value)
+                                in enumerate(control_params)])
         for port_spec in port_spec_per_module.get(i, []):
             module.add_port_spec(port_spec)
         pipeline.add_module(module)